@@ -18,7 +18,7 @@
 import re
 from copy import deepcopy
 from threading import RLock
-from typing import Optional, TYPE_CHECKING
+from typing import Dict, Optional, Tuple, TYPE_CHECKING
 
 from cylc.flow import LOG
 from cylc.flow.broadcast_report import (
@@ -30,6 +30,7 @@ from cylc.flow.broadcast_report import (
 from cylc.flow.cfgspec.workflow import SPEC
 from cylc.flow.cycling.loader import get_point, standardise_point_string
 from cylc.flow.exceptions import PointParsingError
+from cylc.flow.parsec.OrderedDict import OrderedDictWithDefaults
 from cylc.flow.parsec.util import listjoin, pdeepcopy, poverride
 from cylc.flow.parsec.validate import BroadcastConfigValidator
 from cylc.flow.run_modes import WORKFLOW_ONLY_MODES
@@ -58,6 +59,41 @@ def addict(target, source):
             target[key] = val
 
 
+def apply_overrides(rtconfig, overrides):
+    """Return a copy of a runtime config with broadcast overrides applied.
+
+    As "poverride(pdeepcopy(rtconfig), overrides, prepend=True)", except
+    that only the sections which are overridden are copied, the rest are
+    shared with the original config (so must not be modified).
+
+    Examples:
+        >>> rtconfig = OrderedDictWithDefaults(
+        ...     script='x', environment={'A': '1'}, meta={'title': 't'}
+        ... )
+        >>> new = apply_overrides(rtconfig, {'environment': {'B': '2'}})
+        >>> dict(new['environment'])
+        {'B': '2', 'A': '1'}
+        >>> dict(rtconfig['environment'])
+        {'A': '1'}
+        >>> new['meta'] is rtconfig['meta']
+        True
+
+    """
+    target = OrderedDictWithDefaults()
+    if hasattr(rtconfig, 'defaults_'):
+        target.defaults_ = rtconfig.defaults_
+    for key, val in rtconfig.items():
+        target[key] = val
+    for key, val in overrides.items():
+        if isinstance(val, dict):
+            target[key] = apply_overrides(target[key], val)
+        elif key not in target:
+            target.prepend(key, val[:] if isinstance(val, list) else val)
+        else:
+            target[key] = val[:] if isinstance(val, list) else val
+    return target
+
+
 class BroadcastMgr:
     """Manage broadcast.
 
@@ -73,11 +109,65 @@ class BroadcastMgr:
         self.workflow_run_mode = schd.get_run_mode()
         self.workflow_db_mgr = schd.workflow_db_mgr
         self.data_store_mgr = schd.data_store_mgr
+        # Broadcast settings merged for each namespace and cycle, and the
+        # runtime config with them applied, keyed by (cycle, namespace).
+        # The cycle is None for cycles without cycle-specific broadcasts.
+        self._overrides_cache: Dict[Tuple[Optional[str], str], dict] = {}
+        self._rtconfig_cache: Dict[
+            Tuple[Optional[str], str], Tuple[dict, dict]
+        ] = {}
         self.linearized_ancestors = {}
         self.broadcasts = {}
         self.ext_triggers = {}  # Can use collections.Counter in future
         self.lock = RLock()
 
+    @property
+    def linearized_ancestors(self) -> dict:
+        return self._linearized_ancestors
+
+    @linearized_ancestors.setter
+    def linearized_ancestors(self, value: dict) -> None:
+        # (e.g. on reload, the family inheritance may have changed)
+        self._linearized_ancestors = value
+        self._clear_cache()
+
+    @property
+    def broadcasts(self) -> dict:
+        return self._broadcasts
+
+    @broadcasts.setter
+    def broadcasts(self, value: dict) -> None:
+        self._broadcasts = value
+        self._clear_cache()
+
+    def _clear_cache(self) -> None:
+        self._overrides_cache.clear()
+        self._rtconfig_cache.clear()
+
+    def _invalidate_cache(self, point_string: str, namespace: str) -> None:
+        """Remove cache entries affected by a change of broadcast settings.
+
+        Args:
+            point_string: The cycle point the settings were changed for.
+            namespace: The namespace the settings were changed for.
+
+        """
+        for key in list(self._overrides_cache):
+            cycle, name = key
+            if (
+                # (the cycle no longer has cycle-specific broadcasts)
+                (cycle is not None and cycle not in self.broadcasts)
+                or (
+                    (
+                        point_string in ALL_CYCLE_POINTS_STRS
+                        or cycle == point_string
+                    )
+                    and namespace in self.linearized_ancestors.get(name, ())
+                )
+            ):
+                del self._overrides_cache[key]
+                self._rtconfig_cache.pop(key, None)
+
     def check_ext_triggers(self, itask, ext_trigger_queue):
         """Get queued ext trigger messages and try to satisfy itask.
 
@@ -142,6 +232,12 @@ class BroadcastMgr:
         # Prune any empty branches
         bad_options = self._get_bad_options(
             self._prune(), point_strings, namespaces, cancel_keys_list)
+        with self.lock:
+            for point_string, namespace in {
+                (point_string, namespace)
+                for point_string, namespace, _setting in modified_settings
+            }:
+                self._invalidate_cache(point_string, namespace)
 
         # Log the broadcast
         self.workflow_db_mgr.put_broadcast(modified_settings, is_cancel=True)
@@ -169,11 +265,26 @@ class BroadcastMgr:
             return (None, {"expire": [cutoff]})
         return self.clear_broadcast(point_strings=point_strings, **kwargs)
 
+    def _get_cache_key(self, tokens: 'Tokens') -> Tuple[Optional[str], str]:
+        cycle = tokens['cycle']
+        if cycle not in self.broadcasts:
+            # (share the entry with the other cycles without broadcasts)
+            cycle = None
+        return cycle, tokens['task']
+
     def get_broadcast(self, tokens: 'Optional[Tokens]' = None) -> dict:
-        """Retrieve all broadcast variables that target a given task ID."""
+        """Retrieve all broadcast variables that target a given task ID.
+
+        Note, the result is cached so must not be modified.
+        """
         if tokens is None or tokens == 'None':
             # all broadcasts requested
             return self.broadcasts
+        key = self._get_cache_key(tokens)
+        try:
+            return self._overrides_cache[key]
+        except KeyError:
+            pass
         ret: dict = {}
         # The order is:
         #    all:root -> all:FAM -> ... -> all:task
@@ -186,19 +297,35 @@ class BroadcastMgr:
             ):
                 if namespace in self.broadcasts[cycle]:
                     addict(ret, self.broadcasts[cycle][namespace])
+        self._overrides_cache[key] = ret
         return ret
 
     def get_updated_rtconfig(self, itask: 'TaskProxy') -> dict:
         """Retrieve updated rtconfig for a single task proxy"""
-        overrides = self.get_broadcast(
-            itask.tokens
-        )
-        if overrides:
-            rtconfig = pdeepcopy(itask.tdef.rtconfig)
-            poverride(rtconfig, overrides, prepend=True)
-        else:
-            rtconfig = itask.tdef.rtconfig
-        return rtconfig
+        return self.apply_broadcasts(itask.tokens, itask.tdef.rtconfig)
+
+    def apply_broadcasts(self, tokens: 'Tokens', rtconfig: dict) -> dict:
+        """Return a runtime config with the broadcasts for a task applied.
+
+        Note, the result is cached, and may share sections with the
+        original config, so must not be modified.
+
+        Args:
+            tokens: The task (or family) proxy.
+            rtconfig: The runtime config of its namespace.
+
+        """
+        overrides = self.get_broadcast(tokens)
+        if not overrides:
+            return rtconfig
+        key = self._get_cache_key(tokens)
+        cached = self._rtconfig_cache.get(key)
+        # (the namespace config is replaced on reload)
+        if cached is None or cached[0] is not rtconfig:
+            cached = self._rtconfig_cache[key] = (
+                rtconfig, apply_overrides(rtconfig, overrides)
+            )
+        return cached[1]
 
     def load_db_broadcast_states(self, row_idx, row):
         """Load broadcast variables from runtime DB broadcast states row."""
@@ -218,6 +345,7 @@ class BroadcastMgr:
                 dict_.setdefault(section, {})
                 dict_ = dict_[section]
             dict_[cur_key] = value
+            self._invalidate_cache(point, namespace)
         LOG.info(CHANGE_FMT.strip() % {
             "change": CHANGE_PREFIX_SET,
             "point": point,
@@ -243,6 +371,7 @@ class BroadcastMgr:
                 BroadcastConfigValidator().validate(
                     settings, SPEC['runtime']['__MANY__']
                 )
+        self._clear_cache()
 
     def _match_ext_trigger(self, itask):
         """Match external triggers for a waiting task proxy."""
@@ -366,6 +495,12 @@ class BroadcastMgr:
                                 coerced_setting,
                             )
 
+            for point_string, namespace in {
+                (point_string, namespace)
+                for point_string, namespace, _setting in modified_settings
+            }:
+                self._invalidate_cache(point_string, namespace)
+
         # Log the broadcast
         self.workflow_db_mgr.put_broadcast(modified_settings)
         LOG.info(get_broadcast_change_report(modified_settings))
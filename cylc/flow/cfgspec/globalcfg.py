@@ -1251,6 +1251,39 @@ with Conf('global.cylc', desc='''
 
                     .. versionadded:: 8.0.0
             ''')
+            Conf('event driven', VDR.V_BOOLEAN, False, desc='''
+                Run the scheduler main loop in event-driven mode.
+
+                By default the main loop wakes up at a fixed interval and
+                re-examines every task in the pool to see if it is ready to
+                run.
+
+                In event-driven mode the main loop is woken early by incoming
+                task messages, commands and external triggers, and only
+                re-examines tasks which have changed since the previous
+                iteration (along with tasks waiting on xtriggers or external
+                triggers). A full sweep of the task pool is still performed
+                every :cylc:conf:`[..]full sweep interval` as a safety net.
+
+                This can substantially reduce scheduler CPU usage for
+                workflows with very large numbers of active tasks.
+
+                .. versionadded:: 8.7.0
+            ''')
+            Conf(
+                'full sweep interval',
+                VDR.V_INTERVAL,
+                DurationFloat(60),
+                desc='''
+                    In event-driven mode, the interval between full sweeps
+                    of the task pool.
+
+                    This has no effect unless
+                    :cylc:conf:`[..]event driven` is set.
+
+                    .. versionadded:: 8.7.0
+                '''
+            )
 
             with Conf('<plugin name>', desc=(
                 default_for(
@@ -1296,6 +1329,228 @@ with Conf('global.cylc', desc='''
                 Conf('interval', VDR.V_INTERVAL, DurationFloat(1800),
                      desc=MAIN_LOOP_PLUGIN_INTERVAL_DESCR)
 
+        with Conf('database', desc='''
+            Settings for the workflow run databases.
+
+            The scheduler maintains a private database (used for restart)
+            and a public database (``log/db``, read by other Cylc commands
+            and tools).
+
+            .. versionadded:: 8.7.0
+        '''):
+            Conf('background public database writer', VDR.V_BOOLEAN, False,
+                 desc='''
+                Write to the public database in a background thread.
+
+                By default the scheduler writes to the public database
+                synchronously, after each write to the private database.
+                On slow or heavily loaded filesystems this can stall the
+                scheduler main loop.
+
+                If set, writes to the public database are handed to a
+                background thread, which writes all pending changes
+                in a single transaction whenever it can. The public
+                database may then lag slightly behind the private
+                database. If it falls too far behind (see
+                :cylc:conf:`[..]public database max queue length` and
+                :cylc:conf:`[..]public database max lag`) the pending
+                changes are discarded and the public database is recovered
+                by copying the private database.
+
+                .. versionadded:: 8.7.0
+            ''')
+            Conf('public database max queue length', VDR.V_INTEGER, 100,
+                 desc='''
+                The maximum number of pending batches of changes for the
+                background public database writer.
+
+                Each batch holds the changes made in one iteration of the
+                scheduler main loop.
+
+                This has no effect unless
+                :cylc:conf:`[..]background public database writer` is set.
+
+                .. versionadded:: 8.7.0
+            ''')
+            Conf('public database max lag', VDR.V_INTERVAL,
+                 DurationFloat(300), desc='''
+                The maximum age of pending changes for the background public
+                database writer.
+
+                This has no effect unless
+                :cylc:conf:`[..]background public database writer` is set.
+
+                .. versionadded:: 8.7.0
+            ''')
+
+            with Conf('<filesystem type>', desc='''
+                SQLite performance settings for workflows whose run
+                directory is on a filesystem of this type.
+
+                The section name is a filesystem type as listed in
+                ``/proc/mounts`` (e.g. ``ext4``, ``xfs``, ``nfs``,
+                ``lustre``). Workflows on filesystems without a section
+                here use the SQLite defaults, with a new database
+                connection for each write.
+
+                Example::
+
+                   [scheduler]
+                       [[database]]
+                           [[[ext4, xfs]]]
+                               journal mode = WAL
+                               synchronous = NORMAL
+                               persistent connection = True
+
+                .. warning::
+
+                   The ``WAL`` journal mode does not work on network
+                   filesystems (e.g. NFS).
+
+                The ``WAL`` journal mode only applies to the private
+                database. The public database (``log/db``) uses the
+                ``DELETE`` journal mode instead, as readers of a ``WAL``
+                database need write access to it (e.g. other users'
+                ``workflow_state`` xtriggers).
+
+                .. versionadded:: 8.7.0
+            '''):
+                Conf('journal mode', VDR.V_STRING, 'DELETE',
+                     options=['DELETE', 'TRUNCATE', 'PERSIST', 'WAL'],
+                     desc='''
+                    The SQLite journal mode for the workflow databases.
+
+                    .. versionadded:: 8.7.0
+                ''')
+                Conf('synchronous', VDR.V_STRING, 'FULL',
+                     options=['OFF', 'NORMAL', 'FULL', 'EXTRA'],
+                     desc='''
+                    The SQLite synchronous level for the workflow databases.
+
+                    ``NORMAL`` is safe against corruption in ``WAL`` mode
+                    but may lose the most recent transactions on power
+                    loss.
+
+                    .. versionadded:: 8.7.0
+                ''')
+                Conf('persistent connection', VDR.V_BOOLEAN, False, desc='''
+                    Keep the database connections open between writes.
+
+                    The connection is re-opened if the database file is
+                    removed or replaced.
+
+                    .. versionadded:: 8.7.0
+                ''')
+                Conf('cached statements', VDR.V_INTEGER, 128, desc='''
+                    The number of prepared SQL statements to cache per
+                    database connection.
+
+                    .. versionadded:: 8.7.0
+                ''')
+                Conf('cache size', VDR.V_INTEGER, 2000, desc='''
+                    The SQLite page cache size per database connection, in
+                    KiB.
+
+                    .. versionadded:: 8.7.0
+                ''')
+
+        with Conf('server', desc='''
+            Settings for the scheduler's network server, which serves
+            requests from jobs, Cylc commands and the Cylc UI Server.
+
+            .. versionadded:: 8.7.0
+        '''):
+            Conf('concurrent requests', VDR.V_BOOLEAN, False, desc='''
+                Serve requests concurrently.
+
+                By default the server handles one request at a time, so a
+                slow query (e.g. for all tasks in a large workflow) holds up
+                any messages from jobs and commands sent after it.
+
+                If set, job messages and commands are served in the order
+                received, separately from read-only queries, which are
+                served concurrently (see
+                :cylc:conf:`[..]max concurrent queries` and
+                :cylc:conf:`[..]max concurrent queries per client`).
+
+                .. versionadded:: 8.7.0
+            ''')
+            Conf('max concurrent queries', VDR.V_INTEGER, 4, desc='''
+                The maximum number of read-only queries to serve at once.
+
+                This has no effect unless
+                :cylc:conf:`[..]concurrent requests` is set.
+
+                .. versionadded:: 8.7.0
+            ''')
+            Conf('max concurrent queries per client', VDR.V_INTEGER, 2,
+                 desc='''
+                The maximum number of read-only queries to serve at once
+                from any one client host.
+
+                Further queries from the same host wait until one of these
+                has been served.
+
+                This has no effect unless
+                :cylc:conf:`[..]concurrent requests` is set.
+
+                .. versionadded:: 8.7.0
+            ''')
+
+        with Conf('xtrigger workers', desc='''
+            Settings for running xtrigger functions in long-lived worker
+            processes.
+
+            By default each xtrigger call is run in a new
+            ``cylc function-run`` process in the process pool, which pays
+            the cost of starting Python and importing Cylc every time. This
+            adds up for workflows with many xtriggers, e.g. lots of
+            ``workflow_state`` xtriggers polling frequently.
+
+            Worker processes are started once and keep xtrigger modules
+            imported between calls. Arguments and return values are passed
+            as JSON, as for ``cylc function-run``.
+
+            Workers are replaced when the workflow is reloaded, so changes
+            to xtrigger modules (e.g. in the workflow ``lib/python``
+            directory) take effect on reload, as they do without workers.
+            Calls in progress at reload finish with the old code.
+
+            .. seealso::
+
+               :ref:`Section External Triggers`.
+
+            .. versionadded:: 8.7.0
+        '''):
+            Conf('pool size', VDR.V_INTEGER, 0, desc='''
+                The number of xtrigger worker processes.
+
+                If zero (the default), xtrigger functions are run in new
+                processes via the process pool (see
+                :cylc:conf:`global.cylc[scheduler]process pool size`).
+
+                Workers are started as needed, up to this number.
+
+                .. versionadded:: 8.7.0
+            ''')
+            Conf('max calls per worker', VDR.V_INTEGER, 100, desc='''
+                Replace each worker process after this many calls.
+
+                This limits the effect of xtrigger functions which leak
+                memory or leave state behind. Zero means no limit.
+
+                .. versionadded:: 8.7.0
+            ''')
+            Conf('call timeout', VDR.V_INTERVAL, desc='''
+                Kill (and replace) a worker if an xtrigger call takes longer
+                than this.
+
+                Defaults to
+                :cylc:conf:`global.cylc[scheduler]process pool timeout`.
+
+                .. versionadded:: 8.7.0
+            ''')
+
         with Conf('logging', desc=f'''
             Settings for the workflow event log.
 
@@ -1950,6 +2205,54 @@ with Conf('global.cylc', desc='''
 
                 .. versionadded:: 8.0.0
             ''')
+            Conf('job agent', VDR.V_BOOLEAN, False, desc='''
+                Run job submit, poll and kill commands in a long-lived
+                job agent on the platform host.
+
+                By default, each batch of job submits, polls or kills runs a
+                new ``cylc jobs-submit|jobs-poll|jobs-kill`` command, over
+                SSH for remote platforms. If this is set, the scheduler
+                starts a ``cylc jobs-agent`` process on the platform host
+                (over SSH for remote platforms) when first needed, and runs
+                these commands in it. This saves the cost of an SSH
+                connection and Cylc start-up for each command, which can
+                be significant for platforms with many jobs to poll.
+
+                The agent runs one command at a time. If it takes longer
+                than :cylc:conf:`global.cylc[scheduler]process pool timeout`
+                to run a command, it is killed (and a new agent started for
+                the next command).
+
+                The platform hosts must have a version of Cylc which supports
+                job agents.
+
+                .. versionadded:: 8.7.0
+            ''')
+            Conf('job runner status cache interval', VDR.V_INTERVAL,
+                 desc='''
+                Share job runner status queries between workflows.
+
+                When polling jobs, each workflow normally asks the job runner
+                (e.g. with ``squeue``) for the status of its own jobs. If
+                this is set, job polls on the platform host list all of the
+                user's jobs in one query instead, and cache the result for
+                other workflows (and later polls) to use, for up to this
+                interval. The job runner is then queried at most once per
+                interval, however many workflows are polling it.
+
+                Jobs which are missing from a cached result are checked with
+                a new query before they are considered to have left the job
+                runner.
+
+                This is only supported by job runners which can list all of
+                the user's jobs (``lsf``, ``sge``, ``slurm`` and
+                ``slurm_packjob``). Other job runners ignore it.
+
+                The platform hosts must have a version of Cylc which supports
+                this setting.
+
+                .. versionadded:: 8.7.0
+            ''')
             Conf('ssh forward environment variables', VDR.V_STRING_LIST, '',
                  desc='''
                 A list containing the names of the environment variables to
@@ -570,7 +570,7 @@ async def reload_workflow(schd: 'Scheduler', reload_global: bool = False):
         schd._update_workflow_state()
         # Things that can't change on workflow reload:
         schd._set_workflow_params(
-            schd.workflow_db_mgr.pri_dao.select_workflow_params()
+            schd.workflow_db_mgr.get_open_pri_dao().select_workflow_params()
         )
         LOG.info("Reloading the workflow definition.")
         config = schd.load_flow_file(is_reload=True)
@@ -624,10 +624,12 @@ async def reload_workflow(schd: 'Scheduler', reload_global: bool = False):
         # Reset the remote init map to trigger fresh file installation
         schd.task_job_mgr.task_remote_mgr.remote_init_map.clear()
         schd.task_job_mgr.task_remote_mgr.is_reload = True
+        # Load changes to xtrigger modules
+        schd.proc_pool.restart_function_workers()
         schd.pool.reload(config)
         schd.data_store_mgr.apply_task_proxy_db_history()
         # Load jobs from DB
-        schd.workflow_db_mgr.pri_dao.select_jobs_for_restart(
+        schd.workflow_db_mgr.get_open_pri_dao().select_jobs_for_restart(
             schd.data_store_mgr.insert_db_job
         )
         if schd.pool.compute_runahead(force=True):
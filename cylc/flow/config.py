@@ -33,6 +33,7 @@ import os
 from pathlib import Path
 import re
 from textwrap import wrap
+from time import time
 import traceback
 from types import SimpleNamespace
 from typing import (
@@ -56,7 +57,10 @@ from metomi.isodatetime.exceptions import IsodatetimeError
 from metomi.isodatetime.parsers import DurationParser
 from metomi.isodatetime.timezone import get_local_time_zone_format
 
-from cylc.flow import LOG
+from cylc.flow import (
+    LOG,
+    config_cache,
+)
 from cylc.flow.c3mro import C3
 from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
 from cylc.flow.cfgspec.workflow import RawWorkflowConfig
@@ -86,7 +90,7 @@ from cylc.flow.exceptions import (
     WorkflowConfigError,
 )
 import cylc.flow.flags
-from cylc.flow.graph_parser import GraphParser
+from cylc.flow.graph_parser import parse_graph_section
 from cylc.flow.graphnode import GraphNodeParser
 from cylc.flow.id import Tokens
 from cylc.flow.listify import listify
@@ -296,9 +300,9 @@ class WorkflowConfig:
 
         """
         check_deprecation(Path(fpath), force_compat_mode=force_compat_mode)
-        self.mem_log = mem_log_func
-        if self.mem_log is None:
-            self.mem_log = lambda x: None
+        self.mem_log: Callable[[str], None] = (
+            mem_log_func or (lambda x: None)
+        )
         self.mem_log("config.py:config.py: start init config")
         self.workflow = workflow
         self.workflow_name = get_workflow_name_from_id(self.workflow)
@@ -314,8 +318,9 @@ class WorkflowConfig:
             'SequenceBase', Set[Tuple[str, str, bool, bool]]
         ] = {}
         self.taskdefs: Dict[str, TaskDef] = {}
-        self.expiration_offsets = {}
-        self.ext_triggers = {}  # Old external triggers (client/server)
+        self.expiration_offsets: Dict[str, 'IntervalBase'] = {}
+        # Old external triggers (client/server)
+        self.ext_triggers: Dict[str, str] = {}
         self.xtrigger_collator = XtriggerCollator()
         self.workflow_polling_tasks = {}  # type: ignore # TODO figure out type
 
@@ -346,7 +351,7 @@ class WorkflowConfig:
             'first-parent descendants': {},
         }
         # tasks
-        self.leaves = []  # TODO figure out type
+        self.leaves: List[str] = []
         # one up from root
         self.feet = []  # type: ignore # TODO figure out type
 
@@ -365,6 +370,29 @@ class WorkflowConfig:
             self.options
         )
         self.mem_log("config.py: after RawWorkflowConfig init")
+
+        cache_key = None
+        if (
+            getattr(self.options, 'config_cache', False)
+            and config_cache.is_cacheable(self)
+        ):
+            cache_key = config_cache.get_key(self)
+            if self._load_from_cache(cache_key):
+                return
+        start = time()
+        with config_cache.capture_log() as log_records:
+            self._process()
+        if cache_key is not None:
+            config_cache.store(
+                cache_key,
+                # (processing the config can change the options)
+                {**self.__dict__, 'options': vars(self.options)},
+                log_records,
+                time() - start,
+            )
+
+    def _process(self) -> None:
+        """Expand, inherit and validate the raw config, load the graph."""
         self.mem_log("config.py: before get(sparse=True")
         self.cfg = self.pcfg.get(sparse=True)
         self.mem_log("config.py: after get(sparse=True)")
@@ -631,6 +659,28 @@ class WorkflowConfig:
 
         skip_mode_validate(self.taskdefs)
 
+    def _load_from_cache(self, cache_key: str) -> bool:
+        """Load the processed config from the cache, if present.
+
+        Returns True if the config was loaded.
+        """
+        cached = config_cache.load(cache_key)
+        if cached is None:
+            return False
+        state, log_records = cached
+        for key, value in state.pop('options').items():
+            if key not in config_cache.IGNORE_OPTIONS:
+                setattr(self.options, key, value)
+        self.__dict__.update(state)
+        self.pcfg.options = self.options
+        for level, msg in log_records:
+            LOG.log(level, msg)
+        # repeat the global side effects of processing the config
+        set_utc_mode(self.cfg['scheduler']['UTC mode'])
+        init_cyclers(self.cfg)
+        self.process_config_env()
+        return True
+
     def set_experimental_features(self):
         all_ = self.cfg['scheduler']['experimental']['all']
         self.experimental = SimpleNamespace(**{
@@ -2353,6 +2403,9 @@ class WorkflowConfig:
                 sections.append((section, value))
 
         # Parse and process each graph section.
+        # (Sections are parsed independently, so that the results can be
+        # reused on reload, then output optionality is checked across
+        # sections in order.)
         task_triggers = {}
         task_output_opt = {}
         for section, graph in sections:
@@ -2368,14 +2421,13 @@ class WorkflowConfig:
                     msg += ' %s' % exc.args[0]
                 raise WorkflowConfigError(msg) from None
             self.sequences.append(seq)
-            parser = GraphParser(
+            parser = parse_graph_section(
+                graph,
                 family_map,
                 self.parameters,
-                task_output_opt=task_output_opt,
                 expire_triggers=self.experimental.expire_triggers,
             )
-            parser.parse_graph(graph)
-            task_output_opt.update(parser.task_output_opt)
+            parser.merge_output_opt(task_output_opt)
             self.workflow_polling_tasks.update(
                 parser.workflow_state_polling_tasks)
             self._proc_triggers(parser, seq, task_triggers)
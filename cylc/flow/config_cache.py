@@ -0,0 +1,376 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Cache processed workflow configurations on disk.
+
+Processing a workflow configuration (expanding parameters and families,
+computing inheritance, loading the graph, etc.) can take a long time for
+large workflows, and is repeated by every command which loads the
+configuration. The processed configuration is cached, so that it can be
+loaded rather than processed when nothing has changed.
+
+The cache is keyed by a hash of everything which the processing depends on:
+
+* The parsed configuration, i.e. after templating (so changes to the flow
+  file, included files, template variables and anything else templating
+  depends on are accounted for).
+* The command line options.
+* The workflow ID and directories.
+* The global configuration.
+* The Cylc and Python versions, the local time zone and the contents of the
+  workflow's "lib/python" directory.
+
+Configurations whose cycle points are relative to the current time (e.g.
+"initial cycle point = now") are not cached.
+
+Messages logged while processing a configuration are cached with it, and
+logged again when it is loaded from the cache.
+
+Statistics (hits, misses, time saved) are kept in "stats.json" in the cache
+directory, "cylc validate --verbose" prints them.
+
+Cached configs are unpickled, so the cache directory must be private to the
+user, it is not used otherwise.
+"""
+
+from contextlib import contextmanager
+import fcntl
+from hashlib import sha256
+import json
+import logging
+import os
+from pathlib import Path
+import pickle  # nosec
+import re
+import sys
+from time import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from metomi.isodatetime.timezone import get_local_time_zone_format
+
+from cylc.flow import (
+    LOG,
+    __version__ as CYLC_VERSION,
+)
+from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
+
+if TYPE_CHECKING:
+    from cylc.flow.config import WorkflowConfig
+
+
+# the maximum number of configurations to cache
+MAX_ENTRIES = 50
+
+# options which do not affect the configuration
+IGNORE_OPTIONS = {'color', 'config_cache', 'log_timestamp', '_noop'}
+
+# configuration attributes which are not cached
+IGNORE_ATTRS = {'mem_log'}
+
+# absolute ISO8601 cycle points, and offsets from the initial cycle point
+RE_ABSOLUTE_POINT = re.compile(r'^\d{4}')
+RE_ABSOLUTE_OR_OFFSET_POINT = re.compile(r'^(\d{4}|\+P)')
+
+STATS_FILE = 'stats.json'
+
+# (level, message)
+LogRecords = List[Tuple[int, str]]
+
+
+def get_cache_dir() -> Path:
+    """Return the config cache directory, "~/.cylc/config-cache"."""
+    return Path('~', '.cylc', 'config-cache').expanduser()
+
+
+def _make_cache_dir() -> Optional[Path]:
+    """Create the config cache directory if necessary and return it.
+
+    Cached configs are unpickled, so the directory must be private. It is
+    made private if necessary, and not used (None is returned) if it is
+    owned by another user.
+    """
+    cache_dir = get_cache_dir()
+    try:
+        cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        stat = cache_dir.stat()
+        if stat.st_uid != os.getuid():
+            LOG.warning(
+                f'Not using the config cache {cache_dir}:'
+                ' owned by another user'
+            )
+            return None
+        if stat.st_mode & 0o077:
+            cache_dir.chmod(0o700)
+    except OSError as exc:
+        LOG.debug(f'Could not use config cache {cache_dir}: {exc!r}')
+        return None
+    return cache_dir
+
+
+def is_cacheable(config: 'WorkflowConfig') -> bool:
+    """Return False if the config depends on the current time.
+
+    Examples:
+        >>> from types import SimpleNamespace
+        >>> def is_cacheable_(icp, fcp=None, mode=None):
+        ...     return is_cacheable(SimpleNamespace(
+        ...         options=SimpleNamespace(),
+        ...         pcfg=SimpleNamespace(sparse={'scheduling': {
+        ...             'cycling mode': mode,
+        ...             'initial cycle point': icp,
+        ...             'final cycle point': fcp,
+        ...         }}),
+        ...     ))
+        >>> is_cacheable_('2000', '+P1D')
+        True
+        >>> is_cacheable_('1', mode='integer')
+        True
+        >>> is_cacheable_('now')
+        False
+        >>> is_cacheable_('previous(T00)')
+        False
+        >>> is_cacheable_('2000', 'next(T00)')
+        False
+
+    """
+    scheduling = config.pcfg.sparse.get('scheduling', {})
+    if scheduling.get('cycling mode') == 'integer':
+        return True
+    for key, option, regex in (
+        ('initial cycle point', 'icp', RE_ABSOLUTE_POINT),
+        (None, 'startcp', RE_ABSOLUTE_POINT),
+        ('final cycle point', 'fcp', RE_ABSOLUTE_OR_OFFSET_POINT),
+        ('stop after cycle point', 'stopcp', RE_ABSOLUTE_OR_OFFSET_POINT),
+    ):
+        for value in (
+            getattr(config.options, option, None),
+            scheduling.get(key) if key else None,
+        ):
+            if value is None or value == 'ignore':
+                continue
+            value = str(value).strip()
+            if (
+                not regex.match(value)
+                or 'next' in value
+                or 'previous' in value
+            ):
+                return False
+    return True
+
+
+def get_key(config: 'WorkflowConfig') -> str:
+    """Return the cache key for a workflow config.
+
+    This must be called once the raw config has been loaded (i.e. after
+    templating, parsing and validation).
+    """
+    options = {
+        key: value
+        for key, value in sorted(vars(config.options).items())
+        if key not in IGNORE_OPTIONS
+    }
+    items = [
+        CYLC_VERSION,
+        sys.version,
+        get_local_time_zone_format(),
+        config.workflow,
+        str(config.fpath),
+        config.run_dir,
+        config.log_dir,
+        config.work_dir,
+        config.share_dir,
+        options,
+        config.pcfg.sparse,
+        glbl_cfg().get(sparse=True),
+        _get_lib_python_stats(config.fdir),
+    ]
+    return sha256(repr(items).encode()).hexdigest()
+
+
+def _get_lib_python_stats(fdir: str) -> List[Tuple[str, int, int]]:
+    """Return the paths, sizes and modification times of workflow modules.
+
+    (Workflow Python modules, e.g. xtrigger functions, are imported
+    when the config is processed.)
+    """
+    stats = []
+    for path in sorted(Path(fdir, 'lib', 'python').glob('**/*.py')):
+        stat = path.stat()
+        stats.append((str(path), stat.st_size, stat.st_mtime_ns))
+    return stats
+
+
+@contextmanager
+def capture_log() -> Iterator[LogRecords]:
+    """Record the messages logged within this context."""
+    records: LogRecords = []
+    handler = _RecordHandler(records)
+    LOG.addHandler(handler)
+    try:
+        yield records
+    finally:
+        LOG.removeHandler(handler)
+
+
+class _RecordHandler(logging.Handler):
+    def __init__(self, records: LogRecords):
+        super().__init__()
+        self.records = records
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append((record.levelno, record.getMessage()))
+
+
+def load(key: str) -> Optional[Tuple[Dict[str, Any], LogRecords]]:
+    """Return the cached config state and log records for a key, if any."""
+    cache_dir = _make_cache_dir()
+    if cache_dir is None:
+        return None
+    path = cache_dir / f'{key}.pickle'
+    start = time()
+    try:
+        with open(path, 'rb') as handle:
+            entry = pickle.load(handle)  # nosec (written by this user)
+        state, records, build_time = entry
+    except FileNotFoundError:
+        _update_stats(misses=1)
+        return None
+    except Exception as exc:
+        # e.g. a truncated file
+        LOG.debug(f'Ignoring config cache {path}: {exc!r}')
+        _update_stats(misses=1)
+        return None
+    load_time = time() - start
+    # (mark as recently used, see _prune)
+    os.utime(path)
+    _update_stats(hits=1, saved_seconds=build_time - load_time)
+    LOG.debug(f'Config loaded from cache ({load_time:.2f}s): {path}')
+    return state, records
+
+
+def store(
+    key: str,
+    state: Dict[str, Any],
+    records: LogRecords,
+    build_time: float,
+) -> None:
+    """Cache a config state."""
+    cache_dir = _make_cache_dir()
+    if cache_dir is None:
+        return
+    path = cache_dir / f'{key}.pickle'
+    tmp_path = cache_dir / f'{key}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'wb') as handle:
+            pickle.dump(
+                (
+                    {
+                        attr: value
+                        for attr, value in state.items()
+                        if attr not in IGNORE_ATTRS
+                    },
+                    records,
+                    build_time,
+                ),
+                handle,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, path)
+    except Exception as exc:
+        # the cache is an optimisation, failing to write it is not an error
+        LOG.debug(f'Could not write config cache {path}: {exc!r}')
+        tmp_path.unlink(missing_ok=True)
+        return
+    _update_stats(stores=1)
+    _prune(cache_dir)
+
+
+def _prune(cache_dir: Path) -> None:
+    """Remove the least recently used entries beyond MAX_ENTRIES."""
+    entries = []
+    for path in cache_dir.glob('*.pickle'):
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue
+    entries.sort(reverse=True)
+    for _, path in entries[MAX_ENTRIES:]:
+        path.unlink(missing_ok=True)
+
+
+def get_stats() -> Dict[str, float]:
+    """Return the cache statistics.
+
+    hits:
+        Configs loaded from the cache.
+    misses:
+        Configs not found in the cache.
+    stores:
+        Configs written to the cache.
+    saved_seconds:
+        Time saved by loading configs from the cache (approximate).
+
+    """
+    stats = dict.fromkeys(('hits', 'misses', 'stores', 'saved_seconds'), 0.0)
+    try:
+        with open(get_cache_dir() / STATS_FILE, 'r') as handle:
+            stats.update(json.load(handle))
+    except (OSError, ValueError):
+        pass
+    return stats
+
+
+def format_stats(stats: Dict[str, float]) -> str:
+    """Return the cache statistics as a message.
+
+    Examples:
+        >>> print(format_stats(
+        ...     {'hits': 3, 'misses': 1, 'stores': 1, 'saved_seconds': 12.34}
+        ... ))
+        Config cache: 3 hits, 1 misses, 1 stores, 12.3s saved
+
+    """
+    return (
+        f"Config cache: {stats['hits']:g} hits, {stats['misses']:g} misses,"
+        f" {stats['stores']:g} stores, {stats['saved_seconds']:.1f}s saved"
+    )
+
+
+def _update_stats(**increments: float) -> None:
+    """Add to the cache statistics."""
+    cache_dir = _make_cache_dir()
+    if cache_dir is None:
+        return
+    try:
+        with open(cache_dir / f'{STATS_FILE}.lock', 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            stats = get_stats()
+            for key, value in increments.items():
+                stats[key] += value
+            tmp_path = cache_dir / f'{STATS_FILE}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w') as handle:
+                json.dump(stats, handle)
+            os.replace(tmp_path, cache_dir / STATS_FILE)
+    except OSError as exc:
+        LOG.debug(f'Could not update config cache stats: {exc!r}')
@@ -460,6 +460,21 @@ class ISO8601Sequence(SequenceBase):
         if self.exclusions:
             self.value += '!' + str(self.exclusions)
 
+    def __getstate__(self):
+        # (the is_on_sequence cache cannot be pickled)
+        return {
+            attr: getattr(self, attr)
+            for attr in self.__slots__
+            if attr != 'is_on_sequence' and hasattr(self, attr)
+        }
+
+    def __setstate__(self, state):
+        for attr, value in state.items():
+            setattr(self, attr, value)
+        self.is_on_sequence = lru_cache(_LARGE_LRU_CACHE_SIZE)(
+            self._is_on_sequence
+        )
+
     # lru_cache'd see __init__()
     def _is_on_sequence(self, point):
         """Return True if point is on-sequence."""
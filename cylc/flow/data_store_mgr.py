@@ -105,11 +105,7 @@ from cylc.flow.data_messages_pb2 import (
 from cylc.flow.exceptions import WorkflowConfigError
 from cylc.flow.id import Tokens
 from cylc.flow.network import API
-from cylc.flow.parsec.util import (
-    listjoin,
-    pdeepcopy,
-    poverride,
-)
+from cylc.flow.parsec.util import listjoin
 from cylc.flow.run_modes import RunMode
 from cylc.flow.task_job_logs import (
     JOB_LOG_OPTS,
@@ -167,6 +163,10 @@ DELTA_ADDED = 'added'
 DELTA_UPDATED = 'updated'
 DELTA_PRUNED = 'pruned'
 LATEST_STATE_TASKS_QUEUE_SIZE = 5
+# The version of the delta checksums, held in their upper 32 bits
+# (0: adler32 of the sorted stamps, cylc-flow < 8.7; 1: sum of the CRC32s)
+CHECKSUM_VERSION = 1
+EMPTY_CHECKSUM = CHECKSUM_VERSION << 32
 
 MESSAGE_MAP = {
     EDGES: PbEdge,
@@ -311,9 +311,74 @@ def setbuff(obj, key, value):
 
 
 def generate_checksum(in_strings):
-    """Generate cross platform & python checksum from strings."""
+    """Generate cross platform & python checksum from strings.
+
+    The checksum is the sum of the checksums of the individual strings, so
+    it does not depend on their order and can be maintained incrementally
+    (see "update_checksum").
+
+    The checksum version is held in the upper 32 bits (see
+    "get_checksum_version").
+
+    Examples:
+        >>> generate_checksum(['a@1', 'b@2']) == generate_checksum(
+        ...     ['b@2', 'a@1'])
+        True
+        >>> generate_checksum([]) == EMPTY_CHECKSUM
+        True
+
+    """
+    checksum = EMPTY_CHECKSUM
+    for string in in_strings:
+        checksum = update_checksum(checksum, added=string)
+    return checksum
+
+
+def update_checksum(checksum, added=None, removed=None):
+    """Add and/or remove a string from a checksum.
+
+    Examples:
+        >>> checksum = generate_checksum(['a@1', 'b@2'])
+        >>> checksum = update_checksum(checksum, added='b@3', removed='b@2')
+        >>> checksum == generate_checksum(['a@1', 'b@3'])
+        True
+        >>> update_checksum(checksum, removed='a@1') == generate_checksum(
+        ...     ['b@3'])
+        True
+
+    """
     # can't use hash(), it's not the same across 32-64bit or python invocations
-    return zlib.adler32(''.join(sorted(in_strings)).encode()) & 0xffffffff
+    checksum &= 0xffffffff
+    if added is not None:
+        checksum += zlib.crc32(added.encode())
+    if removed is not None:
+        checksum -= zlib.crc32(removed.encode())
+    return EMPTY_CHECKSUM | (checksum & 0xffffffff)
+
+
+def get_checksum_version(checksum):
+    """Return the version of the scheme used to generate a checksum.
+
+    Subscribers can use this to tell whether they can verify the checksums
+    a scheduler publishes with its deltas.
+
+    Examples:
+        >>> get_checksum_version(generate_checksum(['a@1'])) == (
+        ...     CHECKSUM_VERSION)
+        True
+        >>> # the adler32 of the sorted strings (cylc-flow < 8.7)
+        >>> get_checksum_version(zlib.adler32(b'a@1'))
+        0
+
+    """
+    return checksum >> 32
+
+
+def checksum_string(key, element):
+    """Return the string an element contributes to its store's checksum."""
+    if key == EDGES:
+        return element.id
+    return element.stamp
 
 
 def task_mean_elapsed_time(tdef: 'TaskDef') -> float | None:
@@ -422,11 +487,39 @@ def reset_protobuf_object(msg_class, msg_orig):
     return new_msg
 
 
-def apply_delta(key, delta, data):
-    """Apply delta to specific data-store workflow and type."""
+def apply_delta(key, delta, data, checksums=None):
+    """Apply delta to specific data-store workflow and type.
+
+    Args:
+        key: The data-store type (e.g. TASK_PROXIES).
+        delta: The delta for this type.
+        data: The data-store to apply the delta to.
+        checksums:
+            If provided, the checksum of each data-store type (as returned
+            by "generate_checksum") will be kept up to date in this dict as
+            elements are added, updated and pruned.
+
+    """
+    if key == WORKFLOW:
+        checksums = None
+    elif checksums is not None:
+        checksum = checksums.get(key, EMPTY_CHECKSUM)
+
     # Assimilate new data
     if getattr(delta, 'added', False):
-        if key != WORKFLOW:
+        if key != WORKFLOW and checksums is not None:
+            for element in delta.added:
+                old_element = data[key].get(element.id)
+                checksum = update_checksum(
+                    checksum,
+                    added=checksum_string(key, element),
+                    removed=(
+                        None if old_element is None
+                        else checksum_string(key, old_element)
+                    ),
+                )
+                data[key][element.id] = element
+        elif key != WORKFLOW:
             data[key].update({e.id: e for e in delta.added})
         elif delta.added.ListFields():
             data[key].CopyFrom(delta.added)
@@ -461,6 +554,11 @@ def apply_delta(key, delta, data):
             for element in delta.updated:
                 try:
                     data_element = data[key][element.id]
+                    if checksums is not None:
+                        checksum = update_checksum(
+                            checksum,
+                            removed=checksum_string(key, data_element),
+                        )
                     # Clear fields that require overwrite with delta
                     for field, _ in element.ListFields():
                         if field.name in CLEAR_FIELD_MAP[key]:
@@ -473,6 +571,11 @@ def apply_delta(key, delta, data):
                             MESSAGE_MAP[key],
                             data_element
                         )
+                    if checksums is not None:
+                        checksum = update_checksum(
+                            checksum,
+                            added=checksum_string(key, data_element),
+                        )
                 except KeyError as exc:
                     # Ensure data-sync doesn't fail with
                     # network issues, sync reconcile/validate will catch.
@@ -526,8 +629,16 @@ def apply_delta(key, delta, data):
                 with suppress(KeyError, ValueError):
                     getattr(data[WORKFLOW], key).remove(del_id)
             # remove/prune element from data-store
+            if checksums is not None:
+                checksum = update_checksum(
+                    checksum,
+                    removed=checksum_string(key, data[key][del_id]),
+                )
             del data[key][del_id]
 
+    if checksums is not None:
+        checksums[key] = checksum
+
 
 def create_delta_store(delta=None, workflow_id=None):
     """Create a mini data-store out of the all deltas message.
@@ -573,6 +684,61 @@ def create_delta_store(delta=None, workflow_id=None):
     return delta_store
 
 
+def _encode_varint(value):
+    """Encode a non-negative integer as a protobuf varint.
+
+    Examples:
+        >>> _encode_varint(1)
+        b'\\x01'
+        >>> _encode_varint(300)
+        b'\\xac\\x02'
+
+    """
+    result = bytearray()
+    while value > 0x7f:
+        result.append((value & 0x7f) | 0x80)
+        value >>= 7
+    result.append(value)
+    return bytes(result)
+
+
+def serialise_all_deltas(serialised):
+    """Build a serialised AllDeltas message from serialised deltas.
+
+    A serialised protobuf message is the concatenation of its encoded
+    fields, so the AllDeltas message can be built from the deltas of each
+    type without parsing or copying the protobuf objects.
+
+    Args:
+        serialised (dict):
+            Serialised deltas by data-store type (e.g. TASK_PROXIES).
+
+    Returns:
+        bytes
+
+    Examples:
+        >>> delta = TPDeltas(checksum=1)
+        >>> delta.pruned.append('1/a')
+        >>> msg = serialise_all_deltas(
+        ...     {TASK_PROXIES: delta.SerializeToString()})
+        >>> msg == AllDeltas(task_proxies=delta).SerializeToString()
+        True
+        >>> AllDeltas.FromString(msg).task_proxies.pruned
+        ['1/a']
+
+    """
+    fields = AllDeltas.DESCRIPTOR.fields_by_name
+    chunks = []
+    for key in sorted(serialised, key=lambda key: fields[key].number):
+        chunks.append(
+            # field tag (wire type 2: length-delimited)
+            _encode_varint(fields[key].number << 3 | 2)
+            + _encode_varint(len(serialised[key]))
+        )
+        chunks.append(serialised[key])
+    return b''.join(chunks)
+
+
 class DataStoreMgr:
     """Manage the workflow data store.
 
@@ -640,6 +806,8 @@ class DataStoreMgr:
         self.data = {
             self.workflow_id: deepcopy(DATA_TEMPLATE)
         }
+        # Checksums of the data-store types, maintained by apply_delta.
+        self.checksums: Dict[str, int] = {}
         self.added = deepcopy(DATA_TEMPLATE)
         self.updated = deepcopy(DATA_TEMPLATE)
         self.deltas = {
@@ -666,6 +834,12 @@ class DataStoreMgr:
         self.n_window_completed_walks = set()
         self.n_window_depths = {}
         self.update_window_depths = False
+        # Graph children IDs of window nodes, {(taskdef, point): {id, ...}},
+        # cleared on each update. (Siblings of a large fan-out share the
+        # same parent, which would otherwise be regenerated for each.)
+        self.graph_children_ids: Dict[
+            Tuple['TaskDef', str], Set[str]
+        ] = {}
         self.db_load_task_proxies: Dict[str, Tuple[TaskProxy, bool]] = {}
         # Family node IDs that have been pruned. Sent with deltas and used for
         # exclusion from state total and other calculations.
@@ -1189,19 +1363,12 @@ class DataStoreMgr:
         outer_nodes = active_walk['depths'].get(self.n_edge_distance, set())
         for outer_id in outer_nodes:
             outer_tokens = Tokens(outer_id)
-            tdef = taskdefs[outer_tokens['task']]
-            graph_children = generate_graph_children(
-                tdef,
-                get_point(outer_tokens['cycle'])
-            )
-            for items in graph_children.values():
-                for child_name, child_point, _ in items:
-                    child_tokens = self.id_.duplicate(
-                        cycle=str(child_point),
-                        task=child_name,
-                    )
-                    if child_tokens.id in outer_nodes:
-                        self.generate_edge(outer_tokens, child_tokens)
+            for child_id in outer_nodes.intersection(
+                self.get_graph_children_ids(
+                    taskdefs[outer_tokens['task']], outer_tokens['cycle']
+                )
+            ):
+                self.generate_edge(outer_tokens, Tokens(child_id))
 
         # This part is vital to constructing a set of boundary nodes
         # associated with the n=0 window of current active node.
@@ -1245,6 +1412,30 @@ class DataStoreMgr:
                 self.prune_trigger_nodes[active_id])
             del self.prune_trigger_nodes[active_id]
 
+    def get_graph_children_ids(
+        self, tdef: 'TaskDef', point_string: str
+    ) -> Set[str]:
+        """Return the IDs of the graph children of a task (any output).
+
+        These are cached until the next update of the data structure.
+        """
+        key = (tdef, point_string)
+        try:
+            return self.graph_children_ids[key]
+        except KeyError:
+            pass
+        child_ids = self.graph_children_ids[key] = {
+            self.id_.duplicate(
+                cycle=str(child_point),
+                task=child_name,
+            ).id
+            for items in generate_graph_children(
+                tdef, get_point(point_string)
+            ).values()
+            for child_name, child_point, _ in items
+        }
+        return child_ids
+
     def generate_edge(
         self,
         parent_tokens: Tokens,
@@ -1425,7 +1616,7 @@ class DataStoreMgr:
             # Has run before, so get history.
             # Cannot batch as task is active (all jobs retrieved at once).
             if itask.submit_num > 0:
-                flow_db = self.schd.workflow_db_mgr.pri_dao
+                flow_db = self.schd.workflow_db_mgr.get_open_pri_dao()
                 for row in flow_db.select_jobs_for_datastore(
                         {itask.identity}
                 ):
@@ -1556,7 +1747,7 @@ class DataStoreMgr:
         if not self.db_load_task_proxies:
             return
 
-        flow_db = self.schd.workflow_db_mgr.pri_dao
+        flow_db = self.schd.workflow_db_mgr.get_open_pri_dao()
 
         task_ids = set(self.db_load_task_proxies.keys())
         # Batch load rows with matching cycle & name column pairs.
@@ -1698,11 +1889,7 @@ class DataStoreMgr:
 
     def _apply_broadcasts_to_runtime(self, tokens, rtconfig):
         # Handle broadcasts
-        overrides = self.schd.broadcast_mgr.get_broadcast(tokens)
-        if overrides:
-            rtconfig = pdeepcopy(rtconfig)
-            poverride(rtconfig, overrides, prepend=True)
-        return rtconfig
+        return self.schd.broadcast_mgr.apply_broadcasts(tokens, rtconfig)
 
     def insert_job(
         self,
@@ -1867,6 +2054,8 @@ class DataStoreMgr:
             self.window_resize_rewalk()
             self.next_n_edge_distance = None
 
+        self.graph_children_ids.clear()
+
         # load database history for flagged nodes
         self.apply_task_proxy_db_history()
 
@@ -3027,24 +3216,20 @@ class DataStoreMgr:
         data = self.data[self.workflow_id]
         for key, delta in self.deltas.items():
             if delta.ListFields():
-                apply_delta(key, delta, data)
+                apply_delta(key, delta, data, self.checksums)
 
     def apply_delta_checksum(self):
-        """Construct checksum on deltas for export."""
-        data = self.data[self.workflow_id]
+        """Construct checksum on deltas for export.
+
+        The checksums are maintained incrementally as deltas are applied
+        (see "apply_delta"), so this does not depend on the data-store size.
+        """
         update_time = time()
         for key, delta in self.deltas.items():
             if delta.ListFields():
                 delta.time = update_time
                 if hasattr(delta, 'checksum'):
-                    if key == EDGES:
-                        s_att = 'id'
-                    else:
-                        s_att = 'stamp'
-                    delta.checksum = generate_checksum(
-                        [getattr(e, s_att)
-                         for e in data[key].values()]
-                    )
+                    delta.checksum = self.checksums.get(key, EMPTY_CHECKSUM)
 
     def clear_delta_batch(self):
         """Clear current deltas."""
@@ -3088,19 +3273,32 @@ class DataStoreMgr:
         return workflow_msg
 
     def get_publish_deltas(self):
-        """Return deltas for publishing."""
-        all_deltas = DELTAS_MAP[ALL_DELTAS]()
+        """Return deltas for publishing.
+
+        Each delta is serialised once, here, and the serialised deltas are
+        reused to build the "all" deltas message. The publisher is handed
+        immutable bytes, so no copy of the deltas needs to be made for the
+        publisher thread.
+
+        Returns:
+            list: [(topic, serialised delta, None)]
+
+        """
         result = []
+        serialised = {}
         for key, delta in self.deltas.items():
             if delta.ListFields():
-                result.append(
-                    (key.encode('utf-8'), delta, 'SerializeToString'))
-                getattr(all_deltas, key).CopyFrom(delta)
+                serialised[key] = delta.SerializeToString()
+                result.append((key.encode('utf-8'), serialised[key], None))
         result.append(
-            (ALL_DELTAS.encode('utf-8'), all_deltas, 'SerializeToString')
+            (
+                ALL_DELTAS.encode('utf-8'),
+                serialise_all_deltas(serialised),
+                None
+            )
         )
         self.publish_pending = True
-        return deepcopy(result)
+        return result
 
     def get_data_elements(self, element_type):
         """Get elements of a given type in the form of a delta.
@@ -20,7 +20,16 @@ import os
 import sqlite3
 import sys
 from contextlib import suppress
-from typing import Dict, Iterable, Optional, List, Union
+from time import time
+from typing import (
+    Dict,
+    Iterable,
+    Optional,
+    List,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from cylc.flow.exceptions import InputError
 from cylc.flow.cycling.util import add_offset
@@ -50,6 +59,27 @@ output_fallback_msg = (
     "between 8.0.0-8.3.0. Falling back to filtering by task message instead."
 )
 
+# Cached rows are not trusted for DB changes made within this many seconds of
+# reading them, in case a further change does not alter the DB file stamp
+# (i.e. on file systems with coarse modification times).
+RACY_WINDOW = 2.0
+
+# Maximum number of cycle points to select in one query.
+MAX_QUERY_CYCLES = 500
+
+# (task, cycle, selector, is_trigger, is_message, flow_num)
+StateQuery = Tuple[
+    Optional[str],
+    Optional[str],
+    Optional[str],
+    bool,
+    bool,
+    Optional[int],
+]
+
+# (inode, mtime, size) for the DB file and its write-ahead log
+DBStamp = Tuple[Optional[Tuple[int, int, int]], ...]
+
 
 class CylcWorkflowDBChecker:
     """Object for querying task status or outputs from a workflow database.
@@ -76,6 +106,13 @@ class CylcWorkflowDBChecker:
         if not os.path.exists(db_path):
             raise OSError(errno.ENOENT, os.strerror(errno.ENOENT), db_path)
 
+        self.db_path = db_path
+        self.stamp = get_db_stamp(db_path)
+        # Rows by (table, cycle), see workflow_state_query_batch.
+        self._rows: Dict[Tuple[str, str], List[tuple]] = {}
+        self._rows_stamp: DBStamp = ()
+        self._rows_time = 0.0
+
         self.conn: sqlite3.Connection = sqlite3.connect(db_path, timeout=10.0)
 
         # Get workflow point format.
@@ -250,25 +287,8 @@ class CylcWorkflowDBChecker:
 
         check_polling_config(selector, is_trigger, is_message)
 
-        if is_trigger or is_message:
-            target_table = CylcWorkflowDAO.TABLE_TASK_OUTPUTS
-            mask = "name, cycle, outputs"
-        else:
-            target_table = CylcWorkflowDAO.TABLE_TASK_STATES
-            mask = "name, cycle, status"
-
-        if not self.c7_back_compat_mode:
-            # Cylc 8 DBs only
-            mask += ", flow_nums"
-
-        stmt = rf'''
-            SELECT
-                {mask}
-            FROM
-                {target_table}
-        '''  # nosec
-        # * mask is hardcoded
-        # * target_table is a code constant
+        target_table = self._get_target_table(is_trigger, is_message)
+        stmt = self._get_select_stmt(target_table)
 
         # Select from DB by name, cycle, status.
         # (Outputs and flow_nums are serialised).
@@ -305,9 +325,157 @@ class CylcWorkflowDBChecker:
             # (outputs table doesn't record submit number)
             stmt += r"ORDER BY submit_num"
 
-        # Query the DB and drop incompatible rows.
+        return self._filter_rows(
+            self.conn.execute(stmt, stmt_args),
+            target_table,
+            selector,
+            is_trigger,
+            is_message,
+            flow_num,
+        )
+
+    def workflow_state_query_batch(
+        self, queries: Sequence[StateQuery]
+    ) -> List[List[List[str]]]:
+        """Make many workflow_state_query queries at once.
+
+        Rows for the requested cycle points are selected with one query per
+        table (rather than one per query) and are cached until the DB
+        changes, so repeated checks against an unchanged DB don't read it.
+
+        Queries with wildcards are made individually.
+
+        Args:
+            queries:
+                (task, cycle, selector, is_trigger, is_message, flow_num)
+                for each query, see workflow_state_query.
+
+        Returns:
+            The results of each query, see workflow_state_query.
+
+        """
+        self._refresh_rows()
+
+        # select rows for any cycles not cached
+        cycles: Dict[str, set] = {}
+        for task, cycle, _, is_trigger, is_message, _ in queries:
+            if not self._is_batchable(task, cycle):
+                continue
+            table = self._get_target_table(is_trigger, is_message)
+            if (table, cycle) not in self._rows:
+                cycles.setdefault(table, set()).add(cycle)
+        for table, table_cycles in cycles.items():
+            self._select_cycles(table, sorted(table_cycles))
+
+        results = []
+        for task, cycle, selector, is_trigger, is_message, flow_num in (
+            queries
+        ):
+            if not self._is_batchable(task, cycle):
+                results.append(self.workflow_state_query(
+                    task, cycle, selector, is_trigger, is_message, flow_num
+                ))
+                continue
+            check_polling_config(selector, is_trigger, is_message)
+            table = self._get_target_table(is_trigger, is_message)
+            rows = [
+                row for row in self._rows[(table, cycle)]  # type: ignore
+                if (task is None or row[0] == task) and (
+                    selector is None
+                    or table != CylcWorkflowDAO.TABLE_TASK_STATES
+                    or row[2] == selector
+                )
+            ]
+            results.append(self._filter_rows(
+                rows, table, selector, is_trigger, is_message, flow_num
+            ))
+        return results
+
+    @staticmethod
+    def _is_batchable(task: Optional[str], cycle: Optional[str]) -> bool:
+        """Can this query be answered by workflow_state_query_batch?
+
+        Examples:
+            >>> this = CylcWorkflowDBChecker._is_batchable
+            >>> this('foo', '1')
+            True
+            >>> this(None, '1')
+            True
+            >>> this('foo', None), this('f*', '1'), this('foo', '*')
+            (False, False, False)
+
+        """
+        return bool(cycle) and '*' not in cycle and (  # type: ignore
+            task is None or '*' not in task
+        )
+
+    def _refresh_rows(self) -> None:
+        """Forget cached rows if the DB may have changed since read."""
+        stamp = get_db_stamp(self.db_path)
+        mtimes = [item[1] / 1e9 for item in stamp if item]
+        if (
+            stamp != self._rows_stamp
+            or (mtimes and max(mtimes) + RACY_WINDOW > self._rows_time)
+        ):
+            self._rows.clear()
+            self._rows_stamp = stamp
+            self._rows_time = time()
+
+    def _select_cycles(self, table: str, cycles: List[str]) -> None:
+        """Select and cache all rows of a table for some cycle points."""
+        for cycle in cycles:
+            self._rows[(table, cycle)] = []
+        for start in range(0, len(cycles), MAX_QUERY_CYCLES):
+            chunk = cycles[start:start + MAX_QUERY_CYCLES]
+            stmt = (
+                self._get_select_stmt(table)
+                + f"WHERE cycle IN ({', '.join('?' * len(chunk))})\n"
+            )
+            if table == CylcWorkflowDAO.TABLE_TASK_STATES:
+                stmt += r"ORDER BY submit_num"
+            for row in self.conn.execute(stmt, chunk):
+                self._rows[(table, row[1])].append(row)
+
+    @staticmethod
+    def _get_target_table(
+        is_trigger: Optional[bool], is_message: Optional[bool]
+    ) -> str:
+        if is_trigger or is_message:
+            return CylcWorkflowDAO.TABLE_TASK_OUTPUTS
+        return CylcWorkflowDAO.TABLE_TASK_STATES
+
+    def _get_select_stmt(self, target_table: str) -> str:
+        """Return the SELECT ... FROM ... part of a query on a table."""
+        if target_table == CylcWorkflowDAO.TABLE_TASK_OUTPUTS:
+            mask = "name, cycle, outputs"
+        else:
+            mask = "name, cycle, status"
+
+        if not self.c7_back_compat_mode:
+            # Cylc 8 DBs only
+            mask += ", flow_nums"
+
+        return rf'''
+            SELECT
+                {mask}
+            FROM
+                {target_table}
+        '''  # nosec
+        # * mask is hardcoded
+        # * target_table is a code constant
+
+    def _filter_rows(
+        self,
+        rows: Iterable[tuple],
+        target_table: str,
+        selector: Optional[str],
+        is_trigger: Optional[bool],
+        is_message: Optional[bool],
+        flow_num: Optional[int],
+    ) -> List[List[str]]:
+        """Drop incompatible rows and format the results of a query."""
         db_res = []
-        for row in self.conn.execute(stmt, stmt_args):
+        for row in rows:
             # name, cycle, status_or_outputs, [flow_nums]
             res = list(row[:3])
             if row[2] is None:
@@ -371,6 +539,59 @@ class CylcWorkflowDBChecker:
         )
 
 
+def get_db_stamp(db_path: str) -> DBStamp:
+    """Return a stamp which changes when a DB is written to.
+
+    The stamp is the (inode, mtime, size) of the DB file and of its
+    write-ahead log, which is written to instead of the DB file in WAL mode.
+
+    """
+    stamp: List[Optional[Tuple[int, int, int]]] = []
+    for path in (db_path, f'{db_path}-wal'):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            stamp.append(None)
+        else:
+            stamp.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+    return tuple(stamp)
+
+
+# Shared DB checkers by DB path, see get_db_checker.
+_DB_CHECKERS: Dict[str, CylcWorkflowDBChecker] = {}
+
+
+def get_db_checker(rund: str, workflow: str) -> CylcWorkflowDBChecker:
+    """Return a shared DB checker for a workflow.
+
+    The checker (and its DB connection and cached rows) is reused by later
+    calls, for as long as the DB file remains the same file (e.g. it is not
+    removed by "cylc clean" and replaced by a new run).
+
+    Raises:
+        OSError, sqlite3.Error: as for CylcWorkflowDBChecker.
+
+    """
+    db_path = expand_path(
+        rund, workflow, "log", CylcWorkflowDAO.DB_FILE_BASE_NAME
+    )
+    checker = _DB_CHECKERS.get(db_path)
+    if checker is not None:
+        file_stamp = get_db_stamp(db_path)[0]
+        if (
+            file_stamp and checker.stamp[0]
+            and file_stamp[0] == checker.stamp[0][0]  # same inode
+        ):
+            return checker
+        # the DB has been removed or replaced
+        del _DB_CHECKERS[db_path]
+        with suppress(Exception):
+            checker.conn.close()
+    checker = CylcWorkflowDBChecker(rund, workflow, db_path)
+    _DB_CHECKERS[db_path] = checker
+    return checker
+
+
 def check_polling_config(selector, is_trigger, is_message):
     """Check for invalid or unreliable polling configurations."""
     if selector and not (is_trigger or is_message):
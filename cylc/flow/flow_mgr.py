@@ -229,8 +229,9 @@ class FlowMgr:
         Loads metadata for selected flows (those in the task pool at startup).
 
         """
-        self.counter = self.db_mgr.pri_dao.select_workflow_flows_max_flow_num()
-        self.flows = self.db_mgr.pri_dao.select_workflow_flows(flow_nums)
+        pri_dao = self.db_mgr.get_open_pri_dao()
+        self.counter = pri_dao.select_workflow_flows_max_flow_num()
+        self.flows = pri_dao.select_workflow_flows(flow_nums)
         self._log()
 
     def _log(self) -> None:
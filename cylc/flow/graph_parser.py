@@ -322,6 +322,10 @@ class GraphParser:
         self.workflow_state_polling_tasks: Dict = {}
         self.expire_triggers = expire_triggers
         self.end_of_chain_nodes: set[str] = set()
+        # Output optionality inferred from the graph, in order:
+        #   [(name, output, optional, suicide, fam_member)]
+        # (To check against other graph strings, see merge_output_opt.)
+        self.output_opt_calls: List[Tuple[str, str, bool, bool, bool]] = []
 
         # Record task outputs as optional or required:
         #   {(name, output): (is_optional, is_member)}
@@ -797,6 +801,30 @@ class GraphParser:
             # Make expiry optional for suicide triggered tasks.
             self._set_output_opt(name, TASK_OUTPUT_EXPIRED, True, False, False)
 
+    def merge_output_opt(
+        self,
+        task_output_opt: Dict[Tuple[str, str], Tuple[bool, bool, bool]]
+    ) -> None:
+        """Check and merge output optionality from another graph string.
+
+        Output optionality must be consistent across graph strings. Merging
+        in the order the graph strings were defined is equivalent to
+        passing task_output_opt in to each parser in turn.
+
+        Args:
+            task_output_opt:
+                {(name, output): (is-optional, is-opt-default, is-fixed)}
+                from other graph strings, updated in place.
+
+        """
+        section_output_opt = self.task_output_opt
+        self.task_output_opt = task_output_opt
+        try:
+            for args in self.output_opt_calls:
+                self._apply_output_opt(*args)
+        finally:
+            self.task_output_opt = section_output_opt
+
     def _set_output_opt(
         self,
         name: str,
@@ -807,6 +835,22 @@ class GraphParser:
     ) -> None:
         """Set or check consistency of optional/required output.
 
+        See _apply_output_opt.
+        """
+        self.output_opt_calls.append(
+            (name, output, optional, suicide, fam_member))
+        self._apply_output_opt(name, output, optional, suicide, fam_member)
+
+    def _apply_output_opt(
+        self,
+        name: str,
+        output: str,
+        optional: bool,
+        suicide: bool,
+        fam_member: bool = False
+    ) -> None:
+        """Set or check consistency of optional/required output.
+
         Args:
             name: task name
             output: task output name
@@ -841,7 +885,7 @@ class GraphParser:
             # But implicit optional for the real succeed/fail outputs.
             optional = True
             for outp in [TASK_OUTPUT_SUCCEEDED, TASK_OUTPUT_FAILED]:
-                self._set_output_opt(
+                self._apply_output_opt(
                     name, outp, optional, suicide, fam_member)
             return
 
@@ -1009,3 +1053,55 @@ class GraphParser:
                         # Infer optionality for explicit outputs on RHS.
                         self._set_output_opt(
                             mem, output, optional, suicide, fam)
+
+
+# The maximum number of parsed graph strings to keep for reuse.
+PARSE_CACHE_SIZE = 100
+
+# {key: parser}, least recently used first
+_PARSE_CACHE: Dict[str, GraphParser] = {}
+
+
+def parse_graph_section(
+    graph_string: str,
+    family_map: Dict[str, List[str]],
+    parameters: Optional[Dict],
+    expire_triggers: bool = False,
+) -> GraphParser:
+    """Return a parser which has parsed a graph string.
+
+    Parsed graph strings are cached, keyed by the graph string and
+    everything else the result depends on, so that when a workflow is
+    reloaded only the graph sections which have changed are parsed again.
+
+    The parser is shared, it must not be modified. Its output optionality
+    is for this graph string alone, use GraphParser.merge_output_opt to
+    check it against other graph strings.
+
+    Examples:
+        >>> parser = parse_graph_section('a => b', {}, None)
+        >>> sorted(parser.triggers)
+        ['a', 'b']
+        >>> parse_graph_section('a => b', {}, None) is parser
+        True
+        >>> parse_graph_section('a => c', {}, None) is parser
+        False
+
+    """
+    key = repr((
+        graph_string,
+        family_map,
+        parameters,
+        expire_triggers,
+        cylc.flow.flags.cylc7_back_compat,
+    ))
+    try:
+        parser = _PARSE_CACHE.pop(key)
+    except KeyError:
+        parser = GraphParser(
+            family_map, parameters, expire_triggers=expire_triggers)
+        parser.parse_graph(graph_string)
+        if len(_PARSE_CACHE) >= PARSE_CACHE_SIZE:
+            del _PARSE_CACHE[next(iter(_PARSE_CACHE))]
+    _PARSE_CACHE[key] = parser
+    return parser
@@ -0,0 +1,397 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Run job commands (submit, poll, kill) in long-lived job agents.
+
+Normally, each batch of job submits, polls or kills runs a new
+"cylc jobs-submit|jobs-poll|jobs-kill" command, over SSH for remote
+platforms. On platforms configured to use a job agent
+(global.cylc[platforms][<platform>]job agent), the scheduler starts a
+"cylc jobs-agent" process on the platform host instead (over SSH, like
+"cylc remote-init"), and sends it the job commands over the same
+connection, saving the SSH connection and Cylc start-up for each one.
+
+The agent runs one command at a time, in order. If the agent exits (e.g.
+the SSH connection drops), its commands fail with its exit code, so SSH
+failures are handled as for the individual commands, and a new agent is
+started for the next command.
+
+Protocol:
+    The scheduler sends one line of JSON per command::
+
+        {"id": ..., "args": ["jobs-poll", ...], "stdin": ...}
+
+    The agent replies with one line of JSON per command, in order::
+
+        {"id": ..., "ret_code": ..., "out": ..., "err": ...}
+
+"""
+
+from collections import deque
+from contextlib import (
+    redirect_stderr,
+    redirect_stdout,
+    suppress,
+)
+from importlib import import_module
+from io import StringIO
+import json
+import os
+from queue import (
+    Empty,
+    Queue,
+)
+from signal import SIGKILL
+from subprocess import (  # nosec
+    PIPE,
+    TimeoutExpired,
+)
+import sys
+from threading import Thread
+from time import time
+import traceback
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from cylc.flow import LOG
+from cylc.flow.cylc_subproc import procopen
+
+if TYPE_CHECKING:
+    from subprocess import Popen  # nosec
+
+    from cylc.flow.subprocctx import SubProcContext
+
+    # [ctx, bad_hosts, callback, callback_args, callback_255,
+    #  callback_255_args] (as queued by the SubProcPool)
+    AgentCall = List[Any]
+
+
+# the job commands an agent can run {command: module}
+AGENT_COMMANDS = {
+    'jobs-kill': 'cylc.flow.scripts.jobs_kill',
+    'jobs-poll': 'cylc.flow.scripts.jobs_poll',
+    'jobs-submit': 'cylc.flow.scripts.jobs_submit',
+}
+
+
+def run_request(
+    args: List[str], stdin: Optional[str]
+) -> Tuple[int, str, str]:
+    """Run a job command in this process, as the command line would.
+
+    Args:
+        args: The command and its arguments, e.g. ["jobs-poll", ...].
+        stdin: The command's standard input.
+
+    Returns:
+        (ret_code, out, err)
+
+    Examples:
+        >>> run_request(['jobs-foo'], None)
+        (1, '', 'unknown command: jobs-foo')
+
+    """
+    if not args or args[0] not in AGENT_COMMANDS:
+        return 1, '', f'unknown command: {" ".join(args)}'
+    main = import_module(AGENT_COMMANDS[args[0]]).main
+    out = StringIO()
+    err = StringIO()
+    ret_code = 0
+    sys_stdin = sys.stdin
+    sys.stdin = StringIO(stdin or '')
+    try:
+        with redirect_stdout(out), redirect_stderr(err):
+            try:
+                main(*args[1:])
+            except SystemExit as exc:
+                if isinstance(exc.code, int):
+                    ret_code = exc.code
+                elif exc.code is not None:
+                    print(exc.code, file=sys.stderr)
+                    ret_code = 1
+            except Exception:
+                traceback.print_exc()
+                ret_code = 1
+    finally:
+        sys.stdin = sys_stdin
+    return ret_code, out.getvalue(), err.getvalue()
+
+
+def serve(reader: IO[bytes], writer: IO[bytes]) -> None:
+    """Run job commands read from reader, write the results to writer.
+
+    Returns when reader is closed.
+    """
+    for line in iter(reader.readline, b''):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request['id']
+            ret_code, out, err = run_request(
+                [str(arg) for arg in request['args']],
+                request.get('stdin'),
+            )
+        except (KeyError, TypeError, ValueError) as exc:
+            ret_code, out, err = 1, '', f'bad request: {exc}'
+        writer.write(
+            json.dumps({
+                'id': request_id,
+                'ret_code': ret_code,
+                'out': out,
+                'err': err,
+            }).encode() + b'\n'
+        )
+        writer.flush()
+
+
+class _JobAgent:
+    """A job agent process, and threads to talk to it."""
+
+    def __init__(self, cmd: List[str]):
+        self.cmd = cmd
+        self.proc: 'Popen[bytes]' = procopen(
+            cmd,
+            stdin=PIPE,
+            stdoutpipe=True,
+            stderrpipe=True,
+            # (so that os.killpg can kill the agent and anything it started)
+            preexec_fn=os.setpgrp,
+        )
+        # requests to write (None to close the agent's stdin)
+        self.requests: 'Queue[Optional[bytes]]' = Queue()
+        # responses read (None when the agent closes its stdout)
+        self.responses: 'Queue[Optional[dict]]' = Queue()
+        # the last lines written to stderr, reported if the agent fails
+        self.stderr: Deque[str] = deque(maxlen=20)
+        # {request id: call}, in the order sent
+        self.calls: Dict[int, 'AgentCall'] = {}
+        # when the agent started work on the oldest call
+        self.busy_since = 0.0
+        for target in (self._write, self._read, self._read_stderr):
+            Thread(target=target, name='cylc-job-agent', daemon=True).start()
+
+    def send(self, request_id: int, request: dict, call: 'AgentCall') -> None:
+        if not self.calls:
+            self.busy_since = time()
+        self.calls[request_id] = call
+        self.requests.put(json.dumps(request).encode() + b'\n')
+
+    def stop(self) -> None:
+        """Ask the agent to exit (once it has finished its commands)."""
+        self.requests.put(None)
+
+    def kill(self) -> None:
+        """Kill the agent and anything it started."""
+        try:
+            os.killpg(self.proc.pid, SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            self.proc.kill()
+
+    def _write(self) -> None:
+        stdin: IO[bytes] = self.proc.stdin  # type: ignore[assignment]
+        with suppress(OSError):
+            while (data := self.requests.get()) is not None:
+                stdin.write(data)
+                stdin.flush()
+        with suppress(OSError):
+            stdin.close()
+
+    def _read(self) -> None:
+        stdout: IO[bytes] = self.proc.stdout  # type: ignore[assignment]
+        for line in iter(stdout.readline, b''):
+            try:
+                self.responses.put(json.loads(line))
+            except ValueError:
+                # e.g. a login script has written to stdout
+                self.stderr.append(line.decode(errors='replace').rstrip())
+        self.responses.put(None)
+
+    def _read_stderr(self) -> None:
+        stderr: IO[bytes] = self.proc.stderr  # type: ignore[assignment]
+        for line in iter(stderr.readline, b''):
+            self.stderr.append(line.decode(errors='replace').rstrip())
+
+
+class JobAgentPool:
+    """Run job commands in job agents.
+
+    One agent is started for each agent command (i.e. platform host) as
+    required. Commands are sent to the agent as soon as they are put, the
+    agent runs them in order.
+
+    Args:
+        timeout:
+            Command timeout in seconds. If an agent takes longer than this
+            to run a command, it is killed and its commands fail.
+
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        # {agent command: agent}
+        self.agents: Dict[Tuple[str, ...], _JobAgent] = {}
+        self._request_id = 0
+
+    def put_command(self, call: 'AgentCall') -> None:
+        """Send a job command to an agent.
+
+        The command context must define "agent_cmd", the command to start
+        the agent, and "agent_args", the job command to run.
+        """
+        ctx: 'SubProcContext' = call[0]
+        key = tuple(ctx.cmd_kwargs['agent_cmd'])
+        agent = self.agents.get(key)
+        if agent is None:
+            LOG.debug(f'Starting job agent: {" ".join(key)}')
+            agent = self.agents[key] = _JobAgent(list(key))
+        stdin = None
+        if ctx.cmd_kwargs.get('stdin_files'):
+            stdin = ''
+            for path in ctx.cmd_kwargs['stdin_files']:
+                with open(path, 'r') as handle:
+                    stdin += handle.read()
+        self._request_id += 1
+        agent.send(
+            self._request_id,
+            {
+                'id': self._request_id,
+                'args': ctx.cmd_kwargs['agent_args'],
+                'stdin': stdin,
+            },
+            call,
+        )
+
+    def is_not_done(self) -> bool:
+        """Return True if any commands are in progress."""
+        return any(agent.calls for agent in self.agents.values())
+
+    def process(self) -> 'List[AgentCall]':
+        """Collect the results of commands.
+
+        Returns:
+            The calls which have finished (their contexts have been updated
+            with the results).
+
+        """
+        done: 'List[AgentCall]' = []
+        now = time()
+        for key, agent in list(self.agents.items()):
+            exited = False
+            while True:
+                try:
+                    response = agent.responses.get_nowait()
+                except Empty:
+                    break
+                if response is None:
+                    exited = True
+                    break
+                call = agent.calls.pop(response.get('id', 0), None)
+                if call is None:
+                    continue
+                agent.busy_since = now
+                self._exit_call(
+                    call,
+                    response.get('ret_code', 1),
+                    response.get('out', ''),
+                    response.get('err', ''),
+                )
+                done.append(call)
+            if exited:
+                try:
+                    ret_code: Optional[int] = agent.proc.wait(1)
+                except TimeoutExpired:
+                    agent.kill()
+                    ret_code = agent.proc.wait()
+                self._retire(
+                    key, agent, ret_code,
+                    f'job agent exited ({ret_code})', done
+                )
+            elif agent.calls and now > agent.busy_since + self.timeout:
+                agent.kill()
+                self._retire(
+                    key, agent, -SIGKILL,
+                    f'killed on timeout ({self.timeout})', done
+                )
+        return done
+
+    def terminate(self) -> 'List[AgentCall]':
+        """Stop all agents.
+
+        Returns:
+            The calls which were in progress.
+
+        """
+        calls: 'List[AgentCall]' = []
+        for agent in self.agents.values():
+            calls.extend(agent.calls.values())
+            agent.calls.clear()
+            agent.stop()
+        for agent in self.agents.values():
+            try:
+                agent.proc.wait(1)
+            except TimeoutExpired:
+                agent.kill()
+                agent.proc.wait()
+        self.agents.clear()
+        return calls
+
+    def _retire(
+        self,
+        key: Tuple[str, ...],
+        agent: _JobAgent,
+        ret_code: Optional[int],
+        err: str,
+        done: 'List[AgentCall]',
+    ) -> None:
+        """Remove an agent from the pool and fail its commands."""
+        del self.agents[key]
+        agent.stop()
+        if agent.calls:
+            err = '\n'.join([*agent.stderr, err])
+            LOG.warning(f'{err}\n(job agent: {" ".join(key)})')
+        for call in agent.calls.values():
+            self._exit_call(call, ret_code, '', err)
+            done.append(call)
+        agent.calls.clear()
+
+    @staticmethod
+    def _exit_call(
+        call: 'AgentCall', ret_code: Optional[int], out: str, err: str
+    ) -> None:
+        """Record the result of a command."""
+        ctx = call[0]
+        ctx.ret_code = ret_code
+        if out:
+            ctx.out = (ctx.out or '') + out
+        if err:
+            ctx.err = (ctx.err or '') + err
+
+
+def run_agent() -> None:
+    """Run a job agent on stdin/stdout."""
+    # Keep stdout for the agent's responses, and send anything else written
+    # to it (e.g. by job runner commands) to stderr.
+    writer = os.fdopen(os.dup(sys.stdout.fileno()), 'wb')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    serve(sys.stdin.buffer, writer)
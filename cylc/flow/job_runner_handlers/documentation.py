@@ -230,6 +230,20 @@ class ExampleHandler():
 
     """
 
+    POLL_ALL_CMD: str
+    """Command for listing all of the user's jobs.
+
+    If defined, this command should write the IDs of all of the user's
+    submitted/running jobs to stdout, in the same format as
+    :py:attr:`ExampleHandler.POLL_CMD`.
+
+    If the platform's ``job runner status cache interval`` is set, the
+    output of this command is cached and shared by all workflows polling
+    jobs on the host, so that the job runner is queried at most once per
+    interval rather than by every workflow.
+
+    """
+
     POLL_CANT_CONNECT_ERR: str
     """String for detecting communication errors in poll command output.
 
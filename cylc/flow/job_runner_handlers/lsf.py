@@ -68,6 +68,7 @@ class LSFHandler():
     FAIL_SIGNALS = ("EXIT", "ERR", "XCPU", "TERM", "INT", "SIGUSR2")
     KILL_CMD_TMPL = "bkill '%(job_id)s'"
     POLL_CMD = "bjobs"
+    POLL_ALL_CMD = "bjobs"
     REC_ID_FROM_SUBMIT_OUT = re.compile(r"^Job <(?P<id>\d+)>")
     SUBMIT_CMD_TMPL = "bsub"
     TIME_LIMIT_DIRECTIVE = "-W"
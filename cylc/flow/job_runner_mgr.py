@@ -34,7 +34,10 @@ import traceback
 from shutil import rmtree
 from signal import SIGKILL
 from subprocess import DEVNULL  # nosec
+from time import time
 
+from cylc.flow import job_runner_status_cache
+from cylc.flow.job_runner_status_cache import StatusQuery
 from cylc.flow.task_message import (
     CYLC_JOB_PID, CYLC_JOB_INIT_TIME, CYLC_JOB_EXIT_TIME, CYLC_JOB_EXIT,
     CYLC_MESSAGE)
@@ -218,11 +221,15 @@ class JobRunnerManager():
                     f"{self.OUT_PREFIX_CMD_ERR}{now}|{job_log_dir}|{line}\n"
                 )
 
-    def jobs_poll(self, job_log_root, job_log_dirs):
+    def jobs_poll(
+        self, job_log_root, job_log_dirs, status_cache_interval=None
+    ):
         """Poll multiple jobs.
 
         job_log_root -- The log/job/ sub-directory of the workflow.
         job_log_dirs -- A list containing point/name/submit_num for jobs.
+        status_cache_interval -- If set, share job runner status queries
+            with other workflows, using results up to this old (seconds).
 
         """
         if "$" in job_log_root:
@@ -259,7 +266,8 @@ class JobRunnerManager():
 
         for job_runner_name, my_ctx_list in ctx_list_by_job_runner.items():
             self._jobs_poll_runner(
-                job_log_root, job_runner_name, my_ctx_list)
+                job_log_root, job_runner_name, my_ctx_list,
+                status_cache_interval)
 
         cur_time_str = get_current_time_string()
         for ctx in ctx_list:
@@ -488,63 +496,54 @@ class JobRunnerManager():
 
         return ctx
 
-    def _jobs_poll_runner(self, job_log_root, job_runner_name, my_ctx_list):
+    def _jobs_poll_runner(
+        self, job_log_root, job_runner_name, my_ctx_list,
+        status_cache_interval=None
+    ):
         """Helper 2 for self.jobs_poll(job_log_root, job_log_dirs)."""
         exp_job_ids = [ctx.job_id for ctx in my_ctx_list]
         bad_job_ids = list(exp_job_ids)
         exp_pids = []
         bad_pids = []
-        items = [[self._get_sys(job_runner_name), exp_job_ids, bad_job_ids]]
-        if getattr(items[0][0], "SHOULD_POLL_PROC_GROUP", False):
+        items = [[
+            job_runner_name,
+            self._get_sys(job_runner_name),
+            exp_job_ids,
+            bad_job_ids,
+        ]]
+        if getattr(items[0][1], "SHOULD_POLL_PROC_GROUP", False):
             exp_pids = [ctx.pid for ctx in my_ctx_list if ctx.pid is not None]
             bad_pids.extend(exp_pids)
-            items.append([self._get_sys("background"), exp_pids, bad_pids])
+            items.append(
+                ["background", self._get_sys("background"), exp_pids, bad_pids]
+            )
         debug_messages = []
-        for job_runner, exp_ids, bad_ids in items:
-            if hasattr(job_runner, "get_poll_many_cmd"):
-                # Some poll commands may not be as simple
-                cmd = job_runner.get_poll_many_cmd(exp_ids)
-            else:  # if hasattr(job_runner, "POLL_CMD"):
-                # Simple poll command that takes a list of job IDs
-                cmd = [job_runner.POLL_CMD, *exp_ids]
-            try:
-                proc = procopen(cmd, stdindevnull=True,
-                                stderrpipe=True, stdoutpipe=True)
-            except OSError as exc:
-                # subprocess.Popen has a bad habit of not setting the
-                # filename of the executable when it raises an OSError.
-                if not exc.filename:
-                    exc.filename = cmd[0]
-                sys.stderr.write(f"{exc}\n")
-                return
-            ret_code = proc.wait()
-            out, err = (f.decode() for f in proc.communicate())
+        for name, job_runner, exp_ids, bad_ids in items:
+            result = None
+            if (
+                status_cache_interval
+                and getattr(job_runner, "POLL_ALL_CMD", None)
+            ):
+                result = self._jobs_poll_cached(
+                    name, job_runner, exp_ids, bad_ids, status_cache_interval
+                )
+            if result is None:
+                if hasattr(job_runner, "get_poll_many_cmd"):
+                    # Some poll commands may not be as simple
+                    cmd = job_runner.get_poll_many_cmd(exp_ids)
+                else:  # if hasattr(job_runner, "POLL_CMD"):
+                    # Simple poll command that takes a list of job IDs
+                    cmd = [job_runner.POLL_CMD, *exp_ids]
+                try:
+                    result = self._jobs_poll_cmd(cmd)
+                except OSError as exc:
+                    sys.stderr.write(f"{exc}\n")
+                    return
+                self._jobs_poll_filter(job_runner, exp_ids, bad_ids, result)
             debug_messages.append('{0} - {1}'.format(
-                job_runner, len(out.split('\n')))
+                job_runner, len(result.out.split('\n')))
             )
-            sys.stderr.write(err)
-            if (ret_code and hasattr(job_runner, "POLL_CANT_CONNECT_ERR") and
-                    job_runner.POLL_CANT_CONNECT_ERR in err):
-                # Poll command failed because it cannot connect to job runner
-                # Assume jobs are still healthy until the job runner is back.
-                bad_ids[:] = []
-            elif hasattr(job_runner, "filter_poll_many_output"):
-                # Allow custom filter
-                for id_ in job_runner.filter_poll_many_output(out):
-                    with suppress(ValueError):
-                        bad_ids.remove(id_)
-            else:
-                # Just about all poll commands return a table, with column 1
-                # being the job ID. The logic here should be sufficient to
-                # ensure that any table header is ignored.
-                for line in out.splitlines():
-                    try:
-                        head = line.split(None, 1)[0]
-                    except IndexError:
-                        continue
-                    if head in exp_ids:
-                        with suppress(ValueError):
-                            bad_ids.remove(head)
+            sys.stderr.write(result.err)
 
         debug_flag = False
         for ctx in my_ctx_list:
@@ -581,6 +580,88 @@ class JobRunnerManager():
         if debug_flag:
             ctx.job_runner_call_no_lines = ', '.join(debug_messages)
 
+    @staticmethod
+    def _jobs_poll_cmd(cmd):
+        """Run a job runner poll command.
+
+        Return a StatusQuery. Raise OSError if the command cannot be run.
+
+        """
+        start = time()
+        try:
+            proc = procopen(cmd, stdindevnull=True,
+                            stderrpipe=True, stdoutpipe=True)
+        except OSError as exc:
+            # subprocess.Popen has a bad habit of not setting the
+            # filename of the executable when it raises an OSError.
+            if not exc.filename:
+                exc.filename = cmd[0]
+            raise
+        ret_code = proc.wait()
+        out, err = (f.decode() for f in proc.communicate())
+        return StatusQuery(ret_code, out, err, start)
+
+    @staticmethod
+    def _jobs_poll_filter(job_runner, exp_ids, bad_ids, result):
+        """Remove the jobs found by a poll command from "bad_ids"."""
+        if (result.ret_code and
+                hasattr(job_runner, "POLL_CANT_CONNECT_ERR") and
+                job_runner.POLL_CANT_CONNECT_ERR in result.err):
+            # Poll command failed because it cannot connect to job runner
+            # Assume jobs are still healthy until the job runner is back.
+            bad_ids[:] = []
+        elif hasattr(job_runner, "filter_poll_many_output"):
+            # Allow custom filter
+            for id_ in job_runner.filter_poll_many_output(result.out):
+                with suppress(ValueError):
+                    bad_ids.remove(id_)
+        else:
+            # Just about all poll commands return a table, with column 1
+            # being the job ID. The logic here should be sufficient to
+            # ensure that any table header is ignored.
+            for line in result.out.splitlines():
+                try:
+                    head = line.split(None, 1)[0]
+                except IndexError:
+                    continue
+                if head in exp_ids:
+                    with suppress(ValueError):
+                        bad_ids.remove(head)
+
+    def _jobs_poll_cached(
+        self, job_runner_name, job_runner, exp_ids, bad_ids, interval
+    ):
+        """Poll jobs using the job runner status cache.
+
+        The status of all of the user's jobs is read from the cache (see
+        cylc.flow.job_runner_status_cache), or queried if the cache is
+        older than "interval" seconds.
+
+        Return the query result, or None if the query failed, in which case
+        the jobs should be polled as usual.
+
+        """
+        cmd = shlex.split(job_runner.POLL_ALL_CMD)
+        path = job_runner_status_cache.get_cache_path(job_runner_name)
+        start = time()
+        try:
+            # Jobs missing from a cached result may have been submitted
+            # since, so check them against a new query.
+            for not_before in (0, start):
+                result = job_runner_status_cache.query(
+                    path, cmd, self._jobs_poll_cmd, interval, not_before
+                )
+                bad_ids[:] = exp_ids
+                if result.ret_code:
+                    return None
+                self._jobs_poll_filter(job_runner, exp_ids, bad_ids, result)
+                if not bad_ids or result.time >= start:
+                    break
+        except OSError:
+            bad_ids[:] = exp_ids
+            return None
+        return result
+
     def _job_submit_impl(
             self, job_file_path, job_runner_name, submit_opts):
         """Helper for self.jobs_submit() and self.job_submit()."""
@@ -601,8 +682,9 @@ class JobRunnerManager():
         job_runner = self._get_sys(job_runner_name)
         if not self.clean_env:
             # Pass the whole environment to the job submit subprocess.
-            # (Note this runs on the job host).
-            env = os.environ
+            # (Note this runs on the job host). Copy it, as this may run in
+            # a long-lived job agent which submits many jobs.
+            env = dict(os.environ)
         else:
             # $HOME is required by job.sh on the job host.
             env = {'HOME': os.environ.get('HOME', '')}
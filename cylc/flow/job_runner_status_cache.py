@@ -0,0 +1,137 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Share job runner status queries between workflows.
+
+"cylc jobs-poll" normally asks the job runner about the jobs of one
+workflow at a time, so with many workflows on a host, the job runner
+receives many near-identical queries.
+
+For job runners which can list all of the user's jobs in one query (see
+the ``POLL_ALL_CMD`` handler attribute), the output of that query can
+instead be cached in a file and shared by all workflows on the host. The
+first poll in each interval runs the query, later polls (from any
+workflow) read the cache. The cache file is locked while the query runs,
+so concurrent polls wait for its result rather than running their own.
+
+The cache is only written by successful queries. Callers should check
+jobs missing from a cached result against a new query, as they may have
+been submitted since the cached query ran.
+"""
+
+from contextlib import suppress
+import fcntl
+import json
+import os
+import socket
+from time import time
+from typing import (
+    Callable,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+
+class StatusQuery(NamedTuple):
+    """The result of a job runner status query."""
+
+    ret_code: int
+    out: str
+    err: str
+    # when the query was run (seconds since the epoch)
+    time: float
+
+
+def get_cache_path(job_runner_name: str) -> str:
+    """Return the path of the status cache for this user, host and runner.
+
+    This is "~/.cylc/job-runner-status/<host>/<job runner>.json".
+    """
+    return os.path.expanduser(
+        os.path.join(
+            '~', '.cylc', 'job-runner-status', socket.gethostname(),
+            f'{job_runner_name}.json',
+        )
+    )
+
+
+def query(
+    path: str,
+    cmd: List[str],
+    run: Callable[[List[str]], StatusQuery],
+    interval: float,
+    not_before: float = 0,
+) -> StatusQuery:
+    """Return the result of a status query, from the cache if possible.
+
+    Args:
+        path:
+            The cache file.
+        cmd:
+            The query command.
+        run:
+            Function to run the query command.
+        interval:
+            Run the query if the cached result is older than this
+            (seconds).
+        not_before:
+            Run the query if the cached result is from before this time
+            (seconds since the epoch).
+
+    """
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    with open(f'{path}.lock', 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        cached = _read(path, cmd)
+        if (
+            cached is not None
+            and cached.time >= not_before
+            and time() - cached.time < interval
+        ):
+            return cached
+        result = run(cmd)
+        if result.ret_code == 0:
+            _write(path, cmd, result)
+        return result
+
+
+def _read(path: str, cmd: List[str]) -> Optional[StatusQuery]:
+    """Return the cached result of a query command, if any."""
+    try:
+        with open(path, 'r') as handle:
+            data = json.load(handle)
+        if data['cmd'] != cmd:
+            return None
+        return StatusQuery(
+            data['ret_code'], data['out'], data['err'], data['time']
+        )
+    except (OSError, KeyError, TypeError, ValueError):
+        # no cache or a corrupt cache (e.g. from a different Cylc version)
+        return None
+
+
+def _write(path: str, cmd: List[str], result: StatusQuery) -> None:
+    """Cache the result of a query command."""
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w') as handle:
+            json.dump({'cmd': cmd, **result._asdict()}, handle)
+        os.replace(tmp_path, path)
+    except OSError:
+        # the cache is an optimisation, failing to write it is not an error
+        with suppress(OSError):
+            os.unlink(tmp_path)
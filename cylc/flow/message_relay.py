@@ -0,0 +1,427 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Relay task job messages to schedulers in batches.
+
+Each "cylc message" normally connects to the scheduler and sends its
+messages in a request of its own. On hosts which run many short jobs, a
+relay ("cylc message-relay") can be run instead. "cylc message" hands its
+messages to the relay over a local UNIX socket, and the relay forwards them
+to each workflow in batches, over a connection which it keeps open.
+
+The relay is optional. If it is not running, or does not respond,
+"cylc message" sends its messages to the scheduler directly.
+
+Messages are forwarded to each workflow concurrently, so an unresponsive
+workflow does not hold up messages for the others. Its messages are held
+until the request in progress has finished.
+
+If a request fails on a connection kept open from an earlier batch (e.g.
+because the scheduler has restarted on a different port), it is retried
+once on a new connection. Otherwise, the relay does not retry messages it
+fails to forward. The job status file remains the durable record of job
+messages, the scheduler will pick up any lost messages when it next polls
+the job.
+
+Protocol:
+    The client sends a single line of JSON::
+
+        {"workflow": ..., "job_id": ..., "event_time": ...,
+         "messages": [[severity, message], ...]}
+
+    The relay replies with a single line, "ok" if it has accepted the
+    messages, else "error: <reason>".
+"""
+
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from functools import lru_cache
+import json
+import os
+import socket
+import socketserver
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+from cylc.flow import LOG
+from cylc.flow.exceptions import CylcError
+
+if TYPE_CHECKING:
+    from cylc.flow.network.client import WorkflowRuntimeClientBase
+
+
+# environment variable to override the relay socket path
+ENV_RELAY_SOCKET = 'CYLC_MESSAGE_RELAY'
+
+RELAY_OK = b'ok'
+
+# how long clients wait for the relay to accept messages (seconds)
+CLIENT_TIMEOUT = 5
+
+
+class RelayedMessages(NamedTuple):
+    """The messages from one "cylc message" call."""
+
+    job_id: str
+    event_time: str
+    messages: List[List[str]]
+
+
+def get_relay_socket_path() -> str:
+    """Return the path of the relay socket for this user and host.
+
+    This is "~/.cylc/message-relay/<host>.sock" unless overridden by the
+    environment variable ``CYLC_MESSAGE_RELAY``.
+    """
+    path = os.getenv(ENV_RELAY_SOCKET)
+    if path:
+        return os.path.expanduser(path)
+    return os.path.expanduser(
+        os.path.join(
+            '~', '.cylc', 'message-relay', f'{socket.gethostname()}.sock'
+        )
+    )
+
+
+@lru_cache(maxsize=None)
+def get_batch_mutation(size: int) -> str:
+    """Return a GraphQL mutation which sends a batch of job messages.
+
+    Each message is sent by its own (aliased) "message" mutation, so the
+    batch can be sent to any Cylc 8 scheduler.
+
+    Examples:
+        >>> print(get_batch_mutation(2))
+        mutation (
+          $wFlows: [WorkflowID]!,
+          $taskJob0: String!, $eventTime0: String, $messages0: [[String]],
+          $taskJob1: String!, $eventTime1: String, $messages1: [[String]]
+        ) {
+          m0: message (workflows: $wFlows, taskJob: $taskJob0, \
+eventTime: $eventTime0, messages: $messages0) { result }
+          m1: message (workflows: $wFlows, taskJob: $taskJob1, \
+eventTime: $eventTime1, messages: $messages1) { result }
+        }
+
+    """
+    args = ',\n'.join(
+        f'  $taskJob{ind}: String!, $eventTime{ind}: String,'
+        f' $messages{ind}: [[String]]'
+        for ind in range(size)
+    )
+    mutations = '\n'.join(
+        f'  m{ind}: message (workflows: $wFlows, taskJob: $taskJob{ind},'
+        f' eventTime: $eventTime{ind}, messages: $messages{ind})'
+        ' { result }'
+        for ind in range(size)
+    )
+    return (
+        'mutation (\n'
+        '  $wFlows: [WorkflowID]!,\n'
+        f'{args}\n'
+        ') {\n'
+        f'{mutations}\n'
+        '}'
+    )
+
+
+def get_batch_variables(
+    workflow: str, batch: List[RelayedMessages]
+) -> Dict[str, object]:
+    """Return the variables for a batch mutation.
+
+    Examples:
+        >>> get_batch_variables(
+        ...     '~u/w', [RelayedMessages('1/a/01', 'T', [['INFO', 'x']])]
+        ... )
+        ... # doctest: +NORMALIZE_WHITESPACE
+        {'wFlows': ['~u/w'], 'taskJob0': '1/a/01', 'eventTime0': 'T',
+         'messages0': [['INFO', 'x']]}
+
+    """
+    variables: Dict[str, object] = {'wFlows': [workflow]}
+    for ind, item in enumerate(batch):
+        variables[f'taskJob{ind}'] = item.job_id
+        variables[f'eventTime{ind}'] = item.event_time
+        variables[f'messages{ind}'] = item.messages
+    return variables
+
+
+def relay_messages(
+    workflow: str,
+    job_id: str,
+    messages: List[list],
+    event_time: str,
+    path: Optional[str] = None,
+) -> bool:
+    """Hand job messages to the relay, if one is running.
+
+    Returns:
+        True if the relay accepted the messages, else False, in which case
+        the caller should send the messages itself.
+
+    """
+    if path is None:
+        path = get_relay_socket_path()
+    if not os.path.exists(path):
+        return False
+    request = json.dumps({
+        'workflow': workflow,
+        'job_id': job_id,
+        'event_time': event_time,
+        'messages': messages,
+    }).encode() + b'\n'
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CLIENT_TIMEOUT)
+            sock.connect(path)
+            sock.sendall(request)
+            with sock.makefile('rb') as response:
+                return response.readline().strip() == RELAY_OK
+    except OSError:
+        # no relay listening on the socket, or it did not respond
+        return False
+
+
+class _RelayRequestHandler(socketserver.StreamRequestHandler):
+    """Accept job messages from a "cylc message" client."""
+
+    server: '_RelayServer'
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+            self.server.relay.put(
+                str(request['workflow']),
+                RelayedMessages(
+                    str(request['job_id']),
+                    str(request['event_time']),
+                    [
+                        [str(severity), str(message)]
+                        for severity, message in request['messages']
+                    ],
+                )
+            )
+        except (KeyError, TypeError, ValueError) as exc:
+            self.wfile.write(f'error: {exc}\n'.encode())
+        else:
+            self.wfile.write(RELAY_OK + b'\n')
+
+
+class _RelayServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, relay: 'MessageRelay'):
+        self.relay = relay
+        super().__init__(path, _RelayRequestHandler)
+
+
+class MessageRelay:
+    """Relay job messages to schedulers in batches.
+
+    Args:
+        path:
+            The path of the UNIX socket to listen on.
+        interval:
+            How often to forward messages (seconds).
+        max_batch_size:
+            The maximum number of "cylc message" calls to forward to a
+            workflow in a single request.
+        timeout:
+            The client timeout for requests to schedulers (seconds).
+        max_workers:
+            The maximum number of workflows to forward to at once.
+
+    """
+
+    def __init__(
+        self,
+        path: str,
+        interval: float = 0.5,
+        max_batch_size: int = 100,
+        timeout: Optional[float] = None,
+        max_workers: int = 8,
+    ):
+        self.path = path
+        self.interval = interval
+        self.max_batch_size = max_batch_size
+        self.timeout = timeout
+        # {workflow: [messages, ...]}
+        self._pending: Dict[str, List[RelayedMessages]] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix='message-relay-forward'
+        )
+        # {workflow: messages being forwarded}
+        self._forwarding: Dict[str, Future] = {}
+        # {workflow: client}, kept open between batches
+        self._clients: Dict[str, 'WorkflowRuntimeClientBase'] = {}
+        self._stopping = threading.Event()
+
+    def put(self, workflow: str, item: RelayedMessages) -> None:
+        """Queue messages to be forwarded to a workflow."""
+        with self._lock:
+            self._pending.setdefault(os.path.normpath(workflow), []).append(
+                item
+            )
+
+    def flush(self, block: bool = False) -> None:
+        """Start forwarding queued messages.
+
+        Messages for a workflow which is still being forwarded to (from a
+        previous flush) are held until the next flush.
+
+        Args:
+            block:
+                Wait for any messages being forwarded, then forward all
+                queued messages and wait for them to be forwarded.
+
+        """
+        if block:
+            with self._lock:
+                forwarding = list(self._forwarding.values())
+            wait(forwarding)
+        with self._lock:
+            for workflow, future in list(self._forwarding.items()):
+                if future.done():
+                    del self._forwarding[workflow]
+            for workflow in list(self._pending):
+                if workflow not in self._forwarding:
+                    self._forwarding[workflow] = self._executor.submit(
+                        self._forward_all,
+                        workflow,
+                        self._pending.pop(workflow),
+                    )
+            forwarding = list(self._forwarding.values())
+        if block:
+            wait(forwarding)
+
+    def _forward_all(
+        self, workflow: str, items: List[RelayedMessages]
+    ) -> None:
+        """Forward messages to a workflow, in batches."""
+        try:
+            for ind in range(0, len(items), self.max_batch_size):
+                self.forward(workflow, items[ind:ind + self.max_batch_size])
+        except Exception:
+            # (don't lose errors in the executor)
+            LOG.exception(f'{workflow}: failed to forward messages')
+
+    def forward(self, workflow: str, batch: List[RelayedMessages]) -> bool:
+        """Send a batch of messages to a workflow.
+
+        Returns:
+            True if the batch was sent, else False.
+
+        """
+        from cylc.flow.network.client_factory import get_client
+        request = {
+            'request_string': get_batch_mutation(len(batch)),
+            'variables': get_batch_variables(workflow, batch),
+        }
+        while True:
+            client = self._clients.get(workflow)
+            is_new = client is None
+            try:
+                if client is None:
+                    client = self._clients[workflow] = get_client(
+                        workflow, timeout=self.timeout
+                    )
+                client('graphql', request)
+            except (CylcError, OSError) as exc:
+                self._drop_client(workflow)
+                if not is_new:
+                    # The client may be stale, e.g. the scheduler may have
+                    # restarted (with a new port and keys), try a new one.
+                    LOG.debug(f'{workflow}: retrying with a new client: {exc}')
+                    continue
+                # e.g. the workflow has stopped or moved, or the request
+                # failed. The messages are in the job status files, the
+                # scheduler will find them when it polls the jobs.
+                LOG.warning(
+                    f'{workflow}: failed to forward {len(batch)} message(s):'
+                    f' {exc}'
+                )
+                return False
+            LOG.debug(f'{workflow}: forwarded {len(batch)} message(s)')
+            return True
+
+    def _drop_client(self, workflow: str) -> None:
+        client = self._clients.pop(workflow, None)
+        # (the SSH client has no connection to close)
+        stop = getattr(client, 'stop', None)
+        if stop is not None:
+            stop()
+
+    def serve(self) -> None:
+        """Listen for messages and forward them until stopped."""
+        self._bind()
+        server = _RelayServer(self.path, self)
+        os.chmod(self.path, 0o600)
+        thread = threading.Thread(
+            target=server.serve_forever,
+            name='message-relay-server',
+            daemon=True,
+        )
+        thread.start()
+        LOG.info(f'Relaying job messages from {self.path}')
+        try:
+            while not self._stopping.wait(self.interval):
+                self.flush()
+        finally:
+            server.shutdown()
+            server.server_close()
+            os.unlink(self.path)
+            # forward anything accepted before the server shut down
+            self.flush(block=True)
+            self._executor.shutdown()
+            for workflow in list(self._clients):
+                self._drop_client(workflow)
+
+    def stop(self) -> None:
+        """Stop the relay (from another thread)."""
+        self._stopping.set()
+
+    def _bind(self) -> None:
+        """Prepare the socket path, removing any left by a dead relay.
+
+        Raises:
+            CylcError:
+                If another relay is already listening on the socket.
+
+        """
+        os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+        if not os.path.exists(self.path):
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(self.path)
+            except OSError:
+                # stale socket
+                os.unlink(self.path)
+            else:
+                raise CylcError(
+                    f'A message relay is already running on {self.path}'
+                )
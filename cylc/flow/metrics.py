@@ -0,0 +1,259 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Live performance metrics for the scheduler main loop.
+
+Unlike the profiler (``cylc play --profile``), these metrics are always
+collected. They are cheap to record and can be requested from a running
+scheduler (via the "metrics" server endpoint or the GraphQL
+``workflows { metrics }`` field) to monitor scheduler health continuously.
+
+Phases:
+    The time spent in each phase of each main loop iteration is recorded in
+    a histogram (see ``MainLoopMetrics.lap``), as is the time spent in the
+    iteration as a whole ("iteration", excluding sleep).
+Counters:
+    Counts of events (e.g. task messages processed) are recorded with their
+    rate per second over the last ``RATE_WINDOW`` seconds.
+"""
+
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from threading import Lock
+from time import (
+    perf_counter,
+    time,
+)
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterator,
+    Tuple,
+)
+
+
+# histogram bucket upper bounds (seconds)
+BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'),
+)
+
+# the window over which counter rates are calculated (seconds)
+RATE_WINDOW = 60
+
+# how often to sample the counters for calculating rates (seconds)
+SAMPLE_INTERVAL = 1
+
+
+class Histogram:
+    """A histogram of durations, in cumulative buckets.
+
+    Examples:
+        >>> hist = Histogram()
+        >>> hist.observe(0.002)
+        >>> hist.observe(0.3)
+        >>> stats = hist.get_stats()
+        >>> stats['count'], stats['max']
+        (2, 0.3)
+        >>> stats['buckets']['0.001'], stats['buckets']['0.0025']
+        (0, 1)
+        >>> stats['buckets']['0.5'], stats['buckets']['+Inf']
+        (2, 2)
+
+    """
+
+    __slots__ = ('counts', 'count', 'sum', 'max')
+
+    def __init__(self) -> None:
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def get_stats(self) -> Dict[str, Any]:
+        buckets: Dict[str, int] = {}
+        total = 0
+        for bound, count in zip(BUCKETS, list(self.counts)):
+            total += count
+            buckets['+Inf' if bound == float('inf') else str(bound)] = total
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'max': self.max,
+            'buckets': buckets,
+        }
+
+
+class Counter:
+    """A count of events and its recent rate.
+
+    Examples:
+        >>> counter = Counter()
+        >>> counter.inc(5)
+        >>> counter.sample(100)
+        >>> counter.inc(10)
+        >>> counter.sample(110)
+        >>> counter.get_stats(110)
+        {'total': 15, 'rate': 1.0}
+
+    """
+
+    __slots__ = ('total', '_samples')
+
+    def __init__(self) -> None:
+        self.total = 0
+        # [(time, total), ...] over the rate window
+        self._samples: Deque[Tuple[float, int]] = deque()
+
+    def inc(self, amount: int = 1) -> None:
+        self.total += amount
+
+    def sample(self, now: float) -> None:
+        """Record the total, for calculating the rate."""
+        self._samples.append((now, self.total))
+        # (keep the newest sample from before the window)
+        while len(self._samples) > 2 and (
+            self._samples[1][0] <= now - RATE_WINDOW
+        ):
+            self._samples.popleft()
+
+    def get_stats(self, now: float) -> Dict[str, Any]:
+        rate = 0.0
+        if self._samples:
+            then, total = self._samples[0]
+            if now > then:
+                rate = (self.total - total) / (now - then)
+        return {'total': self.total, 'rate': rate}
+
+
+class MainLoopMetrics:
+    """Metrics for the scheduler main loop.
+
+    Main loop phases are timed as "laps", each lap ends where the next
+    begins. This is cheaper than timing each phase individually and
+    accounts for all of the time in the iteration.
+
+    Phases and counters may be recorded from other threads (e.g. the
+    server's request handlers), so all access to them is made under a lock.
+
+    Examples:
+        >>> metrics = MainLoopMetrics()
+        >>> metrics.start_iteration()
+        >>> metrics.count('messages', 3)
+        >>> metrics.lap('messages')
+        >>> metrics.lap('events')
+        >>> metrics.lap('messages')
+        >>> metrics.end_iteration()
+        >>> stats = metrics.get_stats()
+        >>> sorted(stats['phases'])
+        ['events', 'iteration', 'messages']
+        >>> stats['phases']['messages']['count']  # once per iteration
+        1
+        >>> stats['counters']['messages']['total']
+        3
+
+    """
+
+    def __init__(self) -> None:
+        self.start_time = time()
+        self.phases: Dict[str, Histogram] = {}
+        self.counters: Dict[str, Counter] = {}
+        self._lap_start = perf_counter()
+        self._iteration_start = self._lap_start
+        self._laps: Dict[str, float] = {}
+        self._last_sample = 0.0
+        self._lock = Lock()
+
+    def start_iteration(self) -> None:
+        """Mark the start of a main loop iteration."""
+        self._laps.clear()
+        self._lap_start = self._iteration_start = perf_counter()
+
+    def lap(self, name: str) -> None:
+        """Mark the end of a phase of the main loop iteration.
+
+        The time since the end of the previous phase is added to this phase.
+        """
+        now = perf_counter()
+        self._laps[name] = (
+            self._laps.get(name, 0.0) + now - self._lap_start
+        )
+        self._lap_start = now
+
+    def end_iteration(self) -> None:
+        """Mark the end of a main loop iteration."""
+        for name, duration in self._laps.items():
+            self.observe(name, duration)
+        self.observe('iteration', perf_counter() - self._iteration_start)
+        now = time()
+        if now - self._last_sample >= SAMPLE_INTERVAL:
+            self._last_sample = now
+            with self._lock:
+                for counter in self.counters.values():
+                    counter.sample(now)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time something outside of the main loop laps."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, perf_counter() - start)
+
+    def observe(self, name: str, duration: float) -> None:
+        """Record the duration of a phase (seconds)."""
+        with self._lock:
+            try:
+                self.phases[name].observe(duration)
+            except KeyError:
+                self.phases[name] = hist = Histogram()
+                hist.observe(duration)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Increment a counter."""
+        with self._lock:
+            try:
+                self.counters[name].inc(amount)
+            except KeyError:
+                self.counters[name] = counter = Counter()
+                counter.inc(amount)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return the metrics (may be called from another thread)."""
+        now = time()
+        with self._lock:
+            return {
+                'time': now,
+                'uptime': now - self.start_time,
+                'phases': {
+                    name: hist.get_stats()
+                    for name, hist in self.phases.items()
+                },
+                'counters': {
+                    name: counter.get_stats(now)
+                    for name, counter in self.counters.items()
+                },
+            }
@@ -99,7 +99,7 @@ def serialize(data: object) -> str:
     return json.dumps(data)
 
 
-def deserialize(message: str) -> 'ResponseDict':
+def deserialize(message: Union[str, bytes]) -> 'ResponseDict':
     """Convert a JSON message string to dict with an added 'user' field."""
     # Abstract out the transport format in order to allow it to be changed
     # in future.
@@ -28,6 +28,7 @@ from typing import (
     TYPE_CHECKING,
     Any,
     Dict,
+    List,
     Optional,
     Union,
 )
@@ -54,6 +55,10 @@ from cylc.flow.network import (
     serialize,
 )
 from cylc.flow.network.client_factory import CommsMeth
+from cylc.flow.network.encoding import (
+    decode_response,
+    get_accept_encoding,
+)
 from cylc.flow.network.server import PB_METHOD_MAP
 from cylc.flow.workflow_files import detect_old_contact_file
 
@@ -223,6 +228,10 @@ class WorkflowRuntimeClient(  # type: ignore[misc]
 
             If both host and port are provided it is not necessary to load
             the contact file.
+        accept_encoding:
+            The response encodings to accept, see
+            ``cylc.flow.network.encoding.get_accept_encoding``. Defaults to
+            all available encodings. Use ``{}`` for plain JSON responses.
 
     Attributes:
         host:
@@ -270,9 +279,13 @@ class WorkflowRuntimeClient(  # type: ignore[misc]
         timeout: Union[float, str, None] = None,
         scheduler_version: Optional[str] = None,
         context: Optional[zmq.asyncio.Context] = None,
-        srv_public_key_loc: Optional[str] = None
+        srv_public_key_loc: Optional[str] = None,
+        accept_encoding: Optional[Dict[str, List[str]]] = None,
     ):
         ZMQSocketBase.__init__(self, zmq.REQ, workflow, context=context)
+        if accept_encoding is None:
+            accept_encoding = get_accept_encoding()
+        self.accept_encoding = accept_encoding
         WorkflowRuntimeClientBase.__init__(
             self,
             workflow,
@@ -347,10 +360,14 @@ class WorkflowRuntimeClient(  # type: ignore[misc]
             )
         LOG.debug('zmq:recv %s', res)
 
-        if command in PB_METHOD_MAP:
-            return res
+        # unwrap the response if sent in a negotiated encoding
+        decoded = decode_response(res)
+        if command in PB_METHOD_MAP and isinstance(decoded, bytes):
+            return decoded
 
-        response: ResponseDict = deserialize(res.decode())
+        response: ResponseDict = (
+            deserialize(decoded) if isinstance(decoded, bytes) else decoded
+        )
 
         try:
             return response['data']
@@ -372,7 +389,7 @@ class WorkflowRuntimeClient(  # type: ignore[misc]
 
         Returns:
             dict: dictionary with the header information, such as
-                program and hostname.
+                program and hostname, and the accepted response encodings.
         """
         host = socket.gethostname()
         if len(sys.argv) > 1:
@@ -390,7 +407,7 @@ class WorkflowRuntimeClient(  # type: ignore[misc]
 
             if cmd.startswith(cylc_bin_dir):
                 cmd = cmd.replace(cylc_bin_dir, '')
-        return {
+        header: Dict[str, Any] = {
             'meta': {
                 'prog': cmd,
                 'host': host,
@@ -401,6 +418,9 @@ class WorkflowRuntimeClient(  # type: ignore[misc]
                     )
             }
         }
+        if self.accept_encoding:
+            header['accept_encoding'] = self.accept_encoding
+        return header
 
     def __del__(self):
         self.stop(stop_loop=False)
@@ -0,0 +1,234 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Negotiated encodings for ZMQ responses.
+
+Requests are always sent as JSON so that they can be understood by any
+server. Clients list the encodings they accept in the request
+("accept_encoding"), the server picks the first format and compression
+it supports, and wraps the response in an envelope naming the encoding::
+
+    b'\\x00' + b'<format>[+<compression>]' + b'\\x00' + payload
+
+Neither JSON nor protobuf messages can start with a null byte, so clients
+can tell an envelope from a plain JSON (or protobuf) response, i.e. one
+from an older server. Servers reply in plain JSON to older clients, which
+do not send "accept_encoding".
+
+Formats:
+    json:
+        Always available.
+    msgpack:
+        Available if the msgpack package is installed.
+    raw:
+        Used by the server for responses which are already bytes
+        (e.g. protobuf messages).
+
+Compression (only applied to payloads of COMPRESS_THRESHOLD bytes or more):
+    zstd:
+        Available if the zstandard package is installed.
+    zlib:
+        Always available.
+"""
+
+import json
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+import zlib
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+if TYPE_CHECKING:
+    from cylc.flow.network import ResponseDict
+
+
+ENVELOPE_MARKER = b'\x00'
+
+# don't compress small payloads, it isn't worth the CPU
+COMPRESS_THRESHOLD = 16 * 1024  # bytes
+
+RAW = 'raw'
+
+FORMATS: Dict[str, Tuple[Callable, Callable]] = {
+    'json': (lambda data: json.dumps(data).encode(), json.loads),
+}
+if msgpack is not None:
+    FORMATS['msgpack'] = (
+        msgpack.packb,
+        lambda payload: msgpack.unpackb(payload, strict_map_key=False),
+    )
+
+COMPRESSIONS: Dict[str, Tuple[Callable, Callable]] = {
+    'zlib': (lambda payload: zlib.compress(payload, 1), zlib.decompress),
+}
+if zstandard is not None:
+    COMPRESSIONS['zstd'] = (
+        zstandard.ZstdCompressor().compress,
+        zstandard.ZstdDecompressor().decompress,
+    )
+
+# preferred first
+FORMAT_PREFERENCE = ['msgpack', 'json']
+COMPRESSION_PREFERENCE = ['zstd', 'zlib']
+
+Encoding = Tuple[str, Optional[str]]
+
+
+def get_accept_encoding(
+    formats: Optional[List[str]] = None,
+    compressions: Optional[List[str]] = None,
+) -> Dict[str, List[str]]:
+    """Return the encodings this client accepts, to send with requests.
+
+    Args:
+        formats:
+            Acceptable formats in order of preference, defaults to all
+            available formats.
+        compressions:
+            Acceptable compressions in order of preference, defaults to all
+            available compressions. Use an empty list for no compression.
+
+    Examples:
+        >>> get_accept_encoding(['json', 'no-such-format'], [])
+        {'formats': ['json'], 'compressions': []}
+
+    """
+    if formats is None:
+        formats = FORMAT_PREFERENCE
+    if compressions is None:
+        compressions = COMPRESSION_PREFERENCE
+    return {
+        'formats': [fmt for fmt in formats if fmt in FORMATS],
+        'compressions': [
+            comp for comp in compressions if comp in COMPRESSIONS
+        ],
+    }
+
+
+def negotiate_encoding(message: object) -> Optional[Encoding]:
+    """Return the encoding to use for the response to a request.
+
+    Returns None if the client did not ask for an encoding (i.e. an older
+    client), in which case the response should be sent as plain JSON.
+
+    Examples:
+        >>> negotiate_encoding({'command': 'api'}) is None
+        True
+        >>> negotiate_encoding({'accept_encoding': {
+        ...     'formats': ['bson', 'json'], 'compressions': ['zlib']}})
+        ('json', 'zlib')
+        >>> negotiate_encoding({'accept_encoding': {'formats': ['bson']}})
+        ('json', None)
+
+    """
+    if not isinstance(message, dict):
+        return None
+    accept = message.get('accept_encoding')
+    if not isinstance(accept, dict):
+        return None
+    fmt = next(
+        (fmt for fmt in accept.get('formats') or [] if fmt in FORMATS),
+        'json'
+    )
+    compression = next(
+        (
+            comp for comp in accept.get('compressions') or []
+            if comp in COMPRESSIONS
+        ),
+        None
+    )
+    return fmt, compression
+
+
+def encode_response(
+    res: 'ResponseDict',
+    encoding: Optional[Encoding],
+) -> bytes:
+    """Encode a response using the negotiated encoding.
+
+    Examples:
+        >>> encode_response({'data': 42}, None)
+        b'{"data": 42}'
+        >>> encode_response({'data': 42}, ('json', 'zlib'))
+        b'\\x00json\\x00{"data": 42}'
+        >>> encode_response({'data': b'\\n\\x01a'}, ('json', None))
+        b'\\x00raw\\x00\\n\\x01a'
+
+    """
+    data = res.get('data')
+    if isinstance(data, bytes):
+        # e.g. protobuf, send the data as is
+        if encoding is None:
+            return data
+        fmt = RAW
+        payload = data
+    elif encoding is None:
+        return json.dumps(res).encode()
+    else:
+        fmt = encoding[0]
+        payload = FORMATS[fmt][0](res)
+    compression = encoding[1]
+    if compression is not None and len(payload) >= COMPRESS_THRESHOLD:
+        payload = COMPRESSIONS[compression][0](payload)
+        fmt = f'{fmt}+{compression}'
+    return ENVELOPE_MARKER + fmt.encode() + ENVELOPE_MARKER + payload
+
+
+def decode_response(message: bytes) -> Union[bytes, Any]:
+    """Decode a response.
+
+    Returns bytes for plain (JSON or protobuf) and raw responses, otherwise
+    the decoded response.
+
+    Examples:
+        >>> decode_response(b'{"data": 42}')
+        b'{"data": 42}'
+        >>> decode_response(encode_response({'data': 42}, ('json', None)))
+        {'data': 42}
+        >>> res = {'data': 'x' * COMPRESS_THRESHOLD}
+        >>> msg = encode_response(res, ('json', 'zlib'))
+        >>> len(msg) < COMPRESS_THRESHOLD
+        True
+        >>> decode_response(msg) == res
+        True
+
+    """
+    if not message.startswith(ENVELOPE_MARKER):
+        return message
+    header, payload = message[1:].split(ENVELOPE_MARKER, 1)
+    fmt, _, compression = header.decode().partition('+')
+    if compression:
+        payload = COMPRESSIONS[compression][1](payload)
+    if fmt == RAW:
+        return payload
+    return FORMATS[fmt][1](payload)
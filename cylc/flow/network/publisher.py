@@ -84,8 +84,11 @@ class WorkflowPublisher(ZMQSocketBase):
         """
         if self.socket:
             self.topics.add(topic)
+            # data is not copied by zmq (if large), so must not be mutated
+            # after publishing (e.g. use bytes)
             self.socket.send_multipart(
-                [topic, serialize_data(data, serializer)]
+                [topic, serialize_data(data, serializer)],
+                copy=False,
             )
         # else we are in the process of shutting down - don't send anything
 
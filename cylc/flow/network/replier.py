@@ -30,7 +30,10 @@ from cylc.flow import (
 from cylc.flow.network import (
     ZMQSocketBase,
     deserialize,
-    serialize,
+)
+from cylc.flow.network.encoding import (
+    encode_response,
+    negotiate_encoding,
 )
 
 
@@ -59,6 +62,8 @@ class WorkflowReplier(ZMQSocketBase):
         * Expects requests of the format: {"command": CMD, "args": {...}}
         * Sends responses of the format: {"data": {...}}
         * Sends errors in the format: {"error": {"message": MSG}}
+        * Responses are encoded as requested by the client (see
+          cylc.flow.network.encoding), or as JSON for older clients.
 
     """
 
@@ -103,7 +108,7 @@ class WorkflowReplier(ZMQSocketBase):
 
             try:
                 # Check for messages
-                msg = self.socket.recv_string(  # type: ignore[union-attr]
+                msg = self.socket.recv(  # type: ignore[union-attr]
                     zmq.NOBLOCK
                 )
             except zmq.error.Again:
@@ -115,26 +120,24 @@ class WorkflowReplier(ZMQSocketBase):
             # attempt to decode the message, authenticating the user in the
             # process
             res: ResponseDict
-            response: bytes
             try:
                 message = deserialize(msg)
             except Exception as exc:  # purposefully catch generic exception
                 # failed to decode message, possibly resulting from failed
                 # authentication
                 LOG.exception(exc)
-                LOG.error(f'failed to decode message: "{msg}"')
+                LOG.error(f'failed to decode message: "{msg!r}"')
                 res = {
                     'error': {'message': str(exc)},
                     'cylc_version': CYLC_VERSION,
                 }
-                response = serialize(res).encode()
+                encoding = None
             else:
                 # success case - serve the request
+                encoding = negotiate_encoding(message)
                 res = self.server.receiver(message)
-                data = res.get('data')
-                # send back the string to bytes response
-                if isinstance(data, bytes):
-                    response = data
-                else:
-                    response = serialize(res).encode()
-            self.socket.send(response)  # type: ignore[union-attr]
+            # reply in the encoding requested by the client (or JSON)
+            self.socket.send(  # type: ignore[union-attr]
+                encode_response(res, encoding),
+                copy=False,
+            )
@@ -755,6 +755,7 @@ class Resolvers(BaseResolvers):
                 cmd,
             )
         )
+        self.schd.wake_main_loop()
         return (True, cmd_uuid)
 
     def broadcast(
@@ -813,6 +814,7 @@ class Resolvers(BaseResolvers):
 
         """
         self.schd.ext_trigger_queue.put((message, id))
+        self.schd.wake_main_loop()
         return (True, 'Event queued')
 
     def put_messages(
@@ -847,6 +849,7 @@ class Resolvers(BaseResolvers):
                     message,
                 )
             )
+        self.schd.wake_main_loop()
         return (True, f'Messages queued: {len(messages)}')
 
     def set_graph_window_extent(
@@ -0,0 +1,243 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Server for concurrent ZMQ requests."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Set,
+)
+
+import zmq
+
+from cylc.flow import (
+    LOG,
+    __version__ as CYLC_VERSION,
+)
+from cylc.flow.network import (
+    ZMQSocketBase,
+    deserialize,
+)
+from cylc.flow.network.encoding import (
+    Encoding,
+    encode_response,
+    negotiate_encoding,
+)
+
+
+if TYPE_CHECKING:
+    from cylc.flow.network import ResponseDict
+    from cylc.flow.network.server import WorkflowRuntimeServer
+    from zmq.asyncio import Context
+
+
+class WorkflowRouter(ZMQSocketBase):
+    """Initiate the ROUTER part of a ZMQ REQ-ROUTER pattern.
+
+    This is an alternative to the WorkflowReplier which serves requests
+    concurrently. Clients use the same (REQ) socket for either.
+
+    Requests are served in two lanes, each with its own thread pool:
+
+    Commands:
+        Job messages, commands (i.e. GraphQL mutations) and other
+        lightweight requests. These are served one at a time, in the order
+        received, so are never held up behind read queries.
+    Queries:
+        GraphQL queries and protobuf data requests, which may be large.
+        Up to ``max_queries`` are served at once, with no more than
+        ``max_client_queries`` at once from any one client (host).
+
+    Responses are encoded in the worker threads, so that large responses do
+    not block the event loop.
+
+    Args:
+        server:
+            The server, used to serve requests.
+        context:
+            An asyncio ZMQ context.
+        max_queries:
+            The maximum number of queries to serve at once.
+        max_client_queries:
+            The maximum number of queries to serve at once from a single
+            client.
+
+    """
+
+    def __init__(
+        self,
+        server: 'WorkflowRuntimeServer',
+        context: 'Context',
+        max_queries: int,
+        max_client_queries: int,
+    ):
+        super().__init__(
+            zmq.ROUTER, server.schd.workflow, bind=True, context=context
+        )
+        self.server = server
+        self.max_queries = max_queries
+        self.max_client_queries = max_client_queries
+        self._command_pool: Optional[ThreadPoolExecutor] = None
+        self._query_pool: Optional[ThreadPoolExecutor] = None
+        # {client: semaphore} for clients with queries in progress
+        self._client_limits: Dict[str, asyncio.Semaphore] = {}
+        self._client_queries: Dict[str, int] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _bespoke_start(self) -> None:
+        """Start the thread pools.
+
+        Overwrites Base method.
+
+        """
+        super()._bespoke_start()
+        self._command_pool = ThreadPoolExecutor(
+            1, thread_name_prefix='server-commands'
+        )
+        self._query_pool = ThreadPoolExecutor(
+            self.max_queries, thread_name_prefix='server-queries'
+        )
+
+    def _bespoke_stop(self) -> None:
+        """Stop the thread pools.
+
+        Overwrites Base method.
+
+        """
+        LOG.debug('stopping zmq router...')
+        self.stopping = True
+        for pool in (self._command_pool, self._query_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    async def listener(self, timeout: float) -> None:
+        """Receive requests and start serving them.
+
+        Waits up to ``timeout`` seconds for a request, then receives all
+        waiting requests before returning to the caller. Requests are
+        served in the background.
+
+        """
+        # Note: we are using CurveZMQ to secure the messages (see
+        # WorkflowReplier.listener).
+        timeout_ms = int(timeout * 1000)
+        while (
+            not self.stopping
+            and await self.socket.poll(  # type: ignore[union-attr,misc]
+                timeout_ms, zmq.POLLIN
+            )
+        ):
+            timeout_ms = 0
+            try:
+                frames: List[bytes] = await (  # type: ignore[misc]
+                    self.socket.recv_multipart()  # type: ignore[union-attr]
+                )
+            except zmq.error.ZMQError as exc:
+                LOG.exception('unexpected error: %s', exc)
+                continue
+            task = asyncio.create_task(self._serve(frames))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def cancel(self) -> None:
+        """Cancel requests in progress (e.g. on shutdown)."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _serve(self, frames: List[bytes]) -> None:
+        """Serve a request and send the response.
+
+        Args:
+            frames:
+                The request, prefixed by the routing envelope.
+
+        """
+        *envelope, msg = frames
+        try:
+            message = deserialize(msg)
+        except Exception as exc:  # purposefully catch generic exception
+            # failed to decode message, possibly resulting from failed
+            # authentication
+            LOG.exception(exc)
+            LOG.error(f'failed to decode message: "{msg!r}"')
+            res: ResponseDict = {
+                'error': {'message': str(exc)},
+                'cylc_version': CYLC_VERSION,
+            }
+            response = encode_response(res, None)
+        else:
+            encoding = negotiate_encoding(message)
+            loop = asyncio.get_running_loop()
+            if not self.server.is_query(message):
+                response = await loop.run_in_executor(
+                    self._command_pool, self._respond, message, encoding
+                )
+            else:
+                client = self._get_client(message, envelope)
+                async with self._client_limit(client):
+                    response = await loop.run_in_executor(
+                        self._query_pool, self._respond, message, encoding
+                    )
+        if self.socket and not self.socket.closed:
+            await self.socket.send_multipart(  # type: ignore[misc]
+                [*envelope, response],
+                copy=False,
+            )
+
+    def _respond(
+        self,
+        message: object,
+        encoding: Optional[Encoding],
+    ) -> bytes:
+        """Serve a request and encode the response (in a worker thread)."""
+        return encode_response(self.server.receiver(message), encoding)
+
+    @staticmethod
+    def _get_client(message: object, envelope: List[bytes]) -> str:
+        """Return an identifier for the client which sent a request.
+
+        This is the client host if known, else the client connection.
+        """
+        if isinstance(message, dict):
+            meta = message.get('meta')
+            if isinstance(meta, dict) and meta.get('host'):
+                return str(meta['host'])
+        return envelope[0].hex()
+
+    @asynccontextmanager
+    async def _client_limit(self, client: str) -> AsyncIterator[None]:
+        """Limit the number of queries served at once for a client."""
+        self._client_queries[client] = self._client_queries.get(client, 0) + 1
+        semaphore = self._client_limits.setdefault(
+            client, asyncio.Semaphore(self.max_client_queries)
+        )
+        try:
+            async with semaphore:
+                yield
+        finally:
+            self._client_queries[client] -= 1
+            if not self._client_queries[client]:
+                # no queries waiting or in progress for this client
+                del self._client_queries[client]
+                del self._client_limits[client]
@@ -566,6 +566,15 @@ async def resolve_broadcasts(root, info: 'GraphQLResolveInfo', **args):
     return result
 
 
+def resolve_metrics(root, info: 'GraphQLResolveInfo', **args):
+    """Resolve the main loop metrics from the scheduler (if available)."""
+    schd = getattr(get_resolvers(info), 'schd', None)
+    if schd is None or root.id != schd.id:
+        # e.g. the data is being served from a UI Server
+        return None
+    return schd.metrics.get_stats()
+
+
 def resolve_json_dump(root, info, **args):
     field = getattr(root, to_snake_case(info.field_name), '{}') or '{}'
     return json.loads(field)
@@ -855,6 +864,18 @@ class Workflow(ObjectType):
             records.
         '''),
     )
+    metrics = GenericScalar(
+        resolver=resolve_metrics,
+        description=sstrip('''
+            Scheduler main loop metrics as a JSON object.
+
+            The time spent in each phase of the main loop (as histograms
+            with cumulative buckets), and counts and rates of task messages,
+            commands, job submissions and requests.
+
+            Only available from the scheduler (not the UI Server).
+        '''),
+    )
 
 
 class RuntimeSetting(ObjectType):
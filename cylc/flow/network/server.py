@@ -16,6 +16,7 @@
 """Server for workflow runtime API."""
 
 import asyncio
+from functools import lru_cache
 from queue import Queue
 from textwrap import dedent
 from time import sleep
@@ -29,7 +30,14 @@ from typing import (
     Union,
 )
 
+from graphql import (
+    GraphQLError,
+    OperationDefinitionNode,
+    OperationType,
+    parse,
+)
 import zmq
+import zmq.asyncio
 from zmq.auth.thread import ThreadAuthenticator
 
 from cylc.flow import (
@@ -48,6 +56,7 @@ from cylc.flow.network.graphql import (
 from cylc.flow.network.publisher import WorkflowPublisher
 from cylc.flow.network.replier import WorkflowReplier
 from cylc.flow.network.resolvers import Resolvers
+from cylc.flow.network.router import WorkflowRouter
 from cylc.flow.network.schema import schema
 
 
@@ -88,6 +97,37 @@ def filter_none(dictionary):
     }
 
 
+@lru_cache(maxsize=128)
+def is_graphql_query(request_string: str) -> bool:
+    """Return True if a GraphQL request is a read-only query.
+
+    Invalid requests are not considered to be queries (they fail fast).
+
+    Examples:
+        >>> is_graphql_query('query { workflows { id } }')
+        True
+        >>> is_graphql_query('{ workflows { id } }')
+        True
+        >>> is_graphql_query('mutation { pause(workflows: ["*"]) { result } }')
+        False
+        >>> is_graphql_query('not graphql')
+        False
+
+    """
+    try:
+        document = parse(request_string)
+    except GraphQLError:
+        return False
+    operations = [
+        definition for definition in document.definitions
+        if isinstance(definition, OperationDefinitionNode)
+    ]
+    return bool(operations) and all(
+        operation.operation == OperationType.QUERY
+        for operation in operations
+    )
+
+
 class WorkflowRuntimeServer:
     """Workflow runtime service API facade exposed via zmq.
 
@@ -202,7 +242,18 @@ class WorkflowRuntimeServer:
         self.configure_curve()
 
         min_, max_ = glbl_cfg().get(['scheduler', 'run hosts', 'ports'])
-        self.replier = WorkflowReplier(self, context=self.zmq_context)
+        server_cfg = glbl_cfg().get(['scheduler', 'server'])
+        if server_cfg['concurrent requests']:
+            self.replier = WorkflowRouter(
+                self,
+                context=zmq.asyncio.Context.shadow(self.zmq_context),
+                max_queries=server_cfg['max concurrent queries'],
+                max_client_queries=server_cfg[
+                    'max concurrent queries per client'
+                ],
+            )
+        else:
+            self.replier = WorkflowReplier(self, context=self.zmq_context)
         self.replier.start(min_, max_)
         self.publisher = WorkflowPublisher(
             self.schd.workflow, context=self.zmq_context
@@ -260,6 +311,11 @@ class WorkflowRuntimeServer:
 
     def operate(self) -> None:
         """Orchestrate the receive, send, publish of messages."""
+        if isinstance(self.replier, WorkflowRouter):
+            self.loop.run_until_complete(
+                self._operate_concurrent(self.replier)
+            )
+            return
         # Note: this cannot be an async method because the response part
         # of the listener runs the event loop synchronously
         # (in graphql schema.execute_async)
@@ -278,11 +334,56 @@ class WorkflowRuntimeServer:
             # Yield control to other threads
             sleep(self.OPERATE_SLEEP_INTERVAL)
 
+    async def _operate_concurrent(self, router: WorkflowRouter) -> None:
+        """Orchestrate the receive, send, publish of messages.
+
+        For use with the WorkflowRouter, which serves requests in the
+        background.
+        """
+        while not self.waiting_to_stop:
+            # Receive requests, or wait for up to the sleep interval.
+            await router.listener(self.OPERATE_SLEEP_INTERVAL)
+            # Publish all requested/queued.
+            await self.publish_queued_items()
+        await router.cancel()
+        # The self.stop() method is waiting for us to signal that we
+        # have finished here
+        self.waiting_to_stop = False
+
+    def is_query(self, message: object) -> bool:
+        """Return True if a request is a read-only query.
+
+        Queries may be served concurrently, at lower priority than other
+        requests (see WorkflowRouter).
+        """
+        if not isinstance(message, dict):
+            return False
+        command = message.get('command')
+        if command in PB_METHOD_MAP:
+            return True
+        if command == 'graphql':
+            request_string = (message.get('args') or {}).get(
+                'request_string'
+            )
+            return (
+                isinstance(request_string, str)
+                and is_graphql_query(request_string)
+            )
+        return False
+
+    def _run_coroutine(self, coro):
+        """Run a coroutine to completion from a (synchronous) endpoint."""
+        if isinstance(self.replier, WorkflowRouter):
+            # endpoints are called in worker threads
+            return asyncio.run(coro)
+        return self.loop.run_until_complete(coro)
+
     async def publish_queued_items(self) -> None:
         """Publish all queued items."""
         while self.publish_queue.qsize():
             articles = self.publish_queue.get()
-            await self.publisher.publish(*articles)
+            with self.schd.metrics.phase('publish'):
+                await self.publisher.publish(*articles)
 
     def receiver(self, message) -> 'ResponseDict':
         """Process incoming messages and coordinate response.
@@ -294,6 +395,7 @@ class WorkflowRuntimeServer:
             message (dict): message contents
         """
         # TODO: If requested, coordinate publishing response/stream.
+        self.schd.metrics.count('requests')
 
         # determine the server method to call
         try:
@@ -399,7 +501,7 @@ class WorkflowRuntimeServer:
         Returns:
             object: Execution result, or a list with errors.
         """
-        executed = self.loop.run_until_complete(
+        executed = self._run_coroutine(
             schema.execute_async(
                 request_string,
                 variable_values=variables,
@@ -419,6 +521,19 @@ class WorkflowRuntimeServer:
             raise Exception(*(error.message for error in executed.errors))
         return executed.data
 
+    @expose
+    def metrics(self, **_kwargs) -> Dict[str, Any]:
+        """Return the scheduler's main loop metrics.
+
+        Returns the time spent in each phase of the main loop (as
+        histograms), and counts and rates of task messages, commands, job
+        submissions and requests.
+
+        See cylc.flow.metrics.
+
+        """
+        return self.schd.metrics.get_stats()
+
     # UIServer Data Commands
     @expose
     def pb_entire_workflow(self, **_kwargs) -> bytes:
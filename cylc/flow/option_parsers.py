@@ -381,7 +381,17 @@ class CylcOptionParser(OptionParser):
             ),
             action='store', default=None, dest='templatevars_file',
             useif='jset'
-        )
+        ),
+        OptionSettings(
+            ['--no-config-cache'],
+            help=(
+                "Process the workflow configuration from scratch, rather"
+                " than loading it from the cache of processed configurations"
+                " (~/.cylc/config-cache) if it has not changed."
+            ),
+            action='store_false', default=True, dest='config_cache',
+            useif='jset'
+        ),
     ]
 
     def __init__(
@@ -534,3 +534,54 @@ def get_workflow_name_from_id(workflow_id: str) -> str:
         name_path = id_path
 
     return str(name_path.relative_to(cylc_run_dir))
+
+
+def get_filesystem_type(
+    path: Union[Path, str], mounts_file: str = '/proc/mounts'
+) -> Optional[str]:
+    """Return the type of the filesystem a path is on (Linux only).
+
+    Returns None if this cannot be determined.
+
+    Examples:
+        >>> from tempfile import NamedTemporaryFile
+        >>> with NamedTemporaryFile('w') as mounts:
+        ...     _ = mounts.write(
+        ...         'sysfs /sys sysfs rw 0 0\\n'
+        ...         '/dev/sda1 / ext4 rw 0 0\\n'
+        ...         'server:/home /home nfs rw 0 0\\n'
+        ...         'server:/x /home/my\\\\040dir lustre rw 0 0\\n'
+        ...     )
+        ...     mounts.flush()
+        ...     get_filesystem_type('/home/me/cylc-run', mounts.name)
+        ...     get_filesystem_type('/home/my dir/cylc-run', mounts.name)
+        ...     get_filesystem_type('/tmp', mounts.name)
+        'nfs'
+        'lustre'
+        'ext4'
+
+    """
+    path = os.path.realpath(path)
+    fs_type: Optional[str] = None
+    longest = -1
+    try:
+        with open(mounts_file) as mounts:
+            for line in mounts:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                # (spaces etc. are octal-escaped in mount points)
+                mount_point = re.sub(
+                    r'\\([0-7]{3})',
+                    lambda match: chr(int(match.group(1), 8)),
+                    fields[1],
+                )
+                if (
+                    len(mount_point) > longest
+                    and is_relative_to(path, mount_point)
+                ):
+                    fs_type = fields[2]
+                    longest = len(mount_point)
+    except OSError:
+        return None
+    return fs_type
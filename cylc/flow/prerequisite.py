@@ -16,7 +16,9 @@
 
 """Functionality for expressing and evaluating logical triggers."""
 
+from functools import lru_cache
 import re
+from sys import intern
 from typing import (
     TYPE_CHECKING,
     Dict,
@@ -24,6 +26,7 @@ from typing import (
     Iterable,
     Iterator,
     KeysView,
+    List,
     Literal,
     NamedTuple,
     Optional,
@@ -68,7 +71,174 @@ class PrereqTuple(NamedTuple):
         if isinstance(tuple_, PrereqTuple):
             return tuple_
         point, task, output = tuple_
-        return PrereqTuple(point=str(point), task=task, output=output)
+        # (intern the point, it is shared by many prerequisites)
+        return PrereqTuple(point=intern(str(point)), task=task, output=output)
+
+
+# A conditional expression in which each output is replaced by its position
+# in the prerequisite, e.g. (0, '|', '(', 1, '&', 2, ')').
+ExpressionTemplate = Tuple[Union[int, str], ...]
+
+# Splits a conditional expression into outputs and operators.
+OPERATOR_REGEX = re.compile(r'([&|()])')
+
+
+class ConditionalExpression:
+    """A conditional prerequisite expression, compiled for evaluation.
+
+    The expression is compiled into a tree of "&" and "|" nodes, whose
+    leaves are the outputs of the prerequisite (by position). The same
+    compiled expression is shared by every prerequisite with the same
+    template (see compile_expression), e.g. the prerequisites generated from
+    a graph dependency at different cycle points.
+
+    Each prerequisite keeps a count of the satisfied children of each node,
+    which is updated as outputs are (un)satisfied, so the expression is never
+    re-evaluated from scratch.
+
+    Examples:
+        >>> expr = compile_expression((0, '|', '(', 1, '&', 2, ')'))
+        >>> counts = expr.get_counts([False, False, False])
+        >>> expr.is_satisfied(counts)
+        False
+        >>> expr.update(counts, 1, True)
+        >>> expr.is_satisfied(counts)
+        False
+        >>> expr.update(counts, 2, True)
+        >>> expr.is_satisfied(counts)
+        True
+        >>> expr.update(counts, 1, False)
+        >>> expr.is_satisfied(counts)
+        False
+        >>> expr.is_satisfied(expr.get_counts([True, False, False]))
+        True
+
+    """
+
+    __slots__ = ('template', 'is_and', 'sizes', 'parents', 'leaves', 'root')
+
+    def __init__(self, template: ExpressionTemplate):
+        self.template = template
+        # for each node: "&" (True) or "|" (False), its number of children,
+        # and its parent (-1 for the root)
+        self.is_and: List[bool] = []
+        self.sizes: List[int] = []
+        self.parents: List[int] = []
+        # {output position: (parent node, ...)}
+        self.leaves: Dict[int, Tuple[int, ...]] = {}
+        items = [
+            item for item in template
+            if isinstance(item, int) or item.strip()
+        ]
+        root, ind = self._parse_or(items, 0)
+        if ind != len(items):
+            raise ValueError(f'unexpected "{items[ind]}"')
+        if root < 0:
+            # (a single output)
+            root = self._add_node(False, [root])
+        self.root = root
+
+    def _add_node(self, is_and: bool, children: List[int]) -> int:
+        """Add a node to the tree.
+
+        Children are node indices, or -1 - position for outputs.
+        """
+        node = len(self.sizes)
+        self.is_and.append(is_and)
+        self.sizes.append(len(children))
+        self.parents.append(-1)
+        for child in children:
+            if child < 0:
+                self.leaves[-1 - child] = (
+                    *self.leaves.get(-1 - child, ()), node
+                )
+            else:
+                self.parents[child] = node
+        return node
+
+    def _parse_or(self, items: list, ind: int) -> Tuple[int, int]:
+        children = []
+        while True:
+            child, ind = self._parse_and(items, ind)
+            children.append(child)
+            if ind < len(items) and items[ind] == '|':
+                ind += 1
+            else:
+                break
+        if len(children) == 1:
+            return children[0], ind
+        return self._add_node(False, children), ind
+
+    def _parse_and(self, items: list, ind: int) -> Tuple[int, int]:
+        children = []
+        while True:
+            child, ind = self._parse_operand(items, ind)
+            children.append(child)
+            if ind < len(items) and items[ind] == '&':
+                ind += 1
+            else:
+                break
+        if len(children) == 1:
+            return children[0], ind
+        return self._add_node(True, children), ind
+
+    def _parse_operand(self, items: list, ind: int) -> Tuple[int, int]:
+        if ind >= len(items):
+            raise ValueError('unexpected end of expression')
+        item = items[ind]
+        if isinstance(item, int):
+            return -1 - item, ind + 1
+        if item == '(':
+            child, ind = self._parse_or(items, ind + 1)
+            if ind >= len(items) or items[ind] != ')':
+                raise ValueError('unmatched "("')
+            return child, ind + 1
+        raise ValueError(f'unexpected "{item}"')
+
+    def _is_node_satisfied(self, node: int, counts: List[int]) -> bool:
+        if self.is_and[node]:
+            return counts[node] == self.sizes[node]
+        return counts[node] > 0
+
+    def get_counts(self, satisfied: Iterable[bool]) -> List[int]:
+        """Return the node counts for the given output states."""
+        counts = [0] * len(self.sizes)
+        for position, is_satisfied in enumerate(satisfied):
+            if is_satisfied:
+                self.update(counts, position, True)
+        return counts
+
+    def update(
+        self, counts: List[int], position: int, satisfied: bool
+    ) -> None:
+        """Update the node counts for a change in the state of an output."""
+        step = 1 if satisfied else -1
+        for node in self.leaves.get(position, ()):
+            while True:
+                before = self._is_node_satisfied(node, counts)
+                counts[node] += step
+                if (
+                    node == self.root
+                    or before == self._is_node_satisfied(node, counts)
+                ):
+                    break
+                # (the node has changed state, so its parent must update)
+                node = self.parents[node]
+
+    def is_satisfied(self, counts: List[int]) -> bool:
+        """Return True if the expression is satisfied."""
+        return self._is_node_satisfied(self.root, counts)
+
+
+@lru_cache(maxsize=None)
+def compile_expression(template: ExpressionTemplate) -> ConditionalExpression:
+    """Return the compiled expression for a template (shared).
+
+    Raises:
+        ValueError: If the expression is not valid.
+
+    """
+    return ConditionalExpression(template)
 
 
 SatisfiedState = Literal[
@@ -96,13 +266,13 @@ class Prerequisite:
     # Memory optimization - constrain possible attributes to this list.
     __slots__ = (
         "_satisfied",
-        "_cached_satisfied",
-        "conditional_expression",
+        "_unsatisfied",
+        "_expression",
+        "_counts",
+        "_positions",
         "point",
     )
 
-    # Extracts T from "foo.T succeeded" etc.
-    SATISFIED_TEMPLATE = 'bool(self._satisfied[("%s", "%s", "%s")])'
     MESSAGE_TEMPLATE = r'%s/%s %s'
 
     def __init__(self, point: 'PointBase'):
@@ -115,15 +285,23 @@ class Prerequisite:
         # {('point string', 'task name', 'output'): DEP_STATE_X, ...}
         self._satisfied: Dict[PrereqTuple, SatisfiedState] = {}
 
-        # Expression present only when the OR operator is used.
+        # The number of outputs which are not satisfied.
+        self._unsatisfied = 0
+
+        # Compiled expression, present only when the OR operator is used.
         # '1/foo failed | 1/bar succeeded'
-        self.conditional_expression: Optional[str] = None
+        self._expression: Optional[ConditionalExpression] = None
+
+        # The satisfied children of each node of the compiled expression.
+        self._counts: Optional[List[int]] = None
 
-        # The cached state of this prerequisite:
-        # * `None` (no cached state)
-        # * `True` (prerequisite satisfied)
-        # * `False` (prerequisite unsatisfied).
-        self._cached_satisfied: Optional[bool] = None
+        # The position of each output in the compiled expression.
+        self._positions: Optional[Dict[PrereqTuple, int]] = None
+
+    @property
+    def conditional_expression(self) -> Optional[str]:
+        """The conditional expression, if the OR operator is used."""
+        return self.get_raw_conditional_expression()
 
     def instantaneous_hash(self) -> int:
         """Generate a hash of this prerequisite in its current state.
@@ -135,7 +313,7 @@ class Prerequisite:
         """
         return hash((
             self.point,
-            self.conditional_expression,
+            self._expression.template if self._expression else None,
             tuple(self._satisfied.keys()),
         ))
 
@@ -163,10 +341,26 @@ class Prerequisite:
         key = PrereqTuple.coerce(key)
         if value is True:
             value = 'satisfied naturally'
+        try:
+            was_satisfied = bool(self._satisfied[key])
+        except KeyError:
+            # new output (not in any conditional expression yet)
+            self._satisfied[key] = value
+            if not value:
+                self._unsatisfied += 1
+            return
         self._satisfied[key] = value
-        if not (self._cached_satisfied and value):
-            # Force later recalculation of cached satisfaction state:
-            self._cached_satisfied = None
+        if was_satisfied != bool(value):
+            self._unsatisfied += -1 if value else 1
+            if (
+                self._expression is not None
+                and self._counts is not None
+                and self._positions is not None
+                and key in self._positions
+            ):
+                self._expression.update(
+                    self._counts, self._positions[key], bool(value)
+                )
 
     def __iter__(self) -> Iterator[PrereqTuple]:
         return iter(self._satisfied)
@@ -177,23 +371,29 @@ class Prerequisite:
     def keys(self) -> KeysView[PrereqTuple]:
         return self._satisfied.keys()
 
-    def get_raw_conditional_expression(self):
+    def get_raw_conditional_expression(self) -> Optional[str]:
         """Return a representation of this prereq as a string.
 
         Returns None if this prerequisite does not involve an OR operator.
 
         """
-        expr = self.conditional_expression
-        if not expr:
+        if self._expression is None:
             return None
-        for task_output in self._satisfied:
-            expr = expr.replace(self.SATISFIED_TEMPLATE % task_output,
-                                self.MESSAGE_TEMPLATE % task_output)
-        return expr
+        outputs = tuple(self._satisfied)
+        return ''.join(
+            self.MESSAGE_TEMPLATE % outputs[item]
+            if isinstance(item, int) else item
+            for item in self._expression.template
+        )
 
-    def set_conditional_expr(self, expr):
+    def set_conditional_expr(self, expr: str) -> None:
         """Set the conditional expression for this prerequisite.
-        Resets the cached state (self._cached_satisfied).
+
+        The expression is compiled once per template, i.e. it is shared by
+        prerequisites with the same expression at other cycle points.
+
+        Raises:
+            TriggerExpressionError: If the expression is not valid.
 
         Examples:
             # GH #3644 construct conditional expression when one task name
@@ -202,10 +402,11 @@ class Prerequisite:
             >>> preq[(1, 'foo', 'succeeded')] = False
             >>> preq[(11, 'foo', 'succeeded')] = False
             >>> preq.set_conditional_expr("11/foo succeeded|1/foo succeeded")
-            >>> expr = preq.conditional_expression
-            >>> expr.split('|')  # doctest: +NORMALIZE_WHITESPACE
-            ['bool(self._satisfied[("11", "foo", "succeeded")])',
-            'bool(self._satisfied[("1", "foo", "succeeded")])']
+            >>> preq._expression.template
+            (1, '|', 0)
+            >>> preq[(1, 'foo', 'succeeded')] = True
+            >>> preq.is_satisfied()
+            True
 
             # GH #6588 integer offset "x[-P2] | a" gives a negative cycle point
             # during validation, for evaluation at the initial cycle point 1.
@@ -213,64 +414,54 @@ class Prerequisite:
             >>> preq[(-1, 'x', 'succeeded')] = False
             >>> preq[(1, 'a', 'succeeded')] = False
             >>> preq.set_conditional_expr("-1/x succeeded|1/a succeeded")
-            >>> expr = preq.conditional_expression
-            >>> expr.split('|')  # doctest: +NORMALIZE_WHITESPACE
-            ['bool(self._satisfied[("-1", "x", "succeeded")])',
-            'bool(self._satisfied[("1", "a", "succeeded")])']
+            >>> preq._expression.template
+            (0, '|', 1)
+            >>> preq.conditional_expression
+            '-1/x succeeded|1/a succeeded'
         """
-        self._cached_satisfied = None
-        if '|' in expr:
-            # Make a Python expression so we can eval() the logic.
-            for t_output in self._satisfied:
-                # Use '\b' in case one task name is a substring of another
-                # and escape special chars ('.', timezone '+') in task IDs.
-                msg = self.MESSAGE_TEMPLATE % t_output
-                if msg[0] == '-':
-                    # -ve cycles: \b needs to be to the right of the `-` char.
-                    pattern = fr"-\b{re.escape(msg[1:])}\b"
-                else:
-                    pattern = fr"\b{re.escape(msg)}\b"
-                expr = re.sub(
-                    pattern,
-                    self.SATISFIED_TEMPLATE % t_output,
-                    expr
-                )
-
-            self.conditional_expression = expr
-
-    def is_satisfied(self):
-        """Return True if prerequisite is satisfied.
-
-        Return cached state if present, else evaluate the prerequisite.
-
-        """
-        if self._cached_satisfied is not None:
-            # Cached value.
-            return self._cached_satisfied
-        if self._satisfied == {}:
-            # No prerequisites left after pre-initial simplification.
-            return True
-        self._cached_satisfied = self._eval_satisfied()
-        return self._cached_satisfied
-
-    def _eval_satisfied(self) -> bool:
-        """Evaluate the prerequisite's condition expression.
-
-        Does not cache the result.
-
-        """
-        if not self.conditional_expression:
-            return all(self._satisfied.values())
-
+        if '|' not in expr:
+            return
+        positions = {
+            self.MESSAGE_TEMPLATE % t_output: position
+            for position, t_output in enumerate(self._satisfied)
+        }
+        template: List[Union[int, str]] = []
         try:
-            res = eval(self.conditional_expression)  # nosec
-            # * the expression is constructed internally
-            # * https://github.com/cylc/cylc-flow/issues/4403
-        except (SyntaxError, ValueError) as exc:
+            for item in OPERATOR_REGEX.split(expr):
+                output = item.strip()
+                if not output or OPERATOR_REGEX.fullmatch(output):
+                    if item:
+                        template.append(item)
+                    continue
+                # (preserve any whitespace around the output)
+                lead, _, trail = item.partition(output)
+                if lead:
+                    template.append(lead)
+                template.append(positions[output])
+                if trail:
+                    template.append(trail)
+            expression = compile_expression(tuple(template))
+        except KeyError as exc:
             raise TriggerExpressionError(
-                f'"{self.get_raw_conditional_expression}":\n{str(exc)}'
+                f'"{expr}":\nunknown output {exc}'
             ) from None
-        return res
+        except ValueError as exc:
+            raise TriggerExpressionError(f'"{expr}":\n{exc}') from None
+        self._expression = expression
+        self._counts = expression.get_counts(
+            bool(value) for value in self._satisfied.values()
+        )
+        self._positions = {
+            output: position
+            for position, output in enumerate(self._satisfied)
+        }
+
+    def is_satisfied(self) -> bool:
+        """Return True if prerequisite is satisfied."""
+        if self._expression is None or self._counts is None:
+            # (no outputs left after pre-initial simplification, is satisfied)
+            return not self._unsatisfied
+        return self._expression.is_satisfied(self._counts)
 
     def satisfy_me(
         self,
@@ -303,10 +494,9 @@ class Prerequisite:
         """Return list of populated Protobuf data objects."""
         if not self._satisfied:
             return None
-        if self.conditional_expression:
-            expr = (
-                self.get_raw_conditional_expression()
-            ).replace('|', ' | ').replace('&', ' & ')
+        raw_expr = self.get_raw_conditional_expression()
+        if raw_expr:
+            expr = raw_expr.replace('|', ' | ').replace('&', ' & ')
         else:
             expr = ' & '.join(
                 self.MESSAGE_TEMPLATE % task_output
@@ -342,13 +532,14 @@ class Prerequisite:
         Sets all of the outputs in this prerequisite to satisfied if not
         already.
         """
-        for task_output in self._satisfied:
-            if not self._satisfied[task_output]:
+        for task_output, satisfied in self._satisfied.items():
+            if not satisfied:
                 self._satisfied[task_output] = 'force satisfied'
-        if self.conditional_expression:
-            self._cached_satisfied = self._eval_satisfied()
-        else:
-            self._cached_satisfied = True
+        self._unsatisfied = 0
+        if self._expression is not None:
+            self._counts = self._expression.get_counts(
+                [True] * len(self._satisfied)
+            )
 
     def iter_target_point_strings(self):
         yield from {
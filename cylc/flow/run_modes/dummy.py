@@ -31,6 +31,7 @@ from cylc.flow.run_modes import RunMode
 from cylc.flow.run_modes.simulation import (
     ModeSettings,
     disable_platforms,
+    get_mode_rtconfig,
     get_simulated_run_len,
     parse_fail_cycle_points,
 )
@@ -63,6 +64,7 @@ def submit_task_job(
         False indicating that TaskJobManager needs to continue running the
         live mode path.
     """
+    rtconfig = get_mode_rtconfig(itask, rtconfig)
     configure_dummy_mode(
         rtconfig, itask.tdef.rtconfig['simulation']['fail cycle points'])
 
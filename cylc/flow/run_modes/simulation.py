@@ -35,6 +35,7 @@ from cylc.flow import LOG
 from cylc.flow.cycling import PointBase
 from cylc.flow.cycling.loader import get_point
 from cylc.flow.exceptions import PointParsingError
+from cylc.flow.parsec.util import pdeepcopy
 from cylc.flow.platforms import FORBIDDEN_WITH_PLATFORM
 from cylc.flow.run_modes import RunMode
 from cylc.flow.task_outputs import (
@@ -57,6 +58,20 @@ if TYPE_CHECKING:
     from cylc.flow.workflow_db_mgr import WorkflowDatabaseManager
 
 
+def get_mode_rtconfig(
+    itask: 'TaskProxy', rtconfig: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Return a task's runtime config for simulation or dummy mode changes.
+
+    A config with broadcasts applied is shared with the broadcast cache
+    (see BroadcastMgr.apply_broadcasts), so it is copied before it is
+    modified. (The task definition's own config is modified in place.)
+    """
+    if rtconfig is itask.tdef.rtconfig:
+        return rtconfig
+    return pdeepcopy(rtconfig)
+
+
 def submit_task_job(
     task_job_mgr: 'TaskJobManager',
     itask: 'TaskProxy',
@@ -68,6 +83,7 @@ def submit_task_job(
     Returns:
         True - indicating that TaskJobManager need take no further action.
     """
+    rtconfig = get_mode_rtconfig(itask, rtconfig)
     configure_sim_mode(
         rtconfig,
         itask.tdef.rtconfig['simulation']['fail cycle points'])
@@ -157,20 +173,21 @@ class ModeSettings:
         try_num = None
         if started_time is None:
             # This is a restart - Get DB info
-            db_info = db_mgr.pri_dao.select_task_job(
+            db_info = db_mgr.get_open_pri_dao().select_task_job(
                 itask.tokens['cycle'],
                 itask.tokens['task'],
                 itask.submit_num,
             )
 
-            if db_info['time_submit']:
+            if db_info and db_info['time_submit']:
                 started_time = get_unix_time_from_time_string(
                     db_info["time_submit"])
                 itask.summary['started_time'] = started_time
             else:
                 started_time = time()
 
-            try_num = db_info["try_num"]
+            if db_info:
+                try_num = db_info["try_num"]
 
         # Parse fail cycle points:
         if not rtconfig:
@@ -351,9 +368,11 @@ def sim_time_check(
 
         # This occurs if the workflow has been restarted.
         if itask.mode_settings is None:
-            rtconfig = task_events_manager.broadcast_mgr.get_updated_rtconfig(
-                itask)
-            rtconfig = configure_sim_mode(
+            rtconfig = get_mode_rtconfig(
+                itask,
+                task_events_manager.broadcast_mgr.get_updated_rtconfig(itask),
+            )
+            configure_sim_mode(
                 rtconfig,
                 itask.tdef.rtconfig['simulation']['fail cycle points'])
             itask.mode_settings = ModeSettings(
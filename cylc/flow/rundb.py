@@ -17,7 +17,11 @@
 
 from collections import defaultdict
 from contextlib import suppress
-from dataclasses import dataclass
+from dataclasses import (
+    dataclass,
+    replace,
+)
+import os
 from os.path import expandvars
 from pprint import pformat
 import sqlite3
@@ -57,6 +61,113 @@ DbUpdateTuple = Union[
     Tuple[DbArgDict, DbArgDict],
     Tuple[str, list]
 ]
+# SQL statements, each with a list of argument lists for "executemany".
+SqlQueue = List[Tuple[str, list]]
+
+
+@dataclass(frozen=True)
+class DatabaseProfile:
+    """SQLite performance settings for a workflow database.
+
+    The defaults correspond to SQLite's own defaults, with a new connection
+    opened for each transaction.
+
+    See global.cylc[scheduler][database][<filesystem type>].
+    """
+
+    journal_mode: str = 'DELETE'
+    synchronous: str = 'FULL'
+    persistent_connection: bool = False
+    cached_statements: int = 128
+    cache_size: int = 2000  # KiB
+
+    @classmethod
+    def from_config(
+        cls, db_cfg: Dict[str, Any], fs_type: Optional[str]
+    ) -> 'DatabaseProfile':
+        """Return the profile configured for a filesystem type.
+
+        Sections may list several filesystem types, e.g. "ext4, xfs". If
+        more than one section lists the filesystem type, the last one is
+        used.
+
+        Args:
+            db_cfg: The global.cylc[scheduler][database] section.
+            fs_type: The filesystem type of the workflow run directory.
+
+        Examples:
+            >>> cfg = {
+            ...     'nfs': {'journal mode': 'TRUNCATE'},
+            ...     'ext4, xfs': {'journal mode': 'WAL'},
+            ... }
+            >>> DatabaseProfile.from_config(cfg, 'nfs').journal_mode
+            'TRUNCATE'
+            >>> DatabaseProfile.from_config(cfg, 'xfs').journal_mode
+            'WAL'
+            >>> DatabaseProfile.from_config(cfg, 'zfs') == DatabaseProfile()
+            True
+
+        """
+        cfg = None
+        for names, section in db_cfg.items():
+            if (
+                isinstance(section, dict)
+                and fs_type in [name.strip() for name in names.split(',')]
+            ):
+                cfg = section
+        if cfg is None:
+            return cls()
+        return cls(**{
+            key.replace(' ', '_'): value
+            for key, value in cfg.items()
+            if value is not None
+        })
+
+    def for_public(self) -> 'DatabaseProfile':
+        """Return the profile for the public database.
+
+        The public database is read by other users (e.g. by workflow_state
+        xtriggers) who may not have write access to the run directory.
+        Readers of a database in WAL mode need write access to its "-shm"
+        and "-wal" files, so the public database uses a rollback journal.
+
+        Examples:
+            >>> DatabaseProfile(journal_mode='WAL').for_public().journal_mode
+            'DELETE'
+            >>> profile = DatabaseProfile(journal_mode='TRUNCATE')
+            >>> profile.for_public() is profile
+            True
+
+        """
+        if self.journal_mode == 'WAL':
+            return replace(self, journal_mode=DatabaseProfile.journal_mode)
+        return self
+
+    def get_pragmas(self) -> List[str]:
+        """Return the PRAGMA statements to run on each new connection.
+
+        (Only non-default settings are applied.)
+
+        Examples:
+            >>> DatabaseProfile().get_pragmas()
+            []
+            >>> DatabaseProfile(
+            ...     journal_mode='WAL', synchronous='NORMAL', cache_size=8000
+            ... ).get_pragmas()
+            ['PRAGMA journal_mode=WAL', 'PRAGMA synchronous=NORMAL',
+             'PRAGMA cache_size=-8000']
+
+        """
+        default = type(self)()
+        pragmas = []
+        if self.journal_mode != default.journal_mode:
+            pragmas.append(f'PRAGMA journal_mode={self.journal_mode}')
+        if self.synchronous != default.synchronous:
+            pragmas.append(f'PRAGMA synchronous={self.synchronous}')
+        if self.cache_size != default.cache_size:
+            # (negative values are in KiB rather than pages)
+            pragmas.append(f'PRAGMA cache_size=-{self.cache_size}')
+        return pragmas
 
 
 @dataclass
@@ -371,7 +482,8 @@ class CylcWorkflowDAO:
         self,
         db_file_name: Union['Path', str],
         is_public: bool = False,
-        create_tables: bool = False
+        create_tables: bool = False,
+        profile: Optional[DatabaseProfile] = None,
     ):
         """Initialise database access object.
 
@@ -383,12 +495,18 @@ class CylcWorkflowDAO:
             is_public: If True, allow retries.
             create_tables: If True, create the tables if they
                 don't already exist.
+            profile: SQLite performance settings.
 
         """
         self.db_file_name = expandvars(db_file_name)
         self.is_public = is_public
+        self.profile = profile or DatabaseProfile()
         self.conn: Optional[sqlite3.Connection] = None
+        # (device, inode) of the database file when connected
+        self.conn_file_id: Optional[Tuple[int, int]] = None
         self.n_tries = 0
+        # Statements from failed write attempts (public database only).
+        self.failed_sql_queue: SqlQueue = []
 
         self.tables = {
             name: CylcWorkflowDAOTable(name, attrs)
@@ -453,10 +571,59 @@ class CylcWorkflowDAO:
         """Connect to the database."""
         if self.conn is None:
             self.conn = sqlite3.connect(
-                self.db_file_name, timeout=self.CONN_TIMEOUT
+                self.db_file_name,
+                timeout=self.CONN_TIMEOUT,
+                cached_statements=self.profile.cached_statements,
+                # a persistent connection may be handed between threads
+                # (e.g. to the public database writer), access is serialised
+                check_same_thread=not self.profile.persistent_connection,
             )
+            for pragma in self.profile.get_pragmas():
+                self.conn.execute(pragma)
+            with suppress(OSError):
+                stat = os.stat(self.db_file_name)
+                self.conn_file_id = (stat.st_dev, stat.st_ino)
         return self.conn
 
+    def check_connection(self) -> None:
+        """Close a persistent connection if the database file has changed.
+
+        E.g. if the file has been removed or replaced, the next connection
+        will be made afresh (and will fail if the run directory has been
+        removed, as with a non-persistent connection).
+        """
+        if self.conn is None:
+            return
+        try:
+            stat = os.stat(self.db_file_name)
+        except OSError:
+            self.close()
+            return
+        if (stat.st_dev, stat.st_ino) != self.conn_file_id:
+            self.close()
+
+    def set_journal_mode(self) -> None:
+        """Set the journal mode of the database file.
+
+        The WAL journal mode is persistent, so this is needed to switch a
+        database back from WAL mode, as well as to switch to it.
+        """
+        self.connect().execute(
+            f'PRAGMA journal_mode={self.profile.journal_mode}'
+        )
+        if not self.profile.persistent_connection:
+            self.close()
+
+    def checkpoint(self) -> None:
+        """Transfer the content of the write-ahead log into the database.
+
+        Required before copying the database file in WAL mode.
+        """
+        if self.profile.journal_mode == 'WAL':
+            self.connect().execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            if not self.profile.persistent_connection:
+                self.close()
+
     def create_tables(self):
         """Create tables."""
         names = []
@@ -473,8 +640,12 @@ class CylcWorkflowDAO:
 
     def execute_queued_items(self):
         """Execute queued items for each table."""
-        # determine the sql statements to execute
-        sql_queue = []  # (sql_statement, values)
+        self.execute_sql(self.take_queued_items())
+
+    def take_queued_items(self) -> SqlQueue:
+        """Return the SQL statements for queued items and clear the queues.
+        """
+        sql_queue: SqlQueue = []  # (sql_statement, values)
         for table in self.tables.values():
             # DELETE statements may have varying number of WHERE args so we
             # can only executemany for each identical template statement.
@@ -495,14 +666,32 @@ class CylcWorkflowDAO:
             for stmt, stmt_args_list in table.update_queues.items():
                 sql_queue.append((stmt, stmt_args_list))
 
+            # (Replace rather than clear: sql_queue references these.)
+            table.delete_queues = {}
+            table.insert_queue = []
+            table.update_queues = defaultdict(list)
+        return sql_queue
+
+    def execute_sql(self, sql_queue: SqlQueue) -> bool:
+        """Execute SQL statements in a single transaction.
+
+        For the public database, statements from previous failed attempts
+        are retried first (to preserve the order of writes).
+
+        Return True on success, False if the public database could not be
+        written to. Raise on failure to write to the private database.
+        """
+        sql_queue = self.failed_sql_queue + sql_queue
+        if not sql_queue:
+            return True
+        if self.profile.persistent_connection:
+            self.check_connection()
+
         # execute the statements and commit the transaction
         try:
             for stmt, stmt_args in sql_queue:
                 self._execute_stmt(stmt, stmt_args)
-            # Connection should only be opened if we have executed something.
-            if self.conn is None:
-                return
-            self.conn.commit()
+            self.connect().commit()
 
         # something went wrong
         # (includes DB file not found, transaction processing issue, db locked)
@@ -552,26 +741,27 @@ class CylcWorkflowDAO:
             if self.conn is not None:
                 with suppress(sqlite3.Error):
                     self.conn.rollback()
-            return
+            # Keep the statements to retry next time
+            self.failed_sql_queue = sql_queue
+            return False
 
         else:
-            # Clear the queues
-            for table in self.tables.values():
-                table.delete_queues.clear()
-                table.insert_queue.clear()
-                table.update_queues.clear()
+            self.failed_sql_queue = []
             # Report public database retry recovery if necessary
             if self.n_tries:
                 LOG.info(
                     "%(file)s: recovered after (%(attempt)d) attempt(s)\n" % {
                         "file": self.db_file_name, "attempt": self.n_tries})
             self.n_tries = 0
+            return True
 
         finally:
             # Note: This is not strictly necessary. But if the workflow run
             # directory is removed, a forced reconnection to the private
-            # database will ensure that the workflow dies.
-            self.close()
+            # database will ensure that the workflow dies. (Persistent
+            # connections are checked instead, see check_connection.)
+            if not self.profile.persistent_connection:
+                self.close()
 
     def _execute_stmt(self, stmt, stmt_args_list):
         """Helper for "self.execute_queued_items".
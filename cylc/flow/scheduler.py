@@ -107,6 +107,7 @@ from cylc.flow.loggingutil import (
     get_sorted_logs_by_time,
     patch_log_level,
 )
+from cylc.flow.metrics import MainLoopMetrics
 from cylc.flow.network import API
 from cylc.flow.network.authentication import key_housekeeping
 from cylc.flow.network.server import WorkflowRuntimeServer
@@ -114,6 +115,7 @@ from cylc.flow.parsec.exceptions import ParsecError
 from cylc.flow.parsec.OrderedDict import DictTree
 from cylc.flow.parsec.validate import DurationFloat
 from cylc.flow.pathutil import (
+    get_filesystem_type,
     get_workflow_name_from_id,
     get_workflow_run_config_log_dir,
     get_workflow_run_dir,
@@ -131,6 +133,7 @@ from cylc.flow.platforms import (
 )
 from cylc.flow.profiler import Profiler
 from cylc.flow.resources import get_resources
+from cylc.flow.rundb import DatabaseProfile
 from cylc.flow.run_modes import RunMode
 from cylc.flow.run_modes.simulation import sim_time_check
 from cylc.flow.subprocpool import SubProcPool
@@ -152,7 +155,6 @@ from cylc.flow.task_state import (
     TASK_STATUS_SUBMITTED,
     TASK_STATUS_WAITING,
     TASK_STATUSES_ACTIVE,
-    TASK_STATUSES_NEVER_ACTIVE,
 )
 from cylc.flow.taskdef import TaskDef
 from cylc.flow.templatevars import (
@@ -285,6 +287,11 @@ class Scheduler:
     # main loop
     main_loop_intervals: deque = deque(maxlen=10)
     main_loop_plugins: Optional[dict] = None
+    main_loop_event_driven: bool = False
+    main_loop_full_sweep_interval: float = 60.0
+    _main_loop_wakeup: Optional[asyncio.Event] = None
+    _main_loop_event_loop: Optional[asyncio.AbstractEventLoop] = None
+    _time_next_full_sweep: float = 0
     auto_restart_mode: Optional[AutoRestartMode] = None
     auto_restart_time: Optional[float] = None
 
@@ -313,6 +320,7 @@ class Scheduler:
         # mutable defaults
         self._profile_amounts = {}
         self._profile_update_times = {}
+        self.metrics = MainLoopMetrics()
         self.bad_hosts: Set[str] = set()
 
         self.restored_stop_task_id: Optional[str] = None
@@ -326,18 +334,23 @@ class Scheduler:
             self.workflow
         )
 
+        db_cfg = glbl_cfg().get(['scheduler', 'database'])
         self.workflow_db_mgr = WorkflowDatabaseManager(
             pri_d=workflow_files.get_workflow_srv_dir(self.workflow),
-            pub_d=os.path.join(self.workflow_run_dir, 'log')
+            pub_d=os.path.join(self.workflow_run_dir, 'log'),
+            background_pub_writer=db_cfg['background public database writer'],
+            pub_writer_max_batches=db_cfg['public database max queue length'],
+            pub_writer_max_lag=db_cfg['public database max lag'],
+            db_profile=DatabaseProfile.from_config(
+                db_cfg, get_filesystem_type(self.workflow_run_dir)
+            ),
         )
-        self.is_restart = Path(self.workflow_db_mgr.pri_path).is_file()
-        if (
-            not self.is_restart
-            and Path(self.workflow_db_mgr.pub_path).is_file()
-        ):
+        self.is_restart = Path(self.workflow_db_mgr.get_pri_path()).is_file()
+        pub_path = self.workflow_db_mgr.get_pub_path()
+        if not self.is_restart and Path(pub_path).is_file():
             # Delete pub DB if pri DB doesn't exist, as we don't want to
             # load anything (e.g. template variables) from it
-            os.unlink(self.workflow_db_mgr.pub_path)
+            os.unlink(pub_path)
 
         # Map used to track incomplete remote inits for restart
         # {install_target: platform}
@@ -581,6 +594,15 @@ class Scheduler:
             self.options.main_loop
         )
 
+        # Event-driven main loop
+        self.main_loop_event_driven = (
+            self.cylc_config['main loop']['event driven'])
+        self.main_loop_full_sweep_interval = (
+            self.cylc_config['main loop']['full sweep interval'])
+        if self.main_loop_event_driven:
+            self._main_loop_wakeup = asyncio.Event()
+            self._main_loop_event_loop = asyncio.get_running_loop()
+
         holdcp = None
         if self.options.holdcp:
             holdcp = self.options.holdcp
@@ -865,20 +887,21 @@ class Scheduler:
 
     def _load_pool_from_db(self):
         """Load task pool from DB, for a restart."""
-        self.workflow_db_mgr.pri_dao.select_broadcast_states(
+        pri_dao = self.workflow_db_mgr.get_open_pri_dao()
+        pri_dao.select_broadcast_states(
             self.broadcast_mgr.load_db_broadcast_states)
         self.broadcast_mgr.post_load_db_coerce()
-        self.workflow_db_mgr.pri_dao.select_task_job_run_times(
+        pri_dao.select_task_job_run_times(
             self._load_task_run_times)
-        self.workflow_db_mgr.pri_dao.select_task_pool_for_restart(
+        pri_dao.select_task_pool_for_restart(
             self.pool.load_db_task_pool_for_restart)
-        self.workflow_db_mgr.pri_dao.select_jobs_for_restart(
+        pri_dao.select_jobs_for_restart(
             self.data_store_mgr.insert_db_job)
-        self.workflow_db_mgr.pri_dao.select_task_action_timers(
+        pri_dao.select_task_action_timers(
             self.pool.load_db_task_action_timers)
-        self.workflow_db_mgr.pri_dao.select_xtriggers_for_restart(
+        pri_dao.select_xtriggers_for_restart(
             self.xtrigger_mgr.load_xtrigger_for_restart)
-        self.workflow_db_mgr.pri_dao.select_abs_outputs_for_restart(
+        pri_dao.select_abs_outputs_for_restart(
             self.pool.load_abs_outputs_for_restart)
 
         # Compute and release runahead tasks once after loading all tasks from
@@ -976,6 +999,7 @@ class Scheduler:
             # task ID (job stripped)
             task_id = task_msg.job_id.duplicate(job=None).relative_id
             messages.setdefault(task_id, []).append(task_msg)
+            self.metrics.count('messages')
 
         unprocessed_messages: List[TaskMsg] = []
         # Poll tasks for which messages caused a backward state change.
@@ -1027,6 +1051,7 @@ class Scheduler:
                 uuid, name, cmd = self.command_queue.get(False)
             except Empty:
                 break
+            self.metrics.count('commands')
             msg = f'Command "{name}" ' + '{result}' + f'. ID={uuid}'
             try:
                 n_warnings: Optional[int] = None
@@ -1055,6 +1080,38 @@ class Scheduler:
 
             self.command_queue.task_done()
 
+    def wake_main_loop(self) -> None:
+        """Wake the main loop early if it is waiting.
+
+        Only has an effect in event-driven mode. This is thread safe, so can
+        be called by the server thread on receipt of messages and commands.
+
+        """
+        loop = self._main_loop_event_loop
+        if loop is None or self._main_loop_wakeup is None:
+            return
+        with suppress(RuntimeError):
+            # (the event loop may already be closed during shutdown)
+            loop.call_soon_threadsafe(self._main_loop_wakeup.set)
+
+    async def _main_loop_sleep(self, duration: float) -> None:
+        """Sleep between main loop iterations.
+
+        In event-driven mode, return early if woken by wake_main_loop.
+
+        """
+        if self._main_loop_wakeup is None:
+            await asyncio.sleep(duration)
+            return
+        if duration > 0:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    self._main_loop_wakeup.wait(), duration
+                )
+        else:
+            await asyncio.sleep(0)
+        self._main_loop_wakeup.clear()
+
     def _set_stop(self, stop_mode: Optional[StopMode] = None) -> None:
         """Set shutdown mode."""
         self.proc_pool.set_stopping()
@@ -1422,7 +1479,11 @@ class Scheduler:
     ) -> 'List[TaskProxy]':
         """Submit task jobs, return tasks that attempted submission."""
         # Note: keep this as simple wrapper for task job mgr's method
-        return self.task_job_mgr.submit_task_jobs(itasks, self.get_run_mode())
+        submitted = self.task_job_mgr.submit_task_jobs(
+            itasks, self.get_run_mode()
+        )
+        self.metrics.count('submissions', len(submitted))
+        return submitted
 
     def process_workflow_db_queue(self):
         """Update workflow DB."""
@@ -1435,22 +1496,30 @@ class Scheduler:
 
     def late_tasks_check(self):
         """Report tasks that are never active and are late."""
-        now = time()
-        for itask in self.pool.get_tasks():
-            if (
-                    not itask.is_late
-                    and itask.get_late_time()
-                    and itask.state(*TASK_STATUSES_NEVER_ACTIVE)
-                    and now > itask.get_late_time()
-            ):
-                msg = '%s (late-time=%s)' % (
-                    self.task_events_mgr.EVENT_LATE,
-                    time2str(itask.get_late_time()))
-                itask.is_late = True
-                LOG.warning(f"[{itask}] {msg}")
-                self.task_events_mgr.setup_event_handlers(
-                    itask, self.task_events_mgr.EVENT_LATE, msg)
-                self.workflow_db_mgr.put_insert_task_late_flags(itask)
+        for itask in self.pool.get_late_tasks(time()):
+            msg = '%s (late-time=%s)' % (
+                self.task_events_mgr.EVENT_LATE,
+                time2str(itask.get_late_time()))
+            itask.is_late = True
+            LOG.warning(f"[{itask}] {msg}")
+            self.task_events_mgr.setup_event_handlers(
+                itask, self.task_events_mgr.EVENT_LATE, msg)
+            self.workflow_db_mgr.put_insert_task_late_flags(itask)
+
+    def get_next_timer_due(self) -> Optional[float]:
+        """Return the time the next task timer is due (if any).
+
+        This covers task event handler timers, job poll timers and
+        timeouts, and late-task checks.
+        """
+        dues = [
+            self.task_events_mgr.get_next_event_timer_due(),
+            self.pool.late_timer_queue.next_due(),
+        ]
+        if self.get_run_mode() != RunMode.SIMULATION:
+            # (job timers are not checked in simulation mode)
+            dues.append(self.task_events_mgr.job_timer_queue.next_due())
+        return min((due for due in dues if due is not None), default=None)
 
     def reset_inactivity_timer(self):
         """Reset inactivity timer - method passed to task event manager."""
@@ -1623,24 +1692,40 @@ class Scheduler:
     async def _main_loop(self) -> None:
         """A single iteration of the main loop."""
         tinit = time()
+        metrics = self.metrics
+        metrics.start_iteration()
 
         # Useful for debugging core scheduler issues:
         # import logging
         # self.pool.log_task_pool(logging.CRITICAL)
         if self.incomplete_ri_map:
             self.manage_remote_init()
+            metrics.lap('remote_init')
 
         await self.process_command_queue()
+        metrics.lap('commands')
         self.proc_pool.process()
+        metrics.lap('proc_pool')
 
         # Unqueued tasks with satisfied prerequisites must be waiting on
         # xtriggers or ext_triggers. Check these and queue tasks if ready.
-        for itask in self.pool.get_tasks():
+        # (In event-driven mode only check tasks that have changed or are
+        # waiting on triggers, with a periodic full sweep as a safety net.)
+        full_sweep = (
+            not self.main_loop_event_driven
+            or tinit >= self._time_next_full_sweep
+        )
+        if full_sweep:
+            self._time_next_full_sweep = (
+                tinit + self.main_loop_full_sweep_interval)
+        for itask in self.pool.get_tasks_to_examine(full_sweep):
             if (
                 not itask.state(TASK_STATUS_WAITING)
                 or itask.state.is_queued
                 or itask.state.is_runahead
             ):
+                if self.main_loop_event_driven:
+                    self.pool.update_trigger_watch(itask)
                 continue
 
             if (
@@ -1659,10 +1744,16 @@ class Scheduler:
             if itask.is_ready_to_run() and not itask.is_manual_submit:
                 self.pool.queue_task(itask)
 
+            if self.main_loop_event_driven:
+                self.pool.update_trigger_watch(itask)
+
+        self.xtrigger_mgr.call_batched_xtriggers()
         if self.xtrigger_mgr.do_housekeeping:
-            self.xtrigger_mgr.housekeep(self.pool.get_tasks())
+            self.xtrigger_mgr.housekeep(self.pool.get_xtrigger_signatures())
+        metrics.lap('xtriggers')
         self.pool.clock_expire_tasks()
         self.release_tasks_to_run()
+        metrics.lap('release')
 
         if (
             self.get_run_mode() == RunMode.SIMULATION
@@ -1674,6 +1765,7 @@ class Scheduler:
         ):
             # A simulated task state change occurred.
             self.reset_inactivity_timer()
+        metrics.lap('simulation')
 
         # auto expire broadcasts
         if not self.is_paused:
@@ -1693,17 +1785,20 @@ class Scheduler:
                     )
 
         self.late_tasks_check()
+        metrics.lap('housekeeping')
 
         self.process_queued_task_messages()
+        metrics.lap('messages')
         await self.process_command_queue()
+        metrics.lap('commands')
         self.task_events_mgr.process_events(self)
 
         # Update state summary, database, and uifeed
         self.workflow_db_mgr.put_task_event_timers(self.task_events_mgr)
+        metrics.lap('events')
 
         # List of task whose states have changed.
-        updated_task_list = [
-            t for t in self.pool.get_tasks() if t.state.is_updated]
+        updated_task_list = self.pool.get_updated_tasks()
         has_updated = updated_task_list or self.is_updated
 
         if updated_task_list and self.is_restart_timeout_wait:
@@ -1715,6 +1810,7 @@ class Scheduler:
         if has_updated or self.data_store_mgr.updates_pending:
             # Update the datastore.
             await self.update_data_structure()
+        metrics.lap('data_store')
 
         if has_updated:
             if not self.is_reloaded:
@@ -1726,8 +1822,7 @@ class Scheduler:
 
             # Reset workflow and task updated flags.
             self.is_updated = False
-            for itask in updated_task_list:
-                itask.state.is_updated = False
+            self.pool.clear_updated_tasks(updated_task_list)
 
             if not self.is_stalled:
                 # Stop the stalled timer.
@@ -1739,12 +1834,14 @@ class Scheduler:
         # If public database is stuck, blast it away by copying the content
         # of the private database into it.
         self.database_health_check()
+        metrics.lap('database')
 
         # Shutdown workflow if timeouts have occurred
         self.timeout_check()
 
         # Does the workflow need to shutdown on task failure?
         await self.workflow_shutdown()
+        metrics.lap('housekeeping')
 
         if self.options.profile_mode:
             self.update_profiler_logs(tinit)
@@ -1757,10 +1854,13 @@ class Scheduler:
                 self
             )
         )
+        metrics.lap('plugins')
 
         if not has_updated and not self.stop_mode:
             # Has the workflow stalled?
             self.check_workflow_stalled()
+        metrics.lap('housekeeping')
+        metrics.end_iteration()
 
         # Sleep a bit for things to catch up.
         # Quick sleep if there are items pending in process pool.
@@ -1776,7 +1876,12 @@ class Scheduler:
             duration = self.INTERVAL_MAIN_LOOP_QUICK - elapsed
         else:
             duration = self.INTERVAL_MAIN_LOOP - elapsed
-        await asyncio.sleep(duration)
+        next_timer_due = self.get_next_timer_due()
+        if next_timer_due is not None:
+            # Don't oversleep the next task timer.
+            duration = min(duration, max(next_timer_due - time(), 0))
+        with metrics.phase('sleep'):
+            await self._main_loop_sleep(duration)
         # Record latest main loop interval
         self.main_loop_intervals.append(time() - tinit)
         # END MAIN LOOP
@@ -0,0 +1,41 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""cylc jobs-agent [OPTIONS]
+
+(This command is for internal use.)
+
+Run job commands (jobs-submit, jobs-poll, jobs-kill) read from STDIN, until
+STDIN is closed.
+
+Used on platforms configured to use a job agent, see
+global.cylc[platforms][<platform>]job agent.
+"""
+
+from cylc.flow.job_agent import run_agent
+from cylc.flow.option_parsers import CylcOptionParser as COP
+from cylc.flow.terminal import cli_function
+
+INTERNAL = True
+
+
+def get_option_parser() -> COP:
+    return COP(__doc__, argdoc=[])
+
+
+@cli_function(get_option_parser)
+def main(parser, options):
+    """CLI main."""
+    run_agent()
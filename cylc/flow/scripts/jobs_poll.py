@@ -39,6 +39,16 @@ def get_option_parser() -> COP:
             )
         ],
     )
+    parser.add_option(
+        "--status-cache-interval",
+        help="Share job runner status queries with other workflows, using"
+        " results up to this old (seconds).",
+        action="store",
+        type="float",
+        metavar="SECONDS",
+        dest="status_cache_interval",
+        default=None,
+    )
 
     return parser
 
@@ -46,4 +56,6 @@ def get_option_parser() -> COP:
 @cli_function(get_option_parser)
 def main(parser, options, job_log_root, *job_log_dirs):
     """CLI main."""
-    JobRunnerManager().jobs_poll(job_log_root, job_log_dirs)
+    JobRunnerManager().jobs_poll(
+        job_log_root, job_log_dirs, options.status_cache_interval
+    )
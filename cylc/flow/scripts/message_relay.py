@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""cylc message-relay [OPTIONS]
+
+Relay task job messages to schedulers in batches.
+
+Run this on hosts which run many short jobs to reduce the load which job
+messages place on schedulers and on the host.
+
+While the relay is running, "cylc message" (as called by jobs) hands its
+messages to the relay over a local UNIX socket. The relay forwards the
+messages to each workflow in batches, over a connection which it keeps open
+between batches. If the relay is not running, "cylc message" sends its
+messages to the scheduler directly.
+
+Messages are still written to the job status file by "cylc message", if the
+relay fails to forward a message, the scheduler will pick it up from this
+file when it next polls the job.
+
+The relay runs in the foreground until interrupted, run one per user on each
+job host that needs it.
+
+The relay listens on "~/.cylc/message-relay/<host>.sock" by default. To
+use a different path, set the environment variable CYLC_MESSAGE_RELAY for
+both the relay and the jobs (e.g. in the job environment).
+
+Examples:
+  # start a relay on this host
+  $ cylc message-relay
+
+  # forward messages once a second, in batches of up to 500 messages
+  $ cylc message-relay --interval=1 --max-batch-size=500
+"""
+
+from contextlib import suppress
+import signal
+from typing import TYPE_CHECKING
+
+from cylc.flow.message_relay import (
+    MessageRelay,
+    get_relay_socket_path,
+)
+from cylc.flow.option_parsers import CylcOptionParser as COP
+from cylc.flow.terminal import cli_function
+
+if TYPE_CHECKING:
+    from optparse import Values
+
+
+def get_option_parser() -> COP:
+    parser = COP(__doc__, comms=True, argdoc=[])
+
+    parser.add_option(
+        '--interval',
+        help='How often to forward messages (seconds), default %default.',
+        metavar='SECONDS', action='store', type='float', default=0.5,
+        dest='interval')
+
+    parser.add_option(
+        '--max-batch-size',
+        help=(
+            'The maximum number of "cylc message" calls to forward to a'
+            ' workflow in one request, default %default.'
+        ),
+        metavar='N', action='store', type='int', default=100,
+        dest='max_batch_size')
+
+    return parser
+
+
+@cli_function(get_option_parser)
+def main(_parser: COP, options: 'Values') -> None:
+    relay = MessageRelay(
+        get_relay_socket_path(),
+        interval=options.interval,
+        max_batch_size=options.max_batch_size,
+        timeout=options.comms_timeout,
+    )
+    signal.signal(signal.SIGTERM, lambda *_: relay.stop())
+    with suppress(KeyboardInterrupt):
+        relay.serve()
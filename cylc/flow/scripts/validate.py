@@ -32,7 +32,7 @@ from pathlib import Path
 import sys
 from typing import TYPE_CHECKING
 
-from cylc.flow import LOG, __version__ as CYLC_VERSION
+from cylc.flow import LOG, __version__ as CYLC_VERSION, config_cache
 from cylc.flow.config import WorkflowConfig
 from cylc.flow.exceptions import (
     WorkflowConfigError,
@@ -206,5 +206,9 @@ async def run(
         if cylc.flow.flags.verbosity > 0:
             print('  + %s ok' % itask.identity)
 
+    if cylc.flow.flags.verbosity > 0 and getattr(
+        options, 'config_cache', False
+    ):
+        print(config_cache.format_stats(config_cache.get_stats()))
     print(cparse('<green>Valid for cylc-%s</green>' % CYLC_VERSION))
     profiler.stop()
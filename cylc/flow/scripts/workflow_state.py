@@ -202,7 +202,7 @@ class WorkflowPoller(Poller):
 
         super().__init__(**kwargs)
 
-    def _find_workflow(self) -> bool:
+    def find_workflow(self) -> bool:
         """Find workflow and infer run directory, return True if found."""
         try:
             self.workflow_id = infer_latest_run_from_id(
@@ -244,7 +244,7 @@ class WorkflowPoller(Poller):
         Store self.result for external access.
 
         """
-        if self.workflow_id is None and not self._find_workflow():
+        if self.workflow_id is None and not self.find_workflow():
             return False
 
         if self.db_checker is None:
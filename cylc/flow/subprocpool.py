@@ -16,7 +16,15 @@
 """Manage queueing and pooling of subprocesses for the scheduler."""
 
 from collections import deque
+from contextlib import (
+    redirect_stderr,
+    redirect_stdout,
+    suppress,
+)
+from dataclasses import dataclass
+from io import StringIO
 import json
+import multiprocessing
 import os
 import selectors
 import shlex
@@ -30,13 +38,17 @@ import sys
 from tempfile import SpooledTemporaryFile
 from threading import RLock
 from time import time
+import traceback
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
+    Deque,
+    Dict,
     List,
     Optional,
     Set,
+    Tuple,
 )
 
 from cylc.flow import (
@@ -47,6 +59,7 @@ from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
 from cylc.flow.cylc_subproc import procopen
 from cylc.flow.exceptions import PlatformLookupError
 from cylc.flow.hostuserutil import is_remote_host
+from cylc.flow.job_agent import JobAgentPool
 from cylc.flow.platforms import (
     get_platform,
     log_platform_event,
@@ -58,10 +71,15 @@ from cylc.flow.wallclock import get_current_time_string
 
 
 if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+    from multiprocessing.context import SpawnContext
     from subprocess import Popen
 
     from cylc.flow.subprocctx import SubProcContext
 
+    # (context, callback, callback args)
+    FunctionCall = Tuple[SubFuncContext, Optional[Callable], Optional[list]]
+
 _XTRIG_MOD_CACHE: dict = {}
 _XTRIG_FUNC_CACHE: dict = {}
 
@@ -172,6 +190,351 @@ def run_function(mod_name, func_name, json_args, json_kwargs, src_dir):
     sys.stdout.write(json.dumps(res))
 
 
+def _run_function_worker(conn: 'Connection') -> None:
+    """Run functions sent down a pipe, in an xtrigger worker process.
+
+    Each request is the arguments of "cylc function-run" (see run_function),
+    the response is its (ret_code, stdout, stderr).
+
+    A request of None stops the worker.
+
+    """
+    # Lead a process group of our own so that any processes started by the
+    # function can be killed with the worker (see _FunctionWorker.kill).
+    os.setpgrp()
+    # ready to serve
+    conn.send(None)
+    while True:
+        try:
+            args = conn.recv()
+        except EOFError:
+            # the scheduler has gone away
+            break
+        if args is None:
+            break
+        ret_code = 0
+        out = StringIO()
+        err = StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            try:
+                run_function(*args)
+            except SystemExit as exc:
+                ret_code = exc.code if isinstance(exc.code, int) else 1
+            except Exception:
+                traceback.print_exc()
+                ret_code = 1
+        conn.send((ret_code, out.getvalue(), err.getvalue()))
+
+
+class _FunctionWorker:
+    """A long-lived xtrigger worker process."""
+
+    def __init__(self, mp_context: 'SpawnContext'):
+        self.conn, child_conn = mp_context.Pipe()
+        self.proc = mp_context.Process(
+            target=_run_function_worker,
+            args=(child_conn,),
+            name='cylc-xtrigger-worker',
+            daemon=True,
+        )
+        self.proc.start()
+        child_conn.close()
+        # has the worker started up?
+        self.ready = False
+        # number of calls served
+        self.calls = 0
+        # the call in progress
+        self.call: 'Optional[FunctionCall]' = None
+        self.call_start = 0.0
+        # retire once the call in progress has finished?
+        self.expired = False
+
+    def run(self, call: 'FunctionCall') -> None:
+        """Send a call to the worker."""
+        # (ctx.cmd = ["cylc", "function-run", *args])
+        self.conn.send(call[0].cmd[2:])
+        self.call = call
+        self.call_start = time()
+
+    def stop(self) -> None:
+        """Ask an idle worker to exit."""
+        with suppress(OSError):
+            self.conn.send(None)
+        self.conn.close()
+
+    def kill(self) -> None:
+        """Kill the worker and anything it started."""
+        try:
+            os.killpg(self.proc.pid, SIGKILL)  # type: ignore[arg-type]
+        except (ProcessLookupError, PermissionError):
+            # not (yet) a process group leader
+            self.proc.kill()
+        self.conn.close()
+
+
+@dataclass
+class FunctionStats:
+    """Call latency statistics for an xtrigger function."""
+
+    calls: int = 0
+    errors: int = 0
+    time_total: float = 0.0
+    time_max: float = 0.0
+
+    def add(self, elapsed: float, ret_code: Optional[int]) -> None:
+        """Record a call.
+
+        Examples:
+            >>> stats = FunctionStats()
+            >>> stats.add(1.0, 0)
+            >>> stats.add(3.0, 1)
+            >>> stats
+            FunctionStats(calls=2, errors=1, time_total=4.0, time_max=3.0)
+            >>> stats.time_mean
+            2.0
+
+        """
+        self.calls += 1
+        if ret_code != 0:
+            self.errors += 1
+        self.time_total += elapsed
+        self.time_max = max(self.time_max, elapsed)
+
+    @property
+    def time_mean(self) -> float:
+        return self.time_total / self.calls if self.calls else 0.0
+
+
+class FunctionPool:
+    """A pool of long-lived worker processes for running xtrigger functions.
+
+    This is an alternative to running each xtrigger call in a new
+    "cylc function-run" process. Workers are started as needed, up to
+    ``size``, and keep xtrigger modules imported (see _XTRIG_MOD_CACHE)
+    between calls.
+
+    Workers are replaced after ``max_calls`` calls (if set) and are killed
+    (and replaced) if a call takes longer than ``timeout`` seconds.
+
+    Workers are replaced on reload (see ``restart``), so that changes to
+    xtrigger modules take effect.
+
+    Call latencies are recorded by function, see ``stats``.
+
+    Args:
+        size:
+            Maximum number of worker processes.
+        max_calls:
+            Number of calls after which to replace a worker, 0 for no limit.
+        timeout:
+            Call timeout in seconds.
+
+    """
+
+    def __init__(self, size: int, max_calls: int, timeout: float):
+        self.size = size
+        self.max_calls = max_calls
+        self.timeout = timeout
+        self.queuings: 'Deque[FunctionCall]' = deque()
+        self.workers: List[_FunctionWorker] = []
+        # workers which have been stopped or killed but not yet reaped
+        self.retirings: List[_FunctionWorker] = []
+        # {function name: stats}
+        self.stats: Dict[str, FunctionStats] = {}
+        # (don't fork the scheduler, it has threads)
+        self._mp_context = multiprocessing.get_context('spawn')
+
+    def put_command(
+        self,
+        ctx: SubFuncContext,
+        callback: Optional[Callable] = None,
+        callback_args: Optional[list] = None,
+    ) -> None:
+        """Queue a function call."""
+        self.queuings.append((ctx, callback, callback_args))
+
+    def is_not_done(self) -> bool:
+        """Return True if any calls are queued or running."""
+        return bool(self.queuings) or any(
+            worker.call is not None for worker in self.workers
+        )
+
+    def process(self) -> 'List[FunctionCall]':
+        """Collect the results of calls and start queued calls.
+
+        Returns:
+            The calls which have finished (their contexts have been updated
+            with the results).
+
+        """
+        done: 'List[FunctionCall]' = []
+        now = time()
+        for worker in list(self.workers):
+            if not worker.ready:
+                if worker.conn.poll():
+                    try:
+                        worker.conn.recv()
+                    except (EOFError, OSError):
+                        self._retire(worker, kill=True)
+                        self._fail_start(worker, done)
+                    else:
+                        worker.ready = True
+                continue
+            if worker.call is None:
+                if not worker.proc.is_alive():
+                    self._retire(worker)
+                continue
+            ret_code: Optional[int]
+            if worker.conn.poll():
+                try:
+                    ret_code, out, err = worker.conn.recv()
+                except (EOFError, OSError):
+                    # the function killed the worker (or something else did)
+                    worker.proc.join(1)
+                    ret_code = worker.proc.exitcode
+                    out = ''
+                    err = f'xtrigger worker exited ({ret_code})'
+                    self._retire(worker, kill=True)
+            elif now > worker.call_start + self.timeout:
+                ret_code = -SIGKILL
+                out = ''
+                err = f'killed on timeout ({self.timeout})'
+                self._retire(worker, kill=True)
+            else:
+                continue
+            call = worker.call
+            worker.call = None
+            worker.calls += 1
+            self._exit_call(call, ret_code, out, err, now - worker.call_start)
+            done.append(call)
+            if worker.expired or (
+                self.max_calls and worker.calls >= self.max_calls
+            ):
+                self._retire(worker)
+
+        # reap retired workers
+        for worker in list(self.retirings):
+            worker.proc.join(0)
+            if worker.proc.exitcode is not None:
+                worker.proc.close()
+                self.retirings.remove(worker)
+
+        # start queued calls on idle workers
+        for worker in list(self.workers):
+            if not self.queuings:
+                break
+            if worker.ready and worker.call is None:
+                call = self.queuings.popleft()
+                try:
+                    worker.run(call)
+                except OSError:
+                    # the worker has exited, leave the call for another
+                    self.queuings.appendleft(call)
+                    self._retire(worker, kill=True)
+
+        # start more workers if needed (calls are started on them once they
+        # are ready, so that start up time doesn't count towards timeouts)
+        starting = sum(not worker.ready for worker in self.workers)
+        while len(self.workers) < self.size and starting < len(self.queuings):
+            self.workers.append(_FunctionWorker(self._mp_context))
+            starting += 1
+        return done
+
+    def restart(self) -> None:
+        """Replace the workers, e.g. on reload.
+
+        Workers keep xtrigger modules imported, so they must be replaced for
+        changes to the modules to take effect. Idle workers are stopped,
+        busy workers are stopped once their calls have finished. (Workers
+        which are still starting up have not imported any modules yet.)
+        """
+        for worker in list(self.workers):
+            if not worker.ready:
+                continue
+            if worker.call is None:
+                self._retire(worker)
+            else:
+                worker.expired = True
+
+    def terminate(self) -> 'List[FunctionCall]':
+        """Stop all workers.
+
+        Returns:
+            The calls which were queued or in progress.
+
+        """
+        calls = list(self.queuings)
+        self.queuings.clear()
+        for worker in list(self.workers):
+            if worker.call is not None:
+                calls.append(worker.call)
+            self._retire(worker, kill=worker.call is not None)
+        for worker in self.retirings:
+            worker.proc.join(1)
+            if worker.proc.exitcode is None:
+                worker.kill()
+                worker.proc.join()
+        self.retirings.clear()
+        if self.stats:
+            LOG.info(
+                'xtrigger function calls (worker pool):\n'
+                + '\n'.join(
+                    f'* {name}: {stats.calls} calls ({stats.errors} errors),'
+                    f' mean {stats.time_mean:.3f}s, max {stats.time_max:.3f}s'
+                    for name, stats in sorted(self.stats.items())
+                )
+            )
+        return calls
+
+    def _retire(self, worker: _FunctionWorker, kill: bool = False) -> None:
+        """Remove a worker from the pool."""
+        self.workers.remove(worker)
+        if kill:
+            worker.kill()
+        else:
+            worker.stop()
+        self.retirings.append(worker)
+
+    def _fail_start(
+        self, worker: _FunctionWorker, done: 'List[FunctionCall]'
+    ) -> None:
+        """Fail the next call if a worker failed to start.
+
+        (So that the failure is reported, rather than retried forever.)
+        """
+        if self.queuings:
+            call = self.queuings.popleft()
+            worker.proc.join(1)
+            self._exit_call(
+                call,
+                1,
+                '',
+                f'xtrigger worker failed to start ({worker.proc.exitcode})',
+                0.0,
+            )
+            done.append(call)
+
+    def _exit_call(
+        self,
+        call: 'FunctionCall',
+        ret_code: Optional[int],
+        out: str,
+        err: str,
+        elapsed: float,
+    ) -> None:
+        """Record the result of a call."""
+        ctx = call[0]
+        ctx.ret_code = ret_code
+        if out:
+            ctx.out = (ctx.out or '') + out
+        if err:
+            ctx.err = (ctx.err or '') + err
+        self.stats.setdefault(ctx.func_name, FunctionStats()).add(
+            elapsed, ret_code
+        )
+        LOG.debug(f'{ctx.get_signature()} took {elapsed:.3f}s')
+
+
 class SubProcPool:
     """Manage queueing and pooling of subprocesses.
 
@@ -213,6 +576,27 @@ class SubProcPool:
         self.queuings = deque()
         self.runnings = []
         self.pipepoller = selectors.DefaultSelector()
+        # xtrigger functions are run by the function pool if configured
+        self.func_pool: Optional[FunctionPool] = None
+        func_pool_size = glbl_cfg().get(
+            ['scheduler', 'xtrigger workers', 'pool size'])
+        if func_pool_size > 0:
+            self.func_pool = FunctionPool(
+                func_pool_size,
+                glbl_cfg().get(
+                    ['scheduler', 'xtrigger workers', 'max calls per worker']
+                ),
+                glbl_cfg().get(
+                    ['scheduler', 'xtrigger workers', 'call timeout']
+                ) or self.proc_pool_timeout,
+            )
+        # job commands are run by job agents on platforms which use them
+        self.agent_pool = JobAgentPool(self.proc_pool_timeout)
+
+    def restart_function_workers(self) -> None:
+        """Replace the xtrigger workers (if any), e.g. on reload."""
+        if self.func_pool is not None:
+            self.func_pool.restart()
 
     def close(self):
         """Mark the pool as closed, which will prevent putting new commands,
@@ -228,7 +612,9 @@ class SubProcPool:
 
     def is_not_done(self):
         """Return True if queuings or runnings not empty."""
-        return self.queuings or self.runnings
+        return self.queuings or self.runnings or (
+            self.func_pool is not None and self.func_pool.is_not_done()
+        ) or self.agent_pool.is_not_done()
 
     def _is_stopping(self):
         """Return whether .stopping is True or not.
@@ -322,6 +708,24 @@ class SubProcPool:
 
         # Update list of running items
         self.runnings[:] = runnings
+        # Handle function calls that are done (and start more)
+        if self.func_pool is not None:
+            for ctx, callback, callback_args in self.func_pool.process():
+                LOG.debug(ctx.dump())
+                self._run_command_exit(
+                    ctx, callback=callback, callback_args=callback_args
+                )
+        # Handle job agent commands that are done
+        for (
+            ctx, bad_hosts, callback, callback_args,
+            callback_255, callback_255_args
+        ) in self.agent_pool.process():
+            LOG.debug(ctx)
+            self._run_command_exit(
+                ctx, bad_hosts=bad_hosts,
+                callback=callback, callback_args=callback_args,
+                callback_255=callback_255, callback_255_args=callback_255_args
+            )
         # Create more child processes, if items in queue and space in pool
         stopping = self._is_stopping()
         while self.queuings and len(self.runnings) < self.size:
@@ -370,6 +774,14 @@ class SubProcPool:
                 callback=callback, callback_args=callback_args,
                 callback_255=callback_255, callback_255_args=callback_255_args
             )
+        elif self.func_pool is not None and isinstance(ctx, SubFuncContext):
+            self.func_pool.put_command(ctx, callback, callback_args)
+        elif ctx.cmd_kwargs.get('agent_cmd'):
+            # job commands for platforms which use a job agent
+            self.agent_pool.put_command([
+                ctx, bad_hosts, callback, callback_args,
+                callback_255, callback_255_args
+            ])
         else:
             self.queuings.append(
                 [
@@ -426,6 +838,16 @@ class SubProcPool:
             ctx.err = self.ERR_WORKFLOW_STOPPING
             ctx.ret_code = self.RET_CODE_WORKFLOW_STOPPING
             self._run_command_exit(ctx)
+        if self.func_pool is not None:
+            for ctx, _, _ in self.func_pool.terminate():
+                ctx.err = self.ERR_WORKFLOW_STOPPING
+                ctx.ret_code = self.RET_CODE_WORKFLOW_STOPPING
+                self._run_command_exit(ctx)
+        for call in self.agent_pool.terminate():
+            ctx = call[0]
+            ctx.err = self.ERR_WORKFLOW_STOPPING
+            ctx.ret_code = self.RET_CODE_WORKFLOW_STOPPING
+            self._run_command_exit(ctx)
         # Kill remaining processes
         for value in self.runnings:
             proc = value[0]
@@ -16,12 +16,31 @@
 
 """Timer for task actions."""
 
+from contextlib import suppress
+from heapq import (
+    heapify,
+    heappop,
+    heappush,
+)
+from itertools import count
 from time import time
+from typing import (
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
 from cylc.flow.wallclock import (
     get_seconds_as_interval_string, get_time_string_from_unix_time)
 
 
+KeyT = TypeVar('KeyT', bound=Hashable)
+
+
 class TimerFlags:
 
     EXECUTION_RETRY = 'execution-retry'
@@ -105,3 +124,100 @@ class TaskActionTimer:
     def unset_waiting(self):
         """Unset waiting flag after an action has completed."""
         self.is_waiting = False
+
+
+class TimerQueue(Generic[KeyT]):
+    """A queue of keys (e.g. timers) ordered by the time they are due.
+
+    This allows the main loop to find the timers which are due, and the
+    time the next one is due, without examining every timer.
+
+    A key is due at one time only, adding a key which is already queued
+    reschedules it. Removed or rescheduled entries are left in the heap and
+    skipped when they reach the top of it.
+
+    Examples:
+        >>> queue = TimerQueue()
+        >>> queue.add('a', 20.0)
+        >>> queue.add('b', 10.0)
+        >>> queue.add('c', 30.0)
+        >>> queue.add('a', 5.0)  # reschedule
+        >>> queue.remove('c')
+        >>> queue.next_due()
+        5.0
+        >>> queue.pop_due(10.0)  # (due before 10.0)
+        ['a']
+        >>> queue.pop_due(10.5)
+        ['b']
+        >>> len(queue), queue.next_due()
+        (0, None)
+
+    """
+
+    # Memory optimization - constrain possible attributes to this list.
+    __slots__ = ["_heap", "_entries", "_counter"]
+
+    # rebuild the heap if it has this many more entries than queued keys
+    COMPACT_THRESHOLD = 1000
+
+    def __init__(self):
+        # [(due, sequence number, key), ...]
+        self._heap: List[Tuple[float, int, KeyT]] = []
+        # {key: (due, sequence number)} for the current entry of each key
+        self._entries: Dict[KeyT, Tuple[float, int]] = {}
+        self._counter = count()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: KeyT) -> bool:
+        return key in self._entries
+
+    def get_due(self, key: KeyT) -> Optional[float]:
+        """Return the time a key is due, or None if not queued."""
+        with suppress(KeyError):
+            return self._entries[key][0]
+        return None
+
+    def add(self, key: KeyT, due: float) -> None:
+        """Queue a key, or reschedule it if already queued."""
+        if self.get_due(key) == due:
+            return
+        entry = (due, next(self._counter))
+        self._entries[key] = entry
+        heappush(self._heap, (*entry, key))
+        if len(self._heap) > len(self._entries) + self.COMPACT_THRESHOLD:
+            self._heap = [
+                (*entry, key) for key, entry in self._entries.items()
+            ]
+            heapify(self._heap)
+
+    def remove(self, key: KeyT) -> None:
+        """Remove a key from the queue (if queued)."""
+        self._entries.pop(key, None)
+
+    def _prune(self) -> None:
+        """Drop removed or rescheduled entries from the top of the heap."""
+        while (
+            self._heap
+            and self._entries.get(self._heap[0][2]) != self._heap[0][:2]
+        ):
+            heappop(self._heap)
+
+    def next_due(self) -> Optional[float]:
+        """Return the time the next key is due, or None if queue empty."""
+        self._prune()
+        if self._heap:
+            return self._heap[0][0]
+        return None
+
+    def pop_due(self, now: float) -> List[KeyT]:
+        """Remove and return the keys due before now, soonest first."""
+        keys: List[KeyT] = []
+        while True:
+            self._prune()
+            if not self._heap or self._heap[0][0] >= now:
+                return keys
+            key = heappop(self._heap)[2]
+            del self._entries[key]
+            keys.append(key)
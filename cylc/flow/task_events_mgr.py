@@ -89,6 +89,7 @@ from cylc.flow.subprocctx import (
 from cylc.flow.task_action_timer import (
     TaskActionTimer,
     TimerFlags,
+    TimerQueue,
 )
 from cylc.flow.task_job_logs import (
     JOB_LOG_ERR,
@@ -524,6 +525,11 @@ class TaskEventsManager():
         # NOTE: do not mutate directly
         # use the {add,remove,unset_waiting}_event_timers methods
         self._event_timers: Dict[EventKey, Any] = {}
+        # event timers which are not waiting, by the time they are due
+        # (timers which need to be started are due at once)
+        self._event_timer_queue: TimerQueue[EventKey] = TimerQueue()
+        # task IDs by the time their next job poll or timeout is due
+        self.job_timer_queue: TimerQueue[str] = TimerQueue()
         # NOTE: flag for DB use
         self.event_timers_updated = True
         self.timestamp = timestamp
@@ -555,7 +561,11 @@ class TaskEventsManager():
         return True
 
     def check_job_time(self, itask, now):
-        """Check/handle job timeout and poll timer"""
+        """Check/handle job timeout and poll timer
+
+        Only needs calling when the task is due in the job_timer_queue
+        (see queue_job_timers).
+        """
         can_poll = self.check_poll_time(itask, now)
         if itask.timeout is None or now <= itask.timeout:
             return can_poll
@@ -581,10 +591,8 @@ class TaskEventsManager():
         """Get deprecated "[remote]" items that default to platforms."""
         overrides = self.broadcast_mgr.get_broadcast(itask.tokens)
         SKEY = 'remote'
-        if SKEY not in overrides:
-            overrides[SKEY] = {}
         return (
-            overrides[SKEY].get(key) or
+            overrides.get(SKEY, {}).get(key) or
             itask.tdef.rtconfig[SKEY][key] or
             itask.platform[key]
         )
@@ -603,9 +611,11 @@ class TaskEventsManager():
         """
         ctx_groups: dict = {}
         now = time()
-        for id_key, timer in self._event_timers.copy().items():
-            if timer.is_waiting:
-                continue
+        # (on shutdown, don't hold back mail for the mail interval)
+        for id_key in self._event_timer_queue.pop_due(
+            float('inf') if schd.stop_mode else now
+        ):
+            timer = self._event_timers[id_key]
             # Set timer if timeout is None.
             if not timer.is_timeout_set():
                 if timer.next() is None:
@@ -633,7 +643,10 @@ class TaskEventsManager():
                 if msg:
                     LOG.debug("%s %s", id_key.tokens.relative_id, msg)
             # Ready to run?
-            if not timer.is_delay_done() or (
+            if not timer.is_delay_done():
+                self._event_timer_queue.add(id_key, timer.timeout)
+                continue
+            if (
                 # Avoid flooding user's mail box with mail notification.
                 # Group together as many notifications as possible within a
                 # given interval.
@@ -642,6 +655,7 @@ class TaskEventsManager():
                 self.next_mail_time is not None and
                 self.next_mail_time > now
             ):
+                self._event_timer_queue.add(id_key, self.next_mail_time)
                 continue
 
             timer.set_waiting()
@@ -1263,6 +1277,7 @@ class TaskEventsManager():
             for key in proc_ctx.cmd_kwargs['id_keys']:
                 timer = self._event_timers[key]
                 timer.reset()
+                self._queue_event_timer(key)
 
     def _job_logs_retrieval_callback(
         self,
@@ -1367,6 +1382,7 @@ class TaskEventsManager():
                 os.getenv("CYLC_WORKFLOW_RUN_DIR")
             )
             itask.state.add_xtrigger(label)
+        itask.notify_state_changed()
 
         # add the retry xtrigger to the data store
         sig = self.xtrigger_mgr.get_xtrig_ctx(itask, label).get_signature()
@@ -1909,6 +1925,7 @@ class TaskEventsManager():
             # Reset, task not active
             itask.timeout = None
             itask.poll_timer = None
+            self.job_timer_queue.remove(itask.identity)
             return
 
         ctx = (itask.submit_num, itask.state.status)
@@ -1970,6 +1987,24 @@ class TaskEventsManager():
         LOG.debug(f"[{itask}] {message}")
         # Set next poll time
         self.check_poll_time(itask)
+        self.queue_job_timers(itask)
+
+    def queue_job_timers(self, itask: 'TaskProxy') -> None:
+        """Queue a task for its next job poll or timeout (if any).
+
+        Call whenever the task's poll timer or timeout is changed.
+        """
+        due = [] if itask.timeout is None else [itask.timeout]
+        if itask.poll_timer and itask.poll_timer.timeout is not None:
+            due.append(itask.poll_timer.timeout)
+        if due:
+            self.job_timer_queue.add(itask.identity, min(due))
+        else:
+            self.job_timer_queue.remove(itask.identity)
+
+    def get_next_event_timer_due(self) -> Optional[float]:
+        """Return the time the next event timer is due (if any)."""
+        return self._event_timer_queue.next_due()
 
     @staticmethod
     def process_execution_polling_intervals(
@@ -2048,18 +2083,31 @@ class TaskEventsManager():
     ) -> None:
         """Add a new event timer."""
         self._event_timers[id_key] = event_timer
+        self._queue_event_timer(id_key)
         self.event_timers_updated = True
 
     def remove_event_timer(self, id_key: EventKey) -> None:
         """Remove an event timer."""
         del self._event_timers[id_key]
+        self._event_timer_queue.remove(id_key)
         self.event_timers_updated = True
 
     def unset_waiting_event_timer(self, id_key: EventKey) -> None:
         """Invoke unset_waiting on an event timer."""
         self._event_timers[id_key].unset_waiting()
+        self._queue_event_timer(id_key)
         self.event_timers_updated = True
 
+    def _queue_event_timer(self, id_key: EventKey) -> None:
+        """Queue an event timer for process_events (unless waiting)."""
+        timer = self._event_timers[id_key]
+        if timer.is_waiting:
+            self._event_timer_queue.remove(id_key)
+        else:
+            self._event_timer_queue.add(
+                id_key, 0 if timer.timeout is None else timer.timeout
+            )
+
     def reset_bad_hosts(self):
         """Clear bad_hosts list."""
         if self.bad_hosts:
@@ -189,11 +189,18 @@ class TaskJobManager:
         """Check submission and execution timeout and polling timers.
 
         Poll tasks that have timed out and/or have reached next polling time.
+        Only tasks which are due in the job timer queue are checked.
         """
         now = time()
         poll_tasks = set()
-        for itask in task_pool.get_tasks():
-            if self.task_events_mgr.check_job_time(itask, now):
+        for task_id in self.task_events_mgr.job_timer_queue.pop_due(now):
+            itask = task_pool._get_task_by_id(task_id)
+            if itask is None:
+                # task no longer in the pool
+                continue
+            due = self.task_events_mgr.check_job_time(itask, now)
+            self.task_events_mgr.queue_job_timers(itask)
+            if due:
                 poll_tasks.add(itask)
                 if itask.poll_timer.delay is not None:
                     LOG.info(
@@ -506,6 +513,7 @@ class TaskJobManager:
                 '%s ... # will invoke in batches, sizes=%s',
                 cmd, [len(b) for b in itasks_batches])
 
+            args = cmd
             if remote_mode:
                 cmd = construct_ssh_cmd(
                     cmd, platform, host
@@ -552,7 +560,10 @@ class TaskJobManager:
                         cmd + job_log_dirs,
                         stdin_files=stdin_files,
                         job_log_dirs=job_log_dirs,
-                        host=host
+                        host=host,
+                        **self._get_job_agent_kwargs(
+                            platform, host, args + job_log_dirs
+                        ),
                     ),
                     bad_hosts=self.bad_hosts,
                     callback=self._submit_task_jobs_callback,
@@ -949,39 +960,48 @@ class TaskJobManager:
                     f' platform {platform_name}.'
                 )
                 continue
-            if is_remote_platform(platform):
-                remote_mode = True
-                cmd = [cmd_key]
-            else:
-                cmd = ["cylc", cmd_key]
-                remote_mode = False
+            args = [cmd_key]
             if LOG.isEnabledFor(DEBUG):
-                cmd.append("--debug")
-            cmd.append("--")
-            cmd.append(get_remote_workflow_run_job_dir(self.workflow))
-            job_log_dirs = []
+                args.append("--debug")
+            if (
+                cmd_key == self.JOBS_POLL
+                and platform['job runner status cache interval']
+            ):
+                args.append(
+                    '--status-cache-interval='
+                    f'{platform["job runner status cache interval"]:g}'
+                )
+            args.append("--")
+            args.append(get_remote_workflow_run_job_dir(self.workflow))
             host = 'localhost'
 
-            ctx = SubProcContext(cmd_key, cmd, host=host)
-            if remote_mode:
+            if is_remote_platform(platform):
                 try:
                     host = get_host_from_platform(
                         platform, bad_hosts=self.bad_hosts
                     )
-                    cmd = construct_ssh_cmd(
-                        cmd, platform, host
-                    )
                 except NoHostsError:
+                    ctx = SubProcContext(cmd_key, args, host=host)
                     ctx.err = f'No available hosts for {platform["name"]}'
                     LOG.debug(ctx)
                     callback_255(ctx, itasks)
                     continue
-                else:
-                    ctx = SubProcContext(cmd_key, cmd, host=host)
+                cmd = construct_ssh_cmd(args, platform, host)
+            else:
+                cmd = ['cylc', *args]
 
-            for itask in sorted(itasks, key=lambda task: task.identity):
-                job_log_dirs.append(itask.job_tokens.relative_id)
-            cmd += job_log_dirs
+            job_log_dirs = [
+                itask.job_tokens.relative_id
+                for itask in sorted(itasks, key=lambda task: task.identity)
+            ]
+            ctx = SubProcContext(
+                cmd_key,
+                cmd + job_log_dirs,
+                host=host,
+                **self._get_job_agent_kwargs(
+                    platform, host, args + job_log_dirs
+                ),
+            )
             LOG.debug(f'{cmd_key} for {platform["name"]} on {host}')
             self.proc_pool.put_command(
                 ctx,
@@ -991,6 +1011,28 @@ class TaskJobManager:
                 callback_255=callback_255,
             )
 
+    @staticmethod
+    def _get_job_agent_kwargs(
+        platform: dict, host: str, args: List[str]
+    ) -> Dict[str, List[str]]:
+        """Return the context arguments to run a job command in a job agent.
+
+        (Or none, if the platform does not use job agents.)
+
+        Args:
+            platform: The platform to run the command on.
+            host: The platform host to run the command on.
+            args: The job command, e.g. ["jobs-poll", ...].
+
+        """
+        if not platform['job agent']:
+            return {}
+        if is_remote_platform(platform):
+            agent_cmd = construct_ssh_cmd(['jobs-agent'], platform, host)
+        else:
+            agent_cmd = ['cylc', 'jobs-agent']
+        return {'agent_cmd': agent_cmd, 'agent_args': args}
+
     @staticmethod
     def _set_retry_timers(
         itask: 'TaskProxy',
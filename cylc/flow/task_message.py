@@ -18,7 +18,8 @@
 Send messages to:
 - The stdout/stderr.
 - The job status file, if there is one.
-- The scheduler, if communication is possible.
+- The scheduler, if communication is possible (via the message relay, if one
+  is running, see cylc.flow.message_relay).
 """
 
 from logging import (
@@ -33,6 +34,7 @@ from typing import List
 
 from cylc.flow.exceptions import WorkflowStopped
 import cylc.flow.flags
+from cylc.flow.message_relay import relay_messages
 from cylc.flow.network.client_factory import (
     CommsMeth,
     get_client,
@@ -129,6 +131,12 @@ def send_messages(
     workflow: str, job_id: str, messages: List[list], event_time: str
 ) -> None:
     workflow = os.path.normpath(workflow)
+    if (
+        get_comms_method() == CommsMeth.ZMQ
+        and relay_messages(workflow, job_id, messages, event_time)
+    ):
+        # the message relay will forward the messages
+        return
     try:
         pclient = get_client(workflow)
     except WorkflowStopped:
@@ -16,6 +16,7 @@
 """Task output message manager and constants."""
 
 import ast
+from functools import lru_cache
 import re
 from typing import (
     TYPE_CHECKING,
@@ -125,6 +126,34 @@ def get_trigger_completion_variable_maps(triggers: Iterable[str]):
     )
 
 
+@lru_cache(maxsize=None)
+def get_output_maps(
+    outputs: Tuple[Tuple[str, str], ...]
+) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Return the message to trigger and completion variable maps of a task.
+
+    These are shared by all TaskOutputs with the same outputs, so must not
+    be modified.
+
+    Args:
+        outputs: The (trigger, message) pairs of the task's outputs.
+
+    Examples:
+        >>> get_output_maps((('x-y', 'message'),))
+        ({'message': 'x-y'}, {'message': 'x_y'})
+        >>> get_output_maps((('x', 'y'),)) is get_output_maps((('x', 'y'),))
+        True
+
+    """
+    return (
+        {message: trigger for trigger, message in outputs},
+        {
+            message: trigger_to_completion_variable(trigger)
+            for trigger, message in outputs
+        },
+    )
+
+
 def get_completion_expression(tdef: 'TaskDef') -> str:
     """Return a completion expression for this task definition.
 
@@ -346,8 +375,14 @@ class TaskOutputs:
         else:
             # normal use e.g. from within the scheduler
             self._completion_expression = get_completion_expression(tdef)
-            for trigger, (message, _required) in tdef.outputs.items():
-                self.add(trigger, message)
+            # (the output maps are shared between tasks of the same outputs)
+            self._message_to_trigger, self._message_to_compvar = (
+                get_output_maps(tuple(
+                    (trigger, message)
+                    for trigger, (message, _required) in tdef.outputs.items()
+                ))
+            )
+            self._completed = dict.fromkeys(self._message_to_trigger, False)
 
     def add(self, trigger: str, message: str) -> None:
         """Register a new output.
@@ -357,10 +392,14 @@ class TaskOutputs:
         where TaskOutputs are used outside of the scheduler where there is no
         TaskDef object handy so outputs must be listed manually.
         """
-        self._message_to_trigger[message] = trigger
-        self._message_to_compvar[message] = trigger_to_completion_variable(
-            trigger
-        )
+        # (copy the maps, they may be shared with other tasks)
+        self._message_to_trigger = {
+            **self._message_to_trigger, message: trigger
+        }
+        self._message_to_compvar = {
+            **self._message_to_compvar,
+            message: trigger_to_completion_variable(trigger),
+        }
         self._completed[message] = False
 
     def get_trigger(self, message: str) -> str:
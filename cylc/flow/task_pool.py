@@ -62,6 +62,7 @@ from cylc.flow.run_modes.skip import process_outputs as get_skip_mode_outputs
 from cylc.flow.task_action_timer import (
     TaskActionTimer,
     TimerFlags,
+    TimerQueue,
 )
 from cylc.flow.task_events_mgr import (
     CustomTaskEventHandlerContext,
@@ -70,6 +71,10 @@ from cylc.flow.task_events_mgr import (
     TaskJobLogsRetrieveContext,
 )
 from cylc.flow.task_id import TaskID
+from cylc.flow.task_pool_index import (
+    TaskPoolIndex,
+    sort_tasks,
+)
 from cylc.flow.task_outputs import (
     TASK_OUTPUT_EXPIRED,
     TASK_OUTPUT_FAILED,
@@ -88,6 +93,7 @@ from cylc.flow.task_state import (
     TASK_STATUS_WAITING,
     TASK_STATUSES_ACTIVE,
     TASK_STATUSES_FINAL,
+    TASK_STATUSES_NEVER_ACTIVE,
     status_geq,
 )
 from cylc.flow.task_trigger import TaskTrigger
@@ -108,7 +114,10 @@ if TYPE_CHECKING:
     )
     from cylc.flow.prerequisite import SatisfiedState
     from cylc.flow.task_events_mgr import TaskEventsManager
-    from cylc.flow.taskdef import TaskDef
+    from cylc.flow.taskdef import (
+        TaskDef,
+        TaskTuple,
+    )
     from cylc.flow.workflow_db_mgr import WorkflowDatabaseManager
     from cylc.flow.xtrigger_mgr import XtriggerManager
 
@@ -196,6 +205,22 @@ class TaskPool:
         self.active_tasks_changed = False
         self.tasks_removed = False
 
+        # Secondary indexes of the active tasks.
+        self.index = TaskPoolIndex(
+            lambda itask, label: (
+                self.xtrigger_mgr.get_xtrig_ctx(itask, label).get_signature()
+            )
+        )
+
+        # Tasks which have changed since the pool was last examined by the
+        # main loop (used by the event-driven main loop).
+        self.dirty_tasks: Set[TaskProxy] = set()
+        # Waiting tasks which need to be examined on every main loop
+        # iteration because they have unsatisfied xtriggers or ext-triggers.
+        self.trigger_watch_tasks: Set[TaskProxy] = set()
+        # IDs of tasks which could become late, by late time.
+        self.late_timer_queue: TimerQueue[str] = TimerQueue()
+
         self.hold_point: Optional['PointBase'] = None
         self.abs_outputs_done: Set[Tuple[str, str, str]] = set()
 
@@ -241,8 +266,17 @@ class TaskPool:
     def _swap_out(self, itask):
         """Swap old task for new, during reload."""
         if itask.identity in self.active_tasks.get(itask.point, set()):
+            old_itask = self.active_tasks[itask.point][itask.identity]
+            old_itask.state_listener = None
+            self.index.remove(old_itask)
+            self.dirty_tasks.discard(old_itask)
+            self.trigger_watch_tasks.discard(old_itask)
             self.active_tasks[itask.point][itask.identity] = itask
             self.active_tasks_changed = True
+            self.index.add(itask)
+            itask.state_listener = self.task_changed
+            self.dirty_tasks.add(itask)
+            self.update_late_timer(itask)
 
     def load_from_point(self):
         """Load the task pool for the workflow start point.
@@ -277,6 +311,10 @@ class TaskPool:
             return None
         self.active_tasks[itask.point][itask.identity] = itask
         self.active_tasks_changed = True
+        self.index.add(itask)
+        itask.state_listener = self.task_changed
+        self.dirty_tasks.add(itask)
+        self.update_late_timer(itask)
         LOG.debug(f"[{itask}] added to the n=0 window")
 
         self.create_data_store_elements(itask)
@@ -314,10 +352,8 @@ class TaskPool:
         # tasks can cause the task pool to change size during iteration.
         release_me = [
             itask
-            for point, itask_id_map in self.active_tasks.items()
-            for itask in itask_id_map.values()
-            if point <= self.runahead_limit_point
-            if itask.state.is_runahead
+            for itask in sort_tasks(self.index.runahead)
+            if itask.point <= self.runahead_limit_point
         ]
 
         for itask in release_me:
@@ -504,8 +540,9 @@ class TaskPool:
         if not flow_nums:
             return False
 
+        pri_dao = self.workflow_db_mgr.get_open_pri_dao()
         for task_outputs, task_flow_nums in (
-            self.workflow_db_mgr.pri_dao.select_task_outputs(task, cycle)
+            pri_dao.select_task_outputs(task, cycle)
         ).items():
             # loop through matching tasks
             # (if task_flow_nums is empty, it means the 'none' flow)
@@ -591,6 +628,7 @@ class TaskPool:
                     itask.set_summary_time('started', time_run)
                 if timeout is not None:
                     itask.timeout = timeout
+                    self.task_events_mgr.queue_job_timers(itask)
             elif status == TASK_STATUS_PREPARING:
                 # put back to be readied again.
                 status = TASK_STATUS_WAITING
@@ -615,10 +653,9 @@ class TaskPool:
 
             # Update prerequisite satisfaction status from DB
             sat = {}
+            pri_dao = self.workflow_db_mgr.get_open_pri_dao()
             for prereq_name, prereq_cycle, prereq_output_msg, satisfied in (
-                self.workflow_db_mgr.pri_dao.select_task_prerequisites(
-                    cycle, name, flow_nums,
-                )
+                pri_dao.select_task_prerequisites(cycle, name, flow_nums)
             ):
                 # Prereq satisfaction as recorded in the DB.
                 sat[
@@ -710,6 +747,7 @@ class TaskPool:
                 return
             itask.poll_timer = TaskActionTimer(
                 ctx, delays, num, delay, timeout)
+            self.task_events_mgr.queue_job_timers(itask)
         elif ctx_key[0] == "try_timers":
             itask = self._get_task_by_id(id_)
             if itask is None:
@@ -758,7 +796,7 @@ class TaskPool:
         database."""
         self.tasks_to_hold.update(
             (name, get_point(cycle)) for name, cycle in
-            self.workflow_db_mgr.pri_dao.select_tasks_to_hold()
+            self.workflow_db_mgr.get_open_pri_dao().select_tasks_to_hold()
         )
 
     def rh_release_and_queue(self, itask) -> None:
@@ -919,6 +957,11 @@ class TaskPool:
             )
             self.tasks_removed = True
             self.active_tasks_changed = True
+            itask.state_listener = None
+            self.index.remove(itask)
+            self.dirty_tasks.discard(itask)
+            self.trigger_watch_tasks.discard(itask)
+            self.late_timer_queue.remove(itask.identity)
             if not self.active_tasks[itask.point]:
                 del self.active_tasks[itask.point]
             self.task_queue_mgr.remove_task(itask)
@@ -967,6 +1010,119 @@ class TaskPool:
             ]
         return self._active_tasks_list
 
+    def task_changed(self, itask: TaskProxy) -> None:
+        """Re-index a task and record it as changed since last examined.
+
+        This is the state listener of every task proxy in the pool.
+        """
+        self.index.update(itask)
+        self.dirty_tasks.add(itask)
+        self.update_late_timer(itask)
+
+    def update_late_timer(self, itask: TaskProxy) -> None:
+        """Queue a task for the late check if it could become late.
+
+        (Tasks can only become late before they are active.)
+        """
+        if (
+            not itask.is_late
+            and itask.state(*TASK_STATUSES_NEVER_ACTIVE)
+            and itask.get_late_time()
+        ):
+            self.late_timer_queue.add(itask.identity, itask.get_late_time())
+        else:
+            self.late_timer_queue.remove(itask.identity)
+
+    def get_late_tasks(self, now: float) -> List[TaskProxy]:
+        """Return tasks which have become late (and are not yet flagged).
+
+        Only tasks which are due in the late timer queue are checked.
+        """
+        itasks = []
+        for task_id in self.late_timer_queue.pop_due(now):
+            itask = self._get_task_by_id(task_id)
+            if (
+                itask is not None
+                and not itask.is_late
+                and itask.state(*TASK_STATUSES_NEVER_ACTIVE)
+            ):
+                itasks.append(itask)
+        return itasks
+
+    def get_tasks_to_examine(self, full: bool = True) -> List[TaskProxy]:
+        """Return tasks the main loop should check for readiness.
+
+        Args:
+            full:
+                If True return every waiting task which is not queued or
+                runahead limited, otherwise return only tasks which have
+                changed since the last call, plus any tasks waiting on
+                xtriggers or external triggers.
+
+        Either way, the record of changed tasks is cleared.
+
+        """
+        if full:
+            itasks = sort_tasks(
+                self.index.by_status[TASK_STATUS_WAITING]
+                - self.index.queued
+                - self.index.runahead
+            )
+        else:
+            itasks = sort_tasks(self.dirty_tasks | self.trigger_watch_tasks)
+        self.dirty_tasks.clear()
+        return itasks
+
+    def get_tasks_by_status(self, *statuses: str) -> List[TaskProxy]:
+        """Return tasks in the pool with any of the given statuses."""
+        return sort_tasks(
+            itask
+            for status in statuses
+            for itask in self.index.by_status[status]
+        )
+
+    def get_tasks_by_name(self, name: str) -> List[TaskProxy]:
+        """Return all instances of the named task in the pool."""
+        return sort_tasks(self.index.by_name.get(name, ()))
+
+    def get_xtrigger_signatures(self) -> Set[str]:
+        """Return signatures of all xtriggers that tasks are waiting on."""
+        return set(self.index.by_xtrigger)
+
+    def get_updated_tasks(self) -> List[TaskProxy]:
+        """Return tasks whose state has been updated (is_updated)."""
+        return list(self.index.updated)
+
+    def get_held_tasks(self) -> List[TaskProxy]:
+        """Return held tasks in the pool."""
+        return sort_tasks(self.index.held)
+
+    def clear_updated_tasks(self, itasks: Iterable[TaskProxy]) -> None:
+        """Reset the is_updated flag of the given tasks."""
+        for itask in itasks:
+            itask.state.is_updated = False
+            self.index.update(itask)
+
+    def update_trigger_watch(self, itask: TaskProxy) -> None:
+        """Watch a task if waiting on xtriggers or external triggers.
+
+        Watched tasks are returned by every call to get_tasks_to_examine
+        until they no longer qualify.
+        """
+        if (
+            itask.state(
+                TASK_STATUS_WAITING, is_queued=False, is_runahead=False
+            )
+            and not itask.transient
+            and (
+                not itask.state.xtriggers_all_satisfied()
+                or not itask.state.external_triggers_all_satisfied()
+            )
+        ):
+            self.trigger_watch_tasks.add(itask)
+        else:
+            self.trigger_watch_tasks.discard(itask)
+
     def get_task_ids(self) -> Set[str]:
         """Return a list of task IDs in the task pool."""
         return {itask.identity for itask in self.get_tasks()}
@@ -988,10 +1144,7 @@ class TaskPool:
 
     def _get_task_by_id(self, id_: str) -> Optional[TaskProxy]:
         """Return pool task by ID if it exists, or None."""
-        for itask_ids in self.active_tasks.values():
-            if id_ in itask_ids:
-                return itask_ids[id_]
-        return None
+        return self.index.by_id.get(id_)
 
     def get_itasks(self, ids: 'Iterable[Tokens]') -> List[TaskProxy]:
         """Return a list of itasks matching the IDs provided.
@@ -1003,10 +1156,11 @@ class TaskPool:
             A list of an active tasks matching these IDs.
 
         """
+        by_id = self.index.by_id
         return [
-            itasks[id_]
-            for itasks in self.active_tasks.values()
-            for id_ in itasks.keys() & {id_.relative_id for id_ in ids}
+            by_id[id_]
+            for id_ in dict.fromkeys(tokens.relative_id for tokens in ids)
+            if id_ in by_id
         ]
 
     def queue_task(self, itask: TaskProxy) -> None:
@@ -1038,22 +1192,22 @@ class TaskPool:
         # entered the PREPARING state
         pre_prep_tasks = []
 
-        for itask in self.get_tasks():
-            # populate active_task_counter and pre_prep_tasks together to
-            # avoid iterating the task pool twice
-            if itask.waiting_on_job_prep:
-                # a task which has entered the submission pipeline
-                # for the purposes of queue limiting this should be treated
-                # the same as an active task
-                active_task_counter.update([itask.tdef.name])
-                pre_prep_tasks.append(itask)
-            elif itask.state(
-                TASK_STATUS_PREPARING,
-                TASK_STATUS_SUBMITTED,
-                TASK_STATUS_RUNNING,
-            ):
-                # an active task
-                active_task_counter.update([itask.tdef.name])
+        for itask in sort_tasks(self.index.waiting_on_job_prep):
+            # a task which has entered the submission pipeline
+            # for the purposes of queue limiting this should be treated
+            # the same as an active task
+            active_task_counter.update([itask.tdef.name])
+            pre_prep_tasks.append(itask)
+
+        for status in (
+            TASK_STATUS_PREPARING,
+            TASK_STATUS_SUBMITTED,
+            TASK_STATUS_RUNNING,
+        ):
+            for itask in self.index.by_status[status]:
+                if not itask.waiting_on_job_prep:
+                    # an active task
+                    active_task_counter.update([itask.tdef.name])
 
         return active_task_counter, pre_prep_tasks
 
@@ -1241,10 +1395,9 @@ class TaskPool:
         ):
             self.runahead_limit_point = stop_point
             # Now handle existing waiting tasks (e.g. xtriggered).
-            for itask in self.get_tasks():
+            for itask in self.get_tasks_by_status(TASK_STATUS_WAITING):
                 if (
                     itask.point > stop_point
-                    and itask.state(TASK_STATUS_WAITING)
                     and itask.state_reset(is_runahead=True)
                 ):
                     self.data_store_mgr.delta_task_state(itask)
@@ -1307,9 +1460,7 @@ class TaskPool:
     def log_incomplete_tasks(self) -> bool:
         """Log finished but incomplete tasks; return True if there any."""
         incomplete = []
-        for itask in self.get_tasks():
-            if not itask.state(*TASK_STATUSES_FINAL):
-                continue
+        for itask in self.get_tasks_by_status(*TASK_STATUSES_FINAL):
             if not itask.state.outputs.is_complete():
                 incomplete.append(
                     (
@@ -1374,15 +1525,15 @@ class TaskPool:
           - runahead-limited tasks (held back by the above)
         """
         if any(
-            itask.state(
-                *TASK_STATUSES_ACTIVE,
-                TASK_STATUS_PREPARING
-            ) or (
-                itask.state(TASK_STATUS_WAITING)
-                and not itask.state.is_runahead
-                # (avoid waiting pre-spawned absolute-triggered tasks:)
-                and itask.prereqs_are_satisfied()
-            ) for itask in self.get_tasks()
+            self.index.by_status[status]
+            for status in (*TASK_STATUSES_ACTIVE, TASK_STATUS_PREPARING)
+        ) or any(
+            # (avoid waiting pre-spawned absolute-triggered tasks:)
+            itask.prereqs_are_satisfied()
+            for itask in (
+                self.index.by_status[TASK_STATUS_WAITING]
+                - self.index.runahead
+            )
         ):
             return False
 
@@ -1463,7 +1614,7 @@ class TaskPool:
     def release_hold_point(self) -> None:
         """Unset the workflow hold point and release all held active tasks."""
         self.hold_point = None
-        for itask in self.get_tasks():
+        for itask in self.get_held_tasks():
             self.release_held_active_task(itask)
         self.tasks_to_hold.clear()
         self.workflow_db_mgr.put_tasks_to_hold(self.tasks_to_hold)
@@ -1521,16 +1672,66 @@ class TaskPool:
             # task has begun submission -> clear all xtriggers
             self.xtrigger_mgr.force_satisfy_all(itask, log=False)
 
-        suicide = []
+        suicide = self.spawn_children(itask, output, children)
+
+        for c_task in suicide:
+            if self.config.experimental.expire_triggers:
+                self.task_queue_mgr.remove_task(c_task)
+                self.task_events_mgr.process_message(
+                    c_task, logging.WARNING, TASK_OUTPUT_EXPIRED
+                )
+            else:
+                self.remove(c_task, self.__class__.SUICIDE_MSG)
+
+        if suicide:
+            # Update DB now in case of very quick respawn attempt.
+            # See https://github.com/cylc/cylc-flow/issues/6066
+            self.workflow_db_mgr.process_queued_ops()
+
+        self.remove_if_complete(itask, output)
+
+    def spawn_children(
+        self,
+        itask: TaskProxy,
+        output: str,
+        children: 'Iterable[TaskTuple]',
+    ) -> List[TaskProxy]:
+        """Spawn and satisfy the children of an output, in one pass.
+
+        Children which are already in the pool are updated, others are
+        spawned (if the parent belongs to a flow), satisfied, and then added
+        to the pool (which creates their data store elements, with their
+        prerequisites, so no separate prerequisite delta is required).
+
+        For absolute outputs, every instance of the child in the pool is
+        updated.
+
+        Args:
+            itask: The parent task.
+            output: The completed output.
+            children: The children of the output (see
+                TaskProxy.graph_children).
+
+        Returns:
+            Children whose suicide prerequisites are all satisfied.
+
+        """
+        suicide: List[TaskProxy] = []
+        # the completed output, as satisfied in each child
+        outputs = [itask.tokens.duplicate(task_sel=output)]
+        by_id = self.index.by_id
+        abs_done = False
         for c_name, c_point, is_abs in children:
-            if is_abs:
+            if is_abs and not abs_done:
+                # record the absolute output once, for all its children
+                abs_done = True
                 self.abs_outputs_done.add(
                     (str(itask.point), itask.tdef.name, output))
                 self.workflow_db_mgr.put_insert_abs_output(
                     str(itask.point), itask.tdef.name, output)
                 self.workflow_db_mgr.process_queued_ops()
 
-            c_task = self._get_task_by_id(quick_relative_id(c_point, c_name))
+            c_task = by_id.get(quick_relative_id(c_point, c_name))
             in_pool = c_task is not None
 
             if c_task is not None and c_task != itask:
@@ -1542,56 +1743,38 @@ class TaskPool:
                 # for an upcoming flow merge before spawning ... then spawn it.
                 c_task = self.spawn_task(c_name, c_point, itask.flow_nums)
 
-            tasks: List[TaskProxy]
-            if c_task is not None:
-                # Have child task, update its prerequisites.
-                if is_abs:
-                    matched, _unmatched = self.id_match(
-                        {TaskTokens(cycle='*', task=c_name)}
-                    )
-                    tasks = self.get_itasks(matched)
-                    if c_task not in tasks:
-                        tasks.append(c_task)
-                else:
-                    tasks = [c_task]
-
-                for t in tasks:
-                    t.satisfy_me(
-                        [itask.tokens.duplicate(task_sel=output)],
-                        mode=itask.run_mode
-                    )
-                    self.data_store_mgr.delta_task_prerequisite(t)
-                    if not in_pool:
-                        self.add_to_pool(t)
-
-                    if (
-                        self.runahead_limit_point is not None
-                        and t.point <= self.runahead_limit_point
-                    ):
-                        self.rh_release_and_queue(t)
-
-                    # Event-driven suicide.
-                    if (
-                        t.state.suicide_prerequisites and
-                        t.state.suicide_prerequisites_all_satisfied()
-                    ):
-                        suicide.append(t)
+            if c_task is None:
+                continue
 
-        for c_task in suicide:
-            if self.config.experimental.expire_triggers:
-                self.task_queue_mgr.remove_task(c_task)
-                self.task_events_mgr.process_message(
-                    c_task, logging.WARNING, TASK_OUTPUT_EXPIRED
+            # Have child task, update its prerequisites.
+            tasks: List[TaskProxy] = [c_task]
+            if is_abs:
+                tasks.extend(
+                    task
+                    for task in self.get_tasks_by_name(c_name)
+                    if task is not c_task
                 )
-            else:
-                self.remove(c_task, self.__class__.SUICIDE_MSG)
 
-        if suicide:
-            # Update DB now in case of very quick respawn attempt.
-            # See https://github.com/cylc/cylc-flow/issues/6066
-            self.workflow_db_mgr.process_queued_ops()
+            for t in tasks:
+                t.satisfy_me(outputs, mode=itask.run_mode)
+                if t is c_task and not in_pool:
+                    self.add_to_pool(t)
+                else:
+                    self.data_store_mgr.delta_task_prerequisite(t)
 
-        self.remove_if_complete(itask, output)
+                if (
+                    self.runahead_limit_point is not None
+                    and t.point <= self.runahead_limit_point
+                ):
+                    self.rh_release_and_queue(t)
+
+                # Event-driven suicide.
+                if (
+                    t.state.suicide_prerequisites and
+                    t.state.suicide_prerequisites_all_satisfied()
+                ):
+                    suicide.append(t)
+        return suicide
 
     def remove_if_complete(
         self, itask: TaskProxy, output: Optional[str] = None
@@ -1756,7 +1939,7 @@ class TaskPool:
         status: Optional[str] = None
         flow_wait = False
 
-        info = self.workflow_db_mgr.pri_dao.select_prev_instances(
+        info = self.workflow_db_mgr.get_open_pri_dao().select_prev_instances(
             name, str(point)
         )
         with suppress(ValueError):
@@ -1781,7 +1964,7 @@ class TaskPool:
 
         NOTE this creates a task_states/task_outputs DB entry if not present.
         """
-        info = self.workflow_db_mgr.pri_dao.select_task_outputs(
+        info = self.workflow_db_mgr.get_open_pri_dao().select_task_outputs(
             itask.tdef.name, str(itask.point))
         if not info:
             # task never ran before
@@ -2374,7 +2557,10 @@ class TaskPool:
         """
         return (
             set().union(*(itask.flow_nums for itask in self.get_tasks()))
-            or self.workflow_db_mgr.pri_dao.select_latest_flow_nums()
+            or (
+                self.workflow_db_mgr.get_open_pri_dao()
+                .select_latest_flow_nums()
+            )
             or {1}
         )
 
@@ -2456,18 +2642,16 @@ class TaskPool:
 
     def clock_expire_tasks(self):
         """Expire any tasks past their clock-expiry time."""
-        for itask in self.get_tasks():
+        # only waiting tasks can clock-expire
+        # see https://github.com/cylc/cylc-flow/issues/6025
+        # (note retrying tasks will be in the waiting state)
+        for itask in self.get_tasks_by_status(TASK_STATUS_WAITING):
             if (
                 # force triggered tasks can not clock-expire
                 # see proposal point 10:
                 # https://cylc.github.io/cylc-admin/proposal-optional-output-extension.html#proposal
                 not itask.is_manual_submit
 
-                # only waiting tasks can clock-expire
-                # see https://github.com/cylc/cylc-flow/issues/6025
-                # (note retrying tasks will be in the waiting state)
-                and itask.state(TASK_STATUS_WAITING)
-
                 # check if this task is clock expired
                 and itask.clock_expire()
             ):
@@ -0,0 +1,196 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Secondary indexes over the tasks in the task pool."""
+
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+)
+
+from cylc.flow.task_state import TASK_STATUSES_ORDERED
+
+
+if TYPE_CHECKING:
+    from cylc.flow.task_proxy import TaskProxy
+
+
+class _IndexKey(NamedTuple):
+    """The task attributes a task is currently indexed under."""
+
+    status: str
+    is_held: bool
+    is_queued: bool
+    is_runahead: bool
+    is_updated: bool
+    waiting_on_job_prep: bool
+    xtrigger_labels: FrozenSet[str]
+    xtrigger_sigs: FrozenSet[str]
+
+
+def sort_tasks(itasks: 'Iterable[TaskProxy]') -> 'List[TaskProxy]':
+    """Return tasks in a stable order (by cycle point then name)."""
+    return sorted(itasks, key=lambda itask: (itask.point, itask.tdef.name))
+
+
+class TaskPoolIndex:
+    """Incrementally maintained indexes of the tasks in the pool.
+
+    Tasks are indexed by ID, status, the held/queued/runahead/updated flags,
+    whether they are waiting on job preparation, name, and by the
+    signatures of their unsatisfied xtriggers. This allows common task pool
+    queries to be answered in time proportional to the size of the result
+    rather than the size of the pool.
+
+    Tasks must be re-indexed by calling "update" whenever these attributes
+    change; the task pool does this via the task proxy state listener.
+
+    Args:
+        get_xtrigger_sig:
+            Function returning the signature of a task's xtrigger, given
+            the task and xtrigger label.
+
+    """
+
+    def __init__(
+        self,
+        get_xtrigger_sig: 'Callable[[TaskProxy, str], str]',
+    ) -> None:
+        self.get_xtrigger_sig = get_xtrigger_sig
+        self.by_id: Dict[str, 'TaskProxy'] = {}
+        self.by_status: Dict[str, Set['TaskProxy']] = {
+            status: set() for status in TASK_STATUSES_ORDERED
+        }
+        self.by_name: Dict[str, Set['TaskProxy']] = {}
+        self.by_xtrigger: Dict[str, Set['TaskProxy']] = {}
+        self.held: Set['TaskProxy'] = set()
+        self.queued: Set['TaskProxy'] = set()
+        self.runahead: Set['TaskProxy'] = set()
+        self.updated: Set['TaskProxy'] = set()
+        self.waiting_on_job_prep: Set['TaskProxy'] = set()
+        self._keys: Dict['TaskProxy', _IndexKey] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, itask: 'TaskProxy') -> bool:
+        return itask in self._keys
+
+    def add(self, itask: 'TaskProxy') -> None:
+        """Add a task to the indexes."""
+        self.by_id[itask.identity] = itask
+        self.by_name.setdefault(itask.tdef.name, set()).add(itask)
+        self._keys[itask] = self._index(itask, self._get_key(itask))
+
+    def remove(self, itask: 'TaskProxy') -> None:
+        """Remove a task from the indexes (if present)."""
+        key = self._keys.pop(itask, None)
+        if key is None:
+            return
+        if self.by_id.get(itask.identity) is itask:
+            del self.by_id[itask.identity]
+        self._discard(self.by_name, itask.tdef.name, itask)
+        self._unindex(itask, key)
+
+    def update(self, itask: 'TaskProxy') -> None:
+        """Re-index a task after a change to its state."""
+        old_key = self._keys.get(itask)
+        if old_key is None:
+            # not in the index (e.g. a transient task)
+            return
+        new_key = self._get_key(itask, old_key)
+        if new_key != old_key:
+            self._unindex(itask, old_key)
+            self._keys[itask] = self._index(itask, new_key)
+
+    def _get_key(
+        self,
+        itask: 'TaskProxy',
+        old_key: Optional[_IndexKey] = None,
+    ) -> _IndexKey:
+        """Return the attributes a task should be indexed under.
+
+        Xtrigger signatures are only (re)computed if the set of unsatisfied
+        xtriggers has changed.
+        """
+        state = itask.state
+        xtrigger_labels = frozenset(
+            label for label, satisfied in state.xtriggers.items()
+            if not satisfied
+        )
+        if old_key is not None and old_key.xtrigger_labels == xtrigger_labels:
+            xtrigger_sigs = old_key.xtrigger_sigs
+        else:
+            xtrigger_sigs = frozenset(
+                self.get_xtrigger_sig(itask, label)
+                for label in xtrigger_labels
+            )
+        return _IndexKey(
+            state.status,
+            state.is_held,
+            state.is_queued,
+            state.is_runahead,
+            state.is_updated,
+            itask.waiting_on_job_prep,
+            xtrigger_labels,
+            xtrigger_sigs,
+        )
+
+    def _index(self, itask: 'TaskProxy', key: _IndexKey) -> _IndexKey:
+        self.by_status[key.status].add(itask)
+        for flag, index in self._flag_indexes(key):
+            if flag:
+                index.add(itask)
+        for sig in key.xtrigger_sigs:
+            self.by_xtrigger.setdefault(sig, set()).add(itask)
+        return key
+
+    def _unindex(self, itask: 'TaskProxy', key: _IndexKey) -> None:
+        self.by_status[key.status].discard(itask)
+        for flag, index in self._flag_indexes(key):
+            if flag:
+                index.discard(itask)
+        for sig in key.xtrigger_sigs:
+            self._discard(self.by_xtrigger, sig, itask)
+
+    def _flag_indexes(self, key: _IndexKey):
+        return (
+            (key.is_held, self.held),
+            (key.is_queued, self.queued),
+            (key.is_runahead, self.runahead),
+            (key.is_updated, self.updated),
+            (key.waiting_on_job_prep, self.waiting_on_job_prep),
+        )
+
+    @staticmethod
+    def _discard(
+        index: Dict[str, Set['TaskProxy']],
+        key: str,
+        itask: 'TaskProxy',
+    ) -> None:
+        """Remove a task from a keyed index, dropping empty entries."""
+        itasks = index.get(key)
+        if itasks is not None:
+            itasks.discard(itask)
+            if not itasks:
+                del index[key]
@@ -18,6 +18,7 @@
 
 from collections import Counter
 from fnmatch import fnmatchcase
+from sys import intern
 from time import time
 from typing import (
     TYPE_CHECKING,
@@ -140,6 +141,8 @@ class TaskProxy:
             Object representing the state of this task.
         .platform:
             Dict containing info for platform where latest job is submitted.
+            (The default, localhost, is only copied from the global config
+            when first used.)
         .tdef:
             The definition object of this task.
         .timeout:
@@ -166,6 +169,9 @@ class TaskProxy:
         .removed:
             A flag to indicate this task has been removed by command (used
             e.g. to disable failed/submit-failed event handlers).
+        .state_listener:
+            Called with this task proxy whenever its state, prerequisites or
+            triggers change (set by the task pool for tasks in the pool).
 
     Args:
         tdef: The definition object of this task.
@@ -203,15 +209,16 @@ class TaskProxy:
         'flow_nums',
         'flow_wait',
         'graph_children',
-        'platform',
+        '_platform',
         'timeout',
         'tokens',
         'try_timers',
-        'waiting_on_job_prep',
+        '_waiting_on_job_prep',
         'mode_settings',
         'transient',
         'is_xtrigger_sequential',
         'removed',
+        'state_listener',
     )
 
     def __init__(
@@ -244,7 +251,7 @@ class TaskProxy:
         self.flow_wait = flow_wait
         self.point = point
         self.tokens: TaskTokens = scheduler_tokens.duplicate(
-            cycle=str(self.point),
+            cycle=intern(str(self.point)),
             task=self.tdef.name,
         )
         self.identity = self.tokens.relative_id
@@ -263,16 +270,11 @@ class TaskProxy:
             'execution_time_limit': None,
             'job_runner_name': None,
             'submit_method_id': None,
-            'flow_nums': set(),
-            'flow_wait': self.flow_wait
         }
 
         self.local_job_file_path: Optional[str] = None
 
-        if data_mode:
-            self.platform = {}
-        else:
-            self.platform = get_platform()
+        self._platform: Optional[Dict[str, Any]] = {} if data_mode else None
 
         self.transient = transient
 
@@ -286,8 +288,9 @@ class TaskProxy:
         self.expire_time: Optional[float] = None
         self.late_time: Optional[float] = None
         self.is_late = is_late
-        self.waiting_on_job_prep = False
+        self._waiting_on_job_prep = False
         self.removed: bool = False
+        self.state_listener: Optional[Callable[['TaskProxy'], None]] = None
 
         self.state = TaskState(tdef, self.point, status, is_held)
 
@@ -317,6 +320,28 @@ class TaskProxy:
                 )
             )
 
+    @property
+    def platform(self) -> Dict[str, Any]:
+        if self._platform is None:
+            # (most tasks are not submitted for some time, if at all, so the
+            # default platform is not copied for every task)
+            self._platform = get_platform()
+        return self._platform
+
+    @platform.setter
+    def platform(self, value: Dict[str, Any]) -> None:
+        self._platform = value
+
+    @property
+    def waiting_on_job_prep(self) -> bool:
+        return self._waiting_on_job_prep
+
+    @waiting_on_job_prep.setter
+    def waiting_on_job_prep(self, value: bool) -> None:
+        if value != self._waiting_on_job_prep:
+            self._waiting_on_job_prep = value
+            self.notify_state_changed()
+
     @property
     def job_tokens(self) -> 'Tokens':
         """Return the job tokens for this task proxy."""
@@ -352,7 +377,7 @@ class TaskProxy:
         reload_successor.summary = self.summary
         reload_successor.local_job_file_path = self.local_job_file_path
         reload_successor.try_timers = self.try_timers
-        reload_successor.platform = self.platform
+        reload_successor._platform = self._platform
         reload_successor.job_vacated = self.job_vacated
         reload_successor.poll_timer = self.poll_timer
         reload_successor.timeout = self.timeout
@@ -569,10 +594,16 @@ class TaskProxy:
         ):
             if not silent and not self.transient:
                 LOG.info(f"[{before}] => {self.state}")
+            self.notify_state_changed()
             return True
 
         return False
 
+    def notify_state_changed(self) -> None:
+        """Tell the state listener (if any) that this task has changed."""
+        if self.state_listener is not None:
+            self.state_listener(self)
+
     def satisfy_me(
         self,
         task_messages: 'Iterable[Tokens]',
@@ -587,6 +618,7 @@ class TaskProxy:
             *self.state.prerequisites, *self.state.suicide_prerequisites
         ):
             prereq.satisfy_me(task_messages, mode=mode)
+        self.notify_state_changed()
 
     def force_satisfy(
         self, prereqs: 'Iterable[PrereqTuple]', set_all: bool = False
@@ -612,12 +644,14 @@ class TaskProxy:
                         f"[{self}] prerequisite already satisfied:"
                         f" {pre.get_id(True)}"
                     )
+        self.notify_state_changed()
 
     def force_satisfy_external_triggers(self):
         """Set all external triggers to satisfied - via 'cylc trigger'."""
         for ext in self.state.external_triggers:
             LOG.info(f'[{self}] external trigger force-satisfied: "{ext}"')
             self.state.external_triggers[ext] = True
+        self.notify_state_changed()
 
     def clock_expire(self) -> bool:
         """Return True if clock expire time is up, else False."""
@@ -0,0 +1,363 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""A local replica of a workflow's data store, kept up to date by deltas.
+
+Rather than re-issuing the whole GraphQL query every update, Tui subscribes
+to the deltas published by the scheduler and applies them to a local copy
+of the data store. The entire data store is only requested (via the
+"pb_entire_workflow" endpoint) to begin with, or if the replica's checksums
+no longer match those of the scheduler.
+
+The replica provides the workflow data in the same format as the GraphQL
+query (see cylc.flow.tui.data), only converting the elements which have
+changed since the last update.
+"""
+
+from copy import deepcopy
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+)
+
+from packaging.specifiers import SpecifierSet
+import zmq
+
+from cylc.flow.data_messages_pb2 import (
+    AllDeltas,
+    PbEntireWorkflow,
+)
+from cylc.flow.data_store_mgr import (
+    DATA_TEMPLATE,
+    EMPTY_CHECKSUM,
+    FAMILIES,
+    FAMILY_PROXIES,
+    JOBS,
+    TASK_PROXIES,
+    TASKS,
+    WORKFLOW,
+    apply_delta,
+    checksum_string,
+    generate_checksum,
+)
+from cylc.flow.exceptions import WorkflowStopped
+from cylc.flow.id import Tokens
+from cylc.flow.network.subscriber import WorkflowSubscriber
+
+if TYPE_CHECKING:
+    from cylc.flow.network.client import WorkflowRuntimeClient
+
+
+# scheduler versions whose deltas can be applied to a replica
+# (the data store checksums were changed at 8.7.0)
+DELTA_VERSIONS = SpecifierSet('>=8.7.dev')
+
+# the data store types which Tui uses
+REPLICA_TYPES = (WORKFLOW, TASKS, FAMILIES, FAMILY_PROXIES, TASK_PROXIES, JOBS)
+
+# the topics to subscribe to
+TOPIC_DELTAS = b'all'
+TOPIC_SHUTDOWN = b'shutdown'
+
+
+def get_job_data(job) -> dict:
+    """Return the Tui data for a job (see cylc.flow.tui.data._QUERY)."""
+    return {
+        'id': job.id,
+        'submitNum': job.submit_num,
+        'state': job.state,
+        'platform': job.platform,
+        'jobRunnerName': job.job_runner_name,
+        'jobId': job.job_id,
+        'startedTime': job.started_time,
+        'estimatedFinishTime': job.estimated_finish_time,
+        'finishedTime': job.finished_time,
+    }
+
+
+class WorkflowReplica:
+    """A local replica of a workflow's data store.
+
+    Args:
+        workflow_id:
+            The workflow ID (as used by Tui).
+
+    Usage:
+        * Call "connect" to subscribe to the workflow's deltas.
+        * Call "update" to apply any deltas received (and fetch the entire
+          data store if required).
+        * Call "get_data" to get the workflow data for Tui.
+
+    """
+
+    def __init__(self, workflow_id: str):
+        self.workflow_id = workflow_id
+        self.subscriber: Optional[WorkflowSubscriber] = None
+        # True if the entire data store needs to be requested
+        self.stale = True
+        # True if the workflow has sent the shutdown message
+        self.stopped = False
+        self.data: dict = deepcopy(DATA_TEMPLATE)
+        self.checksums: Dict[str, int] = {}
+        # the time of the most recent delta applied for each type
+        self.delta_times: Dict[str, float] = {}
+        # the Tui data for each element, converted as required
+        self._task_data: Dict[str, dict] = {}
+        self._family_data: Dict[str, dict] = {}
+        # {task proxy ID: task ID} and {task ID: {task proxy ID, ...}}
+        self._task_ids: Dict[str, str] = {}
+        self._proxies_by_task: Dict[str, Set[str]] = {}
+        # elements which have changed since the last "get_data"
+        self._changed_tasks: Set[str] = set()
+        self._changed_families: Set[str] = set()
+
+    def connect(self) -> None:
+        """Subscribe to the workflow's deltas.
+
+        Raises:
+            WorkflowStopped:
+                If the workflow is not running.
+
+        """
+        self.subscriber = WorkflowSubscriber(
+            Tokens(self.workflow_id)['workflow'],
+            topics={TOPIC_DELTAS, TOPIC_SHUTDOWN},
+        )
+
+    def stop(self) -> None:
+        """Unsubscribe from the workflow's deltas."""
+        if self.subscriber is not None:
+            self.subscriber.stop(stop_loop=False)
+            self.subscriber = None
+
+    async def update(self, client: 'WorkflowRuntimeClient') -> None:
+        """Apply the deltas received since the last update.
+
+        The entire data store is requested if the replica is new, or if
+        its checksums no longer match those of the workflow.
+
+        Raises:
+            WorkflowStopped:
+                If the workflow has shut down.
+
+        """
+        if self.subscriber is None:
+            self.connect()
+        while not self.stopped:
+            try:
+                topic, msg = await (
+                    self.subscriber.socket.recv_multipart(  # type: ignore
+                        flags=zmq.NOBLOCK
+                    )
+                )
+            except zmq.Again:
+                break
+            if topic == TOPIC_SHUTDOWN:
+                self.stopped = True
+            elif not self.stale:
+                self.apply_deltas(AllDeltas.FromString(msg))
+        if self.stopped:
+            raise WorkflowStopped(self.workflow_id)
+        if self.stale:
+            self.load(
+                PbEntireWorkflow.FromString(
+                    await client.async_request('pb_entire_workflow')
+                )
+            )
+
+    def load(self, entire_workflow: PbEntireWorkflow) -> None:
+        """Replace the replica's data with the entire data store."""
+        self.data = deepcopy(DATA_TEMPLATE)
+        self.data[WORKFLOW].CopyFrom(entire_workflow.workflow)
+        for key in REPLICA_TYPES:
+            if key == WORKFLOW:
+                continue
+            self.data[key] = {
+                element.id: element
+                for element in getattr(entire_workflow, key)
+            }
+            self.checksums[key] = generate_checksum(
+                checksum_string(key, element)
+                for element in self.data[key].values()
+            )
+        # deltas from before the snapshot have already been applied
+        self.delta_times = dict.fromkeys(
+            REPLICA_TYPES, entire_workflow.workflow.last_updated
+        )
+        self._task_data.clear()
+        self._family_data.clear()
+        self._task_ids.clear()
+        self._proxies_by_task.clear()
+        self._changed_tasks = set(self.data[TASK_PROXIES])
+        self._changed_families = set(self.data[FAMILY_PROXIES])
+        self.stale = False
+
+    def apply_deltas(self, all_deltas: AllDeltas) -> None:
+        """Apply published deltas to the replica.
+
+        If the resulting checksums do not match those of the workflow, the
+        replica is marked as stale.
+        """
+        for key in REPLICA_TYPES:
+            if not all_deltas.HasField(key):
+                continue
+            delta = getattr(all_deltas, key)
+            if delta.time < self.delta_times.get(key, 0):
+                continue
+            if delta.reloaded:
+                # the workflow has been reloaded, start again
+                self.stale = True
+                return
+            self.delta_times[key] = delta.time
+            self._record_changes(key, delta)
+            apply_delta(key, delta, self.data, self.checksums)
+            if (
+                key != WORKFLOW
+                and delta.checksum != self.checksums.get(key, EMPTY_CHECKSUM)
+            ):
+                self.stale = True
+
+    def _record_changes(self, key: str, delta) -> None:
+        """Record the elements changed by a delta."""
+        if key == TASK_PROXIES:
+            self._changed_tasks.update(self._get_ids(delta))
+        elif key == FAMILY_PROXIES:
+            self._changed_families.update(self._get_ids(delta))
+        elif key == JOBS:
+            # a job is displayed as part of its task
+            self._changed_tasks.update(
+                job_id.rsplit('/', 1)[0] for job_id in self._get_ids(delta)
+            )
+        elif key == TASKS:
+            for task_id in self._get_ids(delta):
+                self._changed_tasks.update(
+                    self._proxies_by_task.get(task_id, ())
+                )
+
+    @staticmethod
+    def _get_ids(delta) -> Iterable[str]:
+        """Return the IDs of the elements added, updated or pruned."""
+        yield from (element.id for element in delta.added)
+        yield from (element.id for element in delta.updated)
+        yield from delta.pruned
+
+    def get_data(self, task_states: Iterable[str]) -> dict:
+        """Return the workflow data in the format of the Tui GraphQL query.
+
+        Args:
+            task_states:
+                Only return tasks in these states.
+
+        """
+        self._update_task_data()
+        self._update_family_data()
+        workflow = self.data[WORKFLOW]
+        task_states = set(task_states)
+        family_proxies: List[dict] = []
+        cycle_points: List[dict] = []
+        for family in self._family_data.values():
+            if family['name'] == 'root':
+                cycle_points.append(family)
+            else:
+                family_proxies.append(family)
+        return {
+            'id': workflow.id,
+            'name': workflow.name,
+            'port': workflow.port,
+            'status': workflow.status,
+            'stateTotals': dict(workflow.state_totals),
+            'taskProxies': [
+                task
+                for task in self._task_data.values()
+                if task['state'] in task_states
+            ],
+            'familyProxies': family_proxies,
+            'cyclePoints': cycle_points,
+        }
+
+    def _get_first_parent(self, family_id: str) -> Optional[dict]:
+        family = self.data[FAMILY_PROXIES].get(family_id)
+        if family is None:
+            return None
+        return {'id': family.id, 'name': family.name}
+
+    def _update_task_data(self) -> None:
+        """Convert the task proxies which have changed."""
+        for tp_id in self._changed_tasks:
+            tproxy = self.data[TASK_PROXIES].get(tp_id)
+            self._task_data.pop(tp_id, None)
+            task_id = self._task_ids.pop(tp_id, None)
+            if task_id is not None:
+                self._proxies_by_task[task_id].discard(tp_id)
+            if tproxy is None:
+                continue
+            self._task_ids[tp_id] = tproxy.task
+            self._proxies_by_task.setdefault(tproxy.task, set()).add(tp_id)
+            task = self.data[TASKS].get(tproxy.task)
+            jobs = [
+                self.data[JOBS][job_id]
+                # (remove any duplicates)
+                for job_id in dict.fromkeys(tproxy.jobs)
+                if job_id in self.data[JOBS]
+            ]
+            jobs.sort(key=lambda job: job.submit_num, reverse=True)
+            self._task_data[tp_id] = {
+                'id': tproxy.id,
+                'name': tproxy.name,
+                'cyclePoint': tproxy.cycle_point,
+                'state': tproxy.state,
+                'isHeld': tproxy.is_held,
+                'isQueued': tproxy.is_queued,
+                'isRunahead': tproxy.is_runahead,
+                'isRetry': tproxy.is_retry,
+                'isWallclock': tproxy.is_wallclock,
+                'isXtriggered': tproxy.is_xtriggered,
+                'flowNums': tproxy.flow_nums,
+                'firstParent': self._get_first_parent(tproxy.first_parent),
+                'jobs': [get_job_data(job) for job in jobs],
+                'task': {
+                    'meanElapsedTime': (
+                        task.mean_elapsed_time if task is not None else None
+                    ),
+                },
+            }
+        self._changed_tasks.clear()
+
+    def _update_family_data(self) -> None:
+        """Convert the family proxies which have changed."""
+        for fp_id in self._changed_families:
+            family = self.data[FAMILY_PROXIES].get(fp_id)
+            if family is None:
+                self._family_data.pop(fp_id, None)
+                continue
+            self._family_data[fp_id] = {
+                'id': family.id,
+                'name': family.name,
+                'cyclePoint': family.cycle_point,
+                'state': family.state,
+                'isHeld': family.is_held,
+                'isQueued': family.is_queued,
+                'isRunahead': family.is_runahead,
+                'isRetry': family.is_retry,
+                'isWallclock': family.is_wallclock,
+                'isXtriggered': family.is_xtriggered,
+                'firstParent': self._get_first_parent(family.first_parent),
+            }
+        self._changed_families.clear()
@@ -51,8 +51,13 @@ from cylc.flow.tui.data import (
     VersionIncompat,
     get_query,
 )
+from cylc.flow.tui.replica import (
+    DELTA_VERSIONS,
+    WorkflowReplica,
+)
 from cylc.flow.tui.util import (
     NaturalSort,
+    TreeCache,
     compute_tree,
     suppress_logging,
 )
@@ -118,7 +123,10 @@ class Updater():
     """The bit of Tui which provides the data.
 
     It lists workflows using the "scan" interface, and provides detail using
-    the "GraphQL" interface.
+    a replica of each workflow's data store which is kept up to date by the
+    deltas the workflow publishes (see WorkflowReplica). For older
+    workflows, which do not publish compatible deltas, the detail is
+    requested using the "GraphQL" interface every update.
 
     """
 
@@ -134,6 +142,10 @@ class Updater():
     def __init__(self, client_timeout=3):
         # Cylc comms clients for each workflow we're connected to
         self._clients = {}
+        # data store replicas for each workflow we're connected to
+        self._replicas = {}
+        # tree nodes from the last update, reused where nothing has changed
+        self._tree_cache = TreeCache()
 
         # iterate over this to get a list of workflows
         self._scan_pipe = None
@@ -197,6 +209,13 @@ class Updater():
     def _unsubscribe(self, w_id):
         if w_id in self._clients:
             self._clients.pop(w_id)
+        self._drop_replica(w_id)
+
+    def _drop_replica(self, w_id):
+        """Stop and remove the data store replica for a workflow."""
+        replica = self._replicas.pop(w_id, None)
+        if replica:
+            replica.stop()
 
     def _update_filters(self, filters):
         if (
@@ -225,6 +244,8 @@ class Updater():
         while not self._command_queue.empty():
             (command, payload) = self._command_queue.get()
             if command == self.SIGNAL_TERMINATE:
+                for w_id in list(self._replicas):
+                    self._drop_replica(w_id)
                 return command
             getattr(self, command)(payload)
 
@@ -262,7 +283,11 @@ class Updater():
         # are any task state filters active?
         task_filters_active = not all(self.filters['tasks'].values())
 
-        return compute_tree(data, prune_families=task_filters_active)
+        return compute_tree(
+            data,
+            prune_families=task_filters_active,
+            cache=self._tree_cache,
+        )
 
     async def _update_workflow(self, w_id, client, data):
         if not client:
@@ -270,28 +295,37 @@ class Updater():
             # e.g. workflow is shut down
             return
 
+        # list of task states we want to see
+        task_states = [
+            state
+            for state, is_on in self.filters['tasks'].items()
+            if is_on
+        ]
         try:
-            # get a graphql query compatible with this workflow
-            query = get_query(client.scheduler_version)
-
-            # fetch the data from the workflow
-            workflow_update = await client.async_request(
-                'graphql',
-                {
-                    'request_string': query,
-                    'variables': {
-                        # list of task states we want to see
-                        'taskStates': [
-                            state
-                            for state, is_on in self.filters['tasks'].items()
-                            if is_on
-                        ]
+            if client.scheduler_version in DELTA_VERSIONS:
+                # apply the deltas the workflow has published
+                if w_id not in self._replicas:
+                    self._replicas[w_id] = WorkflowReplica(w_id)
+                replica = self._replicas[w_id]
+                await replica.update(client)
+                workflow_data = replica.get_data(task_states)
+            else:
+                # get a graphql query compatible with this workflow
+                query = get_query(client.scheduler_version)
+
+                # fetch the data from the workflow
+                workflow_update = await client.async_request(
+                    'graphql',
+                    {
+                        'request_string': query,
+                        'variables': {'taskStates': task_states},
                     }
-                }
-            )
+                )
+                workflow_data = workflow_update['workflows'][0]
         except WorkflowStopped:
             # remove the client on any error, we'll reconnect next time
             self._clients[w_id] = None
+            self._drop_replica(w_id)
             for workflow in data['workflows']:
                 if workflow['id'] == w_id:
                     break
@@ -306,6 +340,7 @@ class Updater():
                 })
         except ClientTimeout:
             self._clients[w_id] = None
+            self._drop_replica(w_id)
             set_message(
                 data,
                 w_id,
@@ -322,10 +357,10 @@ class Updater():
             # something went wrong :(
             # remove the client on any error, we'll reconnect next time
             self._clients[w_id] = None
+            self._drop_replica(w_id)
             set_message(data, w_id, exc)
         else:
             # the data arrived, add it to the update
-            workflow_data = workflow_update['workflows'][0]
             for workflow in data['workflows']:
                 if workflow['id'] == workflow_data['id']:
                     workflow.update(workflow_data)
@@ -201,7 +201,28 @@ def idpop(id_):
     return tokens.id
 
 
-def compute_tree(data: dict, prune_families: bool = False) -> Node:
+class TreeCache:
+    """Nodes computed by compute_tree, kept for reuse in the next update.
+
+    A task whose data has not changed (i.e. is the same object, as with the
+    data from a WorkflowReplica) keeps its node, and the children of a node
+    are only sorted if they have changed.
+    """
+
+    def __init__(self):
+        # {workflow ID: {task ID: task node}}
+        self.tasks: Dict[str, Dict[str, Node]] = {}
+        # {workflow ID: {node ID: sorted child IDs}}
+        self.orders: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        # {workflow ID: {node ID: sort key}}
+        self.sort_keys: Dict[str, Dict[str, 'NaturalSort']] = {}
+
+
+def compute_tree(
+    data: dict,
+    prune_families: bool = False,
+    cache: Optional[TreeCache] = None,
+) -> Node:
     """Digest GraphQL data to produce a tree.
 
     Args:
@@ -210,19 +231,30 @@ def compute_tree(data: dict, prune_families: bool = False) -> Node:
         prune_families:
             If True any empty families will be removed from the tree.
             Turn this on if task state filters are active.
+        cache:
+            Nodes from the previous call to reuse where the data has not
+            changed. This is updated with the nodes from this call.
 
     """
     root_node: Node = add_node('root', 'root', create_node_store(), data={})
+    if cache is None:
+        cache = TreeCache()
+    tasks_cache: Dict[str, Dict[str, Node]] = {}
+    orders_cache: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+    sort_keys_cache: Dict[str, Dict[str, 'NaturalSort']] = {}
 
     for flow in data['workflows']:
         nodes: NodeStore = create_node_store()  # nodes for this workflow
         flow_node = add_node(
             'workflow', flow['id'], nodes, data=flow)
         root_node['children'].append(flow_node)
+        prev_tasks = cache.tasks.get(flow['id'], {})
 
         # populate cycle nodes
         for cycle in flow.get('cyclePoints', []):
-            cycle['id'] = idpop(cycle['id'])  # strip the family off of the id
+            # strip the family off of the id
+            # (copy the data, it may be reused for future updates)
+            cycle = {**cycle, 'id': idpop(cycle['id'])}
             cycle_node = add_node('cycle', cycle['id'], nodes, data=cycle)
             flow_node['children'].append(cycle_node)
 
@@ -253,8 +285,12 @@ def compute_tree(data: dict, prune_families: bool = False) -> Node:
             # during/after API query resolution. So ignore.
             if not task['firstParent']:
                 continue
-            task_node = add_node(
-                'task', task['id'], nodes, data=task)
+            task_node = prev_tasks.get(task['id'])
+            if task_node is not None and task_node['data'] is task:
+                # the task has not changed, reuse its node (and job nodes)
+                nodes['task'][task['id']] = task_node
+            else:
+                task_node = _add_task_node(task, nodes)
             if task['firstParent']['name'] == 'root':
                 family_node = add_node(
                     'cycle', idpop(task['id']), nodes)
@@ -262,26 +298,22 @@ def compute_tree(data: dict, prune_families: bool = False) -> Node:
                 family_node = add_node(
                     'family', task['firstParent']['id'], nodes)
             family_node['children'].append(task_node)
-            for job in task['jobs']:
-                job_node = add_node(
-                    'job', job['id'], nodes, data=job)
-                job_info_node = add_node(
-                    'job_info', job['id'] + '_info', nodes, data=job)
-                job_node['children'] = [job_info_node]
-                task_node['children'].append(job_node)
+
+        # sort
+        # (before pruning, so that the order can be reused whatever the
+        # filters)
+        orders_cache[flow['id']] = _sort_children(
+            nodes,
+            cache.orders.get(flow['id'], {}),
+            cache.sort_keys.get(flow['id'], {}),
+            sort_keys_cache.setdefault(flow['id'], {}),
+        )
+        tasks_cache[flow['id']] = nodes['task']
 
         # trim empty families / cycles (cycles are just "root" families)
         if prune_families:
             _prune_empty_families(nodes)
 
-        # sort
-        for type_ in ('workflow', 'cycle', 'family', 'job'):
-            for node in nodes[type_].values():
-                # NOTE: jobs are sorted by submit-num in the GraphQL query
-                node['children'].sort(
-                    key=lambda x: NaturalSort(x['id_'])
-                )
-
         # spring nodes
         if 'port' not in flow:
             # the "port" field is only available via GraphQL
@@ -297,9 +329,67 @@ def compute_tree(data: dict, prune_families: bool = False) -> Node:
                 )
             )
 
+    cache.tasks = tasks_cache
+    cache.orders = orders_cache
+    cache.sort_keys = sort_keys_cache
     return root_node
 
 
+def _add_task_node(task: dict, nodes: NodeStore) -> Node:
+    """Add a task node and its job nodes to the store."""
+    task_node = add_node('task', task['id'], nodes, data=task)
+    for job in task['jobs']:
+        job_node = add_node(
+            'job', job['id'], nodes, data=job)
+        job_info_node = add_node(
+            'job_info', job['id'] + '_info', nodes, data=job)
+        job_node['children'] = [job_info_node]
+        task_node['children'].append(job_node)
+    return task_node
+
+
+def _sort_children(
+    nodes: NodeStore,
+    prev_orders: Dict[str, Tuple[str, ...]],
+    prev_sort_keys: Dict[str, 'NaturalSort'],
+    sort_keys: Dict[str, 'NaturalSort'],
+) -> Dict[str, Tuple[str, ...]]:
+    """Sort the children of workflow, cycle and family nodes.
+
+    The children of a node are only sorted if they are not the same as
+    last time (prev_orders), otherwise the previous order is reused.
+
+    NOTE: jobs are sorted by submit-num in the GraphQL query.
+
+    Returns the sorted child IDs of each node.
+
+    """
+    orders: Dict[str, Tuple[str, ...]] = {}
+    for type_ in ('workflow', 'cycle', 'family'):
+        for node in nodes[type_].values():
+            children = node['children']
+            child_ids = tuple(child['id_'] for child in children)
+            # keep the sort keys of the current nodes for next time
+            for id_ in child_ids:
+                sort_keys[id_] = prev_sort_keys.get(id_) or NaturalSort(id_)
+            prev_order = prev_orders.get(node['id_'])
+            if (
+                prev_order is not None
+                and len(prev_order) == len(child_ids)
+                and set(prev_order) == set(child_ids)
+            ):
+                # the children have not changed, reuse the previous order
+                by_id = dict(zip(child_ids, children))
+                children[:] = [by_id[id_] for id_ in prev_order]
+                orders[node['id_']] = prev_order
+            else:
+                children.sort(key=lambda x: sort_keys[x['id_']])
+                orders[node['id_']] = tuple(
+                    child['id_'] for child in children
+                )
+    return orders
+
+
 def _prune_empty_families(nodes: NodeStore) -> None:
     """Prune empty families from the tree.
 
@@ -24,6 +24,7 @@ This module provides the logic to:
 """
 
 from collections import defaultdict
+from contextlib import suppress
 import json
 import os
 from shutil import (
@@ -38,11 +39,13 @@ from typing import (
     AnyStr,
     DefaultDict,
     Dict,
+    Iterable,
     List,
     Optional,
     Set,
     Tuple,
     Union,
+    cast,
 )
 
 from packaging.version import parse as parse_version
@@ -56,7 +59,10 @@ from cylc.flow.exceptions import (
     CylcError,
     ServiceFileError,
 )
-from cylc.flow.rundb import CylcWorkflowDAO
+from cylc.flow.rundb import (
+    CylcWorkflowDAO,
+    DatabaseProfile,
+)
 from cylc.flow.task_outputs import TASK_OUTPUT_SUCCEEDED
 from cylc.flow.util import (
     deserialise_set,
@@ -66,6 +72,7 @@ from cylc.flow.wallclock import (
     get_current_time_string,
     get_utc_mode,
 )
+from cylc.flow.workflow_db_writer import PublicDatabaseWriter
 from cylc.flow.scripts.set import XTRIGGER_PREREQ_PREFIX
 
 if TYPE_CHECKING:
@@ -91,6 +98,76 @@ PERM_PRIVATE = 0o600  # -rw-------
 INCOMPAT_MSG = f"Workflow database is incompatible with Cylc {CYLC_VERSION}"
 
 
+def coalesce_updates(
+    db_updates: 'Iterable[DbUpdateTuple]'
+) -> 'List[DbUpdateTuple]':
+    """Combine UPDATE items for the same table row into one.
+
+    Later UPDATEs with the same WHERE args as an earlier one are merged into
+    the earlier one (values from later UPDATEs take precedence).
+
+    To preserve the result of the UPDATEs, merging does not cross:
+    * raw SQL statements,
+    * UPDATEs which set a column used in a WHERE clause (which may change
+      which rows subsequent UPDATEs apply to),
+    * UPDATEs with a different set of WHERE columns (which may apply to
+      overlapping rows).
+
+    Args:
+        db_updates: UPDATE items for a single table.
+
+    Examples:
+        >>> coalesce_updates([
+        ...     ({'status': 'running'}, {'name': 'a'}),
+        ...     ({'status': 'waiting'}, {'name': 'b'}),
+        ...     ({'status': 'succeeded', 'time': 1}, {'name': 'a'}),
+        ... ])
+        [({'status': 'succeeded', 'time': 1}, {'name': 'a'}),
+         ({'status': 'waiting'}, {'name': 'b'})]
+
+        >>> coalesce_updates([
+        ...     ({'status': 'running'}, {'name': 'a'}),
+        ...     ('UPDATE ...', []),
+        ...     ({'status': 'succeeded'}, {'name': 'a'}),
+        ... ])
+        [({'status': 'running'}, {'name': 'a'}),
+         ('UPDATE ...', []),
+         ({'status': 'succeeded'}, {'name': 'a'})]
+
+    """
+    ret: 'List[DbUpdateTuple]' = []
+    # {where args: index in ret} for UPDATEs which can be merged into
+    mergeable: Dict[tuple, int] = {}
+    where_columns: Set[str] = set()
+    for db_update in db_updates:
+        set_args, where_args = db_update
+        if isinstance(set_args, str):
+            mergeable.clear()
+            ret.append(db_update)
+            continue
+        where_args = cast('DbArgDict', where_args)
+        if (
+            where_columns.intersection(set_args)
+            or not where_columns.issuperset(where_args)
+            or len(where_columns) != len(where_args)
+        ):
+            # can't merge across this UPDATE
+            mergeable.clear()
+            where_columns = set(where_args)
+            if where_columns.intersection(set_args):
+                ret.append(db_update)
+                continue
+        key = tuple(sorted(where_args.items()))
+        index = mergeable.get(key)
+        if index is None:
+            mergeable[key] = len(ret)
+            ret.append(db_update)
+        else:
+            prev_set_args = cast('DbArgDict', ret[index][0])
+            ret[index] = ({**prev_set_args, **set_args}, where_args)
+    return ret
+
+
 class WorkflowDatabaseManager:
     """Manage the workflow runtime private and public databases."""
 
@@ -126,18 +203,52 @@ class WorkflowDatabaseManager:
     TABLE_XTRIGGERS = CylcWorkflowDAO.TABLE_XTRIGGERS
     TABLE_ABS_OUTPUTS = CylcWorkflowDAO.TABLE_ABS_OUTPUTS
 
-    def __init__(self, pri_d=None, pub_d=None):
-        self.pri_path = None
+    # Tables written by put_task_pool and their primary key columns.
+    TASK_POOL_TABLE_KEYS: Dict[str, Tuple[str, ...]] = {
+        table_name: tuple(
+            column[0]
+            for column in cast(
+                'list', CylcWorkflowDAO.TABLES_ATTRS[table_name]
+            )
+            if isinstance(column[-1], dict)
+            and column[-1].get('is_primary_key')
+        )
+        for table_name in (
+            TABLE_TASK_POOL,
+            TABLE_TASK_PREREQUISITES,
+            TABLE_TASK_TIMEOUT_TIMERS,
+            TABLE_TASK_ACTION_TIMERS,
+        )
+    }
+
+    def __init__(
+        self,
+        pri_d=None,
+        pub_d=None,
+        background_pub_writer: bool = False,
+        pub_writer_max_batches: int = 100,
+        pub_writer_max_lag: float = 300.0,
+        db_profile: Optional[DatabaseProfile] = None,
+    ):
+        self.pri_path: Optional[str] = None
         if pri_d:
             self.pri_path = os.path.join(
                 pri_d, CylcWorkflowDAO.DB_FILE_BASE_NAME)
-        self.pub_path = None
+        self.pub_path: Optional[str] = None
         if pub_d:
             self.pub_path = os.path.join(
                 pub_d, CylcWorkflowDAO.DB_FILE_BASE_NAME)
-        self.pri_dao = None
-        self.pub_dao = None
+        self.pri_dao: Optional[CylcWorkflowDAO] = None
+        self.pub_dao: Optional[CylcWorkflowDAO] = None
         self.n_restart = 0
+        # SQLite performance settings for the private and public databases
+        self.db_profile = db_profile or DatabaseProfile()
+
+        # Write to the public database in a background thread?
+        self.background_pub_writer = background_pub_writer
+        self.pub_writer_max_batches = pub_writer_max_batches
+        self.pub_writer_max_lag = pub_writer_max_lag
+        self.pub_writer: Optional[PublicDatabaseWriter] = None
 
         self.db_deletes_map: Dict[str, List[DbArgDict]] = {
             self.TABLE_BROADCAST_STATES: [],
@@ -167,9 +278,13 @@ class WorkflowDatabaseManager:
         self.db_updates_map: DefaultDict[
             str, List[DbUpdateTuple]
         ] = defaultdict(list)
+        # The rows last written by put_task_pool, by table and primary key.
+        self._task_pool_rows: Dict[str, Dict[tuple, DbArgDict]] = {}
 
     def copy_pri_to_pub(self) -> None:
         """Copy content of primary database file to public database file."""
+        if self.pri_dao is None or self.pub_dao is None:
+            return
         self.pub_dao.close()
         # Use temporary file to ensure that we do not end up with a
         # partial file.
@@ -189,9 +304,24 @@ class WorkflowDatabaseManager:
             # Get default permissions level for public db:
             st_mode = os.stat(self.pub_dao.db_file_name).st_mode
 
+            # (in WAL mode, recent changes may not be in the DB file yet)
+            self.pri_dao.checkpoint()
             copy(self.pri_dao.db_file_name, temp_pub_db_file_name)
+            if self.pri_dao.profile.journal_mode != (
+                self.pub_dao.profile.journal_mode
+            ):
+                # (the journal mode is copied with the file, see
+                # DatabaseProfile.for_public)
+                with CylcWorkflowDAO(
+                    temp_pub_db_file_name, profile=self.pub_dao.profile
+                ) as temp_pub_dao:
+                    temp_pub_dao.set_journal_mode()
             os.rename(temp_pub_db_file_name, self.pub_dao.db_file_name)
             os.chmod(self.pub_dao.db_file_name, st_mode)
+            # Any WAL files belong to the old public db
+            for suffix in ('-wal', '-shm'):
+                with suppress(FileNotFoundError):
+                    os.remove(self.pub_dao.db_file_name + suffix)
         except OSError:
             if os.path.exists(temp_pub_db_file_name):
                 os.remove(temp_pub_db_file_name)
@@ -203,7 +333,28 @@ class WorkflowDatabaseManager:
         NOTE: the DAO should be closed after use. You can use this function as
         a context manager, which handles this for you.
         """
-        return CylcWorkflowDAO(self.pri_path, create_tables=True)
+        return CylcWorkflowDAO(self.get_pri_path(), create_tables=True)
+
+    def get_open_pri_dao(self) -> CylcWorkflowDAO:
+        """Return the primary DAO opened by on_workflow_start.
+
+        Unlike get_pri_dao, this does not open a new connection.
+        """
+        if self.pri_dao is None:
+            raise RuntimeError("the workflow database is not open")
+        return self.pri_dao
+
+    def get_pri_path(self) -> str:
+        """Return the primary database path."""
+        if self.pri_path is None:
+            raise RuntimeError("no primary database directory given")
+        return self.pri_path
+
+    def get_pub_path(self) -> str:
+        """Return the public database path."""
+        if self.pub_path is None:
+            raise RuntimeError("no public database directory given")
+        return self.pub_path
 
     @staticmethod
     def _namedtuple2json(obj):
@@ -227,22 +378,40 @@ class WorkflowDatabaseManager:
         * private database file is private
         * public database is in sync with private database
         """
+        pri_path = self.get_pri_path()
         if not is_restart:
             try:
                 # Note: it should no longer be possible to have DB as we now
                 # detect restart based on whether DB exists...
-                os.unlink(self.pri_path)
+                os.unlink(pri_path)
             except OSError:
                 # ... however, in case there is a directory at the path for
                 # some bizarre reason:
-                rmtree(self.pri_path, ignore_errors=True)
-        self.pri_dao = self.get_pri_dao()
-        os.chmod(self.pri_path, PERM_PRIVATE)
-        self.pub_dao = CylcWorkflowDAO(self.pub_path, is_public=True)
+                rmtree(pri_path, ignore_errors=True)
+        self.pri_dao = CylcWorkflowDAO(
+            pri_path, create_tables=True, profile=self.db_profile
+        )
+        os.chmod(pri_path, PERM_PRIVATE)
+        self.pri_dao.set_journal_mode()
+        self.pub_dao = CylcWorkflowDAO(
+            self.get_pub_path(),
+            is_public=True,
+            profile=self.db_profile.for_public(),
+        )
         self.copy_pri_to_pub()
+        if self.background_pub_writer:
+            self.pub_writer = PublicDatabaseWriter(
+                self.pub_dao,
+                self.pub_writer_max_batches,
+                self.pub_writer_max_lag,
+            )
+            self.pub_writer.start()
 
     def on_workflow_shutdown(self):
         """Close data access objects."""
+        if self.pub_writer:
+            self.pub_writer.stop()
+            self.pub_writer = None
         if self.pri_dao:
             self.pri_dao.close()
             self.pri_dao = None
@@ -256,35 +425,36 @@ class WorkflowDatabaseManager:
             return
         # Record workflow parameters and tasks in pool
         # Record any broadcast settings to be dumped out
-        if any(self.db_deletes_map.values()):
-            for table_name, db_deletes in sorted(self.db_deletes_map.items()):
-                while db_deletes:
-                    where_args = db_deletes.pop(0)
+        # (Swap out each queue rather than popping items off the front, which
+        # is quadratic in the number of queued items.)
+        for table_name, db_deletes in sorted(self.db_deletes_map.items()):
+            if db_deletes:
+                self.db_deletes_map[table_name] = []
+                for where_args in db_deletes:
                     self.pri_dao.add_delete_item(table_name, where_args)
                     self.pub_dao.add_delete_item(table_name, where_args)
-        if any(self.db_inserts_map.values()):
-            for table_name, db_inserts in sorted(self.db_inserts_map.items()):
-                while db_inserts:
-                    db_insert = db_inserts.pop(0)
+        for table_name, db_inserts in sorted(self.db_inserts_map.items()):
+            if db_inserts:
+                self.db_inserts_map[table_name] = []
+                for db_insert in db_inserts:
                     self.pri_dao.add_insert_item(table_name, db_insert)
                     self.pub_dao.add_insert_item(table_name, db_insert)
-        if any(self.db_updates_map.values()):
-            for table_name, db_updates in sorted(self.db_updates_map.items()):
-                while db_updates:
-                    db_update = db_updates.pop(0)
+        for table_name, db_updates in sorted(self.db_updates_map.items()):
+            if db_updates:
+                self.db_updates_map[table_name] = []
+                for db_update in coalesce_updates(db_updates):
                     self.pri_dao.add_update_item(table_name, db_update)
                     self.pub_dao.add_update_item(table_name, db_update)
 
-        # Previously, we used a separate thread for database writes. This has
-        # now been removed. For the private database, there is no real
-        # advantage in using a separate thread as it needs to be always in sync
-        # with what is current. For the public database, which does not need to
-        # be fully in sync, there is some advantage of using a separate
-        # thread/process, if writing to it becomes a bottleneck. At the moment,
-        # there is no evidence that this is a bottleneck, so it is better to
-        # keep the logic simple.
+        # The private database must always be in sync with what is current,
+        # so is written to synchronously. The public database does not need
+        # to be fully in sync, so can optionally be written to by a
+        # background thread (for use where writing to it is a bottleneck).
         self.pri_dao.execute_queued_items()
-        self.pub_dao.execute_queued_items()
+        if self.pub_writer:
+            self.pub_writer.put(self.pub_dao.take_queued_items())
+        else:
+            self.pub_dao.execute_queued_items()
 
     def put_broadcast(self, modified_settings, is_cancel=False):
         """Put or clear broadcasts in runtime database."""
@@ -419,6 +589,8 @@ class WorkflowDatabaseManager:
         """Put statements to update the task_action_timers table."""
         if task_events_mgr.event_timers_updated:
             self.db_deletes_map[self.TABLE_TASK_ACTION_TIMERS].append({})
+            # task poll and retry timers must be re-inserted too
+            self._task_pool_rows.pop(self.TABLE_TASK_ACTION_TIMERS, None)
             id_key: 'EventKey'
             for id_key, timer in task_events_mgr._event_timers.items():
                 key1 = (id_key.handler, id_key.event)
@@ -488,80 +660,98 @@ class WorkflowDatabaseManager:
             (set_args, where_args))
 
     def put_task_pool(self, pool: 'TaskPool') -> None:
-        """Delete task pool table content and recreate from current task pool.
+        """Update task pool table content to match the current task pool.
 
-        Also recreate:
+        Also update:
         - prerequisites table
         - timeout timers table
-        - action timers table
-
-        And update:
+        - action timers table (poll and retry timers)
         - task states table
+
+        Only rows which have changed since the previous call are written and
+        only rows which no longer correspond to the task pool are deleted.
+        The first call rewrites the tables in full to clear out any rows left
+        over from a previous run.
         """
-        self.db_deletes_map[self.TABLE_TASK_POOL].append({})
-        # Comment this out to retain the trigger-time prereq status of past
-        # tasks (but then the prerequisite table will grow indefinitely):
-        self.db_deletes_map[self.TABLE_TASK_PREREQUISITES].append({})
-        # This should already be done by self.put_task_event_timers above:
-        # self.db_deletes_map[self.TABLE_TASK_ACTION_TIMERS].append({})
-        self.db_deletes_map[self.TABLE_TASK_TIMEOUT_TIMERS].append({})
+        rows: Dict[str, Dict[tuple, 'DbArgDict']] = {
+            table_name: {} for table_name in self.TASK_POOL_TABLE_KEYS
+        }
         for itask in pool.get_tasks():
+            name = itask.tdef.name
+            cycle = str(itask.point)
+            flow_nums = serialise_set(itask.flow_nums)
             for prereq in itask.state.prerequisites:
                 for (p_cycle, p_name, p_output), satisfied_state in (
                     prereq.items()
                 ):
-                    self.put_insert_task_prerequisites(itask, {
-                        "prereq_name": p_name,
-                        "prereq_cycle": p_cycle,
-                        "prereq_output": p_output,
-                        "satisfied": satisfied_state
-                    })
+                    self._put_task_pool_row(
+                        rows, self.TABLE_TASK_PREREQUISITES, {
+                            "name": name,
+                            "cycle": cycle,
+                            "flow_nums": flow_nums,
+                            "prereq_name": p_name,
+                            "prereq_cycle": p_cycle,
+                            "prereq_output": p_output,
+                            "satisfied": satisfied_state
+                        }
+                    )
             for x_label, x_satisfied in itask.state.xtriggers.items():
                 if x_satisfied:
-                    self.put_insert_task_prerequisites(itask, {
-                        "prereq_name": x_label,
-                        "prereq_cycle": XTRIGGER_PREREQ_PREFIX,
-                        "prereq_output": TASK_OUTPUT_SUCCEEDED,
-                        "satisfied": True
-                    })
-
-            self.db_inserts_map[self.TABLE_TASK_POOL].append({
-                "name": itask.tdef.name,
-                "cycle": str(itask.point),
-                "flow_nums": serialise_set(itask.flow_nums),
+                    self._put_task_pool_row(
+                        rows, self.TABLE_TASK_PREREQUISITES, {
+                            "name": name,
+                            "cycle": cycle,
+                            "flow_nums": flow_nums,
+                            "prereq_name": x_label,
+                            "prereq_cycle": XTRIGGER_PREREQ_PREFIX,
+                            "prereq_output": TASK_OUTPUT_SUCCEEDED,
+                            "satisfied": True
+                        }
+                    )
+
+            self._put_task_pool_row(rows, self.TABLE_TASK_POOL, {
+                "name": name,
+                "cycle": cycle,
+                "flow_nums": flow_nums,
                 "status": itask.state.status,
                 "is_held": itask.state.is_held
             })
             if itask.timeout is not None:
-                self.db_inserts_map[self.TABLE_TASK_TIMEOUT_TIMERS].append({
-                    "name": itask.tdef.name,
-                    "cycle": str(itask.point),
-                    "timeout": itask.timeout
-                })
+                self._put_task_pool_row(
+                    rows, self.TABLE_TASK_TIMEOUT_TIMERS, {
+                        "name": name,
+                        "cycle": cycle,
+                        "timeout": itask.timeout
+                    }
+                )
             if itask.poll_timer is not None:
-                self.db_inserts_map[self.TABLE_TASK_ACTION_TIMERS].append({
-                    "name": itask.tdef.name,
-                    "cycle": str(itask.point),
-                    "ctx_key": json.dumps("poll_timer"),
-                    "ctx": self._namedtuple2json(itask.poll_timer.ctx),
-                    "delays": json.dumps(itask.poll_timer.delays),
-                    "num": itask.poll_timer.num,
-                    "delay": itask.poll_timer.delay,
-                    "timeout": itask.poll_timer.timeout
-                })
+                self._put_task_pool_row(
+                    rows, self.TABLE_TASK_ACTION_TIMERS, {
+                        "name": name,
+                        "cycle": cycle,
+                        "ctx_key": json.dumps("poll_timer"),
+                        "ctx": self._namedtuple2json(itask.poll_timer.ctx),
+                        "delays": json.dumps(itask.poll_timer.delays),
+                        "num": itask.poll_timer.num,
+                        "delay": itask.poll_timer.delay,
+                        "timeout": itask.poll_timer.timeout
+                    }
+                )
             for ctx_key_1, timer in itask.try_timers.items():
                 if timer is None:
                     continue
-                self.db_inserts_map[self.TABLE_TASK_ACTION_TIMERS].append({
-                    "name": itask.tdef.name,
-                    "cycle": str(itask.point),
-                    "ctx_key": json.dumps(("try_timers", ctx_key_1)),
-                    "ctx": self._namedtuple2json(timer.ctx),
-                    "delays": json.dumps(timer.delays),
-                    "num": timer.num,
-                    "delay": timer.delay,
-                    "timeout": timer.timeout
-                })
+                self._put_task_pool_row(
+                    rows, self.TABLE_TASK_ACTION_TIMERS, {
+                        "name": name,
+                        "cycle": cycle,
+                        "ctx_key": json.dumps(("try_timers", ctx_key_1)),
+                        "ctx": self._namedtuple2json(timer.ctx),
+                        "delays": json.dumps(timer.delays),
+                        "num": timer.num,
+                        "delay": timer.delay,
+                        "timeout": timer.timeout
+                    }
+                )
             if itask.state.time_updated:
                 set_args = {
                     "time_updated": itask.state.time_updated,
@@ -571,15 +761,50 @@ class WorkflowDatabaseManager:
                     "is_manual_submit": itask.is_manual_submit,
                 }
                 where_args = {
-                    "cycle": str(itask.point),
-                    "name": itask.tdef.name,
-                    "flow_nums": serialise_set(itask.flow_nums)
+                    "cycle": cycle,
+                    "name": name,
+                    "flow_nums": flow_nums,
                 }
                 self.db_updates_map[self.TABLE_TASK_STATES].append(
                     (set_args, where_args)
                 )
                 itask.state.time_updated = None
 
+        for table_name, keys in self.TASK_POOL_TABLE_KEYS.items():
+            new_rows = rows[table_name]
+            old_rows = self._task_pool_rows.get(table_name)
+            if old_rows is None:
+                # Rewrite the table in full. (The action timers table also
+                # holds event handler timers, these are rewritten separately
+                # by self.put_task_event_timers.)
+                if table_name != self.TABLE_TASK_ACTION_TIMERS:
+                    self.db_deletes_map[table_name].append({})
+                self.db_inserts_map[table_name].extend(new_rows.values())
+                continue
+            self.db_inserts_map[table_name].extend(
+                args
+                for key, args in new_rows.items()
+                if old_rows.get(key) != args
+            )
+            self.db_deletes_map[table_name].extend(
+                dict(zip(keys, key))
+                for key in old_rows
+                if key not in new_rows
+            )
+        self._task_pool_rows = rows
+
+    def _put_task_pool_row(
+        self,
+        rows: Dict[str, Dict[tuple, 'DbArgDict']],
+        table_name: str,
+        args: 'DbArgDict',
+    ) -> None:
+        """Add a row to the set of rows representing the task pool."""
+        key = tuple(
+            args[column] for column in self.TASK_POOL_TABLE_KEYS[table_name]
+        )
+        rows[table_name][key] = args
+
     def put_tasks_to_hold(
         self, tasks: Set[Tuple[str, 'PointBase']]
     ) -> None:
@@ -742,7 +967,7 @@ class WorkflowDatabaseManager:
                     cycle = ?
                     AND name = ?
             '''  # nosec B608 (table name is a code constant)
-            fnums_select_cursor = self.pri_dao.connect().execute(
+            fnums_select_cursor = self.get_open_pri_dao().connect().execute(
                 fnums_select_stmt, (point, name)
             )
 
@@ -795,13 +1020,31 @@ class WorkflowDatabaseManager:
         return removed_flow_nums
 
     def recover_pub_from_pri(self):
-        """Recover public database from private database."""
-        if self.pub_dao.n_tries >= self.pub_dao.MAX_TRIES:
-            self.copy_pri_to_pub()
-            LOG.warning(
-                f"{self.pub_dao.db_file_name}: recovered from "
-                f"{self.pri_dao.db_file_name}")
-            self.pub_dao.n_tries = 0
+        """Recover public database from private database.
+
+        This is done if writes to the public database have failed too many
+        times, or if the background public database writer has fallen too
+        far behind.
+        """
+        if self.pub_writer:
+            if self.pub_writer.is_behind():
+                n_batches, lag = self.pub_writer.get_lag()
+                LOG.warning(
+                    f"{self.pub_dao.db_file_name}: writer is behind"
+                    f" ({n_batches} batch(es) waiting, lag {lag:.1f}s)"
+                )
+                with self.pub_writer.paused():
+                    self._recover_pub_from_pri()
+        elif self.pub_dao.n_tries >= self.pub_dao.MAX_TRIES:
+            self.pub_dao.failed_sql_queue = []
+            self._recover_pub_from_pri()
+
+    def _recover_pub_from_pri(self):
+        self.copy_pri_to_pub()
+        LOG.warning(
+            f"{self.pub_dao.db_file_name}: recovered from "
+            f"{self.pri_dao.db_file_name}")
+        self.pub_dao.n_tries = 0
 
     def restart_check(self) -> None:
         """Check & vacuum the runtime DB for a restart.
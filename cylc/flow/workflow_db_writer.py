@@ -0,0 +1,198 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Write to the public workflow database in a background thread."""
+
+from collections import deque
+from contextlib import contextmanager
+import threading
+from time import time
+from typing import (
+    TYPE_CHECKING,
+    Deque,
+    Iterator,
+    Optional,
+    Tuple,
+)
+
+from cylc.flow import LOG
+
+
+if TYPE_CHECKING:
+    from cylc.flow.rundb import CylcWorkflowDAO, SqlQueue
+
+
+class PublicDatabaseWriter:
+    """Write to the public database in a background thread.
+
+    The scheduler hands over one batch of SQL statements each time it
+    processes the database queue. Whenever the writer thread wakes up it
+    writes all waiting batches (in order) in a single transaction, so a
+    slow filesystem results in fewer, larger transactions rather than a
+    stalled main loop.
+
+    Failed writes are retried, as with synchronous writes. If the writer
+    falls too far behind (see "is_behind") the scheduler should discard the
+    waiting batches and recover the public database by copying the private
+    database (see "paused").
+
+    Args:
+        dao:
+            The public database access object. Once the writer has started,
+            this must not be written to by any other thread except whilst
+            the writer is paused.
+        max_batches:
+            The writer is considered to be behind if more than this number
+            of batches are waiting to be written.
+        max_lag:
+            The writer is considered to be behind if the oldest unwritten
+            batch is older than this (seconds).
+
+    """
+
+    RETRY_DELAY = 1.0  # seconds
+
+    def __init__(
+        self,
+        dao: 'CylcWorkflowDAO',
+        max_batches: int,
+        max_lag: float,
+    ) -> None:
+        self.dao = dao
+        self.max_batches = max_batches
+        self.max_lag = max_lag
+        self._batches: 'Deque[Tuple[float, SqlQueue]]' = deque()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        # time of the oldest batch handed to the DAO but not yet committed
+        self._oldest_unwritten: Optional[float] = None
+        # metrics
+        self.n_batches_written = 0
+        self.n_transactions = 0
+        self.write_time = 0.0
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        self._thread = threading.Thread(
+            target=self._run, name='public-db-writer', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Write any waiting batches, then stop the writer thread."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        LOG.debug(
+            f'{self.dao.db_file_name}: background writer wrote'
+            f' {self.n_batches_written} batch(es) in'
+            f' {self.n_transactions} transaction(s)'
+            f' ({self.write_time:.2f}s)'
+        )
+
+    def put(self, sql_queue: 'SqlQueue') -> None:
+        """Queue a batch of SQL statements to be written."""
+        if not sql_queue:
+            return
+        with self._cond:
+            self._batches.append((time(), sql_queue))
+            self._cond.notify_all()
+
+    def get_lag(self) -> Tuple[int, float]:
+        """Return the number of waiting batches and the age of the oldest
+        unwritten batch (seconds)."""
+        with self._cond:
+            oldest = self._oldest_unwritten
+            if oldest is None and self._batches:
+                oldest = self._batches[0][0]
+            if oldest is None:
+                return len(self._batches), 0.0
+            return len(self._batches), time() - oldest
+
+    def is_behind(self) -> bool:
+        """Return True if the writer has fallen too far behind."""
+        n_batches, lag = self.get_lag()
+        return (
+            n_batches > self.max_batches
+            or lag > self.max_lag
+            or self.dao.n_tries >= self.dao.MAX_TRIES
+        )
+
+    def flush(self) -> None:
+        """Wait until all waiting batches have been written (or failed)."""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: (
+                    self._thread is None
+                    or (not self._batches and not self._busy)
+                )
+            )
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """Pause the writer and discard any unwritten batches.
+
+        Use this to recover the public database from the private database.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: not self._busy)
+            self._batches.clear()
+            self.dao.failed_sql_queue = []
+            self._oldest_unwritten = None
+            yield
+
+    def _run(self) -> None:
+        retry = False
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._batches or self._stopping,
+                    timeout=self.RETRY_DELAY if retry else None,
+                )
+                if self._stopping and not self._batches and not retry:
+                    return
+                batches = list(self._batches)
+                self._batches.clear()
+                if batches and self._oldest_unwritten is None:
+                    self._oldest_unwritten = batches[0][0]
+                self._busy = True
+            start = time()
+            try:
+                retry = not self.dao.execute_sql([
+                    item for _, sql_queue in batches for item in sql_queue
+                ])
+            except Exception as exc:
+                # the batches are lost: force recovery from the private DB
+                LOG.exception(exc)
+                self.dao.n_tries = self.dao.MAX_TRIES
+                retry = False
+            finally:
+                with self._cond:
+                    self._busy = False
+                    if not retry:
+                        self._oldest_unwritten = None
+                        self.n_batches_written += len(batches)
+                        self.n_transactions += 1
+                        self.write_time += time() - start
+                    self._cond.notify_all()
+            if retry and self._stopping:
+                # don't hold up shutdown retrying a failing database
+                return
@@ -39,11 +39,13 @@ from cylc.flow import LOG
 from cylc.flow.exceptions import WorkflowConfigError, XtriggerConfigError
 import cylc.flow.flags
 from cylc.flow.hostuserutil import get_user
-from cylc.flow.subprocctx import add_kwarg_to_sig
+from cylc.flow.id import tokenise
+from cylc.flow.subprocctx import SubFuncContext, add_kwarg_to_sig
 from cylc.flow.subprocpool import get_xtrig_func
 from cylc.flow.xtriggers.wall_clock import _wall_clock
 from cylc.flow.xtriggers.workflow_state import (
     workflow_state,
+    workflow_state_batch,
     _workflow_state_backcompat,
     _upgrade_workflow_state_sig,
 )
@@ -51,10 +53,13 @@ from cylc.flow.xtriggers.workflow_state import (
 if TYPE_CHECKING:
     from inspect import BoundArguments, Signature
     from cylc.flow.scheduler import Scheduler
-    from cylc.flow.subprocctx import SubFuncContext
     from cylc.flow.task_proxy import TaskProxy
 
 
+# Maximum number of workflow_state checks to make in one call (the checks
+# are passed on the command line, see SubFuncContext.update_command).
+WORKFLOW_STATE_BATCH_SIZE = 100
+
 XTRIG_DUP_WARNING = (
     "Duplicate xtrigger prerequisites get satisfied naturally at"
     " once, but they can be satisfied separately with `cylc set`."
@@ -184,6 +189,8 @@ class XtriggerCollator:
         self.functx_map: 'Dict[str, SubFuncContext]' = {}
         # Clock labels, to avoid repeated string comparisons
         self.wall_clock_labels: Set[str] = set()
+        # Labels of (built-in) workflow_state xtriggers, which are batched
+        self.workflow_state_labels: Set[str] = set()
         # Workflow-wide default, used when not specified in xtrigger kwargs.
         self.sequential_xtriggers_default = False
         # Labels whose xtriggers are sequentially checked.
@@ -192,6 +199,7 @@ class XtriggerCollator:
     def update(self, xtriggers: 'XtriggerCollator'):
         self.functx_map.update(xtriggers.functx_map)
         self.wall_clock_labels.update(xtriggers.wall_clock_labels)
+        self.workflow_state_labels.update(xtriggers.workflow_state_labels)
         self.sequential_xtrigger_labels.update(
             xtriggers.sequential_xtrigger_labels)
 
@@ -215,6 +223,8 @@ class XtriggerCollator:
             del self.functx_map[label]
             with suppress(KeyError):
                 self.wall_clock_labels.remove(label)
+            with suppress(KeyError):
+                self.workflow_state_labels.remove(label)
             with suppress(KeyError):
                 self.sequential_xtrigger_labels.remove(label)
 
@@ -244,6 +254,13 @@ class XtriggerCollator:
 
         if fctx.func_name == "wall_clock":
             self.wall_clock_labels.add(label)
+        elif (
+            fctx.func_name == workflow_state.__name__
+            # (not a user-defined function of the same name)
+            and get_xtrig_func(fctx.mod_name, fctx.func_name, fdir)
+            is workflow_state
+        ):
+            self.workflow_state_labels.add(label)
 
     def report_duplicates(self):
         """Report labels that point to the same xtrigger signature."""
@@ -487,6 +504,11 @@ class XtriggerManager:
     Xtrigger functions are called asynchronously in the subprocess pool,
     except for clock triggers, called synchronously because they're quick.
 
+    Calls to the built-in workflow_state function which are due in the same
+    main loop iteration are batched by target workflow, so that each
+    workflow DB is queried once for all of them (see
+    call_batched_xtriggers).
+
     If parentless tasks have xtriggers that are fundamentally sequential in
     nature, spawning them out to the runahead limit can result in unnecessary
     xtrigger activity and UI clutter, so clock-triggered tasks get spawned
@@ -529,6 +551,11 @@ class XtriggerManager:
         self.sat_xtrig: dict = {}
         # Signatures of active functions (waiting on callback).
         self.active: list = []
+        # workflow_state calls waiting to be batched, by target workflow
+        # and alternate run dir.
+        self.workflow_state_calls: Dict[
+            Tuple[str, Optional[str]], List['SubFuncContext']
+        ] = {}
 
         # A record of parentless sequential xtriggered tasks
         # that have had their next occurrance spawned.
@@ -685,11 +712,13 @@ class XtriggerManager:
                 if sig in self.sat_xtrig:
                     # Already satisfied, just update the task
                     itask.state.xtriggers[label] = True
+                    itask.notify_state_changed()
                     if self.all_task_seq_xtriggers_satisfied(itask):
                         self.schd.pool.check_spawn_psx_task(itask)
                 elif _wall_clock(*ctx.func_args, **ctx.func_kwargs):
                     # Newly satisfied
                     itask.state.xtriggers[label] = True
+                    itask.notify_state_changed()
                     self.sat_xtrig[sig] = {}
                     self.data_store_mgr.delta_xtrigger(sig, True)
                     self.workflow_db_mgr.put_xtriggers({sig: {}})
@@ -704,6 +733,7 @@ class XtriggerManager:
                 LOG.info(f"[{itask}] satisfying xtrigger prerequisite: {sig}")
                 if not itask.state.xtriggers[label]:
                     itask.state.xtriggers[label] = True
+                    itask.notify_state_changed()
                     res = {}
                     for key, val in self.sat_xtrig[sig].items():
                         res["%s_%s" % (label, key)] = val
@@ -735,20 +765,77 @@ class XtriggerManager:
             self.t_next_call[sig] = now + ctx.intvl
             # Queue to the process pool, and record as active.
             self.active.append(sig)
-            self.proc_pool.put_command(ctx, callback=self.callback)
+            if label in self.xtriggers.workflow_state_labels:
+                # Batch with other calls for the same workflow.
+                self.workflow_state_calls.setdefault(
+                    self._get_workflow_state_key(ctx), []
+                ).append(ctx)
+            else:
+                self.proc_pool.put_command(ctx, callback=self.callback)
+
+    def call_batched_xtriggers(self) -> None:
+        """Call the xtrigger functions batched by call_xtriggers_async.
+
+        Call this after checking xtriggers for all tasks.
+
+        """
+        for ctxs in self.workflow_state_calls.values():
+            for start in range(0, len(ctxs), WORKFLOW_STATE_BATCH_SIZE):
+                batch = ctxs[start:start + WORKFLOW_STATE_BATCH_SIZE]
+                batch_ctx = SubFuncContext(
+                    workflow_state.__name__,
+                    workflow_state_batch.__name__,
+                    [[self._get_workflow_state_kwargs(ctx) for ctx in batch]],
+                    {},
+                    mod_name=workflow_state.__name__,
+                )
+                batch_ctx.update_command(self.workflow_run_dir)
+                self.proc_pool.put_command(
+                    batch_ctx,
+                    callback=self.workflow_state_batch_callback,
+                    callback_args=[batch],
+                )
+        self.workflow_state_calls.clear()
+
+    @staticmethod
+    def _get_workflow_state_kwargs(ctx: 'SubFuncContext') -> Dict[str, Any]:
+        """Return the keyword arguments of a workflow_state call."""
+        return signature(workflow_state).bind(
+            *ctx.func_args, **ctx.func_kwargs
+        ).arguments
+
+    @classmethod
+    def _get_workflow_state_key(
+        cls, ctx: 'SubFuncContext'
+    ) -> Tuple[str, Optional[str]]:
+        """Return the target workflow and run dir of a workflow_state call.
+
+        Examples:
+            >>> from cylc.flow.subprocctx import SubFuncContext
+            >>> this = XtriggerManager._get_workflow_state_key
+            >>> this(SubFuncContext('x', 'workflow_state', ['a//1/b'], {}))
+            ('a', None)
+            >>> this(SubFuncContext('x', 'workflow_state', [], {
+            ...     'workflow_task_id': 'a/run1//1/b:failed',
+            ...     'alt_cylc_run_dir': '/x',
+            ... }))
+            ('a/run1', '/x')
 
-    def housekeep(self, itasks):
+        """
+        kwargs = cls._get_workflow_state_kwargs(ctx)
+        return (
+            tokenise(kwargs['workflow_task_id'])['workflow'],
+            kwargs.get('alt_cylc_run_dir'),
+        )
+
+    def housekeep(self, all_xtrig: 'Set[str]') -> None:
         """Forget succeeded xtriggers no longer needed by any task.
 
         Check self.do_housekeeping before calling this method.
 
         Args:
-            itasks: list of all task proxies.
+            all_xtrig: signatures of all unsatisfied task xtriggers.
         """
-        all_xtrig = []
-        for itask in itasks:
-            all_xtrig += self._get_xtrigs(
-                itask, sigs_only=True, unsat_only=True)
         for sig in list(self.sat_xtrig):
             if sig not in all_xtrig:
                 LOG.debug(f"Housekeeping xtrigger result: {sig}")
@@ -801,6 +888,36 @@ class XtriggerManager:
 
         self.do_housekeeping = True
 
+    def workflow_state_batch_callback(
+        self,
+        batch_ctx: 'SubFuncContext',
+        ctxs: 'List[SubFuncContext]',
+    ) -> None:
+        """Callback for batched workflow_state calls.
+
+        Pass the result of each call on to the normal callback.
+
+        Args:
+            batch_ctx: the workflow_state_batch function context
+            ctxs: the function context of each workflow_state call
+
+        """
+        try:
+            results = json.loads(batch_ctx.out)
+        except (ValueError, TypeError):
+            results = None
+        for ind, ctx in enumerate(ctxs):
+            if results is None:
+                # the batch failed
+                ctx.ret_code = batch_ctx.ret_code or 1
+                ctx.err = batch_ctx.err
+            else:
+                satisfied, result, err = results[ind]
+                ctx.ret_code = 0 if err is None else 1
+                ctx.err = err
+                ctx.out = json.dumps([satisfied, result])
+            self.callback(ctx)
+
     def force_satisfy(
         self,
         itask: 'TaskProxy',
@@ -844,6 +961,7 @@ class XtriggerManager:
                 continue
 
             itask.state.xtriggers[label] = satisfied
+            itask.notify_state_changed()
             if satisfied and self.all_task_seq_xtriggers_satisfied(itask):
                 self.schd.pool.check_spawn_psx_task(itask)
 
@@ -14,15 +14,23 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from typing import Dict, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
 import asyncio
 from inspect import signature
+import sqlite3
+import traceback
 
 from cylc.flow.scripts.workflow_state import WorkflowPoller
 from cylc.flow.id import tokenise
 from cylc.flow.exceptions import WorkflowConfigError, InputError
+from cylc.flow.pathutil import get_cylc_run_dir
 from cylc.flow.task_state import TASK_STATUS_SUCCEEDED
-from cylc.flow.dbstatecheck import check_polling_config
+from cylc.flow.dbstatecheck import (
+    CylcWorkflowDBChecker,
+    StateQuery,
+    check_polling_config,
+    get_db_checker,
+)
 
 
 DEFAULT_STATUS = TASK_STATUS_SUCCEEDED
@@ -83,7 +91,105 @@ def workflow_state(
        The ``flow_num`` argument was added. The ``cylc_run_dir`` argument
        was renamed to ``alt_cylc_run_dir``.
     """
-    poller = WorkflowPoller(
+    poller = _get_poller(
+        workflow_task_id,
+        offset,
+        flow_num,
+        is_trigger,
+        is_message,
+        alt_cylc_run_dir,
+    )
+    if asyncio.run(poller.poll()):
+        return (True, _get_results(poller))
+    else:
+        return (False, {})
+
+
+def workflow_state_batch(
+    checks: List[Dict[str, Any]]
+) -> List[Tuple[bool, Dict[str, Any], Optional[str]]]:
+    """Make many workflow_state checks at once.
+
+    The scheduler uses this to make all pending workflow_state xtrigger
+    checks against a workflow in one call. Each workflow DB is queried once
+    for all of the checks using a shared DB checker, which caches results
+    until the DB changes (see
+    CylcWorkflowDBChecker.workflow_state_query_batch).
+
+    Args:
+        checks:
+            The keyword arguments of workflow_state for each check.
+
+    Returns:
+        (satisfied, results, error) for each check, where satisfied and
+        results are as for workflow_state, and error is the traceback if
+        the check failed.
+
+    """
+    ret: List[Tuple[bool, Dict[str, Any], Optional[str]]] = [
+        (False, {}, None)
+    ] * len(checks)
+    # {DB checker: [(check index, poller)]}
+    batches: Dict[CylcWorkflowDBChecker, List[Tuple[int, WorkflowPoller]]] = {}
+    for ind, check in enumerate(checks):
+        try:
+            poller = _get_poller(**check)
+            check_polling_config(
+                poller.selector, poller.is_trigger, poller.is_message
+            )
+            if not poller.find_workflow():
+                continue
+            try:
+                checker = get_db_checker(
+                    get_cylc_run_dir(poller.alt_cylc_run_dir),
+                    poller.workflow_id,  # type: ignore[arg-type]
+                )
+            except (OSError, sqlite3.Error):
+                # DB not there (yet)
+                continue
+            poller.cycle = checker.adjust_point_to_db(
+                poller.cycle_raw, poller.offset
+            )
+        except Exception:
+            ret[ind] = (False, {}, traceback.format_exc())
+            continue
+        batches.setdefault(checker, []).append((ind, poller))
+
+    for checker, pollers in batches.items():
+        queries: List[StateQuery] = [
+            (
+                poller.task,
+                poller.cycle,
+                poller.selector,
+                poller.is_trigger,
+                poller.is_message,
+                poller.flow_num,
+            )
+            for _, poller in pollers
+        ]
+        try:
+            results = checker.workflow_state_query_batch(queries)
+        except Exception:
+            err = traceback.format_exc()
+            for ind, _ in pollers:
+                ret[ind] = (False, {}, err)
+            continue
+        for (ind, poller), result in zip(pollers, results):
+            if result:
+                ret[ind] = (True, _get_results(poller), None)
+    return ret
+
+
+def _get_poller(
+    workflow_task_id: str,
+    offset: Optional[str] = None,
+    flow_num: Optional[int] = None,
+    is_trigger: bool = False,
+    is_message: bool = False,
+    alt_cylc_run_dir: Optional[str] = None,
+) -> WorkflowPoller:
+    """Return a poller for a workflow_state check."""
+    return WorkflowPoller(
         workflow_task_id,
         offset,
         flow_num,
@@ -97,33 +203,32 @@ def workflow_state(
         args=[]
     )
 
+
+def _get_results(poller: WorkflowPoller) -> Dict[str, Any]:
+    """Return the results of a satisfied workflow_state check."""
     # NOTE the results dict item names remain compatible with older usage.
+    results = {
+        'workflow': poller.workflow_id,
+        'task': poller.task,
+        'point': poller.cycle,
+    }
+    if poller.alt_cylc_run_dir is not None:
+        results['cylc_run_dir'] = poller.alt_cylc_run_dir
 
-    if asyncio.run(poller.poll()):
-        results = {
-            'workflow': poller.workflow_id,
-            'task': poller.task,
-            'point': poller.cycle,
-        }
-        if poller.alt_cylc_run_dir is not None:
-            results['cylc_run_dir'] = poller.alt_cylc_run_dir
-
-        if offset is not None:
-            results['offset'] = poller.offset
-
-        if flow_num is not None:
-            results["flow_num"] = poller.flow_num
-
-        if poller.is_message:
-            results['message'] = poller.selector
-        elif poller.is_trigger:
-            results['trigger'] = poller.selector
-        else:
-            results['status'] = poller.selector
-
-        return (True, results)
+    if poller.offset is not None:
+        results['offset'] = poller.offset
+
+    if poller.flow_num is not None:
+        results["flow_num"] = poller.flow_num
+
+    if poller.is_message:
+        results['message'] = poller.selector
+    elif poller.is_trigger:
+        results['trigger'] = poller.selector
     else:
-        return (False, {})
+        results['status'] = poller.selector
+
+    return results
 
 
 def validate(args: Dict[str, Any]):
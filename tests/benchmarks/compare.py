@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compare the results of a benchmark between two commits.
+
+Compares the numeric results (other than the options) of two benchmark JSON
+files and prints the relative change of each. Metrics which have got worse
+by more than the threshold are marked as regressions, in which case the
+exit status is 1.
+
+All metrics are assumed to be "lower is better", except for rates
+("per_second").
+
+Examples:
+    $ git checkout master
+    $ python tests/benchmarks/workflow_run.py > before.json
+    $ git checkout my-branch
+    $ python tests/benchmarks/workflow_run.py > after.json
+    $ python tests/benchmarks/compare.py before.json after.json
+"""
+
+from argparse import ArgumentParser
+import json
+import sys
+from typing import (
+    Dict,
+    Iterator,
+    Tuple,
+)
+
+
+def get_parser() -> ArgumentParser:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('before', help='Results JSON file.')
+    parser.add_argument('after', help='Results JSON file.')
+    parser.add_argument(
+        '--threshold', type=float, default=10,
+        help='Percentage change to treat as a regression.'
+    )
+    return parser
+
+
+def flatten(data: dict, prefix: str = '') -> Iterator[Tuple[str, float]]:
+    """Yield the numeric leaves of the results.
+
+    Examples:
+        >>> dict(flatten({'a': {'b': 1, 'c': 'x'}, 'options': {'d': 2}}))
+        {'a.b': 1}
+
+    """
+    for key, value in data.items():
+        if key == 'options':
+            continue
+        if isinstance(value, dict):
+            yield from flatten(value, f'{prefix}{key}.')
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield f'{prefix}{key}', value
+
+
+def compare(
+    before: dict, after: dict, threshold: float
+) -> Dict[str, Dict[str, object]]:
+    """Return the change in each metric.
+
+    Examples:
+        >>> compare({'time': 10, 'per_second': 1}, {'time': 12}, 10)
+        {'time': {'before': 10, 'after': 12, 'change_pct': 20.0, \
+'regression': True}}
+
+    """
+    results: Dict[str, Dict[str, object]] = {}
+    after_metrics = dict(flatten(after))
+    for key, value in flatten(before):
+        if key not in after_metrics:
+            continue
+        new_value = after_metrics[key]
+        change = (new_value - value) / value * 100 if value else 0.0
+        worse = -change if 'per_second' in key else change
+        results[key] = {
+            'before': value,
+            'after': new_value,
+            'change_pct': round(change, 1),
+            'regression': worse > threshold,
+        }
+    return results
+
+
+def main() -> None:
+    opts = get_parser().parse_args()
+    with open(opts.before) as before, open(opts.after) as after:
+        results = compare(json.load(before), json.load(after), opts.threshold)
+    width = max((len(key) for key in results), default=0)
+    for key, result in results.items():
+        print(
+            f'{key:<{width}}  {result["before"]:>14.6g}'
+            f'  {result["after"]:>14.6g}  {result["change_pct"]:>+8.1f}%'
+            + ('  REGRESSION' if result['regression'] else '')
+        )
+    if any(result['regression'] for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark workflow database writes under a synthetic job message storm.
+
+Each "flush" simulates one scheduler main loop iteration in which a batch
+of job messages is processed (one task event insert and one job and task
+state update per message), followed by processing of the DB queue.
+
+Reports commits per second and commit latency for the private and public
+databases as JSON.
+
+Examples:
+    # SQLite defaults, run in $TMPDIR
+    $ python tests/benchmarks/db_message_storm.py
+
+    # WAL mode with a persistent connection, run on the filesystem under test
+    $ python tests/benchmarks/db_message_storm.py \\
+        --dir ~/cylc-run --journal-mode WAL --synchronous NORMAL --persistent
+"""
+
+from argparse import ArgumentParser
+import json
+from pathlib import Path
+from statistics import (
+    mean,
+    median,
+    quantiles,
+)
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from types import SimpleNamespace
+from typing import (
+    Dict,
+    List,
+)
+
+from cylc.flow.rundb import (
+    CylcWorkflowDAO,
+    DatabaseProfile,
+)
+from cylc.flow.workflow_db_mgr import WorkflowDatabaseManager
+
+
+def get_parser() -> ArgumentParser:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dir', default=None, help='Directory to run in.')
+    parser.add_argument('--tasks', type=int, default=1000)
+    parser.add_argument('--flushes', type=int, default=200)
+    parser.add_argument(
+        '--messages-per-flush', type=int, default=50,
+        help='Job messages processed per main loop iteration.'
+    )
+    parser.add_argument('--journal-mode', default='DELETE')
+    parser.add_argument('--synchronous', default='FULL')
+    parser.add_argument('--persistent', action='store_true')
+    parser.add_argument('--cached-statements', type=int, default=128)
+    parser.add_argument('--cache-size', type=int, default=2000)
+    return parser
+
+
+def summarise(latencies: List[float]) -> Dict[str, float]:
+    total = sum(latencies)
+    return {
+        'commits': len(latencies),
+        'commits_per_second': len(latencies) / total if total else 0.0,
+        'latency_mean_ms': mean(latencies) * 1000,
+        'latency_median_ms': median(latencies) * 1000,
+        'latency_p95_ms': quantiles(latencies, n=20)[-1] * 1000,
+        'latency_max_ms': max(latencies) * 1000,
+    }
+
+
+def run(opts, run_dir: Path) -> Dict[str, object]:
+    profile = DatabaseProfile(
+        journal_mode=opts.journal_mode,
+        synchronous=opts.synchronous,
+        persistent_connection=opts.persistent,
+        cached_statements=opts.cached_statements,
+        cache_size=opts.cache_size,
+    )
+    (run_dir / 'srv').mkdir()
+    (run_dir / 'log').mkdir()
+    db_mgr = WorkflowDatabaseManager(
+        run_dir / 'srv', run_dir / 'log', db_profile=profile
+    )
+    db_mgr.on_workflow_start(is_restart=False)
+
+    # record the time taken by each transaction
+    latencies: Dict[str, List[float]] = {'private': [], 'public': []}
+    for key, dao in (('private', db_mgr.pri_dao), ('public', db_mgr.pub_dao)):
+        def _execute_sql(sql_queue, _dao=dao, _key=key):
+            start = perf_counter()
+            ret = CylcWorkflowDAO.execute_sql(_dao, sql_queue)
+            latencies[_key].append(perf_counter() - start)
+            return ret
+        dao.execute_sql = _execute_sql
+
+    itasks = [
+        SimpleNamespace(
+            tdef=SimpleNamespace(name=f't{i}'),
+            point='1',
+            submit_num=1,
+            flow_nums={1},
+        )
+        for i in range(opts.tasks)
+    ]
+    for itask in itasks:
+        db_mgr.put_insert_task_jobs(itask, {'run_status': None})
+    db_mgr.process_queued_ops()
+    for value in latencies.values():
+        value.clear()
+
+    start = perf_counter()
+    n_messages = 0
+    for flush in range(opts.flushes):
+        for _ in range(opts.messages_per_flush):
+            itask = itasks[n_messages % len(itasks)]
+            n_messages += 1
+            db_mgr.put_insert_task_events(itask, {
+                'time': str(n_messages),
+                'event': 'message',
+                'message': f'message {n_messages}',
+            })
+            db_mgr.put_update_task_jobs(itask, {
+                'time_run': str(n_messages),
+            })
+            db_mgr.put_update_task_state(SimpleNamespace(
+                state=SimpleNamespace(
+                    time_updated=str(n_messages), status='running'
+                ),
+                flow_wait=False,
+                is_manual_submit=False,
+                transient=False,
+                **vars(itask),
+            ))
+        db_mgr.process_queued_ops()
+    elapsed = perf_counter() - start
+    db_mgr.on_workflow_shutdown()
+
+    return {
+        'profile': vars(opts),
+        'messages': n_messages,
+        'messages_per_second': n_messages / elapsed,
+        'private': summarise(latencies['private']),
+        'public': summarise(latencies['public']),
+    }
+
+
+def main() -> None:
+    opts = get_parser().parse_args()
+    with TemporaryDirectory(dir=opts.dir) as tmp_dir:
+        print(json.dumps(run(opts, Path(tmp_dir)), indent=2))
+
+
+if __name__ == '__main__':
+    main()
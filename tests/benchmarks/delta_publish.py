@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark preparing data-store deltas for publishing.
+
+Builds a batch of task proxy and job deltas, then times the work done
+between the data-store producing the deltas and the publisher having the
+bytes to send, for the current implementation
+(DataStoreMgr.get_publish_deltas) and for the previous implementation
+(CopyFrom into an AllDeltas message, deepcopy, then serialise each topic in
+the publisher).
+
+Reports latency and an estimate of the number of bytes copied (protobuf
+copies and serialisations) per publish as JSON.
+
+Examples:
+    $ python tests/benchmarks/delta_publish.py --tasks 20000
+"""
+
+from argparse import ArgumentParser
+from copy import deepcopy
+import json
+from statistics import (
+    mean,
+    median,
+)
+from time import perf_counter
+from types import SimpleNamespace
+from typing import (
+    Callable,
+    Dict,
+    List,
+)
+
+from cylc.flow.data_messages_pb2 import (
+    JDeltas,
+    TPDeltas,
+    WDeltas,
+)
+from cylc.flow.data_store_mgr import (
+    ALL_DELTAS,
+    DELTAS_MAP,
+    JOBS,
+    TASK_PROXIES,
+    WORKFLOW,
+    DataStoreMgr,
+)
+from cylc.flow.network.publisher import serialize_data
+
+
+def get_parser() -> ArgumentParser:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--tasks', type=int, default=10000,
+        help='Number of task proxies (and jobs) in each delta.'
+    )
+    parser.add_argument(
+        '--repeats', type=int, default=20,
+        help='Number of publishes to time.'
+    )
+    return parser
+
+
+def make_deltas(n_tasks: int) -> dict:
+    """Return a batch of deltas similar to those of a busy workflow."""
+    tp_delta = TPDeltas(checksum=1)
+    j_delta = JDeltas(checksum=2)
+    for i in range(n_tasks):
+        tp_id = f'~user/workflow//20000101T0000Z/task_{i}'
+        tproxy = tp_delta.added.add(
+            id=tp_id,
+            stamp=f'{tp_id}@1700000000.0',
+            state='running',
+            cycle_point='20000101T0000Z',
+            name=f'task_{i}',
+            job_submits=1,
+        )
+        tproxy.namespace.extend([f'task_{i}', 'FAMILY', 'root'])
+        for output in ('submitted', 'started', 'succeeded', 'failed'):
+            tproxy.outputs[output].label = output
+            tproxy.outputs[output].message = output
+        prereq = tproxy.prerequisites.add(expression='c0', satisfied=True)
+        prereq.conditions.add(
+            task_proxy=f'20000101T0000Z/task_{i - 1}',
+            expr_alias='c0',
+            req_state='succeeded',
+            satisfied=True,
+        )
+        j_id = f'{tp_id}/01'
+        tproxy.jobs.append(j_id)
+        j_delta.updated.add(
+            id=j_id,
+            stamp=f'{j_id}@1700000000.0',
+            state='running',
+            started_time='2000-01-01T00:00:00Z',
+        )
+    w_delta = WDeltas()
+    w_delta.updated.id = '~user/workflow'
+    w_delta.updated.status = 'running'
+    return {TASK_PROXIES: tp_delta, JOBS: j_delta, WORKFLOW: w_delta}
+
+
+def legacy_get_publish_deltas(deltas: dict) -> list:
+    """The previous implementation of DataStoreMgr.get_publish_deltas."""
+    all_deltas = DELTAS_MAP[ALL_DELTAS]()
+    result = []
+    for key, delta in deltas.items():
+        if delta.ListFields():
+            result.append(
+                (key.encode('utf-8'), delta, 'SerializeToString'))
+            getattr(all_deltas, key).CopyFrom(delta)
+    result.append(
+        (ALL_DELTAS.encode('utf-8'), all_deltas, 'SerializeToString')
+    )
+    return deepcopy(result)
+
+
+def current_get_publish_deltas(deltas: dict) -> list:
+    data_store_mgr = SimpleNamespace(deltas=deltas, publish_pending=False)
+    return DataStoreMgr.get_publish_deltas(data_store_mgr)  # type: ignore
+
+
+def publish(items: list) -> List[bytes]:
+    """The serialisation done by WorkflowPublisher.publish."""
+    return [
+        serialize_data(data, serializer) for _, data, serializer in items
+    ]
+
+
+def run(
+    deltas: dict,
+    get_publish_deltas: Callable[[dict], list],
+    repeats: int,
+    copies: int,
+    serialisations: int,
+) -> Dict[str, float]:
+    total_size = sum(delta.ByteSize() for delta in deltas.values())
+    latencies = []
+    for _ in range(repeats):
+        start = perf_counter()
+        publish(get_publish_deltas(deltas))
+        latencies.append(perf_counter() - start)
+    return {
+        'latency_mean_ms': mean(latencies) * 1000,
+        'latency_median_ms': median(latencies) * 1000,
+        'latency_max_ms': max(latencies) * 1000,
+        # protobuf object copies + serialisations of the delta payload
+        'bytes_copied': total_size * (copies + serialisations),
+        'protobuf_copies': copies,
+        'serialisations': serialisations,
+    }
+
+
+def main() -> None:
+    opts = get_parser().parse_args()
+    deltas = make_deltas(opts.tasks)
+    print(json.dumps(
+        {
+            'tasks': opts.tasks,
+            'delta_bytes': sum(
+                delta.ByteSize() for delta in deltas.values()
+            ),
+            # CopyFrom into AllDeltas + deepcopy of the per-topic deltas
+            # and AllDeltas, then serialise the per-topic deltas and
+            # AllDeltas in the publisher
+            'legacy': run(
+                deltas, legacy_get_publish_deltas, opts.repeats, 3, 2
+            ),
+            # serialise the per-topic deltas, then join them (a copy) to
+            # build AllDeltas
+            'current': run(
+                deltas, current_get_publish_deltas, opts.repeats, 1, 1
+            ),
+        },
+        indent=2,
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark spawning children on an output with a large fan-out.
+
+Starts a scheduler (without running the main loop) for a workflow in which
+one task's output triggers many children (e.g. ensemble members), then
+times the task pool spawning and satisfying the children of that output,
+and processing the resulting data-store deltas.
+
+The children can trigger off the parent in the same cycle, or off an
+absolute trigger (in which case all instances of each child in the pool
+are updated).
+
+Reports the time taken as JSON.
+
+Examples:
+    $ python tests/benchmarks/fan_out.py --members 5000
+    $ python tests/benchmarks/fan_out.py --members 1000 --absolute
+"""
+
+from argparse import ArgumentParser
+import asyncio
+from contextlib import suppress
+import cProfile
+import json
+from pathlib import Path
+import pstats
+from secrets import token_hex
+import shutil
+import sys
+from time import perf_counter
+from typing import Dict
+
+from cylc.flow.pathutil import get_cylc_run_dir
+from cylc.flow.scheduler import (
+    Scheduler,
+    SchedulerStop,
+)
+from cylc.flow.scheduler_cli import RunOptions
+from cylc.flow.task_outputs import TASK_OUTPUT_SUCCEEDED
+
+
+def get_parser() -> ArgumentParser:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--members', type=int, default=2000,
+        help='Number of children of the output.'
+    )
+    parser.add_argument(
+        '--absolute', action='store_true',
+        help='Trigger the children off an absolute (R1) output.'
+    )
+    parser.add_argument(
+        '--profile', action='store_true',
+        help='Print the top functions by cumulative time to stderr.'
+    )
+    return parser
+
+
+def get_flow_config(opts) -> str:
+    if opts.absolute:
+        graph = [
+            '        R1 = start',
+            '        P1 = """',
+            '            start[^] => m<m>',
+            '            m<m>[-P1] => m<m>',
+            '        """',
+        ]
+    else:
+        graph = [
+            '        P1 = """',
+            '            start[-P1] => start',
+            '            start => m<m>',
+            '        """',
+        ]
+    return '\n'.join([
+        '[scheduler]',
+        '    allow implicit tasks = True',
+        '[task parameters]',
+        f'    m = 1..{opts.members}',
+        '[scheduling]',
+        '    cycling mode = integer',
+        '    initial cycle point = 1',
+        '    runahead limit = P1',
+        '    [[graph]]',
+        *graph,
+        '[runtime]',
+        '    [[root]]',
+        '        [[[simulation]]]',
+        '            default run length = PT0S',
+    ]) + '\n'
+
+
+async def run_benchmark(opts, workflow_id: str) -> Dict[str, object]:
+    schd = Scheduler(
+        workflow_id,
+        RunOptions(run_mode='simulation', paused_start=True),
+    )
+    await schd.install()
+    await schd.start()
+    try:
+        start_task = schd.pool.get_tasks_by_name('start')[0]
+        start_task.state_reset('succeeded')
+        start_task.state.outputs.set_trigger_complete(TASK_OUTPUT_SUCCEEDED)
+        profile = cProfile.Profile() if opts.profile else None
+
+        start = perf_counter()
+        if profile:
+            profile.enable()
+        schd.pool.spawn_on_output(start_task, TASK_OUTPUT_SUCCEEDED)
+        spawn_time = perf_counter() - start
+        schd.data_store_mgr.update_data_structure()
+        elapsed = perf_counter() - start
+        if profile:
+            profile.disable()
+            pstats.Stats(profile, stream=sys.stderr).sort_stats(
+                'cumulative'
+            ).print_stats(30)
+
+        return {
+            'options': vars(opts),
+            'tasks_in_pool': len(schd.pool.get_tasks()),
+            'spawn_time_s': spawn_time,
+            'total_time_s': elapsed,
+        }
+    finally:
+        schd.workflow_db_mgr.on_workflow_shutdown()
+        await schd.shutdown(SchedulerStop('benchmark complete'))
+
+
+def main() -> None:
+    opts = get_parser().parse_args()
+    workflow_id = f'benchmarks/{token_hex(4)}'
+    run_dir = Path(get_cylc_run_dir(), workflow_id)
+    run_dir.mkdir(parents=True)
+    try:
+        (run_dir / 'flow.cylc').write_text(get_flow_config(opts))
+        results = asyncio.run(run_benchmark(opts, workflow_id))
+    finally:
+        shutil.rmtree(run_dir)
+        with suppress(OSError):
+            # (if there are no other benchmark workflows)
+            run_dir.parent.rmdir()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
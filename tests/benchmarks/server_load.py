@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Load test a running workflow's server with job messages and queries.
+
+Sends job messages (as "cylc message" does) from a number of clients while
+other clients repeatedly make heavy read-only queries (all task proxies),
+and reports the latency of the job messages and queries as JSON.
+
+Run against a large workflow, with and without
+global.cylc[scheduler][server]concurrent requests, to compare.
+
+The job messages are sent for a job which should not exist (see
+--task-job), so they are logged as warnings by the scheduler.
+
+Examples:
+    $ cylc play --pause big-workflow
+    $ python tests/benchmarks/server_load.py big-workflow \\
+        --query-clients 4 --message-clients 8 --messages 200
+"""
+
+from argparse import ArgumentParser
+import json
+from statistics import (
+    mean,
+    median,
+    quantiles,
+)
+import threading
+from time import perf_counter
+from typing import (
+    Dict,
+    List,
+)
+
+from cylc.flow.network.client import WorkflowRuntimeClient
+from cylc.flow.task_message import MUTATION
+
+
+QUERY = '''
+query {
+  workflows {
+    id
+    taskProxies {
+      id
+      state
+      isHeld
+      prerequisites { expression satisfied }
+      outputs { label satisfied }
+      jobs { id state }
+    }
+  }
+}
+'''
+
+
+def get_parser() -> ArgumentParser:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('workflow_id', help='A running workflow.')
+    parser.add_argument(
+        '--query-clients', type=int, default=4,
+        help='Number of clients making heavy queries.'
+    )
+    parser.add_argument(
+        '--message-clients', type=int, default=4,
+        help='Number of clients sending job messages.'
+    )
+    parser.add_argument(
+        '--messages', type=int, default=100,
+        help='Number of job messages to send per message client.'
+    )
+    parser.add_argument(
+        '--task-job', default='1/__server_load__/01',
+        help='The job ID to send messages for.'
+    )
+    parser.add_argument('--timeout', type=float, default=60)
+    return parser
+
+
+def summarise(latencies: List[float]) -> Dict[str, float]:
+    if not latencies:
+        return {'requests': 0}
+    # (quantiles needs at least two data points)
+    percentiles = quantiles(latencies * 2, n=100)
+    return {
+        'requests': len(latencies),
+        'latency_mean_ms': mean(latencies) * 1000,
+        'latency_p50_ms': median(latencies) * 1000,
+        'latency_p99_ms': percentiles[98] * 1000,
+        'latency_max_ms': max(latencies) * 1000,
+    }
+
+
+def send_messages(opts, latencies: List[float]) -> None:
+    client = WorkflowRuntimeClient(opts.workflow_id, timeout=opts.timeout)
+    try:
+        for i in range(opts.messages):
+            start = perf_counter()
+            client('graphql', {
+                'request_string': MUTATION,
+                'variables': {
+                    'wFlows': [opts.workflow_id],
+                    'taskJob': opts.task_job,
+                    'eventTime': '2000-01-01T00:00:00Z',
+                    'messages': [['INFO', f'server load {i}']],
+                },
+            })
+            latencies.append(perf_counter() - start)
+    finally:
+        client.stop()
+
+
+def make_queries(
+    opts, latencies: List[float], done: threading.Event
+) -> None:
+    client = WorkflowRuntimeClient(opts.workflow_id, timeout=opts.timeout)
+    try:
+        while not done.is_set():
+            start = perf_counter()
+            client('graphql', {'request_string': QUERY})
+            latencies.append(perf_counter() - start)
+    finally:
+        client.stop()
+
+
+def run(opts) -> Dict[str, object]:
+    done = threading.Event()
+    message_latencies: List[float] = []
+    query_latencies: List[float] = []
+    query_threads = [
+        threading.Thread(
+            target=make_queries, args=(opts, query_latencies, done)
+        )
+        for _ in range(opts.query_clients)
+    ]
+    message_threads = [
+        threading.Thread(target=send_messages, args=(opts, message_latencies))
+        for _ in range(opts.message_clients)
+    ]
+    for thread in query_threads:
+        thread.start()
+    start = perf_counter()
+    for thread in message_threads:
+        thread.start()
+    for thread in message_threads:
+        thread.join()
+    elapsed = perf_counter() - start
+    done.set()
+    for thread in query_threads:
+        thread.join()
+    return {
+        'options': vars(opts),
+        'elapsed_s': elapsed,
+        'messages': summarise(message_latencies),
+        'queries': summarise(query_latencies),
+    }
+
+
+def main() -> None:
+    print(json.dumps(run(get_parser().parse_args()), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measure the memory used per task proxy.
+
+Loads the configuration of a synthetic workflow (tasks with prerequisites,
+including conditional and inter-cycle ones, xtriggers and custom outputs),
+then creates task proxies for many cycles, as the task pool does for a
+long runahead, and reports the memory allocated per task proxy as JSON.
+
+Examples:
+    $ python tests/benchmarks/task_proxy_memory.py --cycles 1000
+    $ python tests/benchmarks/task_proxy_memory.py --top 10
+"""
+
+from argparse import ArgumentParser
+from contextlib import suppress
+import gc
+import json
+from pathlib import Path
+from secrets import token_hex
+import shutil
+import sys
+import tracemalloc
+from typing import Dict
+
+from cylc.flow.config import WorkflowConfig
+from cylc.flow.cycling.loader import get_point
+from cylc.flow.id import Tokens
+from cylc.flow.option_parsers import Options
+from cylc.flow.pathutil import get_cylc_run_dir
+from cylc.flow.scripts.validate import get_option_parser
+from cylc.flow.task_proxy import TaskProxy
+
+
+FLOW_CONFIG = '''
+[scheduler]
+    allow implicit tasks = True
+[scheduling]
+    cycling mode = integer
+    initial cycle point = 1
+    [[xtriggers]]
+        x = echo(%(point)s, succeed=True)
+    [[graph]]
+        P1 = """
+            @x => a => b & c
+            b:x? | c => d
+            a[-P1] & b:x? => e
+            d & e => f<m>
+        """
+[task parameters]
+    m = 1..5
+[runtime]
+    [[b]]
+        [[[outputs]]]
+            x = the x output
+'''
+
+
+def get_parser() -> ArgumentParser:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--cycles', type=int, default=1000,
+        help='Number of cycles of task proxies to create.'
+    )
+    parser.add_argument(
+        '--top', type=int, default=0,
+        help='Print the top N allocating source lines to stderr.'
+    )
+    return parser
+
+
+def run(opts, flow_file: Path) -> Dict[str, object]:
+    options = Options(get_option_parser())()
+    config = WorkflowConfig('benchmarks/task-proxy-memory', flow_file, options)
+    scheduler_tokens = Tokens('~user/benchmarks/task-proxy-memory')
+    taskdefs = list(config.taskdefs.values())
+    # (exclude one-off allocations, e.g. caches, from the measurement)
+    TaskProxy(scheduler_tokens, taskdefs[0], get_point('1'), {1})
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    itasks = [
+        TaskProxy(scheduler_tokens, tdef, get_point(str(cycle)), {1})
+        for cycle in range(1, opts.cycles + 1)
+        for tdef in taskdefs
+        if tdef.is_valid_point(get_point(str(cycle)))
+    ]
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, 'lineno')
+    total = sum(stat.size_diff for stat in stats)
+    if opts.top:
+        for stat in stats[:opts.top]:
+            print(stat, file=sys.stderr)
+    return {
+        'options': vars(opts),
+        'task_proxies': len(itasks),
+        'total_mb': total / 1024 ** 2,
+        'bytes_per_task_proxy': total / len(itasks),
+    }
+
+
+def main() -> None:
+    opts = get_parser().parse_args()
+    run_dir = Path(get_cylc_run_dir(), 'benchmarks', token_hex(4))
+    run_dir.mkdir(parents=True)
+    try:
+        flow_file = run_dir / 'flow.cylc'
+        flow_file.write_text(FLOW_CONFIG)
+        results = run(opts, flow_file)
+    finally:
+        shutil.rmtree(run_dir)
+        with suppress(OSError):
+            # (if there are no other benchmark workflows)
+            run_dir.parent.rmdir()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
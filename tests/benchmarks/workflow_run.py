@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark running a synthetic workflow through the scheduler.
+
+Generates a workflow of the requested shape, runs it to completion in
+simulation mode (or live mode with all tasks in skip mode), in this
+process, and reports as JSON:
+
+* End-to-end wall time (start-up, run and shutdown).
+* Main loop iteration time, excluding the time spent sleeping.
+* Peak memory (maximum resident set size of this process).
+* Database writes (transactions, statements and rows).
+* Data-store deltas published (count and serialised size).
+
+The workflow has integer cycling. Each cycle contains ``--depth`` layers of
+``--width`` tasks, each task triggering off the task at the same position
+in the layer above (and in the previous cycle, for the first layer):
+
+* ``--families`` families, the tasks of each layer are shared between them.
+* ``--xtriggers`` xtriggers (echo), which the first layer depends on.
+* ``--outputs`` message outputs per task, each of which is required by the
+  task below.
+
+The workflow is installed under ``~/cylc-run/benchmarks/`` and removed
+afterwards (unless ``--keep``).
+
+Save the results from two commits and compare them with ``compare.py``.
+
+Examples:
+    $ python tests/benchmarks/workflow_run.py \\
+        --width 100 --depth 5 --cycles 10 --outputs 2 > before.json
+"""
+
+from argparse import ArgumentParser
+import asyncio
+from contextlib import (
+    contextmanager,
+    suppress,
+)
+import json
+from pathlib import Path
+import resource
+from secrets import token_hex
+import shutil
+from statistics import (
+    mean,
+    median,
+    quantiles,
+)
+import sys
+from time import perf_counter
+from typing import (
+    Dict,
+    Iterator,
+    List,
+)
+
+from cylc.flow import __version__ as CYLC_VERSION
+from cylc.flow.data_store_mgr import ALL_DELTAS
+from cylc.flow.pathutil import get_cylc_run_dir
+from cylc.flow.rundb import CylcWorkflowDAO
+from cylc.flow.scheduler import Scheduler
+from cylc.flow.scheduler_cli import RunOptions
+
+
+def get_parser() -> ArgumentParser:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--width', type=int, default=20, help='Tasks per layer.'
+    )
+    parser.add_argument(
+        '--depth', type=int, default=3, help='Layers of tasks per cycle.'
+    )
+    parser.add_argument('--cycles', type=int, default=5)
+    parser.add_argument('--families', type=int, default=2)
+    parser.add_argument('--xtriggers', type=int, default=1)
+    parser.add_argument(
+        '--outputs', type=int, default=1, help='Message outputs per task.'
+    )
+    parser.add_argument(
+        '--runahead-limit', default='P4', help='An integer interval.'
+    )
+    parser.add_argument(
+        '--mode', choices=('simulation', 'skip'), default='simulation'
+    )
+    parser.add_argument(
+        '--keep', action='store_true',
+        help='Keep the workflow run directory.'
+    )
+    return parser
+
+
+def get_flow_config(opts) -> str:
+    """Return the flow.cylc file for the workflow."""
+    lines = [
+        '[scheduler]',
+        '    allow implicit tasks = False',
+        '    [[events]]',
+        '        stall timeout = PT0S',
+        '        abort on stall timeout = True',
+        '[scheduling]',
+        '    cycling mode = integer',
+        '    initial cycle point = 1',
+        f'    final cycle point = {opts.cycles}',
+        f'    runahead limit = {opts.runahead_limit}',
+        '    [[xtriggers]]',
+    ]
+    lines.extend(
+        f'        x{ind} = echo(succeed=True, x={ind}, point=%(point)s)'
+        for ind in range(opts.xtriggers)
+    )
+    lines.extend(['    [[graph]]', '        P1 = """'])
+    xtriggers = ''.join(f'@x{ind} & ' for ind in range(opts.xtriggers))
+    for ind in range(opts.width):
+        lines.append(f'            {xtriggers}t0_{ind}[-P1] => t0_{ind}')
+        for layer in range(1, opts.depth):
+            upstream = ' & '.join([
+                f't{layer - 1}_{ind}',
+                *(
+                    f't{layer - 1}_{ind}:o{out}'
+                    for out in range(opts.outputs)
+                )
+            ])
+            lines.append(f'            {upstream} => t{layer}_{ind}')
+    lines.extend(['        """', '[runtime]', '    [[root]]'])
+    if opts.mode == 'skip':
+        lines.append('        run mode = skip')
+    lines.extend([
+        '        [[[simulation]]]',
+        '            default run length = PT0S',
+    ])
+    if opts.outputs:
+        lines.append('        [[[outputs]]]')
+        lines.extend(
+            f'            o{out} = message {out}'
+            for out in range(opts.outputs)
+        )
+    families = max(opts.families, 1)
+    lines.extend(
+        f'    [[FAM{fam}]]' for fam in range(opts.families)
+    )
+    for layer in range(opts.depth):
+        for ind in range(opts.width):
+            lines.append(f'    [[t{layer}_{ind}]]')
+            if opts.families:
+                lines.append(f'        inherit = FAM{ind % families}')
+    return '\n'.join(lines) + '\n'
+
+
+def summarise(times: List[float]) -> Dict[str, float]:
+    if not times:
+        return {'count': 0}
+    # (quantiles needs at least two data points)
+    percentiles = quantiles(times * 2, n=100)
+    return {
+        'count': len(times),
+        'total_s': sum(times),
+        'mean_ms': mean(times) * 1000,
+        'p50_ms': median(times) * 1000,
+        'p95_ms': percentiles[94] * 1000,
+        'max_ms': max(times) * 1000,
+    }
+
+
+@contextmanager
+def record_db_writes() -> Iterator[Dict[str, Dict[str, int]]]:
+    """Count the transactions, statements and rows written to the DBs."""
+    stats = {
+        key: {'transactions': 0, 'statements': 0, 'rows': 0}
+        for key in ('private', 'public')
+    }
+    execute_sql = CylcWorkflowDAO.execute_sql
+
+    def _execute_sql(self, sql_queue):
+        stat = stats['public' if self.is_public else 'private']
+        if sql_queue:
+            stat['transactions'] += 1
+        for _stmt, stmt_args_list in sql_queue:
+            stat['statements'] += 1
+            stat['rows'] += len(stmt_args_list) or 1
+        return execute_sql(self, sql_queue)
+
+    CylcWorkflowDAO.execute_sql = _execute_sql  # type: ignore[method-assign]
+    try:
+        yield stats
+    finally:
+        CylcWorkflowDAO.execute_sql = (  # type: ignore[method-assign]
+            execute_sql
+        )
+
+
+def instrument(schd: Scheduler, stats: dict) -> None:
+    """Record main loop iteration times and published delta sizes."""
+    main_loop = schd._main_loop
+    main_loop_sleep = schd._main_loop_sleep
+    get_publish_deltas = schd.data_store_mgr.get_publish_deltas
+    sleeping = [0.0]
+
+    async def _main_loop():
+        sleeping[0] = 0
+        start = perf_counter()
+        await main_loop()
+        stats['main_loop'].append(perf_counter() - start - sleeping[0])
+
+    async def _main_loop_sleep(duration):
+        start = perf_counter()
+        await main_loop_sleep(duration)
+        sleeping[0] += perf_counter() - start
+
+    def _get_publish_deltas():
+        deltas = get_publish_deltas()
+        stats['deltas'].extend(
+            len(msg)
+            for topic, msg, _ in deltas
+            if topic == ALL_DELTAS.encode()
+        )
+        return deltas
+
+    schd._main_loop = _main_loop  # type: ignore[method-assign]
+    schd._main_loop_sleep = _main_loop_sleep  # type: ignore[method-assign]
+    schd.data_store_mgr.get_publish_deltas = (  # type: ignore[method-assign]
+        _get_publish_deltas
+    )
+
+
+async def run_workflow(opts, workflow_id: str) -> Dict[str, object]:
+    schd = Scheduler(
+        workflow_id,
+        RunOptions(
+            run_mode='live' if opts.mode == 'skip' else 'simulation',
+            paused_start=False,
+        ),
+    )
+    stats: Dict[str, list] = {'main_loop': [], 'deltas': []}
+    with record_db_writes() as db_stats:
+        start = perf_counter()
+        await schd.install()
+        await schd.start()
+        instrument(schd, stats)
+        await schd.run_scheduler()
+        elapsed = perf_counter() - start
+    srv_dir = Path(get_cylc_run_dir(), workflow_id, '.service')
+    n_tasks = opts.width * opts.depth * opts.cycles
+    return {
+        'options': vars(opts),
+        'cylc_version': CYLC_VERSION,
+        'python_version': sys.version.split()[0],
+        'tasks': n_tasks,
+        'wall_time_s': elapsed,
+        'tasks_per_second': n_tasks / elapsed,
+        'main_loop': summarise(stats['main_loop']),
+        # (ru_maxrss is in kilobytes on Linux)
+        'max_rss_mb': (
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        ),
+        'database': {
+            **db_stats,
+            'private_db_bytes': (srv_dir / 'db').stat().st_size,
+        },
+        'deltas': {
+            'count': len(stats['deltas']),
+            'total_bytes': sum(stats['deltas']),
+            'max_bytes': max(stats['deltas'], default=0),
+        },
+    }
+
+
+def main() -> None:
+    opts = get_parser().parse_args()
+    workflow_id = f'benchmarks/{token_hex(4)}'
+    run_dir = Path(get_cylc_run_dir(), workflow_id)
+    run_dir.mkdir(parents=True)
+    try:
+        (run_dir / 'flow.cylc').write_text(get_flow_config(opts))
+        results = asyncio.run(run_workflow(opts, workflow_id))
+    finally:
+        if not opts.keep:
+            shutil.rmtree(run_dir)
+            with suppress(OSError):
+                # (if there are no other benchmark workflows)
+                run_dir.parent.rmdir()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -41,6 +41,17 @@ def before_each():
     GraphNodeParser.get_inst().clear()
 
 
+@pytest.fixture(scope='session', autouse=True)
+def config_cache_dir(tmp_path_factory):
+    """Keep the workflow config cache out of the user's home directory."""
+    cache_dir = tmp_path_factory.mktemp('config-cache')
+    with pytest.MonkeyPatch.context() as mpatch:
+        mpatch.setattr(
+            'cylc.flow.config_cache.get_cache_dir', lambda: cache_dir
+        )
+        yield cache_dir
+
+
 @pytest.fixture(scope='module')
 def mod_monkeypatch():
     """A module-scoped version of the monkeypatch fixture."""
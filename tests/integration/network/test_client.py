@@ -20,6 +20,7 @@ from unittest.mock import Mock
 import pytest
 
 from cylc.flow.exceptions import ClientError
+from cylc.flow.network import encoding
 from cylc.flow.network.client import WorkflowRuntimeClient
 from cylc.flow.network.server import PB_METHOD_MAP
 
@@ -55,6 +56,65 @@ async def test_protobuf(harness):
     assert schd.workflow in pb_data.workflow.id
 
 
+@pytest.mark.parametrize(
+    'accept_encoding, expected_header',
+    [
+        pytest.param({}, None, id='legacy-json'),
+        pytest.param(
+            {'formats': ['json'], 'compressions': []},
+            {'json', 'raw'},
+            id='json',
+        ),
+        pytest.param(
+            {'formats': ['json'], 'compressions': ['zlib']},
+            {'json+zlib', 'raw+zlib'},
+            id='json+zlib',
+        ),
+    ],
+)
+async def test_response_encoding(
+    harness, monkeypatch, accept_encoding, expected_header
+):
+    """It should reply in the encoding requested by the client."""
+    schd, _ = harness
+    monkeypatch.setattr(encoding, 'COMPRESS_THRESHOLD', 0)
+    client = WorkflowRuntimeClient(
+        schd.workflow, accept_encoding=accept_encoding
+    )
+
+    # record the raw responses
+    responses = []
+    recv = client.socket.recv
+
+    async def _recv(*args, **kwargs):
+        responses.append(await recv(*args, **kwargs))
+        return responses[-1]
+
+    monkeypatch.setattr(client.socket, 'recv', _recv)
+
+    ret = await client.async_request(
+        'graphql',
+        {'request_string': 'query { workflows { id } }'}
+    )
+    assert schd.workflow in ret['workflows'][0]['id']
+    ret = await client.async_request('pb_entire_workflow')
+    pb_data = PB_METHOD_MAP['pb_entire_workflow']()
+    pb_data.ParseFromString(ret)
+    assert schd.workflow in pb_data.workflow.id
+
+    if expected_header is None:
+        # plain JSON / protobuf
+        assert not any(
+            res.startswith(encoding.ENVELOPE_MARKER) for res in responses
+        )
+    else:
+        assert {
+            res.split(encoding.ENVELOPE_MARKER)[1].decode()
+            for res in responses
+        } == expected_header
+    client.stop(stop_loop=False)
+
+
 async def test_command_validation_failure(harness):
     """It should send the correct response if a command fails validation.
 
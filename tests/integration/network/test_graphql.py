@@ -22,6 +22,7 @@ from typing import TYPE_CHECKING
 
 from graphql import parse, MiddlewareManager
 
+from cylc.flow.data_messages_pb2 import AllDeltas
 from cylc.flow.data_store_mgr import create_delta_store
 from cylc.flow.id import TaskTokens, Tokens
 from cylc.flow.network.client import WorkflowRuntimeClient
@@ -480,7 +481,7 @@ async def test_subscription_deltas(one, start):
             (
                 one.id,
                 btopic.decode('utf-8'),
-                create_delta_store(delta, one.id)
+                create_delta_store(AllDeltas.FromString(delta), one.id)
             )
         )
         aitem = await subscription.__anext__()
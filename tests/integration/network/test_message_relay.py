@@ -0,0 +1,57 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import asyncio
+import threading
+
+from cylc.flow.message_relay import (
+    MessageRelay,
+    relay_messages,
+)
+
+
+async def test_message_relay(one_conf, flow, scheduler, start, tmp_path):
+    """It should forward job messages to the scheduler in a batch."""
+    id_ = flow(one_conf)
+    schd = scheduler(id_)
+    async with start(schd):
+        relay = MessageRelay(str(tmp_path / 'relay.sock'), interval=60)
+        thread = threading.Thread(target=relay.serve, daemon=True)
+        thread.start()
+        try:
+            async with asyncio.timeout(5):
+                while not (tmp_path / 'relay.sock').exists():
+                    await asyncio.sleep(0.01)
+            for message in ('hello', 'world'):
+                assert await asyncio.to_thread(
+                    relay_messages,
+                    schd.workflow,
+                    '1/one/01',
+                    [['INFO', message]],
+                    '2000-01-01T00:00:00Z',
+                    path=relay.path,
+                )
+        finally:
+            # (the messages are forwarded when the relay stops)
+            relay.stop()
+            await asyncio.to_thread(thread.join, 10)
+        messages = []
+        while not schd.message_queue.empty():
+            messages.append(schd.message_queue.get())
+        assert [
+            (msg.job_id.relative_id, msg.message) for msg in messages
+        ] == [('1/one/01', 'hello'), ('1/one/01', 'world')]
@@ -16,13 +16,20 @@
 
 import asyncio
 import logging
+import threading
 from typing import Callable
 
 import pytest
 
 from cylc.flow import __version__ as CYLC_VERSION
-from cylc.flow.network.server import PB_METHOD_MAP
+from cylc.flow.network.client import WorkflowRuntimeClient
+from cylc.flow.network.router import WorkflowRouter
+from cylc.flow.network.server import (
+    PB_METHOD_MAP,
+    WorkflowRuntimeServer,
+)
 from cylc.flow.scheduler import Scheduler
+from cylc.flow.task_message import MUTATION
 
 
 @pytest.fixture(scope='module')
@@ -82,6 +89,29 @@ def test_pb_entire_workflow(myflow):
     assert data.workflow.id == myflow.id
 
 
+async def test_metrics(one: Scheduler, run):
+    """Test the main loop metrics endpoint and GraphQL field."""
+    async with run(one):
+        async with asyncio.timeout(5):
+            while 'iteration' not in one.metrics.phases:
+                await asyncio.sleep(0.1)
+        data = one.server.metrics()
+        assert data['phases']['iteration']['count'] >= 1
+        assert {'commands', 'messages', 'data_store', 'database'} <= set(
+            data['phases']
+        )
+
+        client = WorkflowRuntimeClient(one.workflow)
+        data = await client.async_request('graphql', {
+            'request_string': (
+                f'query {{ workflows(ids: ["{one.id}"]) {{ metrics }} }}'
+            ),
+        })
+        client.stop(stop_loop=False)
+        metrics = data['workflows'][0]['metrics']
+        assert metrics['phases']['iteration']['buckets']['+Inf'] >= 1
+
+
 async def test_stop(one: Scheduler, start):
     """Test stop."""
     async with start(one):
@@ -151,3 +181,120 @@ async def test_publish_before_shutdown(
         one.server.publish_queue.put([(b'fake', b'blah')])
         await one.server.stop('i said stop!')
         assert not one.server.publish_queue.qsize()
+
+
+async def test_concurrent_requests(
+    one: Scheduler, start, mock_glbl_cfg, monkeypatch
+):
+    """Test serving requests concurrently.
+
+    Slow queries should not hold up commands, and the number of queries
+    served at once should be limited per client.
+    """
+    mock_glbl_cfg(
+        'cylc.flow.network.server.glbl_cfg',
+        '''
+            [scheduler]
+                [[server]]
+                    concurrent requests = True
+                    max concurrent queries = 4
+                    max concurrent queries per client = 2
+        ''',
+    )
+
+    # make queries slow and record how many are served at once
+    in_progress = []
+    max_in_progress = 0
+    release = threading.Event()
+    pb_entire_workflow = WorkflowRuntimeServer.pb_entire_workflow
+
+    def _pb_entire_workflow(self, **kwargs):
+        nonlocal max_in_progress
+        in_progress.append(None)
+        max_in_progress = max(max_in_progress, len(in_progress))
+        release.wait(5)
+        in_progress.pop()
+        return pb_entire_workflow(self, **kwargs)
+
+    monkeypatch.setattr(
+        WorkflowRuntimeServer, 'pb_entire_workflow', _pb_entire_workflow
+    )
+
+    async with start(one):
+        assert isinstance(one.server.replier, WorkflowRouter)
+
+        def _query():
+            # (the client blocks whilst waiting, so use a thread for each)
+            client = WorkflowRuntimeClient(one.workflow)
+            try:
+                return client('pb_entire_workflow')
+            finally:
+                client.stop()
+
+        queries = [asyncio.create_task(asyncio.to_thread(_query))]
+        queries.extend(
+            asyncio.create_task(asyncio.to_thread(_query)) for _ in range(2)
+        )
+
+        # commands and job messages are served whilst the slow queries are
+        # in progress
+        client = WorkflowRuntimeClient(one.workflow)
+        async with asyncio.timeout(2):
+            while len(in_progress) < 2:
+                await asyncio.sleep(0.01)
+            assert 'graphql' in await client.async_request('api')
+            ret = await client.async_request(
+                'graphql',
+                {
+                    'request_string': MUTATION,
+                    'variables': {
+                        'wFlows': [one.workflow],
+                        'taskJob': '1/one/01',
+                        'eventTime': '2000-01-01T00:00:00Z',
+                        'messages': [['INFO', 'hello']],
+                    },
+                },
+            )
+            assert ret['message']['result'][0]['response'][0] is True
+            assert one.message_queue.qsize() == 1
+        assert len(in_progress) == 2  # the limit for a single client host
+
+        release.set()
+        async with asyncio.timeout(5):
+            for query in queries:
+                pb_data = PB_METHOD_MAP['pb_entire_workflow']()
+                pb_data.ParseFromString(await query)
+                assert pb_data.workflow.id == one.id
+        assert max_in_progress == 2
+        client.stop(stop_loop=False)
+
+        # requests from the same host finished - no leftover state
+        assert not one.server.replier._client_limits
+
+
+@pytest.mark.parametrize(
+    'message, expected',
+    [
+        pytest.param({'command': 'api', 'args': {}}, False, id='api'),
+        pytest.param(
+            {'command': 'pb_data_elements', 'args': {}}, True, id='pb'
+        ),
+        pytest.param(
+            {
+                'command': 'graphql',
+                'args': {'request_string': 'query { workflows { id } }'}
+            },
+            True,
+            id='query',
+        ),
+        pytest.param(
+            {'command': 'graphql', 'args': {'request_string': MUTATION}},
+            False,
+            id='job-message',
+        ),
+        pytest.param('not a dict', False, id='invalid'),
+    ],
+)
+def test_is_query(myflow, message, expected):
+    """Test requests are classified as queries or commands."""
+    assert myflow.server.is_query(message) is expected
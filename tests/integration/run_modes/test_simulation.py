@@ -477,6 +477,46 @@ async def test_settings_broadcast(
         assert itask.tdef.rtconfig['execution retry delays'] == [5.0, 5.0]
 
 
+async def test_broadcast_rtconfig_unchanged(
+    flow, scheduler, start, monkeytime
+):
+    """Simulation mode submission must not modify the cached broadcast
+    config, which is shared between callers.
+    """
+    id_ = flow({
+        'scheduler': {'cycle point format': '%Y'},
+        'scheduling': {
+            'initial cycle point': '1066',
+            'graph': {'R1': 'one'}
+        },
+        'runtime': {
+            'one': {
+                'platform': 'localhost',
+                'simulation': {'default run length': 'PT1M'},
+            },
+        }
+    }, defaults=False)
+    schd = scheduler(id_, paused_start=False, run_mode='simulation')
+    async with start(schd):
+        itask = schd.pool.get_task(ISO8601Point('1066'), 'one')
+        itask.state.is_queued = False
+        schd.broadcast_mgr.put_broadcast(
+            ['1066'], ['one'], [{
+                'simulation': {'fail cycle points': '1066'},
+            }])
+        rtconfig = schd.broadcast_mgr.get_updated_rtconfig(itask)
+        fail_points = list(rtconfig['simulation']['fail cycle points'])
+        assert rtconfig['platform'] == 'localhost'
+
+        schd.task_job_mgr.submit_nonlive_task_jobs([itask], RunMode.SIMULATION)
+        assert itask.mode_settings.sim_task_fails is True
+
+        # The cached config has not been modified by the submission:
+        assert schd.broadcast_mgr.get_updated_rtconfig(itask) is rtconfig
+        assert rtconfig['platform'] == 'localhost'
+        assert rtconfig['simulation']['fail cycle points'] == fail_points
+
+
 async def test_db_submit_num(
     flow, one_conf, scheduler, run, complete, db_select
 ):
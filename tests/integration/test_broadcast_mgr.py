@@ -282,3 +282,68 @@ async def test_broadcast_old_cycle(flow, scheduler, run, complete):
                 await asyncio.sleep(0.1)
                 if a_1.state(TASK_STATUS_FAILED):
                     break
+
+
+async def test_updated_rtconfig_cache(flow, scheduler, start):
+    """The broadcast runtime config is cached until the broadcasts change.
+
+    The cache is keyed by cycle and namespace, and must be invalidated by any
+    broadcast to the namespace or its ancestors, for the cycle or all cycles.
+    """
+    id_ = flow({
+        'scheduling': {
+            'cycling mode': 'integer',
+            'graph': {'P1': 'a & b'},
+        },
+        'runtime': {
+            'FAM': {},
+            'a': {'inherit': 'FAM'},
+            'b': {},
+        },
+    })
+    schd = scheduler(id_)
+    async with start(schd):
+        bc_mgr = schd.broadcast_mgr
+        a_1 = schd.pool._get_task_by_id('1/a')
+        b_1 = schd.pool._get_task_by_id('1/b')
+
+        def env(itask):
+            return dict(bc_mgr.get_updated_rtconfig(itask)['environment'])
+
+        # no broadcasts: the task config is used as is
+        assert bc_mgr.get_updated_rtconfig(a_1) is a_1.tdef.rtconfig
+
+        # broadcast to a family for all cycles
+        bc_mgr.put_broadcast(['*'], ['FAM'], [{'environment': {'X': '1'}}])
+        rtconfig = bc_mgr.get_updated_rtconfig(a_1)
+        assert env(a_1) == {'X': '1'}
+        assert bc_mgr.get_updated_rtconfig(a_1) is rtconfig
+        assert bc_mgr.get_updated_rtconfig(b_1) is b_1.tdef.rtconfig
+        # sections not broadcast to are not copied
+        assert rtconfig['meta'] is a_1.tdef.rtconfig['meta']
+        # the task config is not modified
+        assert dict(a_1.tdef.rtconfig['environment']) == {}
+
+        # broadcast to the task for its cycle
+        bc_mgr.put_broadcast(['1'], ['a'], [{'environment': {'X': '2'}}])
+        assert env(a_1) == {'X': '2'}
+
+        # broadcast to root for another cycle
+        bc_mgr.put_broadcast(['2'], ['root'], [{'environment': {'Y': '1'}}])
+        assert env(a_1) == {'X': '2'}
+        assert env(b_1) == {}
+
+        # clear the cycle broadcast
+        bc_mgr.clear_broadcast(point_strings=['1'])
+        assert env(a_1) == {'X': '1'}
+
+        # clear the family broadcast
+        bc_mgr.clear_broadcast(namespaces=['FAM'])
+        assert env(a_1) == {}
+        assert bc_mgr.get_updated_rtconfig(a_1) is a_1.tdef.rtconfig
+
+        # expire the cycle 2 broadcast
+        bc_mgr.expire_broadcast('3')
+        assert bc_mgr.broadcasts == {}
+        # (no cache entries are left for cycles without broadcasts)
+        assert {cycle for cycle, _ in bc_mgr._overrides_cache} == {None}
@@ -19,18 +19,25 @@ from pathlib import Path
 import sqlite3
 from textwrap import dedent
 from typing import Any
+from unittest.mock import ANY
+
 import pytest
 
-from cylc.flow import commands
+from cylc.flow import (
+    commands,
+    config_cache,
+)
 from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
 from cylc.flow.cfgspec.globalcfg import GlobalConfig
 from cylc.flow.exceptions import (
+    GraphParseError,
     InputError,
     PointParsingError,
     ServiceFileError,
     WorkflowConfigError,
     XtriggerConfigError,
 )
+from cylc.flow.graph_parser import GraphParser
 from cylc.flow.parsec.exceptions import ListValueError
 from cylc.flow.parsec.fileparse import read_and_proc
 from cylc.flow.pathutil import get_workflow_run_pub_db_path
@@ -837,3 +844,115 @@ async def test_icp_now_reload(
             f'{expected_icp}/foo',
         }
         assert not log_filter(level=logging.WARNING)
+
+
+async def test_config_cache(
+    flow, validate, log_filter, tmp_path, monkeypatch
+):
+    """Processed configs are cached, and reused if nothing has changed."""
+    monkeypatch.setattr(
+        'cylc.flow.config_cache.get_cache_dir', lambda: tmp_path
+    )
+    conf = {
+        'scheduling': {
+            'initial cycle point': '2000',
+            'graph': {'P1D': 'a[-P1D] => a => b'},
+            'queues': {'q': {'members': 'y'}},
+        },
+        'runtime': {
+            'FAM': {},
+            'a, b': {'inherit': 'FAM'},
+        },
+    }
+    wid = flow(conf)
+
+    def load(**kwargs):
+        config = validate(wid, **{'config_cache': True, **kwargs})
+        return config, config_cache.get_stats()
+
+    config1, stats = load()
+    assert stats['stores'] == 1
+    assert stats['hits'] == 0
+    assert log_filter(contains='Queues contain tasks not defined')
+
+    # load it again => loaded from the cache
+    config2, stats = load()
+    assert stats['stores'] == 1
+    assert stats['hits'] == 1
+    assert config2 is not config1
+    assert set(config2.taskdefs) == {'a', 'b'}
+    assert config2.get_parent_lists()['a'] == ['FAM']
+    assert [str(seq) for seq in config2.sequences] == ['R/20000101T0000Z/P1D']
+    assert config2.sequences[0].is_on_sequence(config2.initial_point)
+    # messages logged processing the config are logged again
+    assert len(log_filter(contains='Queues contain tasks not defined')) == 2
+
+    # change the config => processed again
+    conf['runtime']['y'] = {'inherit': 'FAM'}
+    flow(conf, workflow_id=wid)
+    _, stats = load()
+    assert stats['stores'] == 2
+
+    # different options => processed again
+    _, stats = load(icp='2001')
+    assert stats['stores'] == 3
+
+    # configs which depend on the current time are not cached
+    _, stats = load(icp='now')
+    assert stats['stores'] == 3
+
+    # opt out of the cache
+    _, stats = load(config_cache=False)
+    assert stats == {
+        'hits': 1, 'misses': 3, 'stores': 3, 'saved_seconds': ANY
+    }
+
+
+async def test_graph_section_cache(flow, validate, monkeypatch):
+    """Only graph sections which have changed are parsed again."""
+    parsed = []
+
+    def parse_graph(self, graph_string):
+        parsed.append(graph_string)
+        return _parse_graph(self, graph_string)
+
+    _parse_graph = GraphParser.parse_graph
+    monkeypatch.setattr(GraphParser, 'parse_graph', parse_graph)
+    conf = {
+        'task parameters': {'m': '1..3'},
+        'scheduling': {
+            'initial cycle point': '2000',
+            'graph': {
+                'R1': 'a<m> => b?',
+                'P1D': 'b[-P1D]? => c<m>',
+            },
+        },
+    }
+    wid = flow(conf)
+    validate(wid)
+    assert parsed == ['a<m> => b?', 'b[-P1D]? => c<m>']
+
+    # change one section => only that section is parsed again
+    parsed.clear()
+    conf['scheduling']['graph']['P1D'] = 'b[-P1D]? => c<m> => d'
+    flow(conf, workflow_id=wid)
+    config = validate(wid)
+    assert parsed == ['b[-P1D]? => c<m> => d']
+    assert set(config.taskdefs) == {
+        'a_m1', 'a_m2', 'a_m3', 'b', 'c_m1', 'c_m2', 'c_m3', 'd'
+    }
+
+    # change the parameters => all sections are parsed again
+    parsed.clear()
+    conf['task parameters']['m'] = '1..2'
+    flow(conf, workflow_id=wid)
+    validate(wid)
+    assert len(parsed) == 2
+
+    # output optionality is still checked across (cached) sections
+    parsed.clear()
+    conf['scheduling']['graph']['P1D'] = 'b[-P1D] => c<m> => d'
+    flow(conf, workflow_id=wid)
+    with pytest.raises(GraphParseError, match="both required and optional"):
+        validate(wid)
+    assert parsed == ['b[-P1D] => c<m> => d']
@@ -31,17 +31,23 @@ from cylc.flow.commands import (
     run_cmd,
 )
 from cylc.flow.data_messages_pb2 import (
+    AllDeltas,
     PbJob,
     PbPrerequisite,
     PbTaskProxy,
 )
 from cylc.flow.data_store_mgr import (
+    ALL_DELTAS,
+    DELTAS_MAP,
     EDGES,
+    EMPTY_CHECKSUM,
     FAMILY_PROXIES,
     JOBS,
     TASK_PROXIES,
     TASKS,
     WORKFLOW,
+    checksum_string,
+    generate_checksum,
 )
 from cylc.flow.id import (
     TaskTokens,
@@ -512,6 +518,86 @@ async def test_prune_data_store(flow, scheduler, start):
         }) == 0
 
 
+async def test_incremental_checksums(flow, scheduler, start):
+    """The incrementally maintained checksums should match checksums
+    computed over the whole data-store as elements are added, updated and
+    pruned."""
+    id_ = flow({
+        'scheduling': {
+            'graph': {
+                'R1': 'foo => bar => baz'
+            }
+        },
+        'runtime': {
+            'FOO': {},
+            'foo': {'inherit': 'FOO'},
+            'bar': {'inherit': 'FOO'},
+        }
+    })
+    schd = scheduler(id_)
+
+    def check_checksums():
+        data_store_mgr = schd.data_store_mgr
+        data = data_store_mgr.data[data_store_mgr.workflow_id]
+        for key in (EDGES, FAMILY_PROXIES, JOBS, TASK_PROXIES, TASKS):
+            checksum = data_store_mgr.checksums.get(key, EMPTY_CHECKSUM)
+            assert checksum == generate_checksum(
+                checksum_string(key, element)
+                for element in data[key].values()
+            ), key
+
+    async with start(schd):
+        await schd.update_data_structure()
+        check_checksums()
+
+        # update
+        schd.pool.hold_tasks({TaskTokens('*', 'root')})
+        await schd.update_data_structure()
+        check_checksums()
+
+        # add
+        for itask in schd.pool.get_tasks():
+            schd.pool.spawn_on_output(itask, TASK_OUTPUT_SUCCEEDED)
+        await schd.update_data_structure()
+        check_checksums()
+
+        # prune
+        schd.data_store_mgr.set_graph_window_extent(0)
+        await schd.update_data_structure()
+        check_checksums()
+
+        # the published deltas carry the checksums
+        delta = AllDeltas.FromString(
+            schd.data_store_mgr.publish_deltas[-1][1]
+        )
+        assert delta.task_proxies.checksum == (
+            schd.data_store_mgr.checksums[TASK_PROXIES]
+        )
+
+
+async def test_publish_deltas(one: Scheduler, start):
+    """Deltas are published as bytes, with the "all" deltas message built
+    from the deltas of each type."""
+    async with start(one):
+        one.pool.hold_tasks({TaskTokens('1', 'one')})
+        await one.update_data_structure()
+        publish_deltas = one.data_store_mgr.publish_deltas
+        assert all(
+            isinstance(topic, bytes) and isinstance(msg, bytes)
+            and serializer is None
+            for topic, msg, serializer in publish_deltas
+        )
+        topics = [topic.decode() for topic, *_ in publish_deltas]
+        assert topics[-1] == ALL_DELTAS
+        assert TASK_PROXIES in topics
+        all_deltas = AllDeltas.FromString(publish_deltas[-1][1])
+        for topic, msg, _ in publish_deltas[:-1]:
+            assert getattr(all_deltas, topic.decode()) == (
+                DELTAS_MAP[topic.decode()].FromString(msg)
+            )
+        assert all_deltas.task_proxies.updated[0].is_held
+
+
 async def test_family_ascent_point_prune(mod_harness):
     """Test _family_ascent_point_prune. This method tries to remove
     non-existent family."""
@@ -145,3 +145,24 @@ def test_flownum(checker):
         ['good', '10010101T0000Z', 'waiting', '(flows=2)'],
     ]
     assert result == expect
+
+
+def test_batch(checker):
+    """Batched queries give the same results as individual queries."""
+    queries = [
+        (task, cycle, selector, is_trigger, is_message, flow_num)
+        for task in ('good', 'bad', 'output', None)
+        for cycle in ('10000101T0000Z', '10010101T0000Z', '1000*')
+        for selector, is_trigger, is_message in (
+            (None, False, False),
+            ('succeeded', False, False),
+            ('failed', False, False),
+            ('custom_output', True, False),
+            ('foo', False, True),
+            ('finished', True, False),
+        )
+        for flow_num in (None, 1, 2)
+    ]
+    assert checker.workflow_state_query_batch(queries) == [
+        checker.workflow_state_query(*query) for query in queries
+    ]
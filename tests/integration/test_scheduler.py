@@ -454,3 +454,93 @@ async def test_set_stall_interaction(flow, scheduler, start):
             schd.data_store_mgr.data[schd.tokens.id]['workflow'].status_msg
             != 'stalled'
         )
+
+
+async def test_event_driven_main_loop(
+    flow, scheduler, start, mock_glbl_cfg
+):
+    """In event-driven mode only changed or trigger-waiting tasks are checked.
+
+    The main loop should also be woken early by wake_main_loop.
+    """
+    mock_glbl_cfg(
+        'cylc.flow.scheduler.glbl_cfg',
+        '''
+            [scheduler]
+                [[main loop]]
+                    event driven = True
+                    full sweep interval = PT1H
+        ''',
+    )
+    id_ = flow({
+        'scheduling': {
+            'xtriggers': {'never': 'xrandom(0)'},
+            'graph': {
+                'R1': '''
+                    @never => a
+                    b
+                '''
+            },
+        },
+    })
+    schd: 'Scheduler' = scheduler(id_, paused_start=True)
+    async with start(schd):
+        assert schd.main_loop_event_driven
+        a = schd.pool.get_task(schd.config.start_point, 'a')
+        b = schd.pool.get_task(schd.config.start_point, 'b')
+
+        # the first iteration performs a full sweep
+        await schd._main_loop()
+        assert b.state.is_queued
+        assert schd.pool.trigger_watch_tasks == {a}
+
+        # subsequent iterations only examine changed and watched tasks
+        assert schd.pool.get_tasks_to_examine(full=False) == [a]
+        b.state_reset(is_held=True)
+        assert schd.pool.get_tasks_to_examine(full=False) == [a, b]
+        assert schd.pool.get_tasks_to_examine(full=False) == [a]
+
+        # satisfying the xtrigger takes the task off the watch list
+        schd.xtrigger_mgr.force_satisfy(a, {'never': True})
+        await schd._main_loop()
+        assert a.state.is_queued
+        assert not schd.pool.trigger_watch_tasks
+
+        # the main loop can be woken early
+        schd.wake_main_loop()
+        await asyncio.wait_for(schd._main_loop_sleep(60), 5)
+
+
+async def test_late_tasks_check(flow, scheduler, start, log_filter):
+    """Tasks should be checked for lateness when their late time is due."""
+    id_ = flow({
+        'scheduling': {
+            'initial cycle point': '2000',
+            'graph': {'R1': 'foo & bar'},
+        },
+        'runtime': {
+            'foo': {'events': {'late offset': 'PT1H'}},
+            'bar': {'events': {'late offset': 'P100000D'}},
+        },
+    })
+    schd: 'Scheduler' = scheduler(id_, paused_start=True)
+    async with start(schd):
+        foo = schd.pool.get_task(schd.config.start_point, 'foo')
+        bar = schd.pool.get_task(schd.config.start_point, 'bar')
+        queue = schd.pool.late_timer_queue
+        assert queue.get_due(foo.identity) == foo.get_late_time()
+        assert queue.get_due(bar.identity) == bar.get_late_time()
+        assert schd.get_next_timer_due() == foo.get_late_time()
+
+        schd.late_tasks_check()
+        assert foo.is_late
+        assert not bar.is_late
+        assert log_filter(logging.WARNING, contains='late (late-time=')
+        assert foo.identity not in queue
+        assert schd.get_next_timer_due() == bar.get_late_time()
+
+        # tasks can only become late before they are active
+        bar.state_reset(TASK_STATUS_RUNNING)
+        assert bar.identity not in queue
+        bar.state_reset(TASK_STATUS_WAITING)
+        assert queue.get_due(bar.identity) == bar.get_late_time()
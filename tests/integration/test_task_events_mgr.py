@@ -16,6 +16,7 @@
 
 import logging
 from pathlib import Path
+from time import time
 from types import SimpleNamespace
 from typing import Any as Fixture
 
@@ -30,7 +31,9 @@ from cylc.flow.id import Tokens
 from cylc.flow.network.resolvers import TaskMsg
 from cylc.flow.run_modes import RunMode
 from cylc.flow.scheduler import Scheduler
+from cylc.flow.task_action_timer import TaskActionTimer
 from cylc.flow.task_events_mgr import (
+    CustomTaskEventHandlerContext,
     EventKey,
     TaskEventsManager,
     TaskJobLogsRetrieveContext,
@@ -468,3 +471,49 @@ async def test_job_log_retrieval_success_condition(
         assert not log_filter(contains='File(s) not retrieved')
         assert len(_unset_waiting_event_timer_calls) == 2
         assert len(_remove_event_timer_calls) == 1
+
+
+async def test_event_timer_queue(one: Scheduler, start):
+    """Only due event timers should be processed."""
+    commands = []
+    async with start(one):
+        one.proc_pool.put_command = (
+            lambda ctx, **kwargs: commands.append(ctx.cmd_key)
+        )
+        events_mgr = one.task_events_mgr
+        itask = one.pool.get_tasks()[0]
+        itask.submit_num = 1
+        now = time()
+        id_keys = {}
+        for event, timeout in (
+            ('future', now + 3600),
+            ('past', now - 1),
+            ('new', None),
+        ):
+            id_keys[event] = EventKey(
+                'handler', event, event, itask.job_tokens
+            )
+            events_mgr.add_event_timer(
+                id_keys[event],
+                TaskActionTimer(
+                    CustomTaskEventHandlerContext(event, 'true'),
+                    delays=[60],
+                    timeout=timeout,
+                ),
+            )
+        # new timers are due at once (to start them)
+        assert events_mgr.get_next_event_timer_due() == 0
+
+        events_mgr.process_events(one)
+        assert commands == [(('handler', 'past'), 1)]
+        new_timer = events_mgr._event_timers[id_keys['new']]
+        assert new_timer.timeout > now
+        assert events_mgr.get_next_event_timer_due() == new_timer.timeout
+
+        # waiting timers are not queued until the handler has completed
+        events_mgr.process_events(one)
+        assert len(commands) == 1
+        events_mgr.remove_event_timer(id_keys['new'])
+        assert events_mgr.get_next_event_timer_due() == now + 3600
+        events_mgr.unset_waiting_event_timer(id_keys['past'])
+        assert events_mgr.get_next_event_timer_due() == 0
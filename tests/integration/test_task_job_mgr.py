@@ -14,18 +14,24 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 from contextlib import suppress
 import json
 import logging
+from pathlib import Path
+from textwrap import dedent
+from time import time
 from typing import Any as Fixture
 from unittest.mock import Mock
 
 from cylc.flow import CYLC_LOG
 from cylc.flow.job_runner_mgr import JOB_FILES_REMOVED_MESSAGE
+from cylc.flow.pathutil import get_workflow_run_job_dir
 from cylc.flow.scheduler import Scheduler
 from cylc.flow.task_state import (
     TASK_STATUS_FAILED,
     TASK_STATUS_RUNNING,
+    TASK_STATUS_SUCCEEDED,
 )
 
 
@@ -293,3 +299,114 @@ async def test__prep_submit_task_job_impl_handles_all_old_platform_settings(
             schd.task_job_mgr._prep_submit_task_job(task_a)
 
         assert task_a.platform['name'] == 'bakery'
+
+
+async def test_check_task_jobs_due(one_conf, flow, scheduler, start):
+    """Only tasks with a job poll or timeout due should be checked."""
+    schd: Scheduler = scheduler(flow(one_conf), run_mode='live')
+    async with start(schd):
+        polled = []
+        schd.task_job_mgr.poll_task_jobs = polled.append
+        queue = schd.task_events_mgr.job_timer_queue
+        itask = schd.pool.get_tasks()[0]
+        itask.submit_num = 1
+        itask.state_reset(TASK_STATUS_RUNNING)
+        itask.summary['started_time'] = time()
+        itask.platform['execution polling intervals'] = [60]
+        schd.task_events_mgr._reset_job_timers(itask)
+        assert queue.get_due(itask.identity) == itask.poll_timer.timeout
+
+        # not due yet
+        schd.task_job_mgr.check_task_jobs(schd.pool)
+        assert polled == []
+        assert queue.get_due(itask.identity) == itask.poll_timer.timeout
+
+        # due => poll and queue the next poll
+        itask.poll_timer.timeout = time() - 1
+        schd.task_events_mgr.queue_job_timers(itask)
+        schd.task_job_mgr.check_task_jobs(schd.pool)
+        assert polled == [{itask}]
+        assert queue.get_due(itask.identity) == itask.poll_timer.timeout
+        assert itask.poll_timer.timeout > time()
+
+        # timers are dropped when the task is no longer active
+        itask.state_reset(TASK_STATUS_FAILED)
+        schd.task_events_mgr._reset_job_timers(itask)
+        assert itask.identity not in queue
+
+
+async def test_poll_job_agent(
+    one_conf, flow, scheduler, start, mock_glbl_cfg
+):
+    """Jobs can be polled via a job agent."""
+    mock_glbl_cfg(
+        'cylc.flow.platforms.glbl_cfg',
+        '''
+            [platforms]
+                [[localhost]]
+                    job agent = True
+        ''',
+    )
+    schd: Scheduler = scheduler(flow(one_conf))
+    async with start(schd):
+        itask = schd.pool.get_tasks()[0]
+        itask.submit_num = 1
+        itask.state_reset(TASK_STATUS_RUNNING)
+
+        # the job has succeeded
+        job_log_dir = Path(
+            get_workflow_run_job_dir(schd.workflow),
+            itask.job_tokens.relative_id,
+        )
+        job_log_dir.mkdir(parents=True)
+        (job_log_dir / 'job.status').write_text(dedent('''
+            CYLC_JOB_RUNNER_NAME=background
+            CYLC_JOB_ID=99999999
+            CYLC_JOB_PID=99999999
+            CYLC_JOB_EXIT=SUCCEEDED
+        '''))
+
+        for _ in range(2):
+            itask.state_reset(TASK_STATUS_RUNNING)
+            schd.task_job_mgr.poll_task_jobs([itask])
+            # the poll should be run by the job agent
+            assert not schd.proc_pool.queuings
+            start_time = time()
+            while schd.proc_pool.is_not_done():
+                assert time() - start_time < 60
+                schd.proc_pool.process()
+                await asyncio.sleep(0.05)
+            assert itask.state(TASK_STATUS_SUCCEEDED)
+
+        # the same agent should have been used for both polls
+        agent, = schd.proc_pool.agent_pool.agents.values()
+        assert agent.cmd == ['cylc', 'jobs-agent']
+
+
+async def test_poll_status_cache_interval(
+    one_conf, flow, scheduler, start, mock_glbl_cfg
+):
+    """The job runner status cache interval is passed to jobs-poll."""
+    mock_glbl_cfg(
+        'cylc.flow.platforms.glbl_cfg',
+        '''
+            [platforms]
+                [[localhost]]
+                    job runner status cache interval = PT30S
+        ''',
+    )
+    schd: Scheduler = scheduler(flow(one_conf))
+    async with start(schd):
+        itask = schd.pool.get_tasks()[0]
+        itask.submit_num = 1
+        itask.state_reset(TASK_STATUS_RUNNING)
+        schd.task_job_mgr.poll_task_jobs([itask])
+        ctx = schd.proc_pool.queuings[0][0]
+        assert '--status-cache-interval=30' in ctx.cmd
+
+        # the option is only used for polls
+        schd.task_job_mgr.kill_task_jobs([itask])
+        ctx = schd.proc_pool.queuings[1][0]
+        assert not any(
+            arg.startswith('--status-cache-interval') for arg in ctx.cmd
+        )
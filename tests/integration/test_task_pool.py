@@ -57,6 +57,7 @@ from cylc.flow.task_state import (
     TASK_STATUS_SUBMITTED,
     TASK_STATUS_SUCCEEDED,
     TASK_STATUS_WAITING,
+    TASK_STATUSES_ORDERED,
 )
 
 
@@ -2642,3 +2643,111 @@ async def test_add_to_pool(
         schd.pool.add_to_pool(a_1)
 
         assert "1/a not added to n=0: already exists" in caplog.text
+
+
+async def test_task_pool_index(flow, scheduler, start):
+    """The pool index should agree with a brute-force scan of the pool."""
+    id_ = flow({
+        'scheduling': {
+            'cycling mode': 'integer',
+            'runahead limit': 'P1',
+            'xtriggers': {'x': 'xrandom(0)'},
+            'graph': {'P1': '@x => a & b'},
+        },
+    })
+    schd = scheduler(id_)
+
+    def check_index():
+        pool = schd.pool
+        itasks = pool.get_tasks()
+        for status in TASK_STATUSES_ORDERED:
+            assert set(pool.get_tasks_by_status(status)) == {
+                itask for itask in itasks if itask.state(status)
+            }
+        assert set(pool.get_held_tasks()) == {
+            itask for itask in itasks if itask.state.is_held
+        }
+        assert pool.index.queued == {
+            itask for itask in itasks if itask.state.is_queued
+        }
+        assert pool.index.runahead == {
+            itask for itask in itasks if itask.state.is_runahead
+        }
+        for itask in itasks:
+            assert pool._get_task_by_id(itask.identity) is itask
+        assert set(pool.get_tasks_by_name('a')) == {
+            itask for itask in itasks if itask.tdef.name == 'a'
+        }
+
+    async with start(schd):
+        check_index()
+        a_1 = schd.pool.get_task(IntegerPoint('1'), 'a')
+        sig = schd.xtrigger_mgr.get_xtrig_ctx(a_1, 'x').get_signature()
+        assert a_1 in schd.pool.index.by_xtrigger[sig]
+        assert sig in schd.pool.get_xtrigger_signatures()
+
+        # change task state
+        a_1.state_reset(TASK_STATUS_RUNNING)
+        schd.pool.hold_tasks({TaskTokens('1', 'b')})
+        check_index()
+        assert a_1 in schd.pool.get_tasks_by_status(TASK_STATUS_RUNNING)
+
+        # satisfy the xtrigger
+        schd.xtrigger_mgr.force_satisfy(a_1, {'x': True})
+        assert a_1 not in schd.pool.index.by_xtrigger.get(sig, ())
+
+        # remove a task
+        schd.pool.remove(a_1)
+        check_index()
+        assert schd.pool._get_task_by_id('1/a') is None
+
+
+async def test_spawn_children(flow, scheduler, start, db_select):
+    """It should spawn and satisfy all children of an output in one pass.
+
+    * New children should be added to the pool with their prerequisites.
+    * Absolute outputs should satisfy every instance of the child in the
+      pool, and be recorded once.
+    """
+    id_ = flow({
+        'scheduling': {
+            'cycling mode': 'integer',
+            'runahead limit': 'P2',
+            'graph': {
+                'R1': 'build => x & y',
+                'P1': 'build[^] => a',
+            },
+        },
+    })
+    schd = scheduler(id_)
+
+    async with start(schd):
+        pool = schd.pool
+        build = pool.get_task(IntegerPoint('1'), 'build')
+        assert pool.get_task(IntegerPoint('1'), 'x') is None
+        a_tasks = pool.get_tasks_by_name('a')
+        assert len(a_tasks) > 1
+        assert not any(itask.prereqs_are_satisfied() for itask in a_tasks)
+
+        build.state_reset(TASK_STATUS_SUCCEEDED)
+        build.state.outputs.set_trigger_complete(TASK_OUTPUT_SUCCEEDED)
+        pool.spawn_on_output(build, TASK_OUTPUT_SUCCEEDED)
+
+        # the new children are in the pool and the data store, satisfied
+        await schd.update_data_structure()
+        for name in ('x', 'y'):
+            itask = pool.get_task(IntegerPoint('1'), name)
+            assert itask.prereqs_are_satisfied()
+            tproxy = schd.data_store_mgr.data[schd.id][TASK_PROXIES][
+                schd.tokens.duplicate(**itask.tokens.task).id
+            ]
+            assert [prereq.satisfied for prereq in tproxy.prerequisites] == [
+                True
+            ]
+
+        # every instance of the absolute child is satisfied
+        assert all(itask.prereqs_are_satisfied() for itask in a_tasks)
+        assert pool.abs_outputs_done == {('1', 'build', 'succeeded')}
+        assert db_select(schd, True, 'absolute_outputs') == [
+            ('1', 'build', 'succeeded')
+        ]
@@ -208,3 +208,157 @@ async def test_time_zone_writing(
     assert (
         abs(time_submit - now) < timedelta(seconds=10)
     ), f"{time_submit} ~= {now}"
+
+
+async def test_put_task_pool_incremental(
+    flow, scheduler, start, db_select
+):
+    """It should only write task pool rows which have changed.
+
+    Compares the number of rows written per call with a full rewrite of the
+    task pool tables.
+    """
+    id_ = flow({
+        'scheduling': {
+            'cycling mode': 'integer',
+            'runahead limit': 'P4',
+            'graph': {'P1': 'a => b => c'},
+        },
+    })
+    schd: 'Scheduler' = scheduler(id_)
+    async with start(schd):
+        db_mgr = schd.workflow_db_mgr
+        tables = list(db_mgr.TASK_POOL_TABLE_KEYS)
+
+        def queued_rows():
+            """Return the number of task pool rows queued and flush them."""
+            count = sum(
+                len(db_mgr.db_inserts_map[table])
+                + len(db_mgr.db_deletes_map[table])
+                for table in tables
+            )
+            db_mgr.process_queued_ops()
+            return count
+
+        def db_pool():
+            return sorted(db_select(schd, True, 'task_pool'))
+
+        # the first call rewrites the tables in full
+        db_mgr.put_task_pool(schd.pool)
+        full_rewrite = queued_rows()
+        assert full_rewrite > len(schd.pool.get_tasks())
+        assert db_pool() == sorted(
+            (str(itask.point), itask.tdef.name, '[1]', 'waiting', 0)
+            for itask in schd.pool.get_tasks()
+        )
+
+        # nothing has changed so nothing should be written
+        db_mgr.put_task_pool(schd.pool)
+        assert queued_rows() == 0
+
+        # a change to one task should write one row
+        a_1 = schd.pool._get_task_by_id('1/a')
+        a_1.state_reset(is_held=True)
+        db_mgr.put_task_pool(schd.pool)
+        assert queued_rows() == 1
+        assert ('1', 'a', '[1]', 'waiting', 1) in db_pool()
+
+        # a task leaving the pool should delete its rows
+        schd.pool.remove(a_1)
+        db_mgr.put_task_pool(schd.pool)
+        assert 0 < queued_rows() < full_rewrite
+        assert ('1', 'a', '[1]', 'waiting', 1) not in db_pool()
+        assert not db_select(
+            schd, True, 'task_prerequisites', cycle='1', name='a'
+        )
+
+
+async def test_background_pub_writer(
+    flow, scheduler, start, mock_glbl_cfg, log_filter
+):
+    """The public DB should be written by the background writer if enabled.
+
+    If the writer falls behind, the public DB should be recovered from the
+    private DB.
+    """
+    mock_glbl_cfg(
+        'cylc.flow.scheduler.glbl_cfg',
+        '''
+            [scheduler]
+                [[database]]
+                    background public database writer = True
+        ''',
+    )
+    id_ = flow('a => b')
+    schd: 'Scheduler' = scheduler(id_)
+
+    def select_pub_pool():
+        with sqlite3.connect(schd.workflow_db_mgr.pub_path) as conn:
+            return sorted(conn.execute('SELECT cycle, name FROM task_pool'))
+
+    async with start(schd):
+        db_mgr = schd.workflow_db_mgr
+        writer = db_mgr.pub_writer
+        assert writer is not None
+        db_mgr.put_task_pool(schd.pool)
+        schd.process_workflow_db_queue()
+        writer.flush()
+        assert select_pub_pool() == [('1', 'a')]
+        assert writer.n_batches_written
+
+        # make the writer fall behind
+        with writer.paused():
+            schd.pool.remove(schd.pool.get_tasks()[0])
+            db_mgr.put_task_pool(schd.pool)
+            schd.process_workflow_db_queue()
+            writer.max_batches = 0
+            schd.database_health_check()
+        assert log_filter(contains='writer is behind')
+        assert select_pub_pool() == []
+        assert writer.get_lag() == (0, 0.0)
+    assert db_mgr.pub_writer is None
+
+
+async def test_database_profile(
+    flow, scheduler, start, mock_glbl_cfg, monkeypatch
+):
+    """The profile for the run dir filesystem type should be used."""
+    mock_glbl_cfg(
+        'cylc.flow.scheduler.glbl_cfg',
+        '''
+            [scheduler]
+                [[database]]
+                    [[[ext4, xfs]]]
+                        journal mode = WAL
+                        synchronous = NORMAL
+                        persistent connection = True
+        ''',
+    )
+    monkeypatch.setattr(
+        'cylc.flow.scheduler.get_filesystem_type', lambda _: 'xfs'
+    )
+    id_ = flow('a => b')
+    schd: 'Scheduler' = scheduler(id_)
+    async with start(schd):
+        db_mgr = schd.workflow_db_mgr
+        assert db_mgr.db_profile.journal_mode == 'WAL'
+        pri_conn = db_mgr.pri_dao.connect()
+        assert pri_conn.execute('PRAGMA journal_mode').fetchone() == ('wal',)
+        db_mgr.put_task_pool(schd.pool)
+        schd.process_workflow_db_queue()
+        assert db_mgr.pri_dao.conn is pri_conn
+
+        # the public DB should get the content of the WAL when copied
+        db_mgr.copy_pri_to_pub()
+        with sqlite3.connect(db_mgr.pub_path) as conn:
+            assert conn.execute(
+                'SELECT cycle, name FROM task_pool'
+            ).fetchall() == [('1', 'a')]
+            # the public DB should not be in WAL mode (read-only readers
+            # would need write access to its -shm and -wal files)
+            assert conn.execute('PRAGMA journal_mode').fetchone() == (
+                'delete',
+            )
+        assert db_mgr.pub_dao.connect().execute(
+            'PRAGMA journal_mode'
+        ).fetchone() == ('delete',)
@@ -21,6 +21,7 @@ from textwrap import dedent
 from typing import cast, Iterable
 
 from cylc.flow import commands
+from cylc.flow.cycling.integer import IntegerPoint
 from cylc.flow.data_messages_pb2 import PbTaskProxy
 from cylc.flow.data_store_mgr import FAMILY_PROXIES, TASK_PROXIES
 from cylc.flow.id import TaskTokens
@@ -28,6 +29,7 @@ from cylc.flow.pathutil import get_workflow_run_dir
 from cylc.flow.scheduler import Scheduler
 from cylc.flow.subprocctx import SubFuncContext
 from cylc.flow.task_outputs import TASK_OUTPUT_SUCCEEDED
+from cylc.flow.task_state import TASK_STATUS_SUCCEEDED
 
 
 async def test_2_xtriggers(flow, start, scheduler, monkeypatch):
@@ -249,7 +251,7 @@ async def test_1_xtrigger_2_tasks_later(
         assert foo.state.xtriggers == {'echo': True}
 
         # this will delete the xtrigger - nothing else depends on it
-        schd.xtrigger_mgr.housekeep([foo])
+        schd.xtrigger_mgr.housekeep(schd.pool.get_xtrigger_signatures())
 
         # Spawn bar and remove foo
         schd.pool.spawn_on_output(foo, TASK_OUTPUT_SUCCEEDED)
@@ -479,6 +481,120 @@ async def test_error_in_xtrigger(flow, start, scheduler):
         assert error[0] == 'ERROR in xtrigger mytrig()'
 
 
+async def test_xtrigger_workers(
+    flow, start, scheduler, mock_glbl_cfg, db_select
+):
+    """It should run xtriggers in worker processes if configured."""
+    mock_glbl_cfg(
+        'cylc.flow.subprocpool.glbl_cfg',
+        '''
+            [scheduler]
+                [[xtrigger workers]]
+                    pool size = 1
+        '''
+    )
+    id_ = flow({
+        'scheduling': {
+            'xtriggers': {
+                'x100': 'xrandom(100)',  # always succeeds
+                'x0': 'xrandom(0)'  # never succeeds
+            },
+            'graph': {
+                'R1': '''
+                    @x100 => foo
+                    @x0 => bar
+                '''
+            },
+        }
+    })
+    schd = scheduler(id_)
+    async with start(schd):
+        for task in schd.pool.get_tasks():
+            schd.xtrigger_mgr.call_xtriggers_async(task)
+        # the calls go to the function pool, not subprocesses
+        assert not schd.proc_pool.queuings
+        assert len(schd.proc_pool.func_pool.queuings) == 2
+        for _ in range(300):
+            await asyncio.sleep(0.1)
+            schd.proc_pool.process()
+            if not schd.proc_pool.is_not_done():
+                break
+        else:
+            raise Exception('Function pool did not clear')
+        assert list(schd.xtrigger_mgr.sat_xtrig) == ['xrandom(100)']
+        assert not schd.xtrigger_mgr.active
+        # call latencies are recorded by function
+        assert schd.proc_pool.func_pool.stats['xrandom'].calls == 2
+
+    db_xtriggers = db_select(schd, True, 'xtriggers')
+    assert [row[0] for row in db_xtriggers] == ['xrandom(100)']
+
+
+async def test_workflow_state_batch(flow, start, scheduler, log_filter):
+    """It should batch workflow_state xtrigger calls by target workflow."""
+    upstream = flow({
+        'scheduling': {
+            'cycling mode': 'integer',
+            'graph': {'P1': 'a'},
+        },
+    })
+    up_schd = scheduler(upstream)
+    async with start(up_schd):
+        itask = up_schd.pool.get_task(IntegerPoint('1'), 'a')
+        itask.state_reset(TASK_STATUS_SUCCEEDED)
+        up_schd.workflow_db_mgr.put_update_task_state(itask)
+        up_schd.process_workflow_db_queue()
+
+    id_ = flow({
+        'scheduling': {
+            'cycling mode': 'integer',
+            'runahead limit': 'P2',
+            'xtriggers': {
+                'up': (
+                    f'workflow_state("{upstream}//%(point)s/a")'
+                ),
+                'other': 'workflow_state("other//%(point)s/a")',
+            },
+            'graph': {'P1': '@up & @other => b'},
+        },
+    })
+    schd = scheduler(id_)
+    async with start(schd):
+        assert schd.xtrigger_mgr.xtriggers.workflow_state_labels == {
+            'up', 'other'
+        }
+        tasks = [
+            itask for itask in schd.pool.get_tasks()
+            if not itask.state.is_runahead
+        ]
+        assert len(tasks) == 3
+        for task in tasks:
+            schd.xtrigger_mgr.call_xtriggers_async(task)
+        # calls are batched by target workflow
+        assert not schd.proc_pool.queuings
+        assert len(schd.xtrigger_mgr.active) == 6
+        schd.xtrigger_mgr.call_batched_xtriggers()
+        assert sorted(
+            (ctx.func_name, len(ctx.func_args[0]))
+            for ctx, *_ in schd.proc_pool.queuings
+        ) == [('workflow_state_batch', 3), ('workflow_state_batch', 3)]
+
+        for _ in range(100):
+            await asyncio.sleep(0.1)
+            schd.proc_pool.process()
+            if not schd.proc_pool.is_not_done():
+                break
+        else:
+            raise Exception('Process pool did not clear')
+
+        # results are handled per xtrigger
+        assert not schd.xtrigger_mgr.active
+        assert list(schd.xtrigger_mgr.sat_xtrig) == [
+            f'workflow_state({upstream}//1/a)'
+        ]
+        assert not log_filter(contains='ERROR in xtrigger')
+
+
 async def test_1_seq_clock_trigger_2_tasks(flow, start, scheduler):
     """Test that all tasks dependent on a sequential clock trigger continue to
     spawn after the first cycle.
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from cylc.flow.data_messages_pb2 import AllDeltas
+from cylc.flow.data_store_mgr import (
+    ALL_DELTAS,
+    TASK_PROXIES,
+)
+from cylc.flow.task_state import (
+    TASK_STATUS_RUNNING,
+    TASK_STATUS_WAITING,
+    TASK_STATUSES_ORDERED,
+)
+from cylc.flow.tui.replica import WorkflowReplica
+
+
+async def get_all_deltas(schd):
+    """Return the "all" deltas the scheduler would publish next."""
+    await schd.update_data_structure()
+    for topic, msg, _ in schd.data_store_mgr.publish_deltas:
+        if topic == ALL_DELTAS.encode():
+            return AllDeltas.FromString(msg)
+
+
+async def test_replica(flow, scheduler, start):
+    """The replica should follow the data store by applying deltas."""
+    schd = scheduler(
+        flow({
+            'scheduling': {'graph': {'R1': 'a & b'}},
+            'runtime': {'FAM': {}, 'a': {'inherit': 'FAM'}},
+        }),
+        paused_start=True,
+    )
+    async with start(schd):
+        await schd.update_data_structure()
+        replica = WorkflowReplica(schd.tokens.id)
+        replica.load(schd.data_store_mgr.get_entire_workflow())
+        assert not replica.stale
+        data = replica.get_data(TASK_STATUSES_ORDERED)
+        assert data['id'] == schd.tokens.id
+        assert data['status'] == 'paused'
+        tasks = {task['name']: task for task in data['taskProxies']}
+        assert set(tasks) == {'a', 'b'}
+        assert tasks['a']['firstParent']['name'] == 'FAM'
+        assert tasks['b']['firstParent']['name'] == 'root'
+        assert [family['name'] for family in data['familyProxies']] == [
+            'FAM'
+        ]
+        assert [cycle['name'] for cycle in data['cyclePoints']] == ['root']
+
+        # apply a task state change
+        a = schd.pool.get_task(schd.config.start_point, 'a')
+        a.state_reset(TASK_STATUS_RUNNING)
+        schd.data_store_mgr.delta_task_state(a)
+        replica.apply_deltas(await get_all_deltas(schd))
+        assert not replica.stale
+        assert (
+            replica.checksums[TASK_PROXIES]
+            == schd.data_store_mgr.checksums[TASK_PROXIES]
+        )
+        data = replica.get_data([TASK_STATUS_RUNNING])
+        assert [task['name'] for task in data['taskProxies']] == ['a']
+        # (unchanged tasks are not converted again)
+        b_data = tasks['b']
+        data = replica.get_data([TASK_STATUS_WAITING])
+        assert data['taskProxies'] == [b_data]
+        assert data['taskProxies'][0] is b_data
+
+        # a missed delta should be detected by the checksums
+        b = schd.pool.get_task(schd.config.start_point, 'b')
+        b.state_reset(TASK_STATUS_RUNNING)
+        schd.data_store_mgr.delta_task_state(b)
+        await get_all_deltas(schd)
+        a.state_reset(TASK_STATUS_WAITING)
+        schd.data_store_mgr.delta_task_state(a)
+        replica.apply_deltas(await get_all_deltas(schd))
+        assert replica.stale
@@ -24,6 +24,7 @@ from time import time
 
 import pytest
 
+from cylc.flow import commands
 from cylc.flow.cycling.integer import IntegerPoint
 from cylc.flow.id import Tokens
 from cylc.flow.tui.updater import (
@@ -234,3 +235,47 @@ async def test_filters(one_conf, flow, scheduler, run, updater):
             #     '1/b',
             #     '1/c',
             # }
+
+
+async def test_delta_subscription(
+    one_conf, flow, scheduler, run, updater, monkeypatch
+):
+    """It should keep a replica of the workflow up to date with deltas.
+
+    The entire workflow should only be requested to begin with.
+    """
+    schd = scheduler(flow(one_conf), paused_start=True)
+
+    async with run(schd):
+        async with asyncio.timeout(10):
+            updater.subscribe(schd.tokens.id)
+            await updater._update()
+            replica = updater._replicas[schd.tokens.id]
+            assert not replica.stale
+
+            # record requests made to the workflow from now on
+            requests = []
+            client = updater._clients[schd.tokens.id]
+            async_request = client.async_request
+
+            def _async_request(command, *args, **kwargs):
+                requests.append(command)
+                return async_request(command, *args, **kwargs)
+
+            monkeypatch.setattr(client, 'async_request', _async_request)
+
+            # hold the task, the change should arrive as a delta
+            await commands.run_cmd(commands.hold(schd, ['*']))
+            while True:
+                root_node = await updater._update()
+                task_node = root_node['children'][0]['children'][0][
+                    'children'
+                ][0]
+                if task_node['data']['isHeld']:
+                    break
+            assert requests == []
+
+            # unsubscribe from the workflow
+            updater.unsubscribe(schd.tokens.id)
+            await updater._update()
+            assert schd.tokens.id not in updater._replicas
@@ -0,0 +1,81 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+
+import pytest
+
+from cylc.flow.network.encoding import (
+    COMPRESSIONS,
+    FORMATS,
+    decode_response,
+    encode_response,
+    get_accept_encoding,
+    negotiate_encoding,
+)
+
+
+@pytest.mark.parametrize('compression', [None, *COMPRESSIONS])
+@pytest.mark.parametrize('fmt', list(FORMATS))
+def test_round_trip(fmt, compression):
+    """Responses should survive encoding and decoding."""
+    res = {
+        'data': {'workflows': [{'id': f'~u/w{i}'} for i in range(5000)]},
+        'cylc_version': '8',
+    }
+    msg = encode_response(res, (fmt, compression))
+    assert decode_response(msg) == res
+    if compression:
+        # should be smaller than the plain JSON
+        assert len(msg) < len(json.dumps(res)) / 2
+
+    # bytes (e.g. protobuf) are sent as is
+    res = {'data': b'\n\x05hello' * 5000}
+    assert decode_response(encode_response(res, (fmt, compression))) == (
+        res['data']
+    )
+
+
+def test_legacy():
+    """Older clients should get plain JSON or bytes responses."""
+    message = json.loads(json.dumps(
+        {'command': 'graphql', 'args': {}, 'meta': {}}
+    ))
+    encoding = negotiate_encoding(message)
+    assert encoding is None
+    res = {'data': {'a': 1}}
+    assert json.loads(encode_response(res, encoding)) == res
+    assert encode_response({'data': b'x'}, encoding) == b'x'
+
+
+def test_negotiate():
+    """The server should use the first format/compression it supports."""
+    assert negotiate_encoding({'accept_encoding': get_accept_encoding()}) == (
+        next(iter(get_accept_encoding()['formats'])),
+        next(iter(get_accept_encoding()['compressions'])),
+    )
+    assert negotiate_encoding(
+        {'accept_encoding': {'formats': ['x', 'json'], 'compressions': ['y']}}
+    ) == ('json', None)
+    assert negotiate_encoding({'accept_encoding': 'zlib'}) is None
+
+
+def test_msgpack():
+    pytest.importorskip('msgpack', reason='requires msgpack')
+    res = {'data': {'a': [1, 2.5, None, 'x']}}
+    msg = encode_response(res, ('msgpack', None))
+    assert msg.startswith(b'\x00msgpack\x00')
+    assert decode_response(msg) == res
@@ -0,0 +1,42 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import logging
+import os
+
+from cylc.flow import config_cache
+
+
+def test_cache_dir_permissions(tmp_path, monkeypatch, caplog):
+    """The cache dir should be private, and not used if not ours."""
+    cache_dir = tmp_path / 'config-cache'
+    monkeypatch.setattr(
+        'cylc.flow.config_cache.get_cache_dir', lambda: cache_dir
+    )
+    cache_dir.mkdir(mode=0o755)
+    cache_dir.chmod(0o755)
+    config_cache.store('x', {'a': 1}, [], 1.0)
+    assert cache_dir.stat().st_mode & 0o777 == 0o700
+    assert config_cache.load('x') == ({'a': 1}, [])
+
+    # owned by another user => not used
+    monkeypatch.setattr(os, 'getuid', lambda: os.geteuid() + 1)
+    caplog.set_level(logging.WARNING)
+    assert config_cache.load('x') is None
+    assert 'owned by another user' in caplog.text
+    config_cache.store('y', {'a': 1}, [], 1.0)
+    assert not (cache_dir / 'y.pickle').exists()
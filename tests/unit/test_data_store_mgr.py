@@ -20,6 +20,11 @@ from time import time
 from cylc.flow.data_store_mgr import (
     task_mean_elapsed_time,
     apply_delta,
+    generate_checksum,
+    CHECKSUM_VERSION,
+    EMPTY_CHECKSUM,
+    get_checksum_version,
+    TASK_PROXIES,
     WORKFLOW,
     DELTAS_MAP,
     ALL_DELTAS,
@@ -67,3 +72,30 @@ def test_apply_delta():
 
     assert data[WORKFLOW].id == w_id
     assert data[WORKFLOW].pruned is True
+
+
+def test_apply_delta_checksums():
+    """Test checksums are maintained as deltas are applied."""
+    data = deepcopy(DATA_TEMPLATE)
+    checksums = {}
+
+    def apply(added=(), updated=(), pruned=()):
+        delta = DELTAS_MAP[TASK_PROXIES]()
+        for id_, stamp in added:
+            delta.added.add(id=id_, stamp=stamp)
+        for id_, stamp in updated:
+            delta.updated.add(id=id_, stamp=stamp)
+        delta.pruned.extend(pruned)
+        apply_delta(TASK_PROXIES, delta, data, checksums)
+        assert checksums[TASK_PROXIES] == generate_checksum(
+            element.stamp for element in data[TASK_PROXIES].values()
+        )
+
+    apply(added=[('a', 'a@1'), ('b', 'b@1')])
+    apply(updated=[('a', 'a@2'), ('x', 'x@2')])  # x not in the store
+    apply(added=[('b', 'b@3')])  # re-added
+    apply(pruned=['a', 'x'])
+    assert checksums[TASK_PROXIES] == generate_checksum(['b@3'])
+    apply(pruned=['b'])
+    assert checksums[TASK_PROXIES] == EMPTY_CHECKSUM
+    assert get_checksum_version(checksums[TASK_PROXIES]) == CHECKSUM_VERSION
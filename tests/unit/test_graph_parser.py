@@ -995,3 +995,59 @@ def test_proc_dep_pair(args, err):
             gp._proc_dep_pair(*args)
     else:
         assert gp._proc_dep_pair(*args) is None
+
+
+@pytest.mark.parametrize(
+    'graph1, graph2, err',
+    [
+        param(
+            'a:fail? => b',
+            'FAM:fail-any? => c\nx? => y',
+            None,
+            id='consistent',
+        ),
+        param(
+            'a? => b',
+            'a => c',
+            "Output a:succeeded can't be both required and optional",
+            id='inconsistent',
+        ),
+        param(
+            'a => b',
+            'a:fail => c',
+            'Opposite outputs a:failed and a:succeeded must both be optional',
+            id='opposite-outputs',
+        ),
+    ]
+)
+def test_merge_output_opt(graph1, graph2, err):
+    """Merging output optionality is equivalent to passing it in."""
+    fam_map = {'FAM': ['a', 'x']}
+
+    # parse the graphs in turn, passing output optionality in
+    task_output_opt: Dict = {}
+    try:
+        for graph in (graph1, graph2):
+            gp = GraphParser(fam_map, task_output_opt=task_output_opt)
+            gp.parse_graph(graph)
+            task_output_opt.update(gp.task_output_opt)
+    except GraphParseError as exc:
+        assert err and err in str(exc)
+    else:
+        assert not err
+
+    # parse the graphs independently, then merge output optionality
+    merged: Dict = {}
+    gp1 = GraphParser(fam_map)
+    gp1.parse_graph(graph1)
+    gp2 = GraphParser(fam_map)
+    gp2.parse_graph(graph2)
+    gp1.merge_output_opt(merged)
+    if err:
+        with pytest.raises(GraphParseError, match=err):
+            gp2.merge_output_opt(merged)
+    else:
+        gp2.merge_output_opt(merged)
+        assert merged == task_output_opt
+    # the parsers' own output optionality is unchanged
+    assert gp2.task_output_opt != merged
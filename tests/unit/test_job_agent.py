@@ -0,0 +1,176 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from io import BytesIO
+import json
+import os
+from textwrap import dedent
+from time import (
+    sleep,
+    time,
+)
+
+import pytest
+
+from cylc.flow.job_agent import (
+    JobAgentPool,
+    run_request,
+    serve,
+)
+from cylc.flow.subprocctx import SubProcContext
+from cylc.flow.subprocpool import SubProcPool
+
+
+@pytest.fixture
+def job_log_root(tmp_path):
+    """A job log directory with the status file of a succeeded job."""
+    job_log_dir = tmp_path / 'log' / 'job' / '1' / 'a' / '01'
+    job_log_dir.mkdir(parents=True)
+    (job_log_dir / 'job.status').write_text(dedent('''
+        CYLC_JOB_RUNNER_NAME=background
+        CYLC_JOB_ID=99999999
+        CYLC_JOB_PID=99999999
+        CYLC_JOB_EXIT=SUCCEEDED
+    '''))
+    return str(tmp_path / 'log' / 'job')
+
+
+def _poll_ctx(job_log_root, agent_cmd=('cylc', 'jobs-agent')):
+    args = ['jobs-poll', '--', job_log_root, '1/a/01']
+    return SubProcContext(
+        'jobs-poll',
+        ['cylc', *args],
+        agent_cmd=list(agent_cmd),
+        agent_args=args,
+    )
+
+
+def _run_pool(pool, ctxs, timeout=60):
+    for ctx in ctxs:
+        pool.put_command([ctx, None, None, None, None, None])
+    done = []
+    start = time()
+    while pool.is_not_done():
+        assert time() - start < timeout, 'job commands did not complete'
+        done.extend(call[0] for call in pool.process())
+        sleep(0.05)
+    return done
+
+
+def test_serve():
+    """It writes a result for each request, in order.
+
+    (Job commands are run by the agent in the tests below, they change the
+    logging configuration.)
+    """
+    writer = BytesIO()
+    serve(
+        BytesIO(b'{"id": 2, "args": ["jobs-foo"]}\nnot json\n'),
+        writer,
+    )
+    foo, bad = [json.loads(line) for line in writer.getvalue().splitlines()]
+    assert foo == {
+        'id': 2, 'ret_code': 1, 'out': '', 'err': 'unknown command: jobs-foo'
+    }
+    assert bad['id'] is None
+    assert bad['ret_code'] == 1
+
+
+def test_run_request_submit_env(tmp_path):
+    """Job submits should not change the agent's environment."""
+    job_log_dir = tmp_path / 'log' / 'job' / '1' / 'a' / '01'
+    job_log_dir.mkdir(parents=True)
+    job_file = job_log_dir / 'job'
+    job_file.write_text('#!/bin/sh\n# Job runner: background\ntrue\n')
+    job_file.chmod(0o755)
+    path = os.environ['PATH']
+    for _ in range(2):
+        ret_code, out, _err = run_request(
+            [
+                'jobs-submit', '--path=/x/bin', '--env=CYLC_TEST_X',
+                '--', str(tmp_path / 'log' / 'job'), '1/a/01',
+            ],
+            None,
+        )
+        assert ret_code == 0
+        assert '|1/a/01|0|' in out
+    assert os.environ['PATH'] == path
+    assert 'CYLC_TEST_X' not in os.environ
+
+
+def test_job_agent_pool(job_log_root):
+    """Commands for the same agent command run in the same agent."""
+    pool = JobAgentPool(timeout=60)
+    try:
+        done = _run_pool(pool, [_poll_ctx(job_log_root) for _ in range(3)])
+        assert [ctx.ret_code for ctx in done] == [0, 0, 0]
+        assert all('|1/a/01|' in ctx.out for ctx in done)
+        assert all('"run_status": 0' in ctx.out for ctx in done)
+        # the agent is kept for the next command
+        agent, = pool.agents.values()
+        assert agent.proc.poll() is None
+    finally:
+        assert pool.terminate() == []
+    assert agent.proc.returncode == 0
+
+
+def test_job_agent_pool_exit(job_log_root):
+    """Commands fail with the exit code of the agent if it exits."""
+    pool = JobAgentPool(timeout=60)
+    try:
+        ctx, = _run_pool(
+            pool,
+            [
+                _poll_ctx(
+                    job_log_root, ['bash', '-c', 'echo oops >&2; exit 255']
+                )
+            ]
+        )
+        assert ctx.ret_code == 255
+        assert ctx.err == 'oops\njob agent exited (255)'
+        assert not pool.agents
+    finally:
+        pool.terminate()
+
+
+def test_job_agent_pool_timeout(job_log_root):
+    """Agents are killed (and their commands fail) on timeout."""
+    pool = JobAgentPool(timeout=1)
+    try:
+        ctx, = _run_pool(pool, [_poll_ctx(job_log_root, ['sleep', '60'])])
+        assert ctx.ret_code == -9
+        assert 'killed on timeout (1)' in ctx.err
+        assert not pool.agents
+    finally:
+        pool.terminate()
+
+
+def test_subprocpool_job_agent(job_log_root):
+    """The process pool runs job commands in job agents if configured."""
+    proc_pool = SubProcPool()
+    ctx = _poll_ctx(job_log_root)
+    done = []
+    proc_pool.put_command(ctx, callback=done.append)
+    assert not proc_pool.queuings
+    start = time()
+    while proc_pool.is_not_done():
+        assert time() - start < 60
+        proc_pool.process()
+        sleep(0.05)
+    assert done == [ctx]
+    assert ctx.ret_code == 0
+    proc_pool.terminate()
+    assert not proc_pool.agent_pool.agents
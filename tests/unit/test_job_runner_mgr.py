@@ -14,8 +14,11 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from time import time
+
 from cylc.flow.job_runner_mgr import (
-    JobRunnerManager, JOB_FILES_REMOVED_MESSAGE)
+    JobPollContext, JobRunnerManager, JOB_FILES_REMOVED_MESSAGE)
+from cylc.flow.job_runner_status_cache import StatusQuery
 
 jrm = JobRunnerManager()
 
@@ -76,3 +79,75 @@ def test__job_poll_status_files_ioerror(tmp_path, capsys):
     jrm._jobs_poll_status_files(str(tmp_path), 'sub')
     cap = capsys.readouterr()
     assert '[Errno 2] No such file or directory' in cap.err
+
+
+def test__jobs_poll_runner_status_cache(tmp_path, monkeypatch):
+    """Job runner status queries are shared via the status cache."""
+    class Handler:
+        POLL_CMD = 'poll'
+        POLL_ALL_CMD = 'poll-all'
+
+    jobs = ['1', '2']  # the jobs in the job runner
+    cmds = []
+
+    def _jobs_poll_cmd(cmd):
+        cmds.append(cmd)
+        return StatusQuery(
+            0, ''.join(f'{job} R\n' for job in jobs), '', time()
+        )
+
+    monkeypatch.setattr(
+        JobRunnerManager, '_INSTANCES', {'fake': Handler()}
+    )
+    monkeypatch.setattr(
+        'cylc.flow.job_runner_status_cache.get_cache_path',
+        lambda name: str(tmp_path / 'cache' / f'{name}.json'),
+    )
+    job_runner_mgr = JobRunnerManager()
+    monkeypatch.setattr(job_runner_mgr, '_jobs_poll_cmd', _jobs_poll_cmd)
+
+    def poll(*job_ids):
+        ctxs = []
+        for job_id in job_ids:
+            (tmp_path / job_id).mkdir(exist_ok=True)
+            (tmp_path / job_id / 'job.status').write_text(
+                f'CYLC_JOB_RUNNER_NAME=fake\nCYLC_JOB_ID={job_id}\n'
+            )
+            ctxs.append(
+                JobPollContext(
+                    job_id, job_runner_name='fake', job_id=job_id
+                )
+            )
+        job_runner_mgr._jobs_poll_runner(str(tmp_path), 'fake', ctxs, 60)
+        return {ctx.job_id: ctx.job_runner_exit_polled for ctx in ctxs}
+
+    # the first poll lists all jobs
+    assert poll('1', '2') == {'1': 0, '2': 0}
+    assert cmds == [['poll-all']]
+
+    # later polls (e.g. by other workflows) use the cache
+    assert poll('1') == {'1': 0}
+    assert poll('2') == {'2': 0}
+    assert cmds == [['poll-all']]
+
+    # a job missing from the cache is checked with a new query
+    jobs.append('3')
+    assert poll('3') == {'3': 0}
+    assert cmds == [['poll-all']] * 2
+
+    # ... and if it is still missing, it has left the job runner
+    assert poll('1', '4') == {'1': 0, '4': 1}
+    assert cmds == [['poll-all']] * 3
+
+    # if the query fails, the jobs are polled as usual
+    cmds.clear()
+    monkeypatch.setattr(
+        job_runner_mgr,
+        '_jobs_poll_cmd',
+        lambda cmd: cmds.append(cmd) or StatusQuery(
+            int(cmd[0] == 'poll-all'), '5 R\n', '', time()
+        ),
+    )
+    (tmp_path / 'cache' / 'fake.json').unlink()
+    assert poll('5', '6') == {'5': 0, '6': 1}
+    assert cmds == [['poll-all'], ['poll', '5', '6']]
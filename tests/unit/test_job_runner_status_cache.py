@@ -0,0 +1,64 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from time import time
+
+from cylc.flow.job_runner_status_cache import (
+    StatusQuery,
+    query,
+)
+
+
+def test_query(tmp_path):
+    """It caches successful queries for the interval."""
+    path = str(tmp_path / 'host' / 'fake.json')
+    calls = []
+
+    def run(cmd, ret_code=0):
+        calls.append(cmd)
+        return StatusQuery(ret_code, f'out {len(calls)}', '', time())
+
+    # the first query is run
+    assert query(path, ['a'], run, 60).out == 'out 1'
+    # later queries use the cache
+    assert query(path, ['a'], run, 60).out == 'out 1'
+    assert len(calls) == 1
+
+    # the cache is not used for other commands
+    assert query(path, ['b'], run, 60).out == 'out 2'
+    # ... or once it has expired
+    assert query(path, ['b'], run, 0).out == 'out 3'
+    # ... or if it is older than required
+    assert query(path, ['b'], run, 60, not_before=time()).out == 'out 4'
+    assert query(path, ['b'], run, 60).out == 'out 4'
+
+    # failed queries are not cached
+    assert query(
+        path, ['b'], lambda cmd: run(cmd, ret_code=1), 0
+    ).ret_code == 1
+    assert query(path, ['b'], run, 60).out == 'out 4'
+
+
+def test_query_corrupt_cache(tmp_path):
+    """It ignores a corrupt cache."""
+    path = tmp_path / 'fake.json'
+    path.write_text('{')
+    result = query(
+        str(path), ['a'], lambda cmd: StatusQuery(0, 'out', '', time()), 60
+    )
+    assert result.out == 'out'
+    assert query(str(path), ['a'], None, 60) == result
@@ -0,0 +1,209 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import os
+import socket
+import threading
+from typing import List, Tuple
+
+import pytest
+
+from cylc.flow.exceptions import (
+    CylcError,
+    WorkflowStopped,
+)
+from cylc.flow.message_relay import (
+    MessageRelay,
+    RelayedMessages,
+    relay_messages,
+)
+
+
+@pytest.fixture
+def relay(tmp_path, monkeypatch):
+    """A running relay which records the batches it forwards."""
+    batches: List[Tuple[str, List[RelayedMessages]]] = []
+    relay = MessageRelay(
+        # (the messages are forwarded when the relay stops)
+        str(tmp_path / 'relay' / 'relay.sock'), interval=60,
+        max_batch_size=2,
+    )
+    monkeypatch.setattr(
+        relay, 'forward', lambda *args: batches.append(args) or True
+    )
+    relay.batches = batches  # type: ignore[attr-defined]
+    thread = threading.Thread(target=relay.serve, daemon=True)
+    relay.thread = thread  # type: ignore[attr-defined]
+    thread.start()
+    for _ in range(500):
+        if (tmp_path / 'relay' / 'relay.sock').exists():
+            break
+        threading.Event().wait(0.01)
+    yield relay
+    relay.stop()
+    thread.join(5)
+
+
+def test_relay_messages(relay):
+    """It should batch messages per workflow."""
+    for ind in range(3):
+        assert relay_messages(
+            'a', f'1/x/0{ind}', [['INFO', 'hi']], 'T', path=relay.path
+        )
+    assert relay_messages(
+        'b', '1/x/01', [['INFO', 'hi']], 'T', path=relay.path
+    )
+    relay.stop()
+    relay.thread.join(5)
+    assert not os.path.exists(relay.path)
+    assert sorted(
+        (workflow, [item.job_id for item in batch])
+        for workflow, batch in relay.batches
+    ) == [
+        ('a', ['1/x/00', '1/x/01']),
+        ('a', ['1/x/02']),
+        ('b', ['1/x/01']),
+    ]
+
+
+def test_relay_bad_request(relay):
+    """It should reject malformed requests."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(relay.path)
+        sock.sendall(b'{"workflow": "a"}\n')
+        assert sock.makefile('rb').readline().startswith(b'error:')
+
+
+def test_relay_already_running(relay):
+    """It should not start a second relay on the same socket."""
+    with pytest.raises(CylcError, match='already running'):
+        MessageRelay(relay.path)._bind()
+
+
+def test_no_relay(tmp_path):
+    """It should not accept messages if no relay is running."""
+    path = tmp_path / 'relay.sock'
+    assert not relay_messages('a', '1/x/01', [], 'T', path=str(path))
+    # stale socket
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(str(path))
+    assert not relay_messages('a', '1/x/01', [], 'T', path=str(path))
+    MessageRelay(str(path))._bind()
+    assert not path.exists()
+
+
+def test_forward(monkeypatch):
+    """It should keep the client open, unless the request fails."""
+    clients = []
+
+    class Client:
+        def __init__(self, workflow, timeout=None):
+            self.requests = []
+            self.stopped = False
+            clients.append(self)
+
+        def __call__(self, command, args):
+            if args['variables']['taskJob0'] == 'stop':
+                raise WorkflowStopped('a')
+            self.requests.append(args)
+
+        def stop(self):
+            self.stopped = True
+
+    monkeypatch.setattr(
+        'cylc.flow.network.client_factory.get_client', Client
+    )
+    relay = MessageRelay('relay.sock')
+    batch = [RelayedMessages('1/x/01', 'T', [['INFO', 'hi']])]
+    assert relay.forward('a', batch)
+    assert relay.forward('a', batch)
+    assert len(clients) == 1
+    assert len(clients[0].requests) == 2
+    assert clients[0].requests[0]['variables']['wFlows'] == ['a']
+
+    # a failed request is retried once with a new client
+    assert not relay.forward('a', [RelayedMessages('stop', 'T', [])])
+    assert len(clients) == 2
+    assert clients[0].stopped
+    assert clients[1].stopped
+    assert relay.forward('a', batch)
+    assert len(clients) == 3
+
+
+def test_forward_stale_client(monkeypatch):
+    """It should retry with a new client if a kept client fails.
+
+    E.g. if the scheduler has restarted with a new port and keys.
+    """
+    clients = []
+
+    class Client:
+        def __init__(self, workflow, timeout=None):
+            self.stale = False
+            self.requests = []
+            clients.append(self)
+
+        def __call__(self, command, args):
+            if self.stale:
+                raise WorkflowStopped('a')
+            self.requests.append(args)
+
+        def stop(self):
+            pass
+
+    monkeypatch.setattr(
+        'cylc.flow.network.client_factory.get_client', Client
+    )
+    relay = MessageRelay('relay.sock')
+    batch = [RelayedMessages('1/x/01', 'T', [['INFO', 'hi']])]
+    assert relay.forward('a', batch)
+    clients[0].stale = True
+    assert relay.forward('a', batch)
+    assert len(clients) == 2
+    assert len(clients[1].requests) == 1
+
+
+def test_flush_concurrent(monkeypatch):
+    """An unresponsive workflow should not hold up other workflows."""
+    forwarded: List[str] = []
+    unblock = threading.Event()
+
+    def forward(workflow, batch):
+        if workflow == 'slow':
+            unblock.wait(10)
+        forwarded.append(workflow)
+        return True
+
+    relay = MessageRelay('relay.sock')
+    monkeypatch.setattr(relay, 'forward', forward)
+    item = RelayedMessages('1/x/01', 'T', [])
+    relay.put('slow', item)
+    relay.put('fast', item)
+    relay.flush()
+    for _ in range(500):
+        if forwarded:
+            break
+        threading.Event().wait(0.01)
+    assert forwarded == ['fast']
+
+    # messages for the slow workflow are held while it is forwarded to
+    relay.put('slow', item)
+    relay.put('fast', item)
+    relay.flush()
+    unblock.set()
+    relay.flush(block=True)
+    assert sorted(forwarded) == ['fast', 'fast', 'slow', 'slow']
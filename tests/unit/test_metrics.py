@@ -0,0 +1,39 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from threading import Thread
+
+from cylc.flow.metrics import MainLoopMetrics
+
+
+def test_count_threads():
+    """Counters and phases can be recorded from multiple threads."""
+    metrics = MainLoopMetrics()
+
+    def _record():
+        for _ in range(10000):
+            metrics.count('requests')
+            metrics.observe('publish', 0.001)
+
+    threads = [Thread(target=_record) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = metrics.get_stats()
+    assert stats['counters']['requests']['total'] == 80000
+    assert stats['phases']['publish']['count'] == 80000
@@ -15,6 +15,8 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from functools import partial
+from itertools import product
+import re
 from typing import Optional
 
 import pytest
@@ -50,11 +52,8 @@ def test_satisfied(prereq: Prerequisite):
         ('2000', 'c', 'succeeded'): False,
         ('2001', 'd', 'custom'): False,
     }
-    # No cached satisfaction state yet:
-    assert prereq._cached_satisfied is None
-    # Calling self.is_satisfied() should cache the result:
+    assert prereq._unsatisfied == 3
     assert not prereq.is_satisfied()
-    assert prereq._cached_satisfied is False
 
     # mark two prerequisites as satisfied
     prereq.satisfy_me([
@@ -70,8 +69,8 @@ def test_satisfied(prereq: Prerequisite):
         # the remaining dependency should not
         ('2001', 'd', 'custom'): False,
     }
-    # Should have reset cached satisfaction state:
-    assert prereq._cached_satisfied is None
+    # Should have updated the count of unsatisfied outputs:
+    assert prereq._unsatisfied == 1
     assert not prereq.is_satisfied()
 
     # mark all prereqs as satisfied
@@ -85,8 +84,7 @@ def test_satisfied(prereq: Prerequisite):
         # the remaining dependency should be marked as forse-satisfied
         ('2001', 'd', 'custom'): 'force satisfied',
     }
-    # Should have set cached satisfaction state as must be true now:
-    assert prereq._cached_satisfied is True
+    assert prereq._unsatisfied == 0
     assert prereq.is_satisfied()
 
 
@@ -198,7 +196,7 @@ def test_satisfy_me():
     for task_name in ('a', 'b', 'c'):
         prereq[('1', task_name, 'x')] = False
     assert not prereq.is_satisfied()
-    assert prereq._cached_satisfied is False
+    assert prereq._unsatisfied == 3
 
     prereq.satisfy_me(
         [Tokens('//1/a:x'), Tokens('//1/d:x'), Tokens('//1/c:y')],
@@ -208,8 +206,8 @@ def test_satisfy_me():
         ('1', 'b', 'x'): False,
         ('1', 'c', 'x'): False,
     }
-    # should have reset cached satisfaction state
-    assert prereq._cached_satisfied is None
+    # should have updated the count of unsatisfied outputs
+    assert prereq._unsatisfied == 2
 
     prereq.satisfy_me(
         [Tokens('//1/a:x'), Tokens('//1/b:x')],
@@ -264,15 +262,42 @@ def test_satisfy_me__override_truthy(
 
 @pytest.mark.parametrize(
     'expr, err', (
-        ('int("df")', 'invalid literal'),
-        ('7 +', 'invalid syntax'),
+        ('1/a x | 1/z x', 'unknown output'),
+        ('1/a x | (1/b x', 'unmatched'),
+        ('1/a x | ', 'unexpected end'),
+        ('1/a x | 1/b x)', 'unexpected'),
     ))
-def test__eval_satisfied_raises(expr, err, monkeypatch):
-    monkeypatch.setattr(
-        'cylc.flow.prerequisite.Prerequisite.get_raw_conditional_expression',
-        lambda _: expr
-    )
+def test_set_conditional_expr_raises(expr, err):
     prereq = Prerequisite(IntegerPoint('1'))
-    prereq.conditional_expression = expr
+    prereq[('1', 'a', 'x')] = False
+    prereq[('1', 'b', 'x')] = False
     with pytest.raises(TriggerExpressionError, match=err):
-        prereq._eval_satisfied()
+        prereq.set_conditional_expr(expr)
+
+
+@pytest.mark.parametrize(
+    'expr', (
+        'a | b & c',
+        '(a | b) & c',
+        'a & b | c & d',
+        '(a | (b & (c | d))) & e',
+        'a | a & b',
+    ))
+def test_conditional_expression(expr):
+    """Compiled expressions should agree with Python for every change."""
+    names = sorted(set(re.findall(r'\w', expr)))
+    prereq = Prerequisite(IntegerPoint('1'))
+    for name in names:
+        prereq[('1', name, 'x')] = False
+    prereq.set_conditional_expr(re.sub(r'(\w)', r'1/\1 x', expr))
+    assert prereq.get_raw_conditional_expression() == (
+        re.sub(r'(\w)', r'1/\1 x', expr)
+    )
+    # set and unset each output in turn, in every combination
+    for states in product((False, True), repeat=len(names)):
+        for name, state in zip(names, states):
+            prereq[('1', name, 'x')] = state
+        assert prereq.is_satisfied() == eval(  # nosec
+            expr.replace('|', ' or ').replace('&', ' and '),
+            dict(zip(names, states)),
+        )
@@ -31,7 +31,10 @@ import pytest
 
 from cylc.flow.exceptions import PlatformLookupError
 from cylc.flow.flow_mgr import FlowNums
-from cylc.flow.rundb import CylcWorkflowDAO
+from cylc.flow.rundb import (
+    CylcWorkflowDAO,
+    DatabaseProfile,
+)
 from cylc.flow.util import serialise_set
 
 
@@ -237,3 +240,44 @@ def test_select_latest_flow_nums(
         conn.commit()
 
         assert dao.select_latest_flow_nums() == expected
+
+
+def test_database_profile(tmp_path):
+    """It should apply the profile and keep persistent connections healthy.
+    """
+    profile = DatabaseProfile(
+        journal_mode='WAL',
+        synchronous='NORMAL',
+        persistent_connection=True,
+        cache_size=4000,
+    )
+    db_file = tmp_path / 'db'
+    with CylcWorkflowDAO(db_file, create_tables=True, profile=profile) as dao:
+        dao.set_journal_mode()
+        conn = dao.connect()
+        assert conn.execute('PRAGMA journal_mode').fetchone() == ('wal',)
+        assert conn.execute('PRAGMA synchronous').fetchone() == (1,)
+        assert conn.execute('PRAGMA cache_size').fetchone() == (-4000,)
+
+        # the connection should persist between writes
+        dao.add_insert_item(
+            CylcWorkflowDAO.TABLE_TASKS_TO_HOLD, {'name': 'a', 'cycle': '1'}
+        )
+        dao.execute_queued_items()
+        assert dao.conn is conn
+
+        # the changes should be in the DB file after a checkpoint
+        dao.checkpoint()
+        assert not (tmp_path / 'db-wal').stat().st_size
+
+        # it should reconnect if the DB file is replaced
+        db_file.rename(tmp_path / 'db.old')
+        CylcWorkflowDAO(db_file, create_tables=True).close()
+        dao.add_insert_item(
+            CylcWorkflowDAO.TABLE_TASKS_TO_HOLD, {'name': 'b', 'cycle': '1'}
+        )
+        dao.execute_queued_items()
+        assert dao.conn is not conn
+        assert dao.connect().execute(
+            'SELECT name FROM tasks_to_hold'
+        ).fetchall() == [('b',)]
@@ -14,7 +14,13 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import json
+import logging
 from pathlib import Path
+from time import (
+    sleep,
+    time,
+)
 from types import SimpleNamespace
 from tempfile import (
     NamedTemporaryFile,
@@ -29,8 +35,12 @@ from cylc.flow import LOG
 from cylc.flow.id import Tokens
 from cylc.flow.cycling.iso8601 import ISO8601Point
 from cylc.flow.task_events_mgr import TaskJobLogsRetrieveContext
-from cylc.flow.subprocctx import SubProcContext
+from cylc.flow.subprocctx import (
+    SubFuncContext,
+    SubProcContext,
+)
 from cylc.flow.subprocpool import (
+    FunctionPool,
     SubProcPool,
     _XTRIG_FUNC_CACHE,
     get_xtrig_func,
@@ -422,3 +432,159 @@ def test_rsync_255_fail(mock_ctx, expect, ctx_kwargs):
         {'ssh command': 'ssh', 'rsync command': 'rsync command'},
     )
     assert output == expect
+
+
+@pytest.fixture
+def xtrig_dir(tmp_path):
+    """A workflow run dir with an xtrigger module."""
+    python_dir = tmp_path / 'lib' / 'python'
+    python_dir.mkdir(parents=True)
+    (python_dir / 'pool_xtrig.py').write_text(
+        'import os, sys, time\n'
+        'CALLS = []\n'
+        'def pool_xtrig(delay=0):\n'
+        '    CALLS.append(delay)\n'
+        '    print("hello")\n'
+        '    time.sleep(delay)\n'
+        '    return True, {"pid": os.getpid(), "calls": len(CALLS)}\n'
+        'def pool_error():\n'
+        '    raise ValueError("oops")\n'
+    )
+    return tmp_path
+
+
+def _func_ctx(xtrig_dir, func_name='pool_xtrig', **kwargs):
+    ctx = SubFuncContext(
+        'label', func_name, [], kwargs, mod_name='pool_xtrig'
+    )
+    ctx.update_command(str(xtrig_dir))
+    return ctx
+
+
+def _run_pool(pool, ctxs, timeout=60):
+    """Run function calls to completion, return contexts in finish order."""
+    done = []
+    for ctx in ctxs:
+        pool.put_command(ctx)
+    start = time()
+    while pool.is_not_done():
+        assert time() - start < timeout, 'function calls did not complete'
+        done.extend(ctx for ctx, _, _ in pool.process())
+        sleep(0.05)
+    return done
+
+
+def test_function_pool(xtrig_dir, caplog):
+    """Workers keep modules imported between calls and are recycled."""
+    caplog.set_level(logging.INFO, LOG.name)
+    pool = FunctionPool(size=1, max_calls=2, timeout=60)
+    try:
+        done = _run_pool(
+            pool, [_func_ctx(xtrig_dir, delay=0) for _ in range(3)]
+        )
+        results = [json.loads(ctx.out) for ctx in done]
+        assert [ctx.ret_code for ctx in done] == [0, 0, 0]
+        # function stdout is redirected to stderr
+        assert [ctx.err for ctx in done] == ['hello\n'] * 3
+        # the first worker made two calls (with the module imported once),
+        # then was replaced
+        assert [res[1]['calls'] for res in results] == [1, 2, 1]
+        assert results[0][1]['pid'] == results[1][1]['pid']
+        assert results[1][1]['pid'] != results[2][1]['pid']
+        assert pool.stats['pool_xtrig'].calls == 3
+        assert pool.stats['pool_xtrig'].errors == 0
+    finally:
+        assert pool.terminate() == []
+    assert 'pool_xtrig: 3 calls (0 errors)' in caplog.text
+
+
+def test_function_pool_error(xtrig_dir):
+    """Errors are reported as for "cylc function-run"."""
+    pool = FunctionPool(size=1, max_calls=0, timeout=60)
+    try:
+        ctx, = _run_pool(pool, [_func_ctx(xtrig_dir, 'pool_error')])
+        assert ctx.ret_code == 1
+        assert 'ValueError: oops' in ctx.err
+        assert ctx.out is None
+        assert pool.stats['pool_error'].errors == 1
+    finally:
+        pool.terminate()
+
+
+def test_function_pool_timeout(xtrig_dir):
+    """Calls are killed (with the worker) on timeout."""
+    pool = FunctionPool(size=2, max_calls=0, timeout=3)
+    try:
+        slow, fast = _run_pool(
+            pool,
+            [_func_ctx(xtrig_dir, delay=60), _func_ctx(xtrig_dir, delay=0)]
+        )[::-1]
+        assert fast.ret_code == 0
+        assert slow.ret_code == -9
+        assert 'killed on timeout (3)' in slow.err
+        assert len(pool.workers) == 1
+    finally:
+        pool.terminate()
+
+
+def test_function_pool_restart(xtrig_dir):
+    """Workers are replaced on restart, so module changes take effect."""
+    pool = FunctionPool(size=1, max_calls=0, timeout=60)
+    try:
+        ctx, = _run_pool(pool, [_func_ctx(xtrig_dir)])
+        pid = json.loads(ctx.out)[1]['pid']
+
+        # idle workers are replaced
+        mod_file = xtrig_dir / 'lib' / 'python' / 'pool_xtrig.py'
+        mod_file.write_text(
+            mod_file.read_text().replace('"hello"', '"hello again"')
+        )
+        pool.restart()
+        assert not pool.workers
+        ctx, = _run_pool(pool, [_func_ctx(xtrig_dir)])
+        assert ctx.err == 'hello again\n'
+        new_pid = json.loads(ctx.out)[1]['pid']
+        assert new_pid != pid
+
+        # busy workers are replaced once their calls have finished
+        ctx = _func_ctx(xtrig_dir, delay=1)
+        pool.put_command(ctx)
+        while not pool.workers or pool.workers[0].call is None:
+            pool.process()
+            sleep(0.05)
+        pool.restart()
+        worker, = pool.workers
+        assert worker.expired
+        assert _run_pool(pool, []) == [ctx]
+        assert ctx.ret_code == 0
+        assert json.loads(ctx.out)[1]['pid'] == new_pid
+        assert not pool.workers
+    finally:
+        pool.terminate()
+
+
+def test_subprocpool_function_pool(mock_glbl_cfg, xtrig_dir):
+    """The process pool runs xtrigger functions in the function pool."""
+    mock_glbl_cfg(
+        'cylc.flow.subprocpool.glbl_cfg',
+        '''
+            [scheduler]
+                [[xtrigger workers]]
+                    pool size = 1
+        '''
+    )
+    proc_pool = SubProcPool()
+    assert proc_pool.func_pool is not None
+    ctx = _func_ctx(xtrig_dir)
+    done = []
+    proc_pool.put_command(ctx, callback=done.append)
+    assert not proc_pool.queuings
+    start = time()
+    while proc_pool.is_not_done():
+        assert time() - start < 60
+        proc_pool.process()
+        sleep(0.05)
+    assert done == [ctx]
+    assert json.loads(ctx.out)[0] is True
+    proc_pool.terminate()
+    assert not proc_pool.func_pool.workers
@@ -36,3 +36,18 @@ def test_send_messages_err(
         'arasaka', '1/v/01', [['INFO', 'silverhand']], '2077-01-01T00:00:00Z'
     )
     assert f"gaierror: [Errno -2] {exc_msg}" in capsys.readouterr().err
+
+
+def test_send_messages_relay(monkeypatch: pytest.MonkeyPatch):
+    """If the message relay accepts the messages, they should not be sent
+    directly."""
+    def mock_get_client(*a, **k):
+        raise Exception('should not be called')
+
+    monkeypatch.setattr('cylc.flow.task_message.get_client', mock_get_client)
+    monkeypatch.setattr(
+        'cylc.flow.task_message.relay_messages', lambda *a: True
+    )
+    send_messages(
+        'arasaka', '1/v/01', [['INFO', 'silverhand']], '2077-01-01T00:00:00Z'
+    )
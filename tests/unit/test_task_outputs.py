@@ -356,3 +356,23 @@ def test_get_trigger_completion_variable_maps():
     t2c, c2t = get_trigger_completion_variable_maps(('a', 'b-b', 'c-c-c'))
     assert t2c == {'a': 'a', 'b-b': 'b_b', 'c-c-c': 'c_c_c'}
     assert c2t == {'a': 'a', 'b_b': 'b-b', 'c_c_c': 'c-c-c'}
+
+
+def test_shared_output_maps():
+    """Tasks with the same outputs should share their output maps."""
+    task_def = tdef(['x'], [])
+    outputs1 = TaskOutputs(task_def)
+    outputs2 = TaskOutputs(task_def)
+    assert outputs1._message_to_trigger is outputs2._message_to_trigger
+    assert outputs1._message_to_compvar is outputs2._message_to_compvar
+
+    # completing an output should not affect the other task
+    outputs1.set_message_complete('x')
+    assert outputs1.is_message_complete('x') is True
+    assert outputs2.is_message_complete('x') is False
+
+    # adding an output should not affect the other task
+    outputs1.add('y-y', 'y')
+    assert outputs1.get_trigger('y') == 'y-y'
+    assert 'y' not in outputs2._message_to_trigger
+    assert 'y' not in outputs2._message_to_compvar
@@ -51,9 +51,8 @@ def test_get_active_flow_nums(
     mock_task_pool = Mock(
         get_tasks=lambda: [Mock(flow_nums=fnums) for fnums in pool],
     )
-    mock_task_pool.workflow_db_mgr.pri_dao.select_latest_flow_nums = (
-        lambda: db_fnums
-    )
+    mock_pri_dao = mock_task_pool.workflow_db_mgr.get_open_pri_dao()
+    mock_pri_dao.select_latest_flow_nums = lambda: db_fnums
 
     assert TaskPool._get_active_flow_nums(mock_task_pool) == expected
 
@@ -75,7 +74,8 @@ def test_check_output(
     expected: SatisfiedState,
 ):
     mock_task_pool = Mock()
-    mock_task_pool.workflow_db_mgr.pri_dao.select_task_outputs.return_value = {
+    mock_pri_dao = mock_task_pool.workflow_db_mgr.get_open_pri_dao()
+    mock_pri_dao.select_task_outputs.return_value = {
         '{"f": "foo", "g": "goo"}': db_flow_nums,
     }
 
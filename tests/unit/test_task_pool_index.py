@@ -0,0 +1,97 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from cylc.flow.task_pool_index import TaskPoolIndex, sort_tasks
+from cylc.flow.task_state import (
+    TASK_STATUS_RUNNING,
+    TASK_STATUS_WAITING,
+)
+
+
+class MockTask(SimpleNamespace):
+    __hash__ = object.__hash__
+    __eq__ = object.__eq__
+
+
+def make_task(name, point, status=TASK_STATUS_WAITING, xtriggers=None):
+    state = SimpleNamespace(
+        status=status,
+        is_held=False,
+        is_queued=False,
+        is_runahead=False,
+        is_updated=False,
+        xtriggers=xtriggers or {},
+    )
+    return MockTask(
+        identity=f'{point}/{name}',
+        point=point,
+        tdef=SimpleNamespace(name=name),
+        state=state,
+        waiting_on_job_prep=False,
+    )
+
+
+def test_index():
+    """It should keep the indexes in sync with task state."""
+    get_sig = Mock(side_effect=lambda itask, label: f'{label}()')
+    index = TaskPoolIndex(get_sig)
+    foo = make_task('foo', 1, xtriggers={'x': False})
+    bar = make_task('bar', 1)
+    index.add(foo)
+    index.add(bar)
+    assert len(index) == 2
+    assert index.by_id == {'1/foo': foo, '1/bar': bar}
+    assert index.by_status[TASK_STATUS_WAITING] == {foo, bar}
+    assert index.by_name == {'foo': {foo}, 'bar': {bar}}
+    assert index.by_xtrigger == {'x()': {foo}}
+
+    # the xtrigger signature should not be recomputed unnecessarily
+    get_sig.reset_mock()
+    foo.state.status = TASK_STATUS_RUNNING
+    foo.state.is_held = True
+    foo.state.is_updated = True
+    index.update(foo)
+    assert get_sig.call_count == 0
+    assert index.by_status[TASK_STATUS_WAITING] == {bar}
+    assert index.by_status[TASK_STATUS_RUNNING] == {foo}
+    assert index.held == {foo}
+    assert index.updated == {foo}
+
+    foo.state.xtriggers['x'] = True
+    index.update(foo)
+    assert index.by_xtrigger == {}
+
+    foo.state.is_updated = False
+    index.update(foo)
+    assert index.updated == set()
+
+    index.remove(foo)
+    assert foo not in index
+    assert index.by_id == {'1/bar': bar}
+    assert index.by_name == {'bar': {bar}}
+    assert index.held == set()
+    # removing again should be a no-op
+    index.remove(foo)
+
+
+def test_sort_tasks():
+    tasks = [make_task('b', 2), make_task('b', 1), make_task('a', 2)]
+    assert [itask.identity for itask in sort_tasks(tasks)] == [
+        '1/b', '2/a', '2/b'
+    ]
@@ -141,3 +141,21 @@ def test_job_tokens():
         submit_num=3,
     )
     assert str(itask.job_tokens) == 'wflow//10/foo/03'
+
+
+def test_platform_lazy(monkeypatch):
+    """The default platform should only be copied when first used."""
+    get_platform = Mock(return_value={'name': 'localhost'})
+    monkeypatch.setattr('cylc.flow.task_proxy.get_platform', get_platform)
+    itask = TaskProxy(
+        Tokens('wflow'),
+        TaskDef('foo', {}, None, None),
+        IntegerPoint('1'),
+    )
+    get_platform.assert_not_called()
+    assert itask.platform == {'name': 'localhost'}
+    assert itask.platform == {'name': 'localhost'}
+    get_platform.assert_called_once()
+
+    itask.platform = {'name': 'other'}
+    assert itask.platform == {'name': 'other'}
@@ -15,6 +15,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from pathlib import Path
+from time import time
 from typing import (
     List,
     Set,
@@ -30,7 +31,10 @@ from cylc.flow.id import Tokens
 from cylc.flow.task_proxy import TaskProxy
 from cylc.flow.taskdef import TaskDef
 from cylc.flow.util import serialise_set
-from cylc.flow.workflow_db_mgr import WorkflowDatabaseManager
+from cylc.flow.workflow_db_mgr import (
+    WorkflowDatabaseManager,
+    coalesce_updates,
+)
 
 
 @pytest.mark.parametrize('flow_nums, expected_removed', [
@@ -77,3 +81,73 @@ def test_remove_task_from_flows(
                 )
             }
             assert remaining_fnums == expected_remaining
+
+
+def test_coalesce_updates_barriers():
+    """UPDATEs should not be merged across those that change WHERE columns.
+    """
+    db_updates = [
+        ({'status': 'running'}, {'name': 'a', 'flow_nums': '[1]'}),
+        # this changes which rows match the other updates
+        ({'flow_nums': '[2]'}, {'name': 'a', 'flow_nums': '[1]'}),
+        ({'status': 'failed'}, {'name': 'a', 'flow_nums': '[1]'}),
+        ({'status': 'succeeded'}, {'name': 'a', 'flow_nums': '[2]'}),
+        # different WHERE columns
+        ({'status': 'waiting'}, {'name': 'a'}),
+        ({'status': 'expired'}, {'name': 'a', 'flow_nums': '[2]'}),
+        ({'time': 1}, {'name': 'a', 'flow_nums': '[2]'}),
+    ]
+    assert coalesce_updates(db_updates) == [
+        *db_updates[:5],
+        ({'status': 'expired', 'time': 1}, {'name': 'a', 'flow_nums': '[2]'}),
+    ]
+
+
+def test_process_queued_ops_benchmark(tmp_path: Path):
+    """Micro-benchmark processing a large number of queued operations.
+
+    Draining the queues should be linear in the number of queued items and
+    repeated updates to the same row should be coalesced.
+    """
+    class DAO:
+        def __init__(self):
+            self.inserts = []
+            self.updates = []
+
+        def add_insert_item(self, table_name, args):
+            self.inserts.append(args)
+
+        def add_update_item(self, table_name, item):
+            self.updates.append(item)
+
+        def execute_queued_items(self):
+            pass
+
+    n_ops = 100_000
+    db_mgr = WorkflowDatabaseManager(tmp_path)
+    db_mgr.pri_dao = pri_dao = DAO()
+    db_mgr.pub_dao = DAO()
+    for i in range(n_ops // 2):
+        db_mgr.db_inserts_map[db_mgr.TABLE_TASK_POOL].append(
+            {'cycle': '1', 'name': f't{i}', 'status': 'waiting'}
+        )
+        db_mgr.db_updates_map[db_mgr.TABLE_TASK_STATES].append(
+            ({'status': 'running', 'time_updated': i},
+             {'cycle': '1', 'name': f't{i % 100}'})
+        )
+
+    start = time()
+    db_mgr.process_queued_ops()
+    elapsed = time() - start
+
+    assert len(pri_dao.inserts) == n_ops // 2
+    # updates to the same row should have been coalesced
+    assert len(pri_dao.updates) == 100
+    assert pri_dao.updates[0] == (
+        {'status': 'running', 'time_updated': n_ops // 2 - 100},
+        {'cycle': '1', 'name': 't0'},
+    )
+    assert not any(db_mgr.db_inserts_map.values())
+    assert not any(db_mgr.db_updates_map.values())
+    # (generous bound, the old quadratic draining took much longer)
+    assert elapsed < 10, f'{n_ops} operations took {elapsed:.2f}s'
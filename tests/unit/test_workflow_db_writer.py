@@ -0,0 +1,120 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import sqlite3
+from time import sleep
+
+import pytest
+
+from cylc.flow.rundb import CylcWorkflowDAO
+from cylc.flow.workflow_db_writer import PublicDatabaseWriter
+
+
+TABLE = CylcWorkflowDAO.TABLE_TASKS_TO_HOLD
+
+
+@pytest.fixture
+def dao(tmp_path):
+    dao = CylcWorkflowDAO(tmp_path / 'db', is_public=True, create_tables=True)
+    dao.close()
+    yield dao
+    dao.close()
+
+
+def put_tasks_to_hold(dao, writer, *names):
+    """Replace the content of the tasks_to_hold table."""
+    dao.add_delete_item(TABLE)
+    for name in names:
+        dao.add_insert_item(TABLE, {'name': name, 'cycle': '1'})
+    writer.put(dao.take_queued_items())
+
+
+def select_tasks_to_hold(dao):
+    with sqlite3.connect(dao.db_file_name) as conn:
+        return sorted(
+            name for name, _ in conn.execute(f'SELECT * FROM {TABLE}')
+        )
+
+
+def test_writer(dao):
+    """It should write batches in order."""
+    writer = PublicDatabaseWriter(dao, max_batches=10, max_lag=60)
+    writer.start()
+    put_tasks_to_hold(dao, writer, 'a', 'b')
+    put_tasks_to_hold(dao, writer, 'c')
+    writer.flush()
+    assert select_tasks_to_hold(dao) == ['c']
+    assert writer.n_batches_written == 2
+    assert writer.get_lag() == (0, 0.0)
+    assert not writer.is_behind()
+
+    # it should write any waiting batches on stop
+    with writer.paused():
+        put_tasks_to_hold(dao, writer, 'd')
+    put_tasks_to_hold(dao, writer, 'e')
+    writer.stop()
+    assert select_tasks_to_hold(dao) == ['e']
+
+
+def test_writer_behind(dao):
+    """It should report when it falls behind and discard batches on pause.
+    """
+    writer = PublicDatabaseWriter(dao, max_batches=1, max_lag=60)
+    # (writer thread not started)
+    put_tasks_to_hold(dao, writer, 'a')
+    assert not writer.is_behind()
+    put_tasks_to_hold(dao, writer, 'b')
+    assert writer.get_lag()[0] == 2
+    assert writer.is_behind()
+    with writer.paused():
+        pass
+    assert writer.get_lag() == (0, 0.0)
+
+    # too old
+    writer.max_lag = 0
+    put_tasks_to_hold(dao, writer, 'c')
+    assert writer.is_behind()
+
+
+def test_writer_retry(dao, monkeypatch):
+    """It should retry failed writes, preserving the order of writes."""
+    monkeypatch.setattr(PublicDatabaseWriter, 'RETRY_DELAY', 0.01)
+    writer = PublicDatabaseWriter(dao, max_batches=10, max_lag=60)
+
+    # make the first write attempt fail
+    execute_sql = dao.execute_sql
+    attempts = []
+
+    def _execute_sql(sql_queue):
+        attempts.append(sql_queue)
+        if len(attempts) == 1:
+            dao.failed_sql_queue = dao.failed_sql_queue + sql_queue
+            dao.n_tries += 1
+            return False
+        return execute_sql(sql_queue)
+
+    monkeypatch.setattr(dao, 'execute_sql', _execute_sql)
+    put_tasks_to_hold(dao, writer, 'a')
+    writer.start()
+    put_tasks_to_hold(dao, writer, 'b')
+    for _ in range(100):
+        if len(attempts) > 1 and dao.n_tries == 0:
+            break
+        sleep(0.01)
+    writer.stop()
+    assert len(attempts) > 1
+    assert dao.n_tries == 0
+    assert select_tasks_to_hold(dao) == ['b']
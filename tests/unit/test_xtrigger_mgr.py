@@ -159,7 +159,7 @@ def test_housekeeping_nothing_satisfied(xtrigger_mgr):
     xtrigger_mgr.add_xtriggers(XtriggerCollator())
     xtrigger_mgr.load_xtrigger_for_restart(row_idx=0, row=row)
     assert xtrigger_mgr.sat_xtrig
-    xtrigger_mgr.housekeep([])
+    xtrigger_mgr.housekeep(set())
     assert not xtrigger_mgr.sat_xtrig
 
 
@@ -198,7 +198,9 @@ def test_housekeeping_with_xtrigger_satisfied(xtrigger_mgr):
     xtrigger_mgr.callback(xtrig)
     assert xtrigger_mgr.sat_xtrig
 
-    xtrigger_mgr.housekeep([itask])
+    xtrigger_mgr.housekeep(
+        set(xtrigger_mgr._get_xtrigs(itask, unsat_only=True, sigs_only=True))
+    )
     # here we still have the same number as before
     assert xtrigger_mgr.sat_xtrig
 
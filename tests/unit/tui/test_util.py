@@ -27,6 +27,7 @@ import pytest
 from cylc.flow.tui.util import (
     JOB_ICON,
     TASK_ICONS,
+    TreeCache,
     render_node,
     compute_tree,
     get_task_icon
@@ -363,3 +364,78 @@ def test_compute_tree():
         'submitNum'
     ]
     assert len(job_info['children']) == 0
+
+
+@pytest.mark.parametrize('prune_families', [False, True])
+def test_compute_tree_cache(prune_families):
+    """It reuses the nodes of unchanged tasks between updates.
+
+    The tree should be the same as one computed from scratch.
+    """
+    def task(name, parent, state='waiting'):
+        return {
+            'name': name,
+            'id': f'1/{name}',
+            'state': state,
+            'firstParent': {'name': parent, 'id': f'1/{parent}'},
+            'cyclePoint': '1',
+            'jobs': [],
+        }
+
+    workflow = {
+        'id': 'workflow id',
+        'port': 1234,
+        'cyclePoints': [{'id': '1/root', 'cyclePoint': '1'}],
+        'familyProxies': [
+            {
+                'name': 'FOO',
+                'id': '1/FOO',
+                'cyclePoint': '1',
+                'firstParent': {'name': 'root', 'id': '1/root'}
+            },
+            {
+                'name': 'BAR',
+                'id': '1/BAR',
+                'cyclePoint': '1',
+                'firstParent': {'name': 'root', 'id': '1/root'}
+            },
+        ],
+        'taskProxies': [
+            task('b10', 'FOO'),
+            task('b2', 'FOO'),
+            task('a', 'root'),
+            task('c', 'BAR'),
+        ],
+    }
+    data = {'workflows': [workflow]}
+    cache = TreeCache()
+
+    def get_nodes(tree):
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node['children'])
+
+    tree = compute_tree(data, prune_families, cache)
+    assert tree == compute_tree(data, prune_families)
+    b2_node = next(node for node in get_nodes(tree) if node['id_'] == '1/b2')
+
+    # change, add and remove tasks
+    workflow['taskProxies'] = [
+        task('b10', 'FOO', state='running'),
+        workflow['taskProxies'][1],
+        task('b1', 'FOO'),
+        task('a', 'root'),
+    ]
+    tree = compute_tree(data, prune_families, cache)
+    assert tree == compute_tree(data, prune_families)
+    foo_node = next(node for node in get_nodes(tree) if node['id_'] == '1/FOO')
+    assert [node['id_'] for node in foo_node['children']] == [
+        '1/b1', '1/b2', '1/b10'
+    ]
+    # the unchanged task keeps its node
+    assert foo_node['children'][1] is b2_node
+
+    # nothing changes
+    assert compute_tree(data, prune_families, cache) == tree
@@ -14,6 +14,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import os
 from pathlib import Path
 import sqlite3
 from typing import Any, Callable
@@ -21,13 +22,14 @@ from shutil import copytree, rmtree
 
 import pytest
 
-from cylc.flow.dbstatecheck import output_fallback_msg
+from cylc.flow.dbstatecheck import get_db_checker, output_fallback_msg
 from cylc.flow.exceptions import WorkflowConfigError, InputError
 from cylc.flow.rundb import CylcWorkflowDAO
 from cylc.flow.workflow_files import WorkflowFiles
 from cylc.flow.xtriggers.workflow_state import (
     _workflow_state_backcompat,
     workflow_state,
+    workflow_state_batch,
     validate,
 )
 from cylc.flow.xtriggers.suite_state import suite_state
@@ -331,3 +333,113 @@ def test_validate_polling_config():
             'is_message': False,
             'flow_num': 44,
         })
+
+
+def test_workflow_state_batch(tmp_run_dir: 'Callable'):
+    """Test batched workflow_state checks.
+
+    They should give the same results as individual checks, and query the DB
+    once per table, reusing the results until the DB changes.
+    """
+    id_ = 'elrond'
+    run_dir: Path = tmp_run_dir(id_)
+    db_file = run_dir / 'log' / 'db'
+    db_file.parent.mkdir(exist_ok=True)
+    with CylcWorkflowDAO(db_file, create_tables=True) as dao:
+        dao.add_insert_item(
+            CylcWorkflowDAO.TABLE_WORKFLOW_PARAMS,
+            {'key': 'cycle_point_format', 'value': '%Y'},
+        )
+        for name, cycle, flow_nums, status in [
+            ('vilya', '2012', '[1]', 'succeeded'),
+            ('vilya', '2013', '[1]', 'failed'),
+            ('vilya', '2014', '[2]', 'succeeded'),
+            ('narya', '2012', '[1]', 'succeeded'),
+        ]:
+            dao.add_insert_item(CylcWorkflowDAO.TABLE_TASK_STATES, {
+                'name': name, 'cycle': cycle, 'flow_nums': flow_nums,
+                'submit_num': 1, 'status': status,
+            })
+            dao.add_insert_item(CylcWorkflowDAO.TABLE_TASK_OUTPUTS, {
+                'name': name, 'cycle': cycle, 'flow_nums': flow_nums,
+                'outputs': f'{{"{status}": "{status}", "x": "the ring"}}',
+            })
+        dao.execute_queued_items()
+    # (else cached results are not trusted, see RACY_WINDOW)
+    os.utime(db_file, (0, 0))
+
+    checks: Any = [
+        {'workflow_task_id': f'{id_}//2012/vilya'},
+        {'workflow_task_id': f'{id_}//2013/vilya'},
+        {'workflow_task_id': f'{id_}//2013/vilya:failed'},
+        {'workflow_task_id': f'{id_}//2012/vilya', 'flow_num': 2},
+        {'workflow_task_id': f'{id_}//2014/vilya', 'flow_num': 2},
+        {'workflow_task_id': f'{id_}//2011/vilya', 'offset': 'P1Y'},
+        {'workflow_task_id': f'{id_}//2012/narya:x', 'is_trigger': True},
+        {
+            'workflow_task_id': f'{id_}//2012/narya:the ring',
+            'is_message': True,
+        },
+        {'workflow_task_id': f'{id_}//2012/nenya'},
+        {'workflow_task_id': f'{id_}//*/narya'},
+        {'workflow_task_id': f'{id_}//2012/vilya:running'},
+        {'workflow_task_id': 'no-such-workflow//2012/vilya'},
+    ]
+    expected = [
+        (True, {
+            'workflow': id_, 'task': 'vilya', 'point': '2012',
+            'status': 'succeeded'
+        }, None),
+        (False, {}, None),
+        (True, {
+            'workflow': id_, 'task': 'vilya', 'point': '2013',
+            'status': 'failed'
+        }, None),
+        (False, {}, None),
+        (True, {
+            'workflow': id_, 'task': 'vilya', 'point': '2014',
+            'flow_num': 2, 'status': 'succeeded'
+        }, None),
+        (True, {
+            'workflow': id_, 'task': 'vilya', 'point': '2012',
+            'offset': 'P1Y', 'status': 'succeeded'
+        }, None),
+        (True, {
+            'workflow': id_, 'task': 'narya', 'point': '2012',
+            'trigger': 'x'
+        }, None),
+        (True, {
+            'workflow': id_, 'task': 'narya', 'point': '2012',
+            'message': 'the ring'
+        }, None),
+        (False, {}, None),
+        (True, {
+            'workflow': id_, 'task': 'narya', 'point': '*',
+            'status': 'succeeded'
+        }, None),
+    ]
+    results = workflow_state_batch(checks)
+    assert results[:-2] == expected
+    # the same as individual checks
+    for check, (satisfied, result, _) in zip(checks[:-2], results):
+        assert workflow_state(**check) == (satisfied, result)
+    # errors are reported for the check
+    assert 'InputError' in results[-2][2]
+    assert results[-1] == (False, {}, None)
+
+    # the results are cached while the DB is unchanged
+    checker = get_db_checker(str(run_dir.parent), id_)
+    queries = []
+    checker.conn.set_trace_callback(queries.append)
+    assert workflow_state_batch(checks[:9]) == expected[:9]
+    assert queries == []
+
+    # but not after it changes
+    conn = sqlite3.connect(str(db_file))
+    conn.execute(
+        "UPDATE task_states SET status = 'succeeded' WHERE cycle = '2013'"
+    )
+    conn.commit()
+    conn.close()
+    assert workflow_state_batch(checks[1:2])[0][0] is True
+    assert len(queries) == 1